@@ -68,6 +68,6 @@ class AmenityResource(Resource):
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {"error": "Amenity not found"}, 404
-        amenity.update(api.payload)
+        amenity = facade.update_amenity(amenity_id, api.payload)
         return amenity.to_dict(), 200
     
\ No newline at end of file
@@ -64,7 +64,7 @@ class ReviewResource(Resource):
         review = facade.get_review(review_id)
         if not review:
             return {"error": "Review not found"}, 404
-        review.update(api.payload)
+        facade.update_review(review_id, api.payload)
         return {"message": "Review updated successfully"}, 200
 
     @api.response(200, "Review deleted")
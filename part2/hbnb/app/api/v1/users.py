@@ -83,7 +83,7 @@ class UserResource(Resource):
         if not user:
             return {"error": "User not found"}, 404
         try:
-           user.update(api.payload)
+           user = facade.update_user(user_id, api.payload)
            return user.to_dict(), 200
         except ValueError as e:
             return {"error": str(e)}, 400
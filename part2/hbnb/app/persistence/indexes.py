@@ -0,0 +1,71 @@
+"""
+Secondary indexes for the InMemoryRepository.
+
+An index maps the value of one attribute to the ids of the objects
+holding it, so lookups by that attribute do not scan every stored
+object. Indexes remember the key they stored for each object id,
+which lets the repository re-index an object after it was mutated.
+"""
+
+
+class HashIndex:
+    """Hash index on a single attribute (optionally unique)."""
+
+    def __init__(self, attr_name, unique=False):
+        """
+        Args:
+            attr_name: Name of the indexed attribute.
+            unique: If True, two objects may not share the same value.
+        """
+        self.attr_name = attr_name
+        self.unique = unique
+        self._entries = {}   # value -> {obj_id: None} (insertion ordered)
+        self._keys = {}      # obj_id -> indexed value
+
+    @property
+    def name(self):
+        return self.attr_name
+
+    def key_of(self, obj):
+        """Return the value indexed for obj."""
+        return getattr(obj, self.attr_name, None)
+
+    def check(self, obj):
+        """Raise ValueError if inserting obj would break uniqueness."""
+        if not self.unique:
+            return
+        key = self.key_of(obj)
+        if key is None:
+            return
+        for obj_id in self._entries.get(key, ()):
+            if obj_id != obj.id:
+                raise ValueError(
+                    f"Duplicate value for unique index '{self.attr_name}': "
+                    f"{key!r}")
+
+    def insert(self, obj):
+        """Index obj under its current attribute value."""
+        key = self.key_of(obj)
+        if key is None:
+            return
+        self._entries.setdefault(key, {})[obj.id] = None
+        self._keys[obj.id] = key
+
+    def remove(self, obj_id):
+        """Drop whatever entry obj_id currently has in the index."""
+        if obj_id not in self._keys:
+            return
+        key = self._keys.pop(obj_id)
+        bucket = self._entries.get(key)
+        if bucket is not None:
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del self._entries[key]
+
+    def lookup(self, value):
+        """Return the ids of the objects whose attribute equals value."""
+        try:
+            return list(self._entries.get(value, ()))
+        except TypeError:
+            # Unhashable value: nothing can have been indexed under it
+            return []
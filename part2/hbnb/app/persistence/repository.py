@@ -33,10 +33,23 @@ class Repository(ABC):
 
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    def __init__(self, indexes=()):
+        """
+        indexes: secondary indexes (see persistence.indexes) kept in
+        sync with the stored objects, used by get_by_attribute.
+        """
         self._storage = {}
+        self._indexes = {index.name: index for index in indexes}
+
+    def _index(self, obj):
+        for index in self._indexes.values():
+            index.check(obj)
+        for index in self._indexes.values():
+            index.remove(obj.id)
+            index.insert(obj)
 
     def add(self, obj):
+        self._index(obj)
         self._storage[obj.id] = obj
 
     def get(self, obj_id):
@@ -48,20 +61,31 @@ class InMemoryRepository(Repository):
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
+            previous = {name: index.key_of(obj)
+                        for name, index in self._indexes.items()}
             obj.update(data)
+            try:
+                self._index(obj)
+            except ValueError:
+                for attr_name, value in previous.items():
+                    setattr(obj, attr_name, value)
+                raise
             return obj
         return None
 
     def delete(self, obj_id):
         if obj_id in self._storage:
             del self._storage[obj_id]
+            for index in self._indexes.values():
+                index.remove(obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
-        for obj in self.storage.value():
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            for obj_id in index.lookup(attr_value):
+                return self._storage[obj_id]
+            return None
+        for obj in self._storage.values():
             if getattr(obj, attr_name, None) == attr_value:
                 return obj
-<<<<<<< HEAD
-        return None
-=======
         return None
->>>>>>> 7a7329e7ec846a3b7dcbf9bccb96d331c3810077
@@ -3,16 +3,19 @@ Facade layer connecting API and business logic.
 """
 
 from hbnb.app.models import User, Place, Review, Amenity
+from hbnb.app.persistence.indexes import HashIndex
 from hbnb.app.persistence.repository import InMemoryRepository
 
 
 class HBnBFacade:
 
     def __init__(self):
-        self.user_repo = InMemoryRepository()
+        self.user_repo = InMemoryRepository(
+            indexes=[HashIndex("email", unique=True)])
         self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+        self.review_repo = InMemoryRepository(
+            indexes=[HashIndex("place_id"), HashIndex("user_id")])
+        self.amenity_repo = InMemoryRepository(indexes=[HashIndex("name")])
 
     # =========================
     # USER
@@ -35,6 +38,12 @@ class HBnBFacade:
     def get_all_users(self):
         return self.user_repo.get_all()
 
+    def update_user(self, user_id, update_data):
+        user = self.user_repo.update(user_id, update_data)
+        if not user:
+            raise ValueError("User not found")
+        return user
+
     # =========================
     # AMENITY
     # =========================
@@ -50,6 +59,12 @@ class HBnBFacade:
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    def update_amenity(self, amenity_id, update_data):
+        amenity = self.amenity_repo.update(amenity_id, update_data)
+        if not amenity:
+            raise ValueError("Amenity not found")
+        return amenity
+
     def add_amenity_to_place(self, place_id, amenity_id):
 
         place = self.place_repo.get(place_id)
@@ -128,6 +143,12 @@ class HBnBFacade:
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
+    def update_review(self, review_id, update_data):
+        review = self.review_repo.update(review_id, update_data)
+        if not review:
+            raise ValueError("Review not found")
+        return review
+
     def delete_review(self, review_id):
         review = self.review_repo.get(review_id)
         if not review:
@@ -6,7 +6,7 @@ from hbnb.app import create_app
 from hbnb.app.services import facade
 from hbnb.app.utils import hash_password
 
-app = create_app()
+app = create_app("development")
 
 with app.app_context():
     admin_data = {
@@ -7,6 +7,13 @@ from flask_jwt_extended import JWTManager
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
 from hbnb.config import config
+from hbnb.app.credential_cache import credential_cache
+from hbnb.app.hashing import HasherBusy, password_hasher
+from hbnb.app.metrics import metrics
+from hbnb.app.persistence.routing import RoutingSession, replica_router
+from hbnb.app.persistence.write_queue import write_queue
+from hbnb.app.response_cache import response_cache
+from hbnb.app.user_cache import user_cache
  
 # =============================================================================
 # GLOBAL EXTENSIONS
@@ -17,7 +24,8 @@ from hbnb.config import config
 # =============================================================================
 jwt = JWTManager()
 bcrypt = Bcrypt()
-db = SQLAlchemy()
+# Reads of the facade may go to a replica (see persistence/routing.py)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
  
  
 def create_app(config_name='testing'):
@@ -31,17 +39,24 @@ def create_app(config_name='testing'):
     jwt.init_app(app)
     bcrypt.init_app(app)
     db.init_app(app)
+    password_hasher.init_app(app)
+    credential_cache.init_app(app)
+    user_cache.init_app(app)
+    response_cache.init_app(app)
  
-    from sqlalchemy import event
-    from sqlalchemy.engine import Engine
-    import sqlite3
-
-    @event.listens_for(Engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        if isinstance(dbapi_connection, sqlite3.Connection):
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
+    # SQLite settings of each new connection (see persistence/sqlite.py);
+    # the app never writes to the read replica
+    from hbnb.app.persistence.sqlite import apply_pragmas, copy_database
+    pragmas = app.config.get("SQLITE_PRAGMAS", {"foreign_keys": "ON"})
+    replica_router.init_app(app)
+    with app.app_context():
+        apply_pragmas(db.engine, pragmas)
+        replica = db.engines.get(replica_router.bind_key)
+        if replica is not None:
+            apply_pragmas(replica, dict(pragmas, query_only="ON"))
+    # Writer thread of the facade (see persistence/write_queue.py), once
+    # its connections get the pragmas
+    write_queue.init_app(app)
     # -------------------------------------------------------------------------
     # 2. Import the namespaces HERE (inside the function)
     # At this point, db is already defined → no more circular import
@@ -51,6 +66,16 @@ def create_app(config_name='testing'):
     from hbnb.app.api.v1.reviews import api as reviews_ns
     from hbnb.app.api.v1.amenities import api as amenities_ns
     from hbnb.app.api.v1.auth import api as auth_ns
+    from hbnb.app.cli import hbnb_cli
+    from hbnb.app.services import facade
+    facade.place_coordinates.init_app(app)
+    from hbnb.app.token_blocklist import token_blocklist
+    token_blocklist.init_app(app)
+
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        # Asked on every authenticated request (see app/token_blocklist.py)
+        return token_blocklist.is_revoked(jwt_payload)
  
     # -------------------------------------------------------------------------
     # 3. Basic Route
@@ -76,13 +101,28 @@ def create_app(config_name='testing'):
     api.add_namespace(reviews_ns,   path="/api/v1/reviews")
     api.add_namespace(amenities_ns, path="/api/v1/amenities")
     api.add_namespace(auth_ns,      path="/api/v1/auth")
+
+    @api.errorhandler(HasherBusy)
+    def hasher_busy(error):
+        # Backpressure from the password hashing pool
+        return ({"error": "Server busy, please retry later"}, 503,
+                {"Retry-After": str(error.retry_after)})
+
+    # Request counts and latencies, GET /metrics (see app/metrics.py)
+    metrics.init_app(app)
+
+    # `flask hbnb load ...` (see app/cli.py)
+    app.cli.add_command(hbnb_cli)
  
     # -------------------------------------------------------------------------
     # 5. Create the tables (after SQLAlchemy knows all the models)
     # -------------------------------------------------------------------------
     with app.app_context():
         from hbnb.app.models import User, Place, Review, Amenity  # noqa: F401
-        db.create_all()
+        # Primary only: the replica is a copy (see persistence/routing.py)
+        db.create_all(bind_key=None)
+        # Tables created before columns or indexes were added to the
+        # models are brought up to date by `flask hbnb upgrade-schema`
  
     # -------------------------------------------------------------------------
     # 6. Initial data: admin + basic amenities
@@ -115,5 +155,12 @@ def create_app(config_name='testing'):
         except Exception as e:
             print(f"Could not initialize database: {e}")
  
+        # A new, empty replica file starts as a copy of the primary
+        # (`flask hbnb sync-replica` refreshes it)
+        from sqlalchemy import inspect
+        if (replica is not None and replica.dialect.name == "sqlite"
+                and not inspect(replica).get_table_names()):
+            copy_database(db.engine, replica.url.database)
+ 
     return app
  
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+ASGI serving mode: async handlers over SQLAlchemy's asyncio engine.
+
+Under WSGI each in-flight request holds a worker thread, including
+while it waits on the database or on bcrypt. The ASGI app serves the
+API endpoints with async handlers (app/aio/api.py) on an async facade
+and repositories: one event loop interleaves many requests, each
+waiting on its queries (aiosqlite) or password checks (the hasher
+pool) without a thread of its own.
+
+The Flask app is still built (schema, initial data, settings, the
+process-wide caches and JWT keys) and serves, through a WSGI adapter,
+everything without an async handler: the API docs, bulk creation,
+geographic search and the GET variants driven by query parameters
+(pagination, filters, ?expand=, streaming), whose work is mostly
+CPU-bound anyway. It needs the SQL backend (USE_DATABASE=true): the
+in-memory repositories belong to the sync facade.
+
+Run it with an ASGI server, e.g. `uvicorn hbnb.asgi:app`.
+"""
+from contextlib import asynccontextmanager
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.routing import Mount, Route
+
+from hbnb.app.aio.database import async_db
+
+# Paths the async routes would capture, left to the Flask app
+WSGI_ONLY = (
+    '/api/v1/amenities/bulk',
+    '/api/v1/places/bulk',
+    '/api/v1/places/search',
+    '/api/v1/reviews/bulk',
+)
+
+
+class QueryStringFallback:
+    """
+    ASGI middleware: GET requests with a query string go to the
+    fallback app (the Flask app), the others to the async routes.
+    """
+
+    def __init__(self, app, fallback):
+        self.app = app
+        self.fallback = fallback
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] == 'http' and scope['query_string']
+                and scope['method'] in ('GET', 'HEAD')):
+            await self.fallback(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+def create_asgi_app(config_name='testing'):
+    """ASGI application factory (see create_app for config_name)."""
+    from hbnb.app import create_app
+    from hbnb.app.aio.api import routes
+    from hbnb.app.services.facade import USE_DATABASE
+
+    if not USE_DATABASE:
+        raise RuntimeError("The ASGI app needs the SQL backend "
+                           "(USE_DATABASE=true)")
+    flask_app = create_app(config_name)
+    async_db.init_app(flask_app)
+    wsgi = WSGIMiddleware(flask_app)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await async_db.dispose()
+
+    app = Starlette(
+        routes=([Route(path, wsgi) for path in WSGI_ONLY] + routes
+                + [Mount('/', app=wsgi)]),
+        middleware=[Middleware(QueryStringFallback, fallback=wsgi)],
+        lifespan=lifespan)
+    app.state.flask_app = flask_app
+    return app
@@ -0,0 +1,573 @@
+"""
+Async handlers of the API endpoints (Starlette).
+
+Each handler mirrors its flask-restx twin in app/api/v1: same payload
+models (validated by flask-restx's own validator), permissions, status
+codes and bodies, same response cache entries and ETag / Last-Modified
+validators. Listing variants driven by query parameters (pagination,
+filters, ?expand=, streaming), bulk creation and geographic search are
+served by the Flask app (see app/aio/__init__.py).
+"""
+import json
+from datetime import timezone
+from functools import wraps
+from time import perf_counter_ns
+
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import http_date, parse_date, parse_etags
+
+from hbnb.app.aio.auth import (
+    AuthError, hash_password, issue_access_token, issue_token_pair,
+    require_identity, revoke, verify_password)
+from hbnb.app.aio.database import async_db
+from hbnb.app.aio.facade import AsyncHBnBFacade
+from hbnb.app.api.v1.amenities import amenity_model
+from hbnb.app.api.v1.auth import login_model
+from hbnb.app.api.v1.conditional import etag_of
+from hbnb.app.api.v1.places import (
+    place_model, place_tags, place_update_model)
+from hbnb.app.api.v1.reviews import review_model, review_update_model
+from hbnb.app.api.v1.users import user_model, user_update_model
+from hbnb.app.hashing import HasherBusy
+from hbnb.app.metrics import FACADE_CALLS, metrics
+from hbnb.app.response_cache import response_cache
+from hbnb.app.services import facade as sync_facade
+
+# Shares the sync facade's coordinate cache; its calls are timed in the
+# same series as the sync facade's
+facade = metrics.instrument(
+    AsyncHBnBFacade(place_coordinates=sync_facade.place_coordinates),
+    FACADE_CALLS)
+
+
+class ApiError(Exception):
+    """Ends a handler with an error response."""
+
+    def __init__(self, payload, status):
+        super().__init__(payload)
+        self.payload = payload
+        self.status = status
+
+
+def endpoint(handler):
+    """
+    Starlette endpoint of an async handler(request, **path_params)
+    returning (payload, status[, headers]) or a Response. The request's
+    session is closed when it returns, and the request recorded under
+    its route on GET /metrics.
+    """
+    @wraps(handler)
+    async def wrapper(request):
+        started = perf_counter_ns()
+        try:
+            result = await handler(request, **request.path_params)
+        except ApiError as e:
+            result = e.payload, e.status
+        except AuthError as e:
+            result = {'msg': e.msg}, e.status
+        except HasherBusy as e:
+            # Backpressure from the password hashing pool
+            result = ({'error': 'Server busy, please retry later'}, 503,
+                      {'Retry-After': str(e.retry_after)})
+        finally:
+            await async_db.session.remove()
+        response = (result if isinstance(result, Response)
+                    else JSONResponse(*result))
+        if metrics.enabled:
+            metrics.observe_request(_paths.get(wrapper), request.method,
+                                    response.status_code,
+                                    perf_counter_ns() - started)
+        return response
+    return wrapper
+
+
+async def payload_of(request, model):
+    """The JSON body, validated against a flask-restx model"""
+    if request.headers.get('content-type', '').split(';')[0] != \
+            'application/json':
+        raise ApiError({'message': "Did not attempt to load JSON data because"
+                                   " the request Content-Type was not "
+                                   "'application/json'."}, 415)
+    try:
+        payload = json.loads(await request.body())
+    except ValueError as e:
+        raise ApiError(
+            {'message': f'Failed to decode JSON object: {e}'}, 400)
+    try:
+        model.validate(payload)
+    except HTTPException as e:
+        raise ApiError(e.data, e.code)
+    return payload
+
+
+async def cached(request, build):
+    """
+    The cached response of the request, built on a miss (see
+    api/v1/caching.py; the two modes share the entries).
+
+    Args:
+        build: async callable() -> (payload, status, tags).
+    """
+    key = f'{request.url.path}?'
+    body = response_cache.get(key)
+    if body is None:
+        built = response_cache.generation()
+        payload, status, tags = await build()
+        if status != 200:
+            return payload, status
+        body = json.dumps(payload)
+        response_cache.put(key, body, tags, built)
+    return Response(body, 200, media_type='application/json')
+
+
+async def conditional(request, kind, obj_id, handler):
+    """
+    Answer 304 if the client's copy is current, else run handler()
+    and add ETag / Last-Modified (see api/v1/conditional.py).
+    """
+    version = await facade.get_version(kind, obj_id)
+    if version is None:
+        return await handler()
+    latest = version[1] if obj_id is None else version
+    if latest is not None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    etag = etag_of(kind, obj_id, version)
+    headers = {'ETag': etag}
+    if latest is not None:
+        headers['Last-Modified'] = http_date(latest)
+
+    if_none_match = request.headers.get('if-none-match')
+    since = parse_date(request.headers.get('if-modified-since'))
+    if if_none_match:
+        # If-None-Match wins over If-Modified-Since (RFC 9110)
+        not_modified = parse_etags(if_none_match).contains(etag.strip('"'))
+    else:
+        not_modified = (since is not None and latest is not None
+                        and latest.replace(microsecond=0) <= since)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    result = await handler()
+    if isinstance(result, Response):
+        if result.status_code == 200:
+            result.headers.update(headers)
+        return result
+    if result[1] == 200:
+        return result[0], 200, headers
+    return result
+
+
+# =========================================================================
+# AUTH
+# =========================================================================
+
+@endpoint
+async def login(request):
+    """Authenticate user and return a JWT token"""
+    credentials = await payload_of(request, login_model)
+    flask_app = request.app.state.flask_app
+    user = await facade.get_user_by_email(credentials['email'])
+    if not user or not await verify_password(flask_app, user,
+                                             credentials['password']):
+        return {'error': 'Invalid credentials'}, 401
+    access_token, refresh_token = issue_token_pair(flask_app, user.id,
+                                                   user.is_admin)
+    return {'access_token': access_token, 'refresh_token': refresh_token}, 200
+
+
+@endpoint
+async def refresh(request):
+    """Get a new access token (send the refresh token)"""
+    identity = await require_identity(request, refresh=True)
+    user = await facade.get_user_record(identity.user_id)
+    if not user:
+        return {'error': 'User not found'}, 401
+    return {'access_token': issue_access_token(
+        request.app.state.flask_app, identity.claims, user['is_admin'])}, 200
+
+
+@endpoint
+async def logout(request):
+    """Revoke the token sent and its refresh token (or access tokens)"""
+    identity = await require_identity(request, verify_type=False)
+    await revoke(identity.claims)
+    return {'message': 'Successfully logged out'}, 200
+
+
+@endpoint
+async def protected(request):
+    """A protected endpoint that requires a valid JWT token"""
+    identity = await require_identity(request)
+    return {'message': f'Hello, user {identity.user_id}',
+            'is_admin': identity.is_admin}, 200
+
+
+# =========================================================================
+# USERS
+# =========================================================================
+
+@endpoint
+async def list_users(request):
+    """Get all users"""
+    async def handler():
+        return [user.to_dict() for user in await facade.get_all_users()], 200
+    return await conditional(request, 'user', None, handler)
+
+
+@endpoint
+async def create_user(request):
+    """Create a new user (Admin only)"""
+    payload = await payload_of(request, user_model)
+    if not (await require_identity(request)).is_admin:
+        return {'error': 'Admin privileges required'}, 403
+    try:
+        if await facade.get_user_by_email(payload['email']):
+            return {'error': 'Email already registered'}, 400
+        payload['password'] = await hash_password(payload['password'])
+        user = await facade.create_user(payload)
+        return {'id': user.id, 'message': 'User successfully created'}, 201
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def get_user(request, user_id):
+    """Get user by ID"""
+    async def build():
+        user = await facade.get_user(user_id)
+        if not user:
+            return {'message': 'User not found'}, 404, ()
+        return user.to_dict(), 200, [('user', user_id)]
+    return await conditional(request, 'user', user_id,
+                             lambda: cached(request, build))
+
+
+@endpoint
+async def update_user(request, user_id):
+    """Update user (Users can update themselves, admins can update anyone)"""
+    update_data = await payload_of(request, user_update_model)
+    identity = await require_identity(request)
+    if not identity.may_modify(user_id):
+        return {'error': 'Unauthorized action'}, 403
+    if not await facade.get_user(user_id):
+        return {'error': 'User not found'}, 404
+
+    if not identity.is_admin:
+        if 'email' in update_data or 'password' in update_data:
+            return {'error': 'You cannot modify email or password'}, 400
+    else:
+        if 'email' in update_data:
+            existing_user = await facade.get_user_by_email(
+                update_data['email'])
+            if existing_user and existing_user.id != user_id:
+                return {'error': 'Email already in use'}, 400
+        if 'password' in update_data:
+            update_data['password'] = await hash_password(
+                update_data['password'])
+    try:
+        user = await facade.update_user(user_id, update_data)
+        return user.to_dict(), 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+# =========================================================================
+# AMENITIES
+# =========================================================================
+
+@endpoint
+async def list_amenities(request):
+    """Get all amenities (Public)"""
+    async def build():
+        amenities = await facade.get_all_amenities()
+        return ([amenity.to_dict() for amenity in amenities], 200,
+                [('amenities',)])
+    return await conditional(request, 'amenity', None,
+                             lambda: cached(request, build))
+
+
+@endpoint
+async def create_amenity(request):
+    """Create a new amenity (Admin only)"""
+    payload = await payload_of(request, amenity_model)
+    if not (await require_identity(request)).is_admin:
+        return {'error': 'Admin privileges required'}, 403
+    try:
+        return (await facade.create_amenity(payload)).to_dict(), 201
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def get_amenity(request, amenity_id):
+    """Get amenity by ID (Public)"""
+    async def handler():
+        amenity = await facade.get_amenity(amenity_id)
+        if not amenity:
+            return {'error': 'Amenity not found'}, 404
+        return amenity.to_dict(), 200
+    return await conditional(request, 'amenity', amenity_id, handler)
+
+
+@endpoint
+async def update_amenity(request, amenity_id):
+    """Update an amenity (Admin only)"""
+    payload = await payload_of(request, amenity_model)
+    if not (await require_identity(request)).is_admin:
+        return {'error': 'Admin privileges required'}, 403
+    if not await facade.get_amenity(amenity_id):
+        return {'error': 'Amenity not found'}, 404
+    try:
+        return (await facade.update_amenity(amenity_id, payload)).to_dict(), 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+# =========================================================================
+# PLACES
+# =========================================================================
+
+@endpoint
+async def list_places(request):
+    """Get all places (Public endpoint)"""
+    async def handler():
+        return [place.to_dict()
+                for place in await facade.get_all_places()], 200
+    return await conditional(request, 'place', None, handler)
+
+
+@endpoint
+async def create_place(request):
+    """Create a new place (Authenticated users only)"""
+    place_data = await payload_of(request, place_model)
+    place_data['owner_id'] = (await require_identity(request)).user_id
+    try:
+        return (await facade.create_place(place_data)).to_dict(), 201
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def get_place(request, place_id):
+    """Get place by ID (Public endpoint)"""
+    async def build():
+        place = await facade.get_place(place_id)
+        if not place:
+            return {'error': 'Place not found'}, 404, ()
+        return place.to_dict(), 200, place_tags(place)
+    return await conditional(request, 'place', place_id,
+                             lambda: cached(request, build))
+
+
+async def _modifiable_place(request, place_id, expand=()):
+    """The place, if the caller may modify it (else ApiError)"""
+    identity = await require_identity(request)
+    place = await facade.get_place(place_id, expand=expand)
+    if not place:
+        raise ApiError({'error': 'Place not found'}, 404)
+    if not identity.may_modify(place.owner_id):
+        raise ApiError({'error': 'Unauthorized action'}, 403)
+    return place
+
+
+@endpoint
+async def update_place(request, place_id):
+    """Update a place (Owner or Admin)"""
+    update_data = await payload_of(request, place_update_model)
+    await _modifiable_place(request, place_id)
+    try:
+        return (await facade.update_place(place_id, update_data)).to_dict(), 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def delete_place(request, place_id):
+    """Delete a place (Owner or Admin only)"""
+    await _modifiable_place(request, place_id)
+    try:
+        await facade.delete_place(place_id)
+        return {'message': 'Place deleted successfully'}, 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def list_place_amenities(request, place_id):
+    """Récupérer les amenities d'une place (Public)"""
+    async def build():
+        place = await facade.get_place(place_id, expand=('amenities',))
+        if not place:
+            return {'error': 'Place not found'}, 404, ()
+        return ([a.to_dict() for a in place.amenities], 200,
+                place_tags(place, ('amenities',)))
+    return await cached(request, build)
+
+
+async def _place_amenity(request, place_id, amenity_id):
+    """The (place, amenity) pair, if the caller may modify the place"""
+    place = await _modifiable_place(request, place_id, ('amenities',))
+    amenity = await facade.get_amenity(amenity_id)
+    if not amenity:
+        raise ApiError({'error': 'Amenity not found'}, 404)
+    return place, amenity
+
+
+@endpoint
+async def add_place_amenity(request, place_id, amenity_id):
+    """Lier une amenity à une place (Owner ou Admin)"""
+    place, amenity = await _place_amenity(request, place_id, amenity_id)
+    if amenity in place.amenities:
+        return {'error': 'Amenity already linked to this place'}, 400
+    try:
+        await facade.add_amenity_to_place(place_id, amenity_id)
+        return {'message': 'Amenity added to place successfully'}, 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def remove_place_amenity(request, place_id, amenity_id):
+    """Retirer une amenity d'une place (Owner ou Admin)"""
+    place, amenity = await _place_amenity(request, place_id, amenity_id)
+    if amenity not in place.amenities:
+        return {'error': 'Amenity not linked to this place'}, 400
+    try:
+        await facade.remove_amenity_from_place(place_id, amenity_id)
+        return {'message': 'Amenity removed from place successfully'}, 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def list_place_reviews(request, place_id):
+    """Récupérer les reviews d'une place (Public)"""
+    async def build():
+        place = await facade.get_place(place_id)
+        if not place:
+            return {'error': 'Place not found'}, 404, ()
+        reviews = await facade.get_reviews_by_place(place_id)
+        return ([r.to_dict() for r in reviews], 200,
+                place_tags(place, ('reviews',)))
+    return await cached(request, build)
+
+
+# =========================================================================
+# REVIEWS
+# =========================================================================
+
+@endpoint
+async def list_reviews(request):
+    """Get all reviews"""
+    async def handler():
+        return [review.to_dict()
+                for review in await facade.get_all_reviews()], 200
+    return await conditional(request, 'review', None, handler)
+
+
+@endpoint
+async def create_review(request):
+    """Create a new review (Authenticated users only)"""
+    review_data = await payload_of(request, review_model)
+    current_user = (await require_identity(request)).user_id
+
+    place = await facade.get_place(review_data['place_id'])
+    if not place:
+        return {'error': 'Place not found'}, 404
+    if place.owner_id == current_user:
+        return {'error': 'You cannot review your own place'}, 400
+    for review in await facade.get_reviews_by_place(review_data['place_id']):
+        if review.user_id == current_user:
+            return {'error': 'You have already reviewed this place'}, 400
+
+    review_data['user_id'] = current_user
+    try:
+        return (await facade.create_review(review_data)).to_dict(), 201
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def get_review(request, review_id):
+    """Get review by ID"""
+    async def handler():
+        review = await facade.get_review(review_id)
+        if not review:
+            return {'error': 'Review not found'}, 404
+        return review.to_dict(), 200
+    return await conditional(request, 'review', review_id, handler)
+
+
+async def _modifiable_review(request, review_id):
+    """The review, if the caller may modify it (else ApiError)"""
+    identity = await require_identity(request)
+    review = await facade.get_review(review_id)
+    if not review:
+        raise ApiError({'error': 'Review not found'}, 404)
+    if not identity.may_modify(review.user_id):
+        raise ApiError({'error': 'Unauthorized action'}, 403)
+    return review
+
+
+@endpoint
+async def update_review(request, review_id):
+    """Update a review (Author or Admin)"""
+    update_data = await payload_of(request, review_update_model)
+    await _modifiable_review(request, review_id)
+    try:
+        review = await facade.update_review(review_id, update_data)
+        return review.to_dict(), 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+@endpoint
+async def delete_review(request, review_id):
+    """Delete a review (Author or Admin)"""
+    await _modifiable_review(request, review_id)
+    try:
+        await facade.delete_review(review_id)
+        return {'message': 'Review deleted successfully'}, 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+
+V1 = '/api/v1'
+
+routes = [
+    Route(f'{V1}/auth/login', login, methods=['POST']),
+    Route(f'{V1}/auth/refresh', refresh, methods=['POST']),
+    Route(f'{V1}/auth/logout', logout, methods=['POST']),
+    Route(f'{V1}/auth/protected', protected, methods=['GET']),
+    Route(f'{V1}/users/', list_users, methods=['GET']),
+    Route(f'{V1}/users/', create_user, methods=['POST']),
+    Route(f'{V1}/users/{{user_id}}', get_user, methods=['GET']),
+    Route(f'{V1}/users/{{user_id}}', update_user, methods=['PUT']),
+    Route(f'{V1}/amenities/', list_amenities, methods=['GET']),
+    Route(f'{V1}/amenities/', create_amenity, methods=['POST']),
+    Route(f'{V1}/amenities/{{amenity_id}}', get_amenity, methods=['GET']),
+    Route(f'{V1}/amenities/{{amenity_id}}', update_amenity, methods=['PUT']),
+    Route(f'{V1}/places/', list_places, methods=['GET']),
+    Route(f'{V1}/places/', create_place, methods=['POST']),
+    Route(f'{V1}/places/{{place_id}}', get_place, methods=['GET']),
+    Route(f'{V1}/places/{{place_id}}', update_place, methods=['PUT']),
+    Route(f'{V1}/places/{{place_id}}', delete_place, methods=['DELETE']),
+    Route(f'{V1}/places/{{place_id}}/amenities', list_place_amenities,
+          methods=['GET']),
+    Route(f'{V1}/places/{{place_id}}/amenities/{{amenity_id}}',
+          add_place_amenity, methods=['POST']),
+    Route(f'{V1}/places/{{place_id}}/amenities/{{amenity_id}}',
+          remove_place_amenity, methods=['DELETE']),
+    Route(f'{V1}/places/{{place_id}}/reviews', list_place_reviews,
+          methods=['GET']),
+    Route(f'{V1}/reviews/', list_reviews, methods=['GET']),
+    Route(f'{V1}/reviews/', create_review, methods=['POST']),
+    Route(f'{V1}/reviews/{{review_id}}', get_review, methods=['GET']),
+    Route(f'{V1}/reviews/{{review_id}}', update_review, methods=['PUT']),
+    Route(f'{V1}/reviews/{{review_id}}', delete_review, methods=['DELETE']),
+]
+
+# Route of each endpoint, for the request metrics
+_paths = {route.endpoint: route.path for route in routes}
@@ -0,0 +1,139 @@
+"""
+JWT authentication and password checks of the async handlers.
+
+Tokens are issued and decoded by Flask-JWT-Extended, inside an app
+context of the Flask app, so both serving modes accept each other's
+tokens and answer bad ones with the same status and {"msg": ...}. The
+blocklist is asked without blocking the event loop (the "database"
+store is read with the async session); so is the password hasher.
+"""
+import asyncio
+import re
+import time
+
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import ExpiredSignatureError, InvalidTokenError
+from sqlalchemy import delete, select
+
+from hbnb.app.aio.database import async_db
+from hbnb.app.api.v1.identity import Identity
+from hbnb.app.credential_cache import credential_cache
+from hbnb.app.hashing import password_hasher
+from hbnb.app.models import RevokedToken
+from hbnb.app.persistence.unit_of_work import async_transaction
+from hbnb.app.token_blocklist import (
+    DatabaseBlocklist, access_token_for, checked_jtis, revoked_by,
+    token_blocklist, token_pair)
+
+
+class AuthError(Exception):
+    """A request refused by the JWT checks: status and message."""
+
+    def __init__(self, status, msg):
+        super().__init__(msg)
+        self.status = status
+        self.msg = msg
+
+
+def _bearer_token(request):
+    """The token of the Authorization header (as Flask-JWT-Extended reads it)"""
+    header = request.headers.get("Authorization", "").strip().strip(",")
+    if not header:
+        raise AuthError(401, "Missing Authorization Header")
+    bearer = [value for value in re.split(r",\s*", header)
+              if value.split()[0] == "Bearer"]
+    if len(bearer) != 1:
+        raise AuthError(401, "Missing 'Bearer' type in 'Authorization' header."
+                             " Expected 'Authorization: Bearer <JWT>'")
+    parts = bearer[0].split()
+    if len(parts) != 2:
+        raise AuthError(422, "Bad Authorization header. "
+                             "Expected 'Authorization: Bearer <JWT>'")
+    return parts[1]
+
+
+async def is_revoked(claims):
+    """True if the decoded token was revoked (see app/token_blocklist.py)"""
+    if isinstance(token_blocklist.store, DatabaseBlocklist):
+        revoked = await async_db.session().scalar(
+            select(RevokedToken.jti)
+            .where(RevokedToken.jti.in_(checked_jtis(claims))).limit(1))
+        return revoked is not None
+    return token_blocklist.is_revoked(claims)
+
+
+async def revoke(claims):
+    """Revoke a decoded token and its refresh token until they expire"""
+    if not isinstance(token_blocklist.store, DatabaseBlocklist):
+        token_blocklist.revoke(claims)
+        return
+    session = async_db.session()
+    async with async_transaction(session):
+        for jti, expires in revoked_by(claims):
+            await session.merge(RevokedToken(jti=jti, expires=int(expires)))
+        await session.execute(
+            delete(RevokedToken).where(RevokedToken.expires < time.time()))
+
+
+async def require_identity(request, refresh=False, verify_type=True):
+    """
+    The caller's Identity, from a valid, unrevoked token (the async
+    @jwt_required()); AuthError otherwise.
+
+    Args:
+        refresh: Require a refresh token instead of an access token.
+        verify_type: Accept either kind of token.
+    """
+    token = _bearer_token(request)
+    with request.app.state.flask_app.app_context():
+        try:
+            claims = decode_token(token)
+        except ExpiredSignatureError:
+            raise AuthError(401, "Token has expired")
+        except (InvalidTokenError, JWTExtendedException) as e:
+            raise AuthError(422, str(e))
+    if verify_type and refresh and claims["type"] != "refresh":
+        raise AuthError(422, "Only refresh tokens are allowed")
+    if verify_type and not refresh and claims["type"] == "refresh":
+        raise AuthError(422, "Only non-refresh tokens are allowed")
+    if await is_revoked(claims):
+        raise AuthError(401, "Token has been revoked")
+    return Identity(claims["sub"], claims)
+
+
+def issue_token_pair(flask_app, user_id, is_admin):
+    """(access token, refresh token) of a login (see token_pair())"""
+    with flask_app.app_context():
+        return token_pair(str(user_id),
+                          additional_claims={"is_admin": is_admin})
+
+
+def issue_access_token(flask_app, refresh_claims, is_admin):
+    """A new access token from a decoded refresh token"""
+    with flask_app.app_context():
+        return access_token_for(refresh_claims,
+                                additional_claims={"is_admin": is_admin})
+
+
+async def verify_password(flask_app, user, raw_password):
+    """
+    User.verify_password() without blocking the event loop: the bcrypt
+    check runs in the hasher pool while other requests are served.
+    """
+    if not credential_cache.check(user.id, user.password, raw_password):
+        verified = await asyncio.wrap_future(
+            password_hasher.verify_async(user.password, raw_password))
+        if not verified:
+            return False
+        credential_cache.remember(user.id, user.password, raw_password)
+    if password_hasher.needs_rehash(user.password):
+        # Stored later by the sync facade, in this app's context
+        with flask_app.app_context():
+            user._rehash_later(raw_password)
+    return True
+
+
+async def hash_password(raw_password):
+    """hash_password() without blocking the event loop"""
+    return await asyncio.wrap_future(password_hasher.hash_async(raw_password))
@@ -0,0 +1,62 @@
+"""
+Async engine and sessions of the ASGI serving mode (see app/aio).
+
+The async API opens a second engine on the application's database,
+through the asyncio extension of SQLAlchemy and an async driver
+(aiosqlite for SQLite), with the same engine options and PRAGMAs as
+the Flask engine. Sessions are scoped to the current asyncio task, i.e.
+to one request, like db.session is to one thread: `async_db.session()`
+returns the request's AsyncSession and `remove()` closes it.
+"""
+import asyncio
+
+from sqlalchemy.ext.asyncio import (
+    async_scoped_session, async_sessionmaker, create_async_engine)
+
+from hbnb.app.persistence.sqlite import apply_pragmas
+
+# Async driver of each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_url(url):
+    """The URL of the same database with the backend's async driver."""
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+class AsyncDatabase:
+    """The async engine, and the sessions of the current request."""
+
+    def __init__(self):
+        self.engine = None
+        self.session = None
+
+    def init_app(self, app):
+        """Open the async engine on the database of a Flask app."""
+        from hbnb.app import db
+        with app.app_context():
+            url = db.engine.url
+        self.engine = create_async_engine(
+            async_url(url), **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+        apply_pragmas(self.engine.sync_engine,
+                      app.config.get("SQLITE_PRAGMAS", {"foreign_keys": "ON"}))
+        # Loaded attributes stay readable after commit: reloading them
+        # on access would be implicit I/O, which asyncio does not allow
+        self.session = async_scoped_session(
+            async_sessionmaker(self.engine, expire_on_commit=False),
+            scopefunc=asyncio.current_task)
+
+    async def dispose(self):
+        """Close the pooled connections (on shutdown)."""
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+async_db = AsyncDatabase()
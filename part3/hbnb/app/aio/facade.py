@@ -0,0 +1,335 @@
+"""
+Async facade of the ASGI serving mode.
+
+The operations of HBnBFacade behind the async handlers, with the same
+rules, on the async repositories: each database round trip is awaited
+instead of holding a thread. Writes commit once per operation
+(async_transaction); the shared caches (responses, user records,
+credentials, place coordinates) are updated after the commit, exactly
+as the sync facade does, so both modes can serve the same process.
+
+Writes go straight to the primary: the writer queue and the read
+replica only serve the sync facade.
+"""
+from contextlib import asynccontextmanager
+
+from sqlalchemy.exc import IntegrityError
+
+from hbnb.app.aio.database import async_db
+from hbnb.app.aio.repository import AsyncSQLAlchemyRepository
+from hbnb.app.credential_cache import credential_cache
+from hbnb.app.metrics import REPOSITORY_CALLS, metrics
+from hbnb.app.models import User, Place, Review, Amenity
+from hbnb.app.persistence.unit_of_work import after_commit, async_transaction
+from hbnb.app.response_cache import response_cache
+from hbnb.app.user_cache import user_cache
+
+
+def _after_commit(callback, *args):
+    """Call callback(*args) once the current unit of work is committed"""
+    after_commit(async_db.session(), callback, *args)
+
+
+def _repository(model):
+    """Async repository of a model, its calls timed on GET /metrics"""
+    return metrics.instrument(AsyncSQLAlchemyRepository(model),
+                              REPOSITORY_CALLS, model=model.__name__.lower())
+
+
+class AsyncHBnBFacade:
+    def __init__(self, place_coordinates=None):
+        """
+        Args:
+            place_coordinates: The coordinate cache of the sync facade,
+                               kept current by async writes too.
+        """
+        self.user_repo = _repository(User)
+        self.place_repo = _repository(Place)
+        self.review_repo = _repository(Review)
+        self.amenity_repo = _repository(Amenity)
+        self.place_coordinates = place_coordinates
+
+    # =========================
+    # UTILS
+    # =========================
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Unit of work on the request's session (see async_transaction)"""
+        async with async_transaction(async_db.session()):
+            yield
+
+    @staticmethod
+    async def _reload(obj):
+        """
+        Read a written object again, as the sync facade's objects are
+        after their commit (column types, server-side values).
+        """
+        await async_db.session().refresh(obj)
+        return obj
+
+    async def get_version(self, kind, obj_id=None):
+        """
+        Last change of an object, or of a whole collection without
+        obj_id (see HBnBFacade.get_version).
+        """
+        repo = getattr(self, f'{kind}_repo')
+        if obj_id is None:
+            return await repo.get_collection_version()
+        return await repo.get_version(obj_id)
+
+    # =========================
+    # USER
+    # =========================
+
+    async def create_user(self, user_data):
+        """Create a new user with validation"""
+        if await self.get_user_by_email(user_data["email"]):
+            raise ValueError("Email already exists")
+        user = User(**user_data)
+        async with self.transaction():
+            await self.user_repo.add(user)
+        return await self._reload(user)
+
+    async def get_user(self, user_id):
+        """Get user by ID"""
+        return await self.user_repo.get(user_id)
+
+    async def get_user_record(self, user_id):
+        """Get the serialized user (to_dict()), through the user cache"""
+        record = user_cache.get(user_id)
+        if record is None:
+            user = await self.user_repo.get(user_id)
+            if not user:
+                return None
+            record = user.to_dict()
+            user_cache.put(user_id, record)
+        return record
+
+    async def get_user_by_email(self, email):
+        """Get user by email address"""
+        return await self.user_repo.get_by_attribute("email", email)
+
+    async def get_all_users(self):
+        """Get all users"""
+        return await self.user_repo.get_all()
+
+    async def update_user(self, user_id, update_data):
+        """Update user with new data"""
+        async with self.transaction():
+            user = await self.user_repo.update(user_id, update_data)
+            if not user:
+                raise ValueError("User not found")
+            if 'password' in update_data:
+                _after_commit(credential_cache.invalidate, user_id)
+            _after_commit(response_cache.invalidate, ('user', user_id))
+        user = await self._reload(user)
+        user_cache.put(user_id, user.to_dict())
+        return user
+
+    # =========================
+    # AMENITY
+    # =========================
+
+    async def create_amenity(self, amenity_data):
+        """Create a new amenity"""
+        name = amenity_data.get('name')
+        if await self.amenity_repo.get_by_attribute('name', name):
+            raise ValueError(f"Amenity '{name}' already exists")
+
+        amenity = Amenity(**amenity_data)
+        try:
+            async with self.transaction():
+                await self.amenity_repo.add(amenity)
+                _after_commit(response_cache.invalidate, ('amenities',))
+        except IntegrityError:
+            raise ValueError(f"Amenity '{name}' already exists")
+        return await self._reload(amenity)
+
+    async def get_amenity(self, amenity_id):
+        """Get amenity by ID"""
+        return await self.amenity_repo.get(amenity_id)
+
+    async def get_all_amenities(self):
+        """Get all amenities"""
+        return await self.amenity_repo.get_all()
+
+    async def update_amenity(self, amenity_id, update_data):
+        """Update amenity with new data"""
+        amenity = await self.amenity_repo.get(amenity_id)
+        if not amenity:
+            raise ValueError("Amenity not found")
+
+        new_name = update_data.get('name')
+        if new_name and new_name != amenity.name:
+            if await self.amenity_repo.get_by_attribute('name', new_name):
+                raise ValueError(f"Amenity '{new_name}' already exists")
+
+        try:
+            async with self.transaction():
+                await self.amenity_repo.update(amenity_id, update_data)
+                _after_commit(response_cache.invalidate,
+                              ('amenities',), ('amenity', amenity_id))
+        except IntegrityError:
+            raise ValueError(f"Amenity '{new_name}' already exists")
+        return await self._reload(amenity)
+
+    async def add_amenity_to_place(self, place_id, amenity_id):
+        """Add amenity to a place"""
+        place = await self.place_repo.get(place_id, eager=('amenities',))
+        if not place:
+            raise ValueError("Place not found")
+        amenity = await self.amenity_repo.get(amenity_id)
+        if not amenity:
+            raise ValueError("Amenity not found")
+
+        if amenity in place.amenities:
+            raise ValueError("Amenity already linked to this place")
+
+        async with self.transaction():
+            place.amenities.append(amenity)
+            _after_commit(response_cache.invalidate,
+                          ('place_amenities', place_id))
+        return place
+
+    async def remove_amenity_from_place(self, place_id, amenity_id):
+        """Remove amenity from a place"""
+        place = await self.place_repo.get(place_id, eager=('amenities',))
+        if not place:
+            raise ValueError("Place not found")
+        amenity = await self.amenity_repo.get(amenity_id)
+        if not amenity:
+            raise ValueError("Amenity not found")
+
+        if amenity not in place.amenities:
+            raise ValueError("Amenity not linked to this place")
+
+        async with self.transaction():
+            place.amenities.remove(amenity)
+            _after_commit(response_cache.invalidate,
+                          ('place_amenities', place_id))
+        return place
+
+    # =========================
+    # PLACE
+    # =========================
+
+    async def create_place(self, place_data):
+        """Create a new place"""
+        if not await self.user_repo.get(place_data["owner_id"]):
+            raise ValueError("Owner not found")
+        place = Place(**place_data)
+        async with self.transaction():
+            await self.place_repo.add(place)
+            _after_commit(self._sync_place_coordinates, place)
+        return await self._reload(place)
+
+    async def get_place(self, place_id, expand=()):
+        """Get place by ID, with the `expand` relationships loaded"""
+        return await self.place_repo.get(place_id, eager=expand)
+
+    async def get_all_places(self):
+        """Get all places"""
+        return await self.place_repo.get_all()
+
+    async def update_place(self, place_id, update_data):
+        """Update place with new data"""
+        async with self.transaction():
+            place = await self.place_repo.update(place_id, update_data)
+            if not place:
+                raise ValueError("Place not found")
+            _after_commit(self._sync_place_coordinates, place)
+            _after_commit(response_cache.invalidate, ('place', place_id))
+        return await self._reload(place)
+
+    def _sync_place_coordinates(self, place):
+        """Mirror a place's coordinates in the coordinate cache"""
+        cache = self.place_coordinates
+        if cache is not None:
+            cache.upsert(place.id, place.latitude, place.longitude)
+
+    async def delete_place(self, place_id):
+        """Delete a place and its reviews, in a single commit"""
+        async with self.transaction():
+            place = await self.place_repo.get(place_id, eager=('reviews',))
+            if not place:
+                raise ValueError("Place not found")
+            # The reviews go with the place (delete-orphan cascade)
+            await self.place_repo.delete(place_id)
+            if self.place_coordinates is not None:
+                _after_commit(self.place_coordinates.remove, place_id)
+            _after_commit(response_cache.invalidate, ('place', place_id))
+
+    # =========================
+    # REVIEW
+    # =========================
+
+    async def create_review(self, review_data):
+        """Validate place and user existence before creating review"""
+        user = await self.user_repo.get(review_data["user_id"])
+        place = await self.place_repo.get(review_data["place_id"])
+
+        if not place:
+            raise ValueError("Place not found")
+        if not user:
+            raise ValueError("User not found")
+
+        review = Review(**review_data)
+        async with self.transaction():
+            await self.place_repo.increment(
+                place.id, Place.rating_deltas(added=[review.rating]))
+            await self.review_repo.add(review)
+            self._invalidate_place_reviews(place.id)
+        return await self._reload(review)
+
+    async def get_review(self, review_id):
+        """Get review by ID"""
+        return await self.review_repo.get(review_id)
+
+    async def get_all_reviews(self):
+        """Get all reviews"""
+        return await self.review_repo.get_all()
+
+    async def get_reviews_by_place(self, place_id):
+        """Get all reviews for a specific place"""
+        return await self.review_repo.find_by(place_id=place_id)
+
+    @staticmethod
+    def _invalidate_place_reviews(*place_ids):
+        """Reviews changed: their places' lists and rating aggregates"""
+        _after_commit(response_cache.invalidate,
+                      *(tag for place_id in place_ids
+                        for tag in (('place', place_id),
+                                    ('place_reviews', place_id))))
+
+    async def update_review(self, review_id, update_data):
+        """Update review with new data (and its place's rating aggregates)"""
+        review = await self.review_repo.get(review_id)
+        if not review:
+            raise ValueError("Review not found")
+
+        deltas = {}
+        new_rating = update_data.get('rating', review.rating)
+        if new_rating != review.rating and new_rating in Place.RATINGS:
+            deltas = Place.rating_deltas(added=[new_rating],
+                                         removed=[review.rating])
+        place_id = review.place_id
+        async with self.transaction():
+            if deltas:
+                await self.place_repo.increment(place_id, deltas)
+            review = await self.review_repo.update(review_id, update_data)
+            self._invalidate_place_reviews(place_id)
+        return await self._reload(review)
+
+    async def delete_review(self, review_id):
+        """Delete a review"""
+        review = await self.review_repo.get(review_id)
+        if not review:
+            raise ValueError("Review not found")
+
+        place_id = review.place_id
+        async with self.transaction():
+            await self.place_repo.increment(
+                place_id, Place.rating_deltas(removed=[review.rating]))
+            await self.review_repo.delete(review_id)
+            self._invalidate_place_reviews(place_id)
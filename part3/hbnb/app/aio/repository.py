@@ -0,0 +1,118 @@
+"""
+Async twin of SQLAlchemyRepository, on the request's AsyncSession.
+
+Same contract as the sync repository: writes only flush, the caller
+commits once per unit of work (persistence.unit_of_work.
+async_transaction). Relationships are never lazy loaded under asyncio:
+the ones a caller needs are loaded with the object (`eager`).
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import joinedload, selectinload
+
+from hbnb.app.aio.database import async_db
+
+
+class AsyncSQLAlchemyRepository:
+    """Async repository of a SQLAlchemy model"""
+
+    def __init__(self, model):
+        """
+        Args:
+            model: SQLAlchemy model class
+        """
+        self.model = model
+
+    def _eager_options(self, eager):
+        """Loader options of an eager-load spec (relationship names)"""
+        options = []
+        for name in eager:
+            relationship = getattr(self.model, name)
+            if relationship.property.uselist:
+                options.append(selectinload(relationship))
+            else:
+                options.append(joinedload(relationship))
+        return options
+
+    async def add(self, obj):
+        """Add an object to the database"""
+        session = async_db.session()
+        session.add(obj)
+        await session.flush()
+
+    async def get(self, obj_id, eager=()):
+        """
+        Get an object by ID. With `eager`, an object already in the
+        session is read again, so its relationships get loaded too.
+        """
+        return await async_db.session().get(
+            self.model, obj_id, options=self._eager_options(eager),
+            populate_existing=bool(eager))
+
+    async def get_all(self, eager=()):
+        """Get all objects"""
+        result = await async_db.session().scalars(
+            select(self.model).options(*self._eager_options(eager)))
+        return result.all()
+
+    async def get_by_attribute(self, attr_name, attr_value):
+        """Get an object by a specific attribute"""
+        return await async_db.session().scalar(
+            select(self.model).filter_by(**{attr_name: attr_value}).limit(1))
+
+    async def find_by(self, **criteria):
+        """Get all objects matching every criterion (WHERE ... AND ...)"""
+        result = await async_db.session().scalars(
+            select(self.model).filter_by(**criteria))
+        return result.all()
+
+    async def update(self, obj_id, data):
+        """Update an object with new data"""
+        obj = await self.get(obj_id)
+        if obj:
+            # Go through the model so its validations apply
+            obj.update(data)
+            await async_db.session().flush()
+            return obj
+        return None
+
+    async def delete(self, obj_id):
+        """
+        Delete an object by ID. The relationships its delete cascades
+        to must be loaded already (see get(eager=...)).
+        """
+        session = async_db.session()
+        obj = await self.get(obj_id)
+        if obj:
+            await session.delete(obj)
+            await session.flush()
+
+    async def increment(self, obj_id, deltas):
+        """
+        Add deltas with a single UPDATE ... SET col = col + amount, so
+        concurrent increments never overwrite each other
+        """
+        session = async_db.session()
+        model = self.model
+        await session.execute(
+            update(model).where(model.id == obj_id).values(
+                {getattr(model, attr_name): getattr(model, attr_name) + amount
+                 for attr_name, amount in deltas.items()}),
+            execution_options={'synchronize_session': False})
+        obj = session.identity_map.get(session.sync_session.identity_key(
+            model, obj_id))
+        if obj is not None:
+            # Read the new values now: no reload on access under asyncio
+            await session.refresh(obj, list(deltas))
+
+    async def get_version(self, obj_id):
+        """updated_at of an object (None if missing): one column by key"""
+        return await async_db.session().scalar(
+            select(self.model.updated_at).where(self.model.id == obj_id))
+
+    async def get_collection_version(self):
+        """(count, latest updated_at), answered from the indexes"""
+        result = await async_db.session().execute(
+            select(func.count(), func.max(self.model.updated_at))
+            .select_from(self.model))
+        count, latest = result.one()
+        return count, latest
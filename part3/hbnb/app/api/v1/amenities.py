@@ -3,8 +3,13 @@ Amenity API endpoints.
 Handles CRUD operations for amenities.
 """
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt
+from flask_jwt_extended import jwt_required
 from hbnb.app.services import facade
+from hbnb.app.api.v1.identity import current_identity
+from hbnb.app.api.v1.conditional import conditional
+from hbnb.app.api.v1.bulk import bulk_items, bulk_response
+from hbnb.app.api.v1.caching import cached
+from hbnb.app.api.v1.pagination import PAGE_PARAMS, is_paginated, paginate
  
 api = Namespace('amenities', description='Amenity operations')
  
@@ -18,20 +23,31 @@ amenity_model = api.model('Amenity', {
 @api.route('/')
 class AmenityList(Resource):
  
-    @api.doc('list_amenities')
+    @api.doc('list_amenities', params=PAGE_PARAMS)
+    @conditional('amenity')
     def get(self):
         """Get all amenities (Public)"""
-        amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        def build():
+            if is_paginated():
+                try:
+                    return (paginate(facade.get_amenities_page,
+                                     lambda amenity: amenity.to_dict()),
+                            200, [('amenities',)])
+                except ValueError as e:
+                    return {'error': str(e)}, 400, ()
+            amenities = facade.get_all_amenities()
+            return ([amenity.to_dict() for amenity in amenities], 200,
+                    [('amenities',)])
+        return cached(build)
  
     @api.doc('create_amenity')
     @api.expect(amenity_model, validate=True)
     @jwt_required()
     def post(self):
         """Create a new amenity (Admin only)"""
-        current_user = get_jwt()
+        identity = current_identity()
  
-        if not current_user.get('is_admin', False):
+        if not identity.is_admin:
             return {"error": "Admin privileges required"}, 403
  
         try:
@@ -42,10 +58,31 @@ class AmenityList(Resource):
             return {'error': str(e)}, 400
  
  
+@api.route('/bulk')
+class AmenityBulk(Resource):
+ 
+    @api.doc('create_amenities_bulk')
+    @api.expect([amenity_model])
+    @jwt_required()
+    def post(self):
+        """Create many amenities at once (Admin only)"""
+        identity = current_identity()
+ 
+        if not identity.is_admin:
+            return {"error": "Admin privileges required"}, 403
+ 
+        try:
+            created, errors = facade.create_amenities(bulk_items())
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return bulk_response(created, errors)
+ 
+ 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
  
     @api.doc('get_amenity')
+    @conditional('amenity')
     def get(self, amenity_id):
         """Get amenity by ID (Public)"""
         amenity = facade.get_amenity(amenity_id)
@@ -58,9 +95,9 @@ class AmenityResource(Resource):
     @jwt_required()
     def put(self, amenity_id):
         """Update an amenity (Admin only)"""
-        current_user = get_jwt()
+        identity = current_identity()
  
-        if not current_user.get('is_admin', False):
+        if not identity.is_admin:
             return {"error": "Admin privileges required"}, 403
  
         amenity = facade.get_amenity(amenity_id)
@@ -3,8 +3,11 @@ Authentication endpoints.
 Handles user login and JWT token generation.
 """
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from hbnb.app.credential_cache import credential_cache
 from hbnb.app.services import facade
+from hbnb.app.token_blocklist import (
+    access_token_for, token_blocklist, token_pair)
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -29,16 +32,39 @@ class Login(Resource):
         if not user or not user.verify_password(credentials['password']):
             return {'error': 'Invalid credentials'}, 401
         
-        # Step 3: Create a JWT token with the user's id and is_admin flag
-        access_token = create_access_token(
-            identity=str(user.id),
-            additional_claims={"is_admin": user.is_admin}
-        )
+        # Step 3: Create a JWT token with the user's id and is_admin flag,
+        # and a refresh token to renew it once expired (revoked together)
+        access_token, refresh_token = token_pair(
+            str(user.id), additional_claims={"is_admin": user.is_admin})
         
-        # Step 4: Return the JWT token to the client
+        # Step 4: Return the JWT tokens to the client
+        return {'access_token': access_token,
+                'refresh_token': refresh_token}, 200
+
+
+@api.route('/refresh')
+class Refresh(Resource):
+    @jwt_required(refresh=True)
+    def post(self):
+        """Get a new access token (send the refresh token)"""
+        # Read the user again: the admin flag may have changed since login
+        user = facade.get_user_record(get_jwt_identity())
+        if not user:
+            return {'error': 'User not found'}, 401
+        access_token = access_token_for(
+            get_jwt(), additional_claims={"is_admin": user['is_admin']})
         return {'access_token': access_token}, 200
 
 
+@api.route('/logout')
+class Logout(Resource):
+    @jwt_required(verify_type=False)
+    def post(self):
+        """Revoke the token sent and its refresh token (or access tokens)"""
+        token_blocklist.revoke(get_jwt())
+        return {'message': 'Successfully logged out'}, 200
+
+
 @api.route('/protected')
 class ProtectedResource(Resource):
     @jwt_required()
@@ -54,3 +80,13 @@ class ProtectedResource(Resource):
             'message': f'Hello, user {current_user}',
             'is_admin': is_admin
         }, 200
+
+
+@api.route('/credential-cache')
+class CredentialCacheStats(Resource):
+    @jwt_required()
+    def get(self):
+        """Hit / miss counters of the verified-credential cache (Admin only)"""
+        if not get_jwt().get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+        return credential_cache.stats(), 200
@@ -0,0 +1,44 @@
+"""
+Bulk create helpers shared by the /bulk endpoints.
+
+A bulk request is a JSON array of the objects the single-item POST
+accepts. Every item is validated on its own: valid items are inserted
+together in one transaction, invalid ones are reported by position in
+the array, so one bad row does not reject the whole batch.
+"""
+from flask import request
+
+BULK_MAX_ITEMS = 10000
+
+
+def bulk_items():
+    """
+    Read the request body as a list of items.
+
+    Raises:
+        ValueError: if the body is not a non-empty JSON array, or holds
+                    more than BULK_MAX_ITEMS items.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        raise ValueError("Body must be a non-empty JSON array")
+    if len(items) > BULK_MAX_ITEMS:
+        raise ValueError(f"At most {BULK_MAX_ITEMS} items per request")
+    return items
+
+
+def bulk_response(created, errors):
+    """
+    Build the (body, status) of a bulk request.
+
+    Status is 201 when every item was created, 207 (Multi-Status) when
+    only some were, 400 when none was.
+    """
+    body = {
+        "created": [{"index": index, "id": obj.id} for index, obj in created],
+        "errors": [{"index": index, "error": message}
+                   for index, message in errors],
+    }
+    if not errors:
+        return body, 201
+    return body, 207 if created else 400
@@ -0,0 +1,31 @@
+"""
+Serving public GET responses from the response cache.
+
+The handler's work goes in a build() callable, only run on a miss; its
+JSON body is stored under the request's path and query string, tagged
+with the entities it was built from (see app/response_cache.py).
+"""
+import json
+from flask import Response, request
+from hbnb.app.response_cache import response_cache
+
+
+def cached(build):
+    """
+    The cached response of the request, built on a miss.
+
+    Args:
+        build: callable() -> (payload, status, tags). Only 200
+               responses are stored; tags name the entities
+               (e.g. ("place", id)) whose writes invalidate them.
+    """
+    key = request.full_path
+    body = response_cache.get(key)
+    if body is None:
+        built = response_cache.generation()
+        payload, status, tags = build()
+        if status != 200:
+            return payload, status
+        body = json.dumps(payload)
+        response_cache.put(key, body, tags, built)
+    return Response(body, 200, mimetype="application/json")
@@ -0,0 +1,83 @@
+"""
+Conditional GET: ETag / If-None-Match and Last-Modified / If-Modified-Since.
+
+Validators come from updated_at, read without loading the rows
+(HBnBFacade.get_version): an item's version is its updated_at, a
+collection's is (count, latest updated_at). A client sending back the
+validators of its copy gets 304 Not Modified, and the handler does not
+run: nothing is loaded or serialized.
+
+A representation embedding related objects (?expand=), or filtered on
+them, changes when they do, not with its own updated_at: it carries no
+validators.
+"""
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import Response, request
+from werkzeug.http import http_date
+from hbnb.app.services import facade
+
+
+def etag_of(kind, obj_id, version, variant=b""):
+    """Strong ETag of a representation (quoted)"""
+    digest = hashlib.sha1(
+        f"{kind}|{obj_id}|{version!r}|".encode() + variant).hexdigest()
+    return f'"{digest}"'
+
+
+def _not_modified(etag, last_modified):
+    """True if the client's copy, per its request headers, is current"""
+    if request.if_none_match:
+        # If-None-Match wins over If-Modified-Since (RFC 9110)
+        return request.if_none_match.contains(etag.strip('"'))
+    since = request.if_modified_since
+    return (since is not None and last_modified is not None
+            and last_modified.replace(microsecond=0) <= since)
+
+
+def _with_headers(result, headers):
+    """Add headers to a handler's 200 response (Response or tuple)"""
+    if isinstance(result, Response):
+        if result.status_code == 200:
+            result.headers.update(headers)
+        return result
+    if isinstance(result, tuple) and len(result) >= 2 and result[1] == 200:
+        extra = dict(result[2]) if len(result) > 2 else {}
+        return result[0], 200, {**extra, **headers}
+    return result
+
+
+def conditional(kind, bypass=('expand',)):
+    """
+    Decorator of a GET handler: answer 304 when the client's copy of
+    the item (the route's single parameter) or of the whole collection
+    (no parameter) is current, else add ETag and Last-Modified.
+
+    Args:
+        kind: 'user', 'place', 'review' or 'amenity'.
+        bypass: Query parameters making the representation depend on
+                other objects: no validators when one is present.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(resource, *args, **kwargs):
+            if any(request.args.get(name) for name in bypass):
+                return method(resource, *args, **kwargs)
+            obj_id = next(iter(kwargs.values()), None)
+            version = facade.get_version(kind, obj_id)
+            if version is None:
+                # Missing item: the handler answers 404
+                return method(resource, *args, **kwargs)
+            latest = version[1] if obj_id is None else version
+            if latest is not None:
+                latest = latest.replace(tzinfo=timezone.utc)
+            etag = etag_of(kind, obj_id, version, request.query_string)
+            headers = {'ETag': etag}
+            if latest is not None:
+                headers['Last-Modified'] = http_date(latest)
+            if _not_modified(etag, latest):
+                return Response(status=304, headers=headers)
+            return _with_headers(method(resource, *args, **kwargs), headers)
+        return wrapper
+    return decorator
@@ -0,0 +1,38 @@
+"""
+Embedding related objects in list responses.
+
+`?expand=owner,amenities` names the relationships to embed in each
+item. The same spec is handed to the facade, so the repository loads
+those relationships with the page (a bounded number of queries)
+before the serializer walks them, instead of one lazy query per item.
+"""
+from flask import request
+
+def expand_params(allowed):
+    """Swagger documentation of the query parameter (@api.doc(params=...))"""
+    return {
+        "expand": f"Comma-separated relations to embed: {', '.join(allowed)}",
+    }
+
+
+def parse_expand(allowed):
+    """
+    Read ?expand=, checking every name against the allowed relations.
+
+    Returns:
+        tuple of relationship names (empty if not expanding)
+    """
+    raw = request.args.get("expand", "")
+    names = tuple(dict.fromkeys(
+        name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(
+            f"expand must be among: {', '.join(allowed)} "
+            f"(got {', '.join(unknown)})")
+    return names
+
+
+def include_flags(expand):
+    """to_dict() keyword arguments of an expand spec (include_<name>=True)"""
+    return {f"include_{name}": True for name in expand}
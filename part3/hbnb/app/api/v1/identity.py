@@ -0,0 +1,47 @@
+"""
+Identity of the caller of a protected request.
+
+Handlers used to call get_jwt_identity() and get_jwt() separately, then
+reload the caller's row when they needed it. current_identity() builds
+one Identity per request (kept on flask.g) from the verified token: the
+user id and claims are read once, and the caller's user record is
+fetched on first use only, through the user cache (see user_cache.py),
+then reused for the rest of the request.
+"""
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from hbnb.app.services import facade
+
+_NOT_LOADED = object()
+
+
+class Identity:
+    """User id, claims and (lazily) user record of the request's token."""
+
+    def __init__(self, user_id, claims):
+        self.user_id = user_id
+        self.claims = claims
+        self.is_admin = claims.get('is_admin', False)
+        self._record = _NOT_LOADED
+
+    @property
+    def record(self):
+        """
+        The caller's serialized user (to_dict(), None if deleted), read
+        through the user cache once per request.
+        """
+        if self._record is _NOT_LOADED:
+            self._record = facade.get_user_record(self.user_id)
+        return self._record
+
+    def may_modify(self, owner_id):
+        """True for admins and for the owner of the resource."""
+        return self.is_admin or owner_id == self.user_id
+
+
+def current_identity():
+    """The request's Identity (call after @jwt_required())."""
+    identity = g.get('identity')
+    if identity is None:
+        identity = g.identity = Identity(get_jwt_identity(), get_jwt())
+    return identity
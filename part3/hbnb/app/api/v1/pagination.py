@@ -0,0 +1,107 @@
+"""
+Keyset (cursor) pagination helpers shared by the list endpoints.
+
+A cursor is an opaque, URL-safe token encoding the (created_at, id) of
+the last item of a page. The next page starts strictly after it, so the
+cost of a page does not depend on how deep the client has gone. Places
+sorted by rating put (-average, -review_count) in front of it.
+"""
+import base64
+import math
+from datetime import datetime, timezone
+
+from flask import request
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Swagger documentation of the query parameters (@api.doc(params=...))
+PAGE_PARAMS = {
+    "limit": f"Page size, 1-{MAX_LIMIT} (enables pagination)",
+    "cursor": "next_cursor returned by the previous page",
+}
+
+
+def encode_cursor(obj, sort=None):
+    """Build the cursor pointing right after obj (in `sort` order)."""
+    raw = f"{obj.created_at.isoformat()}|{obj.id}"
+    if sort == "rating":
+        average, review_count, _ = obj.rating_order
+        raw = f"{average!r}|{review_count}|{raw}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _parse_datetime(text):
+    """
+    ISO 8601 datetime as stored (naive UTC): a datetime with an offset
+    is converted, since it cannot be compared with the stored ones.
+    """
+    value = datetime.fromisoformat(text)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def decode_cursor(cursor, sort=None):
+    """
+    Return the keyset position encoded in cursor: (created_at, id), or
+    (-average, -review_count, created_at, id) with sort="rating".
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        if sort == "rating":
+            average, review_count, created_at, obj_id = raw.split("|", 3)
+            average = float(average)
+            if not math.isfinite(average):
+                raise ValueError("Invalid cursor")
+            return (average, int(review_count),
+                    _parse_datetime(created_at), obj_id)
+        created_at, obj_id = raw.split("|", 1)
+        return _parse_datetime(created_at), obj_id
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def is_paginated():
+    """True when the client asked for a page (limit and/or cursor)."""
+    return "limit" in request.args or "cursor" in request.args
+
+
+def parse_page_args(sort=None):
+    """Read and validate ?limit= and ?cursor= from the current request."""
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    cursor = request.args.get("cursor")
+    after = decode_cursor(cursor, sort) if cursor else None
+    return limit, after
+
+
+def paginate(fetch_page, serialize, sort=None):
+    """
+    Build a page response body.
+
+    Args:
+        fetch_page: callable(limit, after) returning objects in keyset
+                    order (typically a facade get_*_page method).
+        serialize: callable turning one object into a dict.
+        sort: Order of fetch_page, for the cursors (None or "rating").
+
+    Returns:
+        {"items": [...], "next_cursor": str or None}
+    """
+    limit, after = parse_page_args(sort)
+    # One extra row tells whether another page exists
+    objects = fetch_page(limit + 1, after)
+    has_more = len(objects) > limit
+    objects = objects[:limit]
+    return {
+        "items": [serialize(obj) for obj in objects],
+        "next_cursor": (encode_cursor(objects[-1], sort) if has_more
+                        else None),
+    }
@@ -2,9 +2,18 @@
 Place API endpoints.
 Handles CRUD operations for places.
 """
+from flask import request
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required
 from hbnb.app.services import facade
+from hbnb.app.api.v1.identity import current_identity
+from hbnb.app.api.v1.conditional import conditional
+from hbnb.app.api.v1.bulk import bulk_items, bulk_response
+from hbnb.app.api.v1.caching import cached
+from hbnb.app.api.v1.expand import expand_params, include_flags, parse_expand
+from hbnb.app.api.v1.pagination import PAGE_PARAMS, is_paginated, paginate
+from hbnb.app.api.v1.streaming import (
+    STREAM_PARAMS, stream_format, stream_response)
 
 api = Namespace('places', description='Place operations')
 
@@ -25,20 +34,97 @@ place_update_model = api.model('PlaceUpdate', {
 
 })
 
+filter_params = {
+    'min_price': 'Minimum price per night',
+    'max_price': 'Maximum price per night',
+    'amenities': 'Comma-separated amenity names or ids, all required',
+}
+
+sort_params = {
+    'sort': "'rating': best average rating first (not with stream)",
+}
+
+
+def _place_filters():
+    """Read the place filter parameters, None if there are none."""
+    if not any(name in request.args for name in filter_params):
+        return None
+    filters = {'min_price': None, 'max_price': None, 'amenities': []}
+    for name in ('min_price', 'max_price'):
+        if name in request.args:
+            filters[name], = _float_args(name)
+    if 'amenities' in request.args:
+        filters['amenities'] = [token.strip() for token in
+                                request.args['amenities'].split(',')
+                                if token.strip()]
+    return filters
+
+
+PLACE_RELATIONS = ('owner', 'amenities', 'reviews')
+
+
+def place_tags(place, expand=()):
+    """Response cache tags of a place serialized with `expand`"""
+    tags = [('place', place.id)]
+    if 'owner' in expand:
+        tags.append(('user', place.owner_id))
+    if 'amenities' in expand:
+        tags.append(('place_amenities', place.id))
+        tags.extend(('amenity', amenity.id) for amenity in place.amenities)
+    if 'reviews' in expand:
+        tags.append(('place_reviews', place.id))
+    return tags
+
+
 @api.route('/')
 class PlaceList(Resource):
-    @api.doc('list_places')
+    @api.doc('list_places',
+             params={**filter_params, **sort_params,
+                     **expand_params(PLACE_RELATIONS), **PAGE_PARAMS,
+                     **STREAM_PARAMS})
+    @conditional('place', bypass=('expand', 'amenities'))
     def get(self):
-        """Get all places (Public endpoint)"""
-        places = facade.get_all_places()
-        return [place.to_dict() for place in places], 200
+        """Get all places, optionally filtered or sorted (Public endpoint)"""
+        try:
+            sort = request.args.get('sort')
+            if sort is not None and sort != 'rating':
+                raise ValueError("sort must be: rating")
+            fmt = stream_format()
+            if fmt:
+                if sort is not None:
+                    raise ValueError("stream does not support sort")
+                return stream_response(facade.iter_all_places,
+                                       lambda place: place.to_dict(), fmt)
+            expand = parse_expand(PLACE_RELATIONS)
+            flags = include_flags(expand)
+            filters = _place_filters()
+            if filters is not None or sort is not None:
+                filters = filters or {}
+                if is_paginated():
+                    return paginate(
+                        lambda limit, after: facade.filter_places(
+                            **filters, limit=limit, after=after,
+                            expand=expand, sort=sort),
+                        lambda place: place.to_dict(**flags), sort), 200
+                places = facade.filter_places(**filters, expand=expand,
+                                              sort=sort)
+            elif is_paginated():
+                return paginate(
+                    lambda limit, after: facade.get_places_page(
+                        limit, after, expand=expand),
+                    lambda place: place.to_dict(**flags)), 200
+            else:
+                places = facade.get_all_places(expand=expand)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return [place.to_dict(**flags) for place in places], 200
 
     @api.doc('create_place')
     @api.expect(place_model, validate=True)
     @jwt_required()
     def post(self):
         """Create a new place (Authenticated users only)"""
-        current_user = get_jwt_identity()
+        current_user = current_identity().user_id
         place_data = api.payload
         place_data['owner_id'] = current_user
         try:
@@ -47,28 +133,103 @@ class PlaceList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @api.doc('create_places_bulk')
+    @api.expect([place_model])
+    @jwt_required()
+    def post(self):
+        """Create many places at once (Authenticated users only)"""
+        current_user = current_identity().user_id
+        try:
+            created, errors = facade.create_places(bulk_items(), current_user)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return bulk_response(created, errors)
+
+search_params = {
+    'lat': 'Latitude of the center (radius search)',
+    'lon': 'Longitude of the center (radius search)',
+    'radius_km': 'Search radius in kilometers (radius search)',
+    'limit': 'Return only the N nearest places (radius search)',
+    'min_lat': 'South edge (bounding-box search)',
+    'max_lat': 'North edge (bounding-box search)',
+    'min_lon': 'West edge (bounding-box search, > max_lon crosses 180°)',
+    'max_lon': 'East edge (bounding-box search)',
+}
+
+
+def _float_args(*names):
+    """Read required float query parameters."""
+    values = []
+    for name in names:
+        raw = request.args.get(name)
+        if raw is None:
+            raise ValueError(f"Missing query parameter: {name}")
+        try:
+            values.append(float(raw))
+        except ValueError:
+            raise ValueError(f"{name} must be a number")
+    return values
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc('search_places', params=search_params)
+    def get(self):
+        """Search places by radius, nearest N or bounding box (Public endpoint)"""
+        try:
+            if 'lat' in request.args or 'radius_km' in request.args:
+                lat, lon = _float_args('lat', 'lon')
+                radius_km = limit = None
+                if 'radius_km' in request.args:
+                    radius_km, = _float_args('radius_km')
+                if 'limit' in request.args:
+                    try:
+                        limit = int(request.args['limit'])
+                    except ValueError:
+                        raise ValueError("limit must be a positive integer")
+                results = facade.search_places_near(lat, lon, radius_km, limit)
+                return [dict(place.to_dict(), distance_km=round(distance, 3))
+                        for place, distance in results], 200
+            min_lat, max_lat, min_lon, max_lon = _float_args(
+                'min_lat', 'max_lat', 'min_lon', 'max_lon')
+            places = facade.search_places_in_bbox(
+                min_lat, max_lat, min_lon, max_lon)
+            return [place.to_dict() for place in places], 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
 @api.route('/<place_id>')
 class PlaceResource(Resource):
-    @api.doc('get_place')
+    @api.doc('get_place', params=expand_params(PLACE_RELATIONS))
+    @conditional('place')
     def get(self, place_id):
         """Get place by ID (Public endpoint)"""
-        place = facade.get_place(place_id)
-        if not place:
-            return {'error': 'Place not found'}, 404
-        return place.to_dict(), 200
+        try:
+            expand = parse_expand(PLACE_RELATIONS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        def build():
+            place = facade.get_place(place_id, expand=expand)
+            if not place:
+                return {'error': 'Place not found'}, 404, ()
+            return (place.to_dict(**include_flags(expand)), 200,
+                    place_tags(place, expand))
+        return cached(build)
 
     @api.doc('update_place')
     @api.expect(place_update_model, validate=True)
     @jwt_required()
     def put(self, place_id):
         """Update a place (Owner or Admin)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        identity = current_identity()
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
-        if not is_admin and place.owner_id != current_user_id:
+        if not identity.may_modify(place.owner_id):
             return {'error': 'Unauthorized action'}, 403
         try:
             updated_place = facade.update_place(place_id, api.payload)
@@ -80,13 +241,11 @@ class PlaceResource(Resource):
     @jwt_required()
     def delete(self, place_id):
         """Delete a place (Owner or Admin only)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        identity = current_identity()
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
-        if not is_admin and place.owner_id != current_user_id:
+        if not identity.may_modify(place.owner_id):
             return {'error': 'Unauthorized action'}, 403
         try:
             facade.delete_place(place_id)
@@ -103,10 +262,13 @@ class PlaceAmenities(Resource):
     @api.doc('get_place_amenities')
     def get(self, place_id):
         """Récupérer les amenities d'une place (Public)"""
-        place = facade.get_place(place_id)
-        if not place:
-            return {'error': 'Place not found'}, 404
-        return [a.to_dict() for a in place.amenities], 200
+        def build():
+            place = facade.get_place(place_id)
+            if not place:
+                return {'error': 'Place not found'}, 404, ()
+            return ([a.to_dict() for a in place.amenities], 200,
+                    place_tags(place, ('amenities',)))
+        return cached(build)
 
 @api.route('/<place_id>/amenities/<amenity_id>')
 class PlaceAmenityResource(Resource):
@@ -114,15 +276,13 @@ class PlaceAmenityResource(Resource):
     @jwt_required()
     def post(self, place_id, amenity_id):
         """Lier une amenity à une place (Owner ou Admin)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        identity = current_identity()
 
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
 
-        if not is_admin and place.owner_id != current_user_id:
+        if not identity.may_modify(place.owner_id):
             return {'error': 'Unauthorized action'}, 403
 
         amenity = facade.get_amenity(amenity_id)
@@ -133,9 +293,10 @@ class PlaceAmenityResource(Resource):
             return {'error': 'Amenity already linked to this place'}, 400
 
         try:
-            place.amenities.append(amenity)
-            facade.save()
+            facade.add_amenity_to_place(place_id, amenity_id)
             return {'message': 'Amenity added to place successfully'}, 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             return {'error': str(e)}, 500
 
@@ -143,15 +304,13 @@ class PlaceAmenityResource(Resource):
     @jwt_required()
     def delete(self, place_id, amenity_id):
         """Retirer une amenity d'une place (Owner ou Admin)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        identity = current_identity()
 
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
 
-        if not is_admin and place.owner_id != current_user_id:
+        if not identity.may_modify(place.owner_id):
             return {'error': 'Unauthorized action'}, 403
 
         amenity = facade.get_amenity(amenity_id)
@@ -162,9 +321,10 @@ class PlaceAmenityResource(Resource):
             return {'error': 'Amenity not linked to this place'}, 400
 
         try:
-            place.amenities.remove(amenity)
-            facade.save()
+            facade.remove_amenity_from_place(place_id, amenity_id)
             return {'message': 'Amenity removed from place successfully'}, 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             return {'error': str(e)}, 500
 
@@ -177,9 +337,12 @@ class PlaceReviews(Resource):
     @api.doc('get_place_reviews')
     def get(self, place_id):
         """Récupérer les reviews d'une place (Public)"""
-        place = facade.get_place(place_id)
-        if not place:
-            return {'error': 'Place not found'}, 404
-        # ✅ Utiliser facade.get_reviews_by_place() au lieu de place.reviews
-        reviews = facade.get_reviews_by_place(place_id)
-        return [r.to_dict() for r in reviews], 200
+        def build():
+            place = facade.get_place(place_id)
+            if not place:
+                return {'error': 'Place not found'}, 404, ()
+            # ✅ Utiliser facade.get_reviews_by_place() au lieu de place.reviews
+            reviews = facade.get_reviews_by_place(place_id)
+            return ([r.to_dict() for r in reviews], 200,
+                    place_tags(place, ('reviews',)))
+        return cached(build)
@@ -3,8 +3,15 @@ Review API endpoints.
 Handles CRUD operations for reviews.
 """
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required
 from hbnb.app.services import facade
+from hbnb.app.api.v1.identity import current_identity
+from hbnb.app.api.v1.conditional import conditional
+from hbnb.app.api.v1.bulk import bulk_items, bulk_response
+from hbnb.app.api.v1.expand import expand_params, include_flags, parse_expand
+from hbnb.app.api.v1.pagination import PAGE_PARAMS, is_paginated, paginate
+from hbnb.app.api.v1.streaming import (
+    STREAM_PARAMS, stream_format, stream_response)
 
 api = Namespace('reviews', description='Review operations')
 
@@ -23,20 +30,39 @@ review_update_model = api.model('ReviewUpdate', {
 })
 
 
+REVIEW_RELATIONS = ('user', 'place')
+
+
 @api.route('/')
 class ReviewList(Resource):
-    @api.doc('list_reviews')
+    @api.doc('list_reviews', params={**expand_params(REVIEW_RELATIONS),
+                                     **PAGE_PARAMS, **STREAM_PARAMS})
+    @conditional('review')
     def get(self):
         """Get all reviews"""
-        reviews = facade.get_all_reviews()
-        return [review.to_dict() for review in reviews], 200
+        try:
+            fmt = stream_format()
+            if fmt:
+                return stream_response(facade.iter_all_reviews,
+                                       lambda review: review.to_dict(), fmt)
+            expand = parse_expand(REVIEW_RELATIONS)
+            flags = include_flags(expand)
+            if is_paginated():
+                return paginate(
+                    lambda limit, after: facade.get_reviews_page(
+                        limit, after, expand=expand),
+                    lambda review: review.to_dict(**flags)), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        reviews = facade.get_all_reviews(expand=expand)
+        return [review.to_dict(**flags) for review in reviews], 200
     
     @api.doc('create_review')
     @api.expect(review_model, validate=True)
     @jwt_required()
     def post(self):
         """Create a new review (Authenticated users only)"""
-        current_user = get_jwt_identity()
+        current_user = current_identity().user_id
         review_data = api.payload
         
         # Get the place
@@ -64,9 +90,33 @@ class ReviewList(Resource):
             return {'error': str(e)}, 400
 
 
+# Model for one item of a bulk create (the author is the caller)
+review_bulk_model = api.model('ReviewBulkItem', {
+    'text': fields.String(required=True, description='Text of the review'),
+    'rating': fields.Integer(required=True, description='Rating of the place (1-5)'),
+    'place_id': fields.String(required=True, description='ID of the place')
+})
+
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @api.doc('create_reviews_bulk')
+    @api.expect([review_bulk_model])
+    @jwt_required()
+    def post(self):
+        """Create many reviews at once (Authenticated users only)"""
+        current_user = current_identity().user_id
+        try:
+            created, errors = facade.create_reviews(bulk_items(), current_user)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return bulk_response(created, errors)
+
+
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.doc('get_review')
+    @conditional('review')
     def get(self, review_id):
         """Get review by ID"""
         review = facade.get_review(review_id)
@@ -79,9 +129,7 @@ class ReviewResource(Resource):
     @jwt_required()
     def put(self, review_id):
         """Update a review (Author or Admin)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        identity = current_identity()
         
         review = facade.get_review(review_id)
         
@@ -89,11 +137,11 @@ class ReviewResource(Resource):
             return {'error': 'Review not found'}, 404
         
         # Check if user is author or admin
-        if not is_admin and review.user_id != current_user_id:
+        if not identity.may_modify(review.user_id):
             return {'error': 'Unauthorized action'}, 403
         
         try:
-            review.update(api.payload)
+            review = facade.update_review(review_id, api.payload)
             return review.to_dict(), 200
         except ValueError as e:
             return {'error': str(e)}, 400
@@ -102,9 +150,7 @@ class ReviewResource(Resource):
     @jwt_required()
     def delete(self, review_id):
         """Delete a review (Author or Admin)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        identity = current_identity()
         
         review = facade.get_review(review_id)
         
@@ -112,7 +158,7 @@ class ReviewResource(Resource):
             return {'error': 'Review not found'}, 404
         
         # Check if user is author or admin
-        if not is_admin and review.user_id != current_user_id:
+        if not identity.may_modify(review.user_id):
             return {'error': 'Unauthorized action'}, 403
         
         try:
@@ -3,9 +3,13 @@ User API endpoints.
 Handles CRUD operations for users.
 """
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required
 from hbnb.app.services import facade
+from hbnb.app.api.v1.identity import current_identity
+from hbnb.app.api.v1.conditional import conditional
+from hbnb.app.api.v1.caching import cached
 from hbnb.app.utils import hash_password
+from hbnb.app.api.v1.pagination import PAGE_PARAMS, is_paginated, paginate
 
 api = Namespace("users", description="User operations")
 
@@ -40,10 +44,10 @@ class UserList(Resource):
     @jwt_required()
     def post(self):
         """Create a new user (Admin only)"""
-        current_user = get_jwt()
+        identity = current_identity()
         
         # Check if user is admin
-        if not current_user.get('is_admin', False):
+        if not identity.is_admin:
             return {"error": "Admin privileges required"}, 403
         
         try:
@@ -65,8 +69,17 @@ class UserList(Resource):
             return {"error": str(e)}, 400
     
     @api.response(200, "Users retrieved")
+    @api.response(400, "Invalid limit or cursor")
+    @api.doc(params=PAGE_PARAMS)
+    @conditional('user')
     def get(self):
         """Get all users"""
+        if is_paginated():
+            try:
+                return paginate(facade.get_users_page,
+                                lambda user: user.to_dict()), 200
+            except ValueError as e:
+                return {"error": str(e)}, 400
         users = facade.get_all_users()
         return [u.to_dict() for u in users], 200
 
@@ -79,15 +92,15 @@ class UserResource(Resource):
     
     @api.response(200, "User retrieved")
     @api.response(404, "User not found")
+    @conditional('user')
     def get(self, user_id):
         """Get user by ID"""
-        user = facade.get_user(user_id)
-        if not user:
-            api.abort(404, "User not found")
-        user_data = user.to_dict()
-        # Remove password from response
-        user_data.pop("password", None)
-        return user_data, 200
+        def build():
+            user_data = facade.get_user_record(user_id)
+            if not user_data:
+                api.abort(404, "User not found")
+            return user_data, 200, [('user', user_id)]
+        return cached(build)
     
     @api.expect(user_update_model, validate=True)
     @api.response(200, "User updated")
@@ -96,22 +109,23 @@ class UserResource(Resource):
     @jwt_required()
     def put(self, user_id):
         """Update user (Users can update themselves, admins can update anyone)"""
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
+        identity = current_identity()
         
         # Regular users can only update themselves
-        if not is_admin and current_user_id != user_id:
+        if not identity.may_modify(user_id):
             return {"error": "Unauthorized action"}, 403
         
-        user = facade.get_user(user_id)
+        if user_id == identity.user_id:
+            user = identity.record
+        else:
+            user = facade.get_user_record(user_id)
         if not user:
             return {"error": "User not found"}, 404
         
         update_data = api.payload
         
         # Only admins can modify email and password
-        if not is_admin:
+        if not identity.is_admin:
             if 'email' in update_data or 'password' in update_data:
                 return {"error": "You cannot modify email or password"}, 400
         else:
@@ -126,7 +140,7 @@ class UserResource(Resource):
                 update_data['password'] = hash_password(update_data['password'])
         
         try:
-            user.update(update_data)
+            user = facade.update_user(user_id, update_data)
             return user.to_dict(), 200
         except ValueError as e:
             return {"error": str(e)}, 400
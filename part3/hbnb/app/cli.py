@@ -0,0 +1,170 @@
+"""
+`flask hbnb ...` maintenance commands.
+
+    flask --app "hbnb.app:create_app('development')" hbnb load \\
+        --sql hbnb/initial_data.sql --on-conflict ignore \\
+        users.csv places.ndjson reviews.ndjson
+
+After upgrading the code, bring an existing database up to the models
+once, before serving it:
+
+    flask --app "hbnb.app:create_app('production')" hbnb upgrade-schema
+
+The commands work on the SQL database configured for the app, whatever
+USE_DATABASE says about the API's repositories.
+"""
+import time
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+hbnb_cli = AppGroup("hbnb", help="HBnB maintenance commands.")
+
+
+def _add_missing_columns(engine, metadata):
+    """
+    Add the model columns missing from existing tables (ALTER TABLE ...
+    ADD COLUMN, using their server defaults).
+
+    Returns:
+        list of the (table, column) names added
+    """
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name']
+                        for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.execute(
+                    text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+                added.append((table.name, column.name))
+    return added
+
+
+def _create_missing_indexes(engine, metadata):
+    """Create the declared indexes that do not exist yet."""
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                # Not checkfirst: SQLite reflection skips expression
+                # indexes such as ix_places_rating
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+@hbnb_cli.command("upgrade-schema")
+@click.option("--rebuild-ratings", is_flag=True,
+              help="Recompute the rating aggregates even if their columns "
+                   "already existed.")
+def upgrade_schema(rebuild_ratings):
+    """
+    Add the columns, indexes and triggers declared since the tables were
+    created (create_all() skips existing tables); fill the rating
+    aggregates of the places when their columns were just added.
+    """
+    from hbnb.app import db
+    from hbnb.app.models import Place
+    from hbnb.app.models.place_change import create_triggers
+    from hbnb.app.persistence.place_repository import (
+        SQLAlchemyPlaceRepository)
+    from hbnb.app.persistence.unit_of_work import transaction
+
+    start = time.perf_counter()
+    try:
+        added = _add_missing_columns(db.engine, db.metadata)
+        for table, column in added:
+            click.echo(f"{table}.{column}: added")
+        _create_missing_indexes(db.engine, db.metadata)
+        with db.engine.begin() as connection:
+            create_triggers(connection)
+        if rebuild_ratings or any(
+                table == Place.__tablename__
+                and column in Place.RATING_AGGREGATES
+                for table, column in added):
+            with transaction(db.session):
+                SQLAlchemyPlaceRepository(Place).rebuild_rating_aggregates()
+            click.echo("places: rating aggregates rebuilt")
+    except SQLAlchemyError as e:
+        raise click.ClickException(str(getattr(e, "orig", None) or e))
+    click.echo(f"Schema up to date in {time.perf_counter() - start:.1f}s")
+
+
+@hbnb_cli.command("load")
+@click.argument("paths", nargs=-1,
+                type=click.Path(exists=True, dir_okay=False))
+@click.option("--sql", "sql_paths", multiple=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help="SQL script to run before the files (repeatable).")
+@click.option("--chunk-size", default=10000, show_default=True,
+              help="Rows per executemany.")
+@click.option("--on-conflict", type=click.Choice(["abort", "ignore"]),
+              default="abort", show_default=True,
+              help="ignore: skip rows whose id or unique value exists.")
+def load(paths, sql_paths, chunk_size, on_conflict):
+    """
+    Load CSV / NDJSON files into the tables they are named after
+    (users.csv, places.ndjson, place_amenity.csv...), in one transaction.
+    Plain-text passwords are hashed on the PASSWORD_HASH_WORKERS pool.
+    """
+    from hbnb.app import db
+    from hbnb.app.hashing import password_hasher
+    from hbnb.app.models import Place, Review
+    from hbnb.app.persistence.loader import BulkLoader
+    from hbnb.app.persistence.place_repository import (
+        SQLAlchemyPlaceRepository)
+    from hbnb.app.persistence.unit_of_work import transaction
+
+    if not paths and not sql_paths:
+        raise click.UsageError("Nothing to load: give files and/or --sql")
+    start = time.perf_counter()
+    try:
+        with transaction(db.session):
+            loader = BulkLoader(db.session.connection(), db.metadata,
+                                chunk_size=chunk_size,
+                                hash_passwords=password_hasher.hash_many,
+                                on_conflict=on_conflict)
+            for path in sql_paths:
+                count = loader.load_sql(path)
+                click.echo(f"{path}: {count:,} statements")
+            paths = loader.ordered(paths)
+            tables = {loader.table_for(path) for path in paths}
+            with loader.deferred_checks(tables):
+                for path in paths:
+                    count = loader.load_file(path)
+                    click.echo(f"{path}: {count:,} rows into "
+                               f"{loader.table_for(path).name}")
+            if tables & {Place.__table__, Review.__table__}:
+                SQLAlchemyPlaceRepository(Place).rebuild_rating_aggregates()
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    except SQLAlchemyError as e:
+        # The driver's message, without the (possibly huge) statement
+        raise click.ClickException(str(getattr(e, "orig", None) or e))
+    click.echo(f"Loaded in {time.perf_counter() - start:.1f}s")
+
+
+@hbnb_cli.command("sync-replica")
+def sync_replica():
+    """
+    Refresh the SQLite read replica (REPLICA_BIND) with a consistent
+    copy of the primary database.
+    """
+    from hbnb.app import db
+    from hbnb.app.persistence.routing import replica_router
+    from hbnb.app.persistence.sqlite import copy_database
+
+    replica = db.engines.get(replica_router.bind_key)
+    if replica is None or replica.dialect.name != "sqlite":
+        raise click.ClickException("No SQLite replica bind configured")
+    start = time.perf_counter()
+    copy_database(db.engine, replica.url.database)
+    click.echo(f"{replica.url.database}: synced in "
+               f"{time.perf_counter() - start:.1f}s")
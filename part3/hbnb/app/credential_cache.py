@@ -0,0 +1,100 @@
+"""
+Cache of recently verified credentials.
+
+Clients that log in again and again pay a full bcrypt check each time.
+After a successful check, the cache remembers a keyed HMAC of the
+password for that user and that exact stored hash ("hash version"),
+for a short time: a repeated correct login within the window is one
+HMAC and a dictionary lookup.
+
+The HMAC key is random and lives only in this process, so an entry is
+useless outside of it; plain-text passwords are never stored. An entry
+is bound to the stored hash, so a password change (or a rehash) makes
+it stale even before update_user invalidates it. Failed logins are
+never cached.
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CredentialCache:
+    """Bounded LRU of (user id, hash version) -> HMAC(password), with TTL."""
+
+    def __init__(self, ttl=60, max_entries=10000):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (0 disables the cache).
+            max_entries: Entries kept, least recently used evicted first.
+        """
+        self._key = os.urandom(32)
+        self._entries = OrderedDict()  # user_id -> (version, digest, expires)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.configure(ttl, max_entries)
+
+    def configure(self, ttl=60, max_entries=10000):
+        """Change the settings; existing entries are dropped."""
+        with self._lock:
+            self.ttl = ttl
+            self.max_entries = max_entries
+            self._entries.clear()
+
+    def init_app(self, app):
+        """Read the CREDENTIAL_CACHE_* settings of a Flask app."""
+        self.configure(ttl=app.config.get("CREDENTIAL_CACHE_TTL", 60),
+                       max_entries=app.config.get("CREDENTIAL_CACHE_SIZE",
+                                                  10000))
+
+    def _digest(self, hash_version, password):
+        message = f"{hash_version}\0{password}".encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def check(self, user_id, hash_version, password):
+        """True if this password was verified for this hash recently."""
+        if not self.ttl:
+            return False
+        digest = self._digest(hash_version, password)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                version, cached, expires = entry
+                if expires <= now or version != hash_version:
+                    del self._entries[user_id]
+                elif hmac.compare_digest(cached, digest):
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return True
+            self.misses += 1
+            return False
+
+    def remember(self, user_id, hash_version, password):
+        """Record a successful verification."""
+        if not self.ttl:
+            return
+        entry = (hash_version, self._digest(hash_version, password),
+                 time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Forget the user's entry (e.g. after a password change)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self):
+        """Hit / miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._entries)}
+
+
+credential_cache = CredentialCache()
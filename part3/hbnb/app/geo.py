@@ -0,0 +1,59 @@
+"""
+Geographic helpers for place search.
+
+Distances use the haversine formula on a spherical Earth, which is
+accurate to ~0.5 % — plenty for "places near me" queries.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+# Half of the Earth's circumference: no two points are farther apart
+MAX_RADIUS_KM = math.pi * EARTH_RADIUS_KM
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometers between two points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (math.sin(d_phi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Smallest lat/lon box containing the circle of radius_km around
+    the point.
+
+    Returns:
+        (min_lat, max_lat, min_lon, max_lon). min_lon > max_lon means the
+        box crosses the antimeridian; a circle reaching a pole spans
+        every longitude.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    ratio = (math.sin(radius_km / EARTH_RADIUS_KM)
+             / math.cos(math.radians(latitude)))
+    if ratio >= 1.0:
+        return min_lat, max_lat, -180.0, 180.0
+    d_lon = math.degrees(math.asin(ratio))
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180.0:
+        min_lon += 360.0
+    if max_lon > 180.0:
+        max_lon -= 360.0
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def in_bbox(latitude, longitude, min_lat, max_lat, min_lon, max_lon):
+    """True if the point lies in the box (antimeridian aware)."""
+    if not min_lat <= latitude <= max_lat:
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= longitude <= max_lon
+    return longitude >= min_lon or longitude <= max_lon
@@ -0,0 +1,260 @@
+"""
+Password hashing off the request thread.
+
+bcrypt is deliberately slow: at cost 12 a hash or a check takes about
+250 ms of CPU. Run on the request thread, it holds a worker (and the
+GIL) for that long, so a burst of logins starves every other endpoint.
+The PasswordHasher sends the work to a pool of processes instead, and
+bounds how much of it may be pending: past that, callers get
+HasherBusy right away (the API answers 503 with Retry-After) rather
+than queueing behind everybody else.
+
+The cost of new hashes comes from a work-factor policy set per
+environment (PASSWORD_WORK_FACTOR): a fixed cost, or a callable such
+as calibrated_work_factor(). Checking a password always uses the cost
+stored in its hash; needs_rehash() tells when that cost is no longer
+the target, and rehash_async() migrates such a hash in the background
+after a successful login (see User.verify_password).
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import bcrypt
+
+DEFAULT_WORK_FACTOR = 12
+
+
+class HasherBusy(Exception):
+    """Too many hashes pending; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__("Password hashing is saturated")
+        self.retry_after = retry_after
+
+
+def _hash(password, rounds):
+    """bcrypt hash of password (runs in a pool process)."""
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def _check(hashed_password, password):
+    """True if password matches the hash (runs in a pool process)."""
+    return bcrypt.checkpw(password.encode("utf-8"),
+                          hashed_password.encode("utf-8"))
+
+
+def hash_rounds(hashed_password):
+    """bcrypt cost stored in a hash ("$2b$12$..." -> 12), or None."""
+    parts = hashed_password.split("$") if isinstance(hashed_password, str) else []
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def calibrated_work_factor(target_seconds=0.25, minimum=10, maximum=14):
+    """
+    Work-factor policy: the highest cost whose hash takes at most
+    target_seconds on this machine, measured once at first use.
+    """
+    chosen = None
+
+    def policy():
+        nonlocal chosen
+        if chosen is None:
+            start = time.perf_counter()
+            _hash("calibration", minimum)
+            elapsed = time.perf_counter() - start
+            rounds = minimum
+            # Each extra round doubles the cost
+            while rounds < maximum and elapsed * 2 <= target_seconds:
+                rounds += 1
+                elapsed *= 2
+            chosen = rounds
+        return chosen
+
+    return policy
+
+
+class PasswordHasher:
+    """bcrypt on a process pool with a bounded number of pending calls."""
+
+    def __init__(self, workers=None, queue_size=32, retry_after=1,
+                 work_factor=DEFAULT_WORK_FACTOR):
+        """
+        Args:
+            workers: Pool processes (None: one per CPU).
+            queue_size: Calls allowed to wait for a free process.
+            retry_after: Seconds suggested to callers turned away.
+            work_factor: bcrypt cost of new hashes, or a callable
+                         returning it.
+        """
+        self._executor = None
+        self._writer = None  # thread storing rehashed passwords
+        self._lock = threading.Lock()
+        self._pending = []  # futures submitted, possibly done
+        self._rehashing = set()  # keys with a rehash in flight
+        self.configure(workers, queue_size, retry_after, work_factor)
+
+    def configure(self, workers=None, queue_size=32, retry_after=1,
+                  work_factor=DEFAULT_WORK_FACTOR):
+        """Change the settings (a new pool size applies to the next call)."""
+        workers = workers or os.cpu_count() or 1
+        with self._lock:
+            if self._executor is not None and workers != self.workers:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.workers = workers
+            self.max_pending = workers + queue_size
+            self.retry_after = retry_after
+            self.work_factor = work_factor
+
+    def init_app(self, app):
+        """Read the PASSWORD_* settings of a Flask app."""
+        self.configure(
+            workers=app.config.get("PASSWORD_HASH_WORKERS"),
+            queue_size=app.config.get("PASSWORD_HASH_QUEUE_SIZE", 32),
+            retry_after=app.config.get("PASSWORD_HASH_RETRY_AFTER", 1),
+            work_factor=app.config.get("PASSWORD_WORK_FACTOR",
+                                       DEFAULT_WORK_FACTOR))
+
+    @property
+    def rounds(self):
+        """bcrypt cost of new hashes, from the work-factor policy."""
+        if callable(self.work_factor):
+            return self.work_factor()
+        return self.work_factor
+
+    def _pool(self):
+        if self._executor is None:
+            # forkserver: workers do not inherit the app's threads/sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"))
+        return self._executor
+
+    def _submit(self, func, *args):
+        """Submit func to the pool, or raise HasherBusy if saturated."""
+        with self._lock:
+            self._pending = [future for future in self._pending
+                             if not future.done()]
+            if len(self._pending) >= self.max_pending:
+                raise HasherBusy(self.retry_after)
+            try:
+                future = self._pool().submit(func, *args)
+            except BrokenProcessPool:
+                # A worker died: start a fresh pool
+                self._executor = None
+                future = self._pool().submit(func, *args)
+            self._pending.append(future)
+        return future
+
+    def hash_async(self, password):
+        """Future of the hash of password (HasherBusy if saturated)."""
+        if not isinstance(password, str) or not password:
+            raise ValueError("Password must be non-empty.")
+        return self._submit(_hash, password, self.rounds)
+
+    def hash(self, password):
+        """Hash password (HasherBusy if saturated)."""
+        return self.hash_async(password).result()
+
+    def verify_async(self, hashed_password, password):
+        """Future of verify(): for callers that must not block (asyncio)."""
+        return self._submit(_check, hashed_password, password)
+
+    def verify(self, hashed_password, password):
+        """True if password matches hashed_password (HasherBusy if saturated)."""
+        return self.verify_async(hashed_password, password).result()
+
+    def needs_rehash(self, hashed_password):
+        """True if a bcrypt hash was made at another cost than the target."""
+        rounds = hash_rounds(hashed_password)
+        return rounds is not None and rounds != self.rounds
+
+    def rehash_async(self, key, password, store):
+        """
+        Hash a verified password again at the target cost, in the
+        background, then call store(new_hash) on a writer thread (one at
+        a time, so SQLite sees a single writer). At most one rehash per
+        key is in flight; when the pool is saturated the rehash is
+        skipped, the next login will try again.
+
+        Returns:
+            The future of the new hash, or None if nothing was submitted.
+        """
+        with self._lock:
+            if key in self._rehashing:
+                return None
+            self._rehashing.add(key)
+        try:
+            future = self.hash_async(password)
+        except HasherBusy:
+            with self._lock:
+                self._rehashing.discard(key)
+            return None
+
+        def write(new_hash):
+            try:
+                store(new_hash)
+            finally:
+                with self._lock:
+                    self._rehashing.discard(key)
+
+        def done(future):
+            # Runs on the pool's result thread: hand the write over
+            with self._lock:
+                if future.exception() is not None or self._writer is None:
+                    self._rehashing.discard(key)
+                    return
+                self._writer.submit(write, future.result())
+
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="rehash")
+        future.add_done_callback(done)
+        return future
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch of passwords with the whole pool, in order. Meant
+        for offline jobs: it bypasses the pending-call limit.
+        """
+        passwords = list(passwords)
+        if not passwords:
+            return []
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        with self._lock:
+            executor = self._pool()
+        return list(executor.map(partial(_hash, rounds=self.rounds),
+                                 passwords, chunksize=chunksize))
+
+    def stats(self):
+        """Pool size, calls running or waiting, and how many are allowed."""
+        with self._lock:
+            pending = sum(1 for future in self._pending if not future.done())
+            return {"workers": self.workers, "pending": pending,
+                    "max_pending": self.max_pending}
+
+    def shutdown(self, wait=True):
+        """
+        Stop the pool (it is started again on the next call). With
+        wait=True, pending rehashes are stored first.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=wait)
+
+
+password_hasher = PasswordHasher()
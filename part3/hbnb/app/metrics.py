@@ -0,0 +1,410 @@
+"""
+Runtime metrics, exposed in the Prometheus text format on GET /metrics.
+
+Recorded:
+- every request: a count per namespace, route, method and status, and
+  a latency histogram per namespace, route and method
+- every call made to the facade and, by the facade, to a repository:
+  a latency histogram per method (and model)
+- on each scrape, the counters of the shared components: credential,
+  user and response caches, password hashing pool, token blocklist and
+  writer queue
+
+Histograms are HDR-style: log-linear buckets, two per power of two
+(1, 2, 3, 4, 6, 8, 12, 16 ... microseconds, up to about 67 s), so a
+latency is known within 50% whatever its magnitude, and its bucket is
+found with a table lookup (a few integer operations beyond 65 ms). As
+Prometheus' "le" says, a bucket counts the durations up to and
+including its bound: a call of 4 us is under le="4e-06", one of
+4.001 us under le="6e-06".
+
+Recording takes no lock: each thread writes to its own series (a dict
+of counter lists), summed when /metrics is read. The series of a
+finished thread are folded into a common total when a new thread
+records for the first time, so a thread-per-connection server does not
+grow them without bound.
+"""
+import inspect
+import re
+import threading
+from functools import wraps
+from time import perf_counter_ns
+
+REQUESTS = "hbnb_http_requests_total"
+REQUEST_DURATION = "hbnb_http_request_duration_seconds"
+FACADE_CALLS = "hbnb_facade_call_duration_seconds"
+REPOSITORY_CALLS = "hbnb_repository_call_duration_seconds"
+
+# name -> (type, help) of the recorded families
+FAMILIES = {
+    REQUESTS: ("counter", "HTTP requests served"),
+    REQUEST_DURATION: ("histogram", "Time spent serving an HTTP request"),
+    FACADE_CALLS: ("histogram", "Time spent in a facade method"),
+    REPOSITORY_CALLS: ("histogram", "Time spent in a repository method"),
+}
+
+# Upper bounds of the histogram buckets, in microseconds; latencies
+# beyond the last one are only counted in +Inf
+_BUCKETS = 52
+_BOUNDS = [1] + [2 << (i // 2) if i % 2 else (3 << (i // 2)) >> 1
+                 for i in range(1, _BUCKETS)]
+_LE = [repr(bound / 1e6) for bound in _BOUNDS]
+
+_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+_CONVERTER = re.compile(r"<(?:[^:<>]+:)?([^<>]+)>|\{([^{}]+)\}")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# WSGI environ key of the request's start time (perf_counter_ns)
+STARTED = "hbnb.metrics.started"
+
+
+def bucket(elapsed_ns):
+    """
+    Index of the histogram bucket of a duration in nanoseconds: the
+    first whose bound is not below it.
+    """
+    us = (elapsed_ns + 999) // 1000  # rounded up: 1.2 us is not <= 1 us
+    if us <= 2:
+        return max(us - 1, 0)
+    # The first bound >= us is the first bound > us - 1
+    us -= 1
+    high = us.bit_length() - 1  # 2**high <= us < 2**(high + 1)
+    index = 2 * high + ((us >> (high - 1)) & 1)
+    return index if index < _BUCKETS else _BUCKETS
+
+
+# bucket() of the durations up to 65 ms, by microsecond rounded up: one
+# indexing instead of the integer operations on the recording path
+_INDEXED = 1 << 16
+_INDEX = bytes(bucket(us * 1000) for us in range(_INDEXED))
+
+
+def route_labels(rule):
+    """
+    (namespace, route) labels of a URL rule: converters are dropped
+    ("<string:user_id>" and "{user_id}" both give "<user_id>") so the
+    Flask and the ASGI routes of an endpoint share their series.
+    """
+    if not rule:
+        return "", ""
+    route = _CONVERTER.sub(lambda m: f"<{m.group(1) or m.group(2)}>", rule)
+    parts = route.split("/")
+    namespace = parts[3] if route.startswith("/api/v1/") else ""
+    return namespace, route
+
+
+def _escape(value):
+    return (str(value).replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
+
+
+def labels_of(**labels):
+    """Rendered label set, e.g. 'model="place",method="get"'."""
+    return ",".join(f'{name}="{_escape(value)}"'
+                    for name, value in labels.items())
+
+
+def _sample(name, labels, value):
+    return f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+
+class _Timed:
+    """Proxy made by Metrics.instrument()."""
+
+    def __init__(self, target, methods):
+        self.__dict__.update(methods)
+        self._target = target
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+class Metrics:
+    """Per-thread counters and histograms, rendered for Prometheus."""
+
+    def __init__(self):
+        self.enabled = True
+        self._local = threading.local()
+        self._lock = threading.Lock()  # thread registration and reads only
+        self._shards = []   # (thread, {key: counts})
+        self._retired = {}  # series of the finished threads
+        self._request_keys = {}  # (rule, method, status) -> series key
+
+    def configure(self, enabled=True):
+        """Turn recording on or off; recorded values are reset."""
+        with self._lock:
+            self.enabled = enabled
+            for _, series in self._shards:
+                series.clear()
+            self._retired.clear()
+
+    def init_app(self, app):
+        """
+        Read METRICS_ENABLED; if set, time the app's requests and serve
+        GET /metrics.
+        """
+        from flask import request
+
+        self.configure(app.config.get("METRICS_ENABLED", True))
+        if not self.enabled:
+            return
+        app.wsgi_app = self.timer(app.wsgi_app)
+
+        @app.after_request
+        def record_request(response):
+            # one context lookup: each access through the proxy costs ~1 us
+            current = request._get_current_object()
+            started = current.environ.pop(STARTED, None)
+            if started is not None:
+                rule = current.url_rule
+                self.observe_request(rule.rule if rule else None,
+                                     current.method, response.status_code,
+                                     perf_counter_ns() - started)
+            return response
+
+        @app.route("/metrics")
+        def metrics():
+            return self.render(), 200, {"Content-Type": CONTENT_TYPE}
+
+    def timer(self, wsgi_app):
+        """WSGI middleware stamping the start of each request (STARTED)."""
+        def timed_wsgi_app(environ, start_response):
+            if self.enabled:
+                environ[STARTED] = perf_counter_ns()
+            return wsgi_app(environ, start_response)
+        return timed_wsgi_app
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _counts(self, key):
+        """Counts of key in this thread's series (registered on first use)."""
+        try:
+            series = self._local.series
+        except AttributeError:
+            series = self._local.series = {}
+            with self._lock:
+                alive = []
+                for thread, shard in self._shards:
+                    if thread.is_alive():
+                        alive.append((thread, shard))
+                    else:
+                        self._merge(self._retired, shard)
+                alive.append((threading.current_thread(), series))
+                self._shards = alive
+        counts = series.get(key)
+        if counts is None:
+            # one count per bucket, then +Inf, then the sum (ns)
+            counts = series[key] = [0] * (_BUCKETS + 2)
+        return counts
+
+    def observe(self, key, elapsed_ns):
+        """Add a duration (ns) to the histogram key = (family, labels)."""
+        try:
+            counts = self._local.series[key]
+        except (AttributeError, KeyError):
+            counts = self._counts(key)
+        us = (elapsed_ns + 999) // 1000
+        counts[_INDEX[us] if us < _INDEXED else bucket(elapsed_ns)] += 1
+        counts[-1] += elapsed_ns
+
+    def observe_request(self, rule, method, status, elapsed_ns):
+        """
+        Count a request and record its latency: one histogram per
+        status, whose counts give REQUESTS and whose sum over the
+        statuses gives REQUEST_DURATION.
+        """
+        if method not in _METHODS:
+            method = "other"
+        key = self._request_keys.get((rule, method, status))
+        if key is None:
+            namespace, route = route_labels(rule)
+            key = self._request_keys[(rule, method, status)] = (
+                REQUESTS,
+                labels_of(namespace=namespace, route=route, method=method),
+                int(status))
+        self.observe(key, elapsed_ns)
+
+    def timed(self, function, family, **labels):
+        """function (sync or async) recording its durations in family."""
+        key = (family, labels_of(**labels))
+
+        if inspect.iscoroutinefunction(function):
+            @wraps(function)
+            async def timed(*args, **kwargs):
+                if not self.enabled:
+                    return await function(*args, **kwargs)
+                started = perf_counter_ns()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    self.observe(key, perf_counter_ns() - started)
+            return timed
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            started = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.observe(key, perf_counter_ns() - started)
+        return timed
+
+    def instrument(self, obj, family, **labels):
+        """
+        Proxy of obj timing its public methods in family, with a method
+        label (after labels). Only the calls made through the proxy are
+        recorded: the ones obj makes on itself are part of them.
+        Generators and context managers are passed through untimed (the
+        call only creates them), and so are the other attributes.
+        """
+        methods = {}
+        for name in dir(type(obj)):
+            if name.startswith("_"):
+                continue
+            attribute = inspect.getattr_static(obj, name)
+            if isinstance(attribute, staticmethod):
+                attribute = attribute.__func__
+            if not inspect.isfunction(attribute):
+                continue
+            method = getattr(obj, name)
+            function = inspect.unwrap(attribute)
+            if (inspect.isgeneratorfunction(function)
+                    or inspect.isasyncgenfunction(function)):
+                methods[name] = method
+            else:
+                methods[name] = self.timed(method, family, **labels,
+                                           method=name)
+        return _Timed(obj, methods)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _merge(total, series):
+        for key, counts in list(series.items()):
+            current = total.get(key)
+            if current is None:
+                total[key] = list(counts)
+            else:
+                for index, count in enumerate(counts):
+                    current[index] += count
+
+    def snapshot(self):
+        """
+        {key: counts} summed over all threads. Keys are (family,
+        labels), or (REQUESTS, labels, status) for requests.
+        """
+        with self._lock:
+            total = {key: list(counts)
+                     for key, counts in self._retired.items()}
+            for _, series in self._shards:
+                self._merge(total, series)
+        return total
+
+    def render(self):
+        """Recorded values and component counters, Prometheus text format."""
+        histograms, requests = {}, []
+        for key, counts in self.snapshot().items():
+            if key[0] == REQUESTS:
+                _, labels, status = key
+                requests.append((f'{labels},status="{status}"',
+                                 sum(counts[:-1])))
+                key = (REQUEST_DURATION, labels)
+            self._merge(histograms, {key: counts})
+        lines = [f"# HELP {REQUESTS} {FAMILIES[REQUESTS][1]}",
+                 f"# TYPE {REQUESTS} counter"]
+        lines += [_sample(REQUESTS, labels, count)
+                  for labels, count in sorted(requests)]
+        by_family = {}
+        for (family, labels), counts in histograms.items():
+            by_family.setdefault(family, []).append((labels, counts))
+        for family, (kind, help_text) in FAMILIES.items():
+            if kind != "histogram":
+                continue
+            lines += [f"# HELP {family} {help_text}",
+                      f"# TYPE {family} {kind}"]
+            for labels, counts in sorted(by_family.get(family, ())):
+                prefix = f"{labels}," if labels else ""
+                cumulative = 0
+                for le, count in zip(_LE, counts):
+                    cumulative += count
+                    lines.append(f'{family}_bucket{{{prefix}le="{le}"}} '
+                                 f'{cumulative}')
+                cumulative += counts[_BUCKETS]
+                lines += [
+                    f'{family}_bucket{{{prefix}le="+Inf"}} {cumulative}',
+                    _sample(f"{family}_sum", labels, counts[-1] / 1e9),
+                    _sample(f"{family}_count", labels, cumulative)]
+        for family, kind, help_text, samples in component_samples():
+            lines += [f"# HELP {family} {help_text}",
+                      f"# TYPE {family} {kind}"]
+            lines += [_sample(family, labels, value)
+                      for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+def component_samples():
+    """
+    (family, type, help, [(labels, value)]) of the shared components,
+    read from their stats() at scrape time.
+    """
+    from hbnb.app.credential_cache import credential_cache
+    from hbnb.app.hashing import password_hasher
+    from hbnb.app.persistence.write_queue import write_queue
+    from hbnb.app.response_cache import response_cache
+    from hbnb.app.token_blocklist import token_blocklist
+    from hbnb.app.user_cache import user_cache
+
+    caches = [(labels_of(cache=name), cache.stats()) for name, cache in (
+        ("credential", credential_cache), ("user", user_cache),
+        ("response", response_cache))]
+    responses = caches[-1][1]
+    hasher = password_hasher.stats()
+    queue = write_queue.stats()
+    return [
+        ("hbnb_cache_hits_total", "counter", "Cache lookups answered",
+         [(labels, stats["hits"]) for labels, stats in caches]),
+        ("hbnb_cache_misses_total", "counter", "Cache lookups missed",
+         [(labels, stats["misses"]) for labels, stats in caches]),
+        ("hbnb_cache_entries", "gauge", "Entries held by a cache",
+         [(labels, stats["size"]) for labels, stats in caches]),
+        ("hbnb_response_cache_removals_total", "counter",
+         "Response cache entries dropped",
+         [(labels_of(reason="eviction"), responses["evictions"]),
+          (labels_of(reason="expiration"), responses["expirations"]),
+          (labels_of(reason="invalidation"), responses["invalidations"])]),
+        ("hbnb_password_hasher_workers", "gauge",
+         "Processes of the password hashing pool",
+         [("", hasher["workers"])]),
+        ("hbnb_password_hasher_pending", "gauge",
+         "Password hashing calls running or waiting",
+         [("", hasher["pending"])]),
+        ("hbnb_password_hasher_capacity", "gauge",
+         "Password hashing calls accepted before 503",
+         [("", hasher["max_pending"])]),
+        ("hbnb_revoked_tokens", "gauge", "Revoked tokens not yet expired",
+         [("", len(token_blocklist.store))]),
+        ("hbnb_write_queue_batches_total", "counter",
+         "Batches committed by the writer thread",
+         [("", queue["batches"])]),
+        ("hbnb_write_queue_operations_total", "counter",
+         "Operations run by the writer thread",
+         [("", queue["operations"])]),
+        ("hbnb_write_queue_failures_total", "counter",
+         "Operations of the writer thread that raised",
+         [("", queue["failures"])]),
+        ("hbnb_write_queue_largest_batch", "gauge",
+         "Most operations committed together",
+         [("", queue["largest_batch"])]),
+        ("hbnb_write_queue_pending", "gauge",
+         "Operations waiting for the writer thread",
+         [("", queue["pending"])]),
+    ]
+
+
+metrics = Metrics()
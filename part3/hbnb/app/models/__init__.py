@@ -33,6 +33,9 @@ place_amenity = db.Table(
         db.ForeignKey('amenities.id', ondelete='CASCADE'),
         primary_key=True,
     ),
+    # The primary key serves place -> amenities; this one serves
+    # amenity -> places (filtering places by amenity)
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id', 'place_id'),
     # Avoids "Table already defined" if create_app() is called multiple times
     # (unit tests)
     extend_existing=True,
@@ -45,6 +48,8 @@ from hbnb.app.models.user import User          # noqa: E402, F401
 from hbnb.app.models.amenity import Amenity    # noqa: E402, F401
 from hbnb.app.models.place import Place        # noqa: E402, F401
 from hbnb.app.models.review import Review      # noqa: E402, F401
+from hbnb.app.models.revoked_token import RevokedToken  # noqa: E402, F401
+from hbnb.app.models.place_change import PlaceChange  # noqa: E402, F401
  
 __all__ = [
     'db',
@@ -53,4 +58,6 @@ __all__ = [
     'Amenity',
     'Place',
     'Review',
+    'RevokedToken',
+    'PlaceChange',
 ]
\ No newline at end of file
@@ -12,15 +12,21 @@ class Amenity(BaseModel, db.Model):
     """Équipement/service disponible dans un logement."""
     __tablename__ = "amenities"
  
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Pagination keyset sur (created_at, id)
+        db.Index('ix_amenities_created_at_id', 'created_at', 'id'),
+        {"extend_existing": True},
+    )
  
     id   = db.Column(db.String(36), primary_key=True,
                      default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(255), unique=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow,
                            nullable=False)
+    # Indexé : dernière modification d'une collection (ETag)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow,
-                           onupdate=datetime.utcnow, nullable=False)
+                           onupdate=datetime.utcnow, nullable=False,
+                           index=True)
  
     # -------------------------------------------------------------------------
     # Relation Many-to-Many avec Place (via table place_amenity)
@@ -4,6 +4,7 @@ Represents a place/accommodation in the system.
 """
 from datetime import datetime
 import uuid
+from sqlalchemy import cast, func, literal_column
 from hbnb.app.models.base_model import BaseModel
 from hbnb.app import db
  
@@ -11,6 +12,15 @@ from hbnb.app import db
 class Place(BaseModel, db.Model):
     """Place model mapped with SQLAlchemy"""
     __tablename__ = "places"
+
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        # Bounding-box prefilter of geographic searches
+        db.Index('ix_places_latitude_longitude', 'latitude', 'longitude'),
+        # Price range filters
+        db.Index('ix_places_price', 'price'),
+    )
  
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(255), nullable=False)
@@ -21,8 +31,29 @@ class Place(BaseModel, db.Model):
     owner_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'),
                          nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Indexé : dernière modification d'une collection (ETag)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow,
-                           onupdate=datetime.utcnow, nullable=False)
+                           onupdate=datetime.utcnow, nullable=False,
+                           index=True)
+ 
+    # =========================================================================
+    # RATING AGGREGATES
+    # Maintained by the facade on every review create/update/delete, so
+    # listings never load the reviews to show or sort by rating.
+    # =========================================================================
+    review_count = db.Column(db.Integer, nullable=False, default=0,
+                             server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0,
+                           server_default='0')
+    rating_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+ 
+    RATINGS = (1, 2, 3, 4, 5)
+    RATING_AGGREGATES = ('review_count', 'rating_sum', 'rating_1', 'rating_2',
+                         'rating_3', 'rating_4', 'rating_5')
  
     # =========================================================================
     # RELATIONS
@@ -88,11 +119,49 @@ class Place(BaseModel, db.Model):
         self.latitude = latitude
         self.longitude = longitude
         self.owner_id = owner_id
+        # Column defaults only apply on INSERT; in-memory places need them now
+        for attr_name in self.RATING_AGGREGATES:
+            if getattr(self, attr_name) is None:
+                setattr(self, attr_name, 0)
  
  
     def __repr__(self):
         return f'<Place {self.title}>'
  
+    @property
+    def average_rating(self):
+        """Mean rating, None without reviews"""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+ 
+    @property
+    def rating_order(self):
+        """
+        Sort key of the best rated first: (-average, -review_count,
+        created_at), the average counting as 0 without reviews. Sorts
+        like RATING_ORDER (+ created_at) in SQL.
+        """
+        return (-(self.average_rating or 0.0), -(self.review_count or 0),
+                self.created_at)
+ 
+    @classmethod
+    def rating_deltas(cls, added=(), removed=()):
+        """
+        Changes to apply to the rating aggregates when reviews with the
+        `added` ratings appear and those with the `removed` ratings go.
+        """
+        deltas = {}
+        changes = [(rating, 1) for rating in added]
+        changes += [(rating, -1) for rating in removed]
+        for rating, sign in changes:
+            for attr_name, amount in (('review_count', sign),
+                                      ('rating_sum', sign * rating),
+                                      (f'rating_{rating}', sign)):
+                deltas[attr_name] = deltas.get(attr_name, 0) + amount
+        return {attr_name: amount for attr_name, amount in deltas.items()
+                if amount}
+ 
     def to_dict(self, include_owner=False, include_reviews=False, include_amenities=False):
         data = {
             'id': self.id,
@@ -102,14 +171,19 @@ class Place(BaseModel, db.Model):
             'latitude': self.latitude,
             'longitude': self.longitude,
             'owner_id': self.owner_id,
+            'review_count': self.review_count,
+            'average_rating': (round(self.average_rating, 2)
+                               if self.review_count else None),
+            'rating_histogram': {str(rating): getattr(self, f'rating_{rating}')
+                                 for rating in self.RATINGS},
             'created_at': self.created_at.isoformat() if hasattr(self, 'created_at') else None,
             'updated_at': self.updated_at.isoformat() if hasattr(self, 'updated_at') else None
         }
-        if include_owner and self.owner:
-            data['owner'] = self.owner.to_dict()
-        if include_reviews and self.reviews:
+        if include_owner:
+            data['owner'] = self.owner.to_dict() if self.owner else None
+        if include_reviews:
             data['reviews'] = [review.to_dict() for review in self.reviews]
-        if include_amenities and self.amenities:
+        if include_amenities:
             data['amenities'] = [amenity.to_dict() for amenity in self.amenities]
         return data
  
@@ -143,3 +217,17 @@ class Place(BaseModel, db.Model):
         for key, value in data.items():
             if hasattr(self, key) and key in allowed_fields:
                 setattr(self, key, value)
+        self.save()
+
+
+# sort=rating in SQL, followed by (created_at, id): the expressions are
+# indexed, so ORDER BY ... LIMIT walks ix_places_rating. Constants are
+# literal SQL rather than bound parameters, for the query expressions to
+# match the indexed ones.
+Place.RATING_ORDER = (
+    -func.coalesce(cast(Place.rating_sum, db.Float)
+                   / func.nullif(Place.review_count, literal_column('0')),
+                   literal_column('0')),
+    -Place.review_count,
+)
+db.Index('ix_places_rating', *Place.RATING_ORDER, Place.created_at, Place.id)
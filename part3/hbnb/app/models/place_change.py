@@ -0,0 +1,61 @@
+"""
+hbnb/app/models/place_change.py
+
+Log of the places added, moved or deleted, filled by triggers on the
+places table, so that every writer (another worker, the bulk loader, a
+sqlite3 shell) is logged. A process keeping the place coordinates in
+memory (see persistence/coordinate_cache.py) compares the latest seq
+with the one it synced at, then reads only the places changed since.
+Only the last LOG_SIZE changes are kept.
+"""
+from sqlalchemy import DDL, event
+from hbnb.app import db
+
+LOG_SIZE = 10000
+
+TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS tr_places_log_insert
+    AFTER INSERT ON places BEGIN
+        INSERT INTO place_changes (place_id) VALUES (NEW.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tr_places_log_move
+    AFTER UPDATE OF latitude, longitude ON places
+    WHEN NEW.latitude IS NOT OLD.latitude
+        OR NEW.longitude IS NOT OLD.longitude BEGIN
+        INSERT INTO place_changes (place_id) VALUES (NEW.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tr_places_log_delete
+    AFTER DELETE ON places BEGIN
+        INSERT INTO place_changes (place_id) VALUES (OLD.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tr_place_changes_prune
+    AFTER INSERT ON place_changes BEGIN
+        DELETE FROM place_changes WHERE seq <= NEW.seq - {LOG_SIZE};
+    END""",
+)
+
+
+class PlaceChange(db.Model):
+    """A place added, moved or deleted (see TRIGGERS)."""
+    __tablename__ = "place_changes"
+    # AUTOINCREMENT: numbers are never reused after the pruning
+    __table_args__ = {"sqlite_autoincrement": True, "extend_existing": True}
+
+    seq      = db.Column(db.Integer, primary_key=True)
+    place_id = db.Column(db.String(36), nullable=False)
+
+    def __repr__(self):
+        return f'<PlaceChange {self.seq} {self.place_id}>'
+
+
+def create_triggers(connection):
+    """Create the logging triggers (once the places table exists)."""
+    for trigger in TRIGGERS:
+        connection.execute(DDL(trigger))
+
+
+@event.listens_for(db.metadata, "after_create")
+def _create_triggers(metadata, connection, tables=(), **kw):
+    # With the log table: the places table is created by then
+    if PlaceChange.__table__ in tables:
+        create_triggers(connection)
@@ -15,6 +15,8 @@ class Review(BaseModel, db.Model):
     __table_args__ = (
         db.UniqueConstraint('user_id', 'place_id', name='uq_user_place_review'),
         db.CheckConstraint('rating >= 1 AND rating <= 5', name='ck_review_rating'),
+        # Pagination keyset sur (created_at, id)
+        db.Index('ix_reviews_created_at_id', 'created_at', 'id'),
         # extend_existing doit être dans le même tuple que les autres contraintes
         {"extend_existing": True},
     )
@@ -23,20 +25,25 @@ class Review(BaseModel, db.Model):
                          default=lambda: str(uuid.uuid4()))
     text     = db.Column(db.Text,    nullable=False)
     rating   = db.Column(db.Integer, nullable=False)
+    # Indexés : les reviews sont listées par place et par utilisateur
     user_id  = db.Column(
         db.String(36),
         db.ForeignKey('users.id',  ondelete='CASCADE'),
         nullable=False,
+        index=True,
     )
     place_id = db.Column(
         db.String(36),
         db.ForeignKey('places.id', ondelete='CASCADE'),
         nullable=False,
+        index=True,
     )
     created_at = db.Column(db.DateTime, default=datetime.utcnow,
                            nullable=False)
+    # Indexé : dernière modification d'une collection (ETag)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow,
-                           onupdate=datetime.utcnow, nullable=False)
+                           onupdate=datetime.utcnow, nullable=False,
+                           index=True)
  
     # -------------------------------------------------------------------------
     # Relations
@@ -86,10 +93,10 @@ class Review(BaseModel, db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
         }
-        if include_user and self.user:
-            data['user'] = self.user.to_dict()
-        if include_place and self.place:
-            data['place'] = self.place.to_dict()
+        if include_user:
+            data['user'] = self.user.to_dict() if self.user else None
+        if include_place:
+            data['place'] = self.place.to_dict() if self.place else None
         return data
  
     def update(self, data: dict):
@@ -0,0 +1,17 @@
+"""
+hbnb/app/models/revoked_token.py
+"""
+from hbnb.app import db
+ 
+ 
+class RevokedToken(db.Model):
+    """Jeton JWT révoqué (logout), gardé jusqu'à son expiration."""
+    __tablename__ = "revoked_tokens"
+    __table_args__ = {"extend_existing": True}
+ 
+    jti     = db.Column(db.String(36), primary_key=True)
+    # Expiration du jeton (secondes epoch, claim "exp") : purge
+    expires = db.Column(db.Integer, nullable=False, index=True)
+ 
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
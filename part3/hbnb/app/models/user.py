@@ -3,6 +3,7 @@ hbnb/app/models/user.py
 """
 import re
 import uuid
+from contextlib import nullcontext
 from datetime import datetime
  
 from hbnb.app import db
@@ -14,7 +15,11 @@ class User(BaseModel, db.Model):
     __tablename__ = "users"
  
     # Évite "Table already defined" lors de multiples appels à create_app()
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Pagination keyset sur (created_at, id)
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+        {"extend_existing": True},
+    )
  
     id = db.Column(db.String(36), primary_key=True,
                    default=lambda: str(uuid.uuid4()))
@@ -26,8 +31,10 @@ class User(BaseModel, db.Model):
     is_admin   = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow,
                            nullable=False)
+    # Indexé : dernière modification d'une collection (ETag)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow,
-                           onupdate=datetime.utcnow, nullable=False)
+                           onupdate=datetime.utcnow, nullable=False,
+                           index=True)
  
     # -------------------------------------------------------------------------
     # Relations
@@ -82,9 +89,40 @@ class User(BaseModel, db.Model):
     # Méthodes publiques
     # -------------------------------------------------------------------------
     def verify_password(self, raw_password: str) -> bool:
-        """Vérifie un mot de passe en clair contre le hash stocké."""
+        """
+        Vérifie un mot de passe en clair contre le hash stocké.
+        Une vérification réussie récente évite un nouveau bcrypt
+        (voir app/credential_cache.py). Si le hash n'est pas au coût
+        bcrypt configuré, il est recalculé en arrière-plan.
+        """
+        from hbnb.app.credential_cache import credential_cache
+        from hbnb.app.hashing import password_hasher
         from hbnb.app.utils import check_password
-        return check_password(self.password, raw_password)
+        if not credential_cache.check(self.id, self.password, raw_password):
+            if not check_password(self.password, raw_password):
+                return False
+            credential_cache.remember(self.id, self.password, raw_password)
+        if password_hasher.needs_rehash(self.password):
+            self._rehash_later(raw_password)
+        return True
+ 
+    def _rehash_later(self, raw_password: str):
+        """
+        Recalcule le hash au coût cible hors du thread de la requête,
+        puis l'enregistre s'il n'a pas changé entre-temps
+        (voir PasswordHasher.rehash_async).
+        """
+        from flask import current_app, has_app_context
+        from hbnb.app.hashing import password_hasher
+        from hbnb.app.services import facade
+        app = current_app._get_current_object() if has_app_context() else None
+        user_id, old_hash = self.id, self.password
+ 
+        def store(new_hash):
+            with app.app_context() if app else nullcontext():
+                facade.replace_password_hash(user_id, old_hash, new_hash)
+ 
+        password_hasher.rehash_async(user_id, raw_password, store)
  
     def to_dict(self) -> dict:
         """Sérialisation — le mot de passe est TOUJOURS exclu."""
@@ -112,7 +150,14 @@ class User(BaseModel, db.Model):
             if len(data['last_name']) > 50:
                 raise ValueError("Last name must not exceed 50 characters")
  
-        # email et password intentionnellement non modifiables ici
+        # Nouveau mot de passe : déjà haché par l'appelant (admin seulement,
+        # voir UserResource.put)
+        if 'password' in data:
+            if not isinstance(data['password'], str) or not data['password'].strip():
+                raise ValueError("Password is required")
+            self.password = data['password']
+ 
+        # email intentionnellement non modifiable ici
         allowed = {'first_name', 'last_name', 'is_admin'}
         for key, value in data.items():
             if key in allowed:
@@ -0,0 +1,220 @@
+"""
+Columnar cache of place coordinates for vectorized distance queries.
+
+Ranking places by distance one Place object at a time spends most of
+its time in the Python interpreter. The cache keeps every place's
+latitude and longitude in contiguous float64 arrays (already in
+radians, with cos(latitude) precomputed), so a distance filter or a
+top-k ranking over the whole catalogue is a handful of NumPy passes.
+
+The arrays are dense: a deleted place's slot is filled with the last
+one ("swap delete"), and capacity doubles when full. The facade keeps
+the cache in sync with the place inserts, updates and deletes it
+commits, and records the number of the latest coordinate change the
+repository had logged (see models/place_change.py): when another
+process has written places since, the places changed after that number
+are read again before use. Changes made while a load is in flight are
+replayed on top of it.
+PLACE_COORDINATE_CACHE = False turns the cache off.
+"""
+import threading
+
+import numpy as np
+
+from hbnb.app.geo import EARTH_RADIUS_KM, KM_PER_DEGREE_LAT
+
+
+class PlaceCoordinateCache:
+    """Contiguous lat/lon arrays of all places, keyed by place id."""
+
+    def __init__(self, capacity=1024):
+        self._lat = np.empty(capacity, dtype=np.float64)      # radians
+        self._lon = np.empty(capacity, dtype=np.float64)      # radians
+        self._cos_lat = np.empty(capacity, dtype=np.float64)
+        self._lat_deg = np.empty(capacity, dtype=np.float64)  # prefilter
+        self._ids = []      # slot -> place id
+        self._slots = {}    # place id -> slot
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # one load at a time
+        self._pending = None  # changes made while loading, to replay
+        self.loaded = False
+        self.version = None   # latest change applied (see refresh())
+        self.enabled = True
+
+    def configure(self, enabled=True):
+        """Turn the cache on or off; it is loaded again on next use."""
+        with self._lock:
+            self.enabled = enabled
+            self.loaded = False
+            self.version = None
+
+    def init_app(self, app):
+        """Read the PLACE_COORDINATE_CACHE setting of a Flask app."""
+        self.configure(app.config.get("PLACE_COORDINATE_CACHE", True))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, place_id):
+        return place_id in self._slots
+
+    def _grow(self, needed):
+        capacity = len(self._lat)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('_lat', '_lon', '_cos_lat', '_lat_deg'):
+            array = np.empty(capacity, dtype=np.float64)
+            array[:len(self._ids)] = getattr(self, name)[:len(self._ids)]
+            setattr(self, name, array)
+
+    def _write(self, slot, latitude, longitude):
+        lat = np.radians(latitude)
+        self._lat[slot] = lat
+        self._lon[slot] = np.radians(longitude)
+        self._cos_lat[slot] = np.cos(lat)
+        self._lat_deg[slot] = latitude
+
+    def load(self, rows, version=None):
+        """
+        (Re)build the cache from an iterable of (id, latitude, longitude).
+
+        Upserts and removes made while `rows` is read are applied on top
+        of it, so a write committed during the load is not lost.
+
+        Args:
+            version: Number of the latest change, read before `rows`.
+        """
+        with self._load_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                rows = list(rows)
+            except BaseException:
+                with self._lock:
+                    self._pending = None
+                raise
+            self._rebuild(rows, version)
+
+    def refresh(self, rows, version=None):
+        """
+        Apply an iterable of (id, latitude, longitude) of the places
+        changed since the last load (latitude None: deleted), and record
+        the number of the latest change, read before `rows`.
+        """
+        with self._load_lock:
+            rows = list(rows)
+            with self._lock:
+                for place_id, latitude, longitude in rows:
+                    if latitude is None:
+                        self._remove(place_id)
+                    else:
+                        self._upsert(place_id, latitude, longitude)
+                self.version = version
+
+    def _rebuild(self, rows, version):
+        with self._lock:
+            self._ids = []
+            self._grow(len(rows))
+            self._ids = [row[0] for row in rows]
+            self._slots = {place_id: slot
+                           for slot, place_id in enumerate(self._ids)}
+            if rows:
+                latitudes = np.fromiter((row[1] for row in rows),
+                                        dtype=np.float64, count=len(rows))
+                longitudes = np.fromiter((row[2] for row in rows),
+                                         dtype=np.float64, count=len(rows))
+                self._write(slice(0, len(rows)), latitudes, longitudes)
+            pending, self._pending = self._pending, None
+            for change, args in pending or ():
+                change(*args)
+            self.loaded = True
+            self.version = version
+
+    def upsert(self, place_id, latitude, longitude):
+        """Insert a place or move it to new coordinates."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(
+                    (self._upsert, (place_id, latitude, longitude)))
+            self._upsert(place_id, latitude, longitude)
+
+    def _upsert(self, place_id, latitude, longitude):
+        slot = self._slots.get(place_id)
+        if slot is None:
+            slot = len(self._ids)
+            self._grow(slot + 1)
+            self._ids.append(place_id)
+            self._slots[place_id] = slot
+        self._write(slot, latitude, longitude)
+
+    def remove(self, place_id):
+        """Drop a place; the last slot is moved into its place."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((self._remove, (place_id,)))
+            self._remove(place_id)
+
+    def _remove(self, place_id):
+        slot = self._slots.pop(place_id, None)
+        if slot is None:
+            return
+        last = len(self._ids) - 1
+        if slot != last:
+            moved = self._ids[last]
+            self._ids[slot] = moved
+            self._slots[moved] = slot
+            for array in (self._lat, self._lon,
+                          self._cos_lat, self._lat_deg):
+                array[slot] = array[last]
+        self._ids.pop()
+
+    def nearest(self, latitude, longitude, radius_km=None, limit=None):
+        """
+        Places around a point, nearest first.
+
+        Args:
+            radius_km: Keep only places within this distance (None: all).
+            limit: Keep only the `limit` nearest places (None: all).
+
+        Returns:
+            list of (place_id, distance_km) tuples
+        """
+        lat0 = np.radians(latitude)
+        lon0 = np.radians(longitude)
+        with self._lock:
+            count = len(self._ids)
+            if radius_km is None:
+                slots = np.arange(count)
+                lat, lon = self._lat[:count], self._lon[:count]
+                cos_lat = self._cos_lat[:count]
+            else:
+                # Cheap latitude band first: a point farther than
+                # radius_km in latitude alone cannot be in the circle.
+                band = radius_km / KM_PER_DEGREE_LAT
+                lat_deg = self._lat_deg[:count]
+                slots = np.flatnonzero(np.abs(lat_deg - latitude) <= band)
+                lat, lon = self._lat[slots], self._lon[slots]
+                cos_lat = self._cos_lat[slots]
+            ids = self._ids
+            # Haversine, kept as the monotonic term "h" until the end
+            h = (np.sin((lat - lat0) / 2) ** 2
+                 + np.cos(lat0) * cos_lat * np.sin((lon - lon0) / 2) ** 2)
+            if radius_km is not None:
+                h_max = np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2) ** 2
+                keep = np.flatnonzero(h <= h_max)
+                slots, h = slots[keep], h[keep]
+            if limit is not None and limit < len(h):
+                top = np.argpartition(h, limit - 1)[:limit]
+                slots, h = slots[top], h[top]
+            order = np.argsort(h, kind='stable')
+            distances = (2 * EARTH_RADIUS_KM
+                         * np.arcsin(np.sqrt(np.minimum(h[order], 1.0))))
+            return [(ids[slot], float(distance))
+                    for slot, distance in zip(slots[order].tolist(),
+                                              distances.tolist())]
@@ -0,0 +1,419 @@
+"""
+Secondary indexes for the InMemoryRepository.
+
+An index maps the value of an attribute (or, for GridIndex, a
+coordinate pair; for InvertedIndex, each item of a collection) to the
+ids of the objects holding it, so lookups do not scan the whole
+partition. Indexes remember the key they stored for each object id,
+which lets the repository re-index an object after it was mutated.
+"""
+import bisect
+import math
+from collections import deque
+from operator import itemgetter
+
+_value_of = itemgetter(0)   # value of a SortedIndex (value, obj_id) entry
+
+
+class HashIndex:
+    """Hash index on a single attribute (optionally unique)."""
+
+    def __init__(self, attr_name, unique=False):
+        """
+        Args:
+            attr_name: Name of the indexed attribute.
+            unique: If True, two objects may not share the same value.
+        """
+        self.attr_name = attr_name
+        self.unique = unique
+        self._entries = {}   # value -> {obj_id: None} (insertion ordered)
+        self._keys = {}      # obj_id -> indexed value
+
+    @property
+    def name(self):
+        return self.attr_name
+
+    @property
+    def attributes(self):
+        """Attributes the index depends on."""
+        return (self.attr_name,)
+
+    def key_of(self, obj):
+        """Return the value indexed for obj."""
+        return getattr(obj, self.attr_name, None)
+
+    def check(self, obj):
+        """Raise ValueError if inserting obj would break uniqueness."""
+        if not self.unique:
+            return
+        key = self.key_of(obj)
+        if key is None:
+            return
+        for obj_id in self._entries.get(key, ()):
+            if obj_id != obj.id:
+                raise ValueError(
+                    f"Duplicate value for unique index '{self.attr_name}': "
+                    f"{key!r}")
+
+    def insert(self, obj):
+        """Index obj under its current attribute value."""
+        key = self.key_of(obj)
+        if key is None:
+            return
+        self._entries.setdefault(key, {})[obj.id] = None
+        self._keys[obj.id] = key
+
+    def remove(self, obj_id):
+        """Drop whatever entry obj_id currently has in the index."""
+        if obj_id not in self._keys:
+            return
+        key = self._keys.pop(obj_id)
+        bucket = self._entries.get(key)
+        if bucket is not None:
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del self._entries[key]
+
+    def lookup(self, value):
+        """Return the ids of the objects whose attribute equals value."""
+        try:
+            return list(self._entries.get(value, ()))
+        except TypeError:
+            # Unhashable value: nothing can have been indexed under it
+            return []
+
+
+class SortedIndex:
+    """
+    Ordered index on a single attribute.
+
+    Entries are kept sorted as (value, obj_id) tuples, so walking the
+    index in order is also a walk in (value, id) keyset order. Objects
+    whose value is None are not indexed.
+    """
+
+    unique = False
+
+    def __init__(self, attr_name):
+        self.attr_name = attr_name
+        self._entries = []   # sorted [(value, obj_id)]
+        self._keys = {}      # obj_id -> indexed value
+
+    @property
+    def name(self):
+        return self.attr_name
+
+    @property
+    def attributes(self):
+        """Attributes the index depends on."""
+        return (self.attr_name,)
+
+    def key_of(self, obj):
+        """Return the value indexed for obj."""
+        return getattr(obj, self.attr_name, None)
+
+    def check(self, obj):
+        """Sorted indexes accept duplicate values."""
+
+    def insert(self, obj):
+        """Index obj under its current attribute value."""
+        key = self.key_of(obj)
+        if key is None:
+            return
+        bisect.insort(self._entries, (key, obj.id))
+        self._keys[obj.id] = key
+
+    def remove(self, obj_id):
+        """Drop whatever entry obj_id currently has in the index."""
+        if obj_id not in self._keys:
+            return
+        entry = (self._keys.pop(obj_id), obj_id)
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def lookup(self, value):
+        """Return the ids of the objects whose attribute equals value."""
+        ids = []
+        try:
+            position = bisect.bisect_left(self._entries, (value,))
+        except TypeError:
+            # Not comparable with the indexed values: no match possible
+            return ids
+        while (position < len(self._entries)
+               and self._entries[position][0] == value):
+            ids.append(self._entries[position][1])
+            position += 1
+        return ids
+
+    def after(self, after=None, limit=None):
+        """
+        Return up to limit ids in (value, id) order.
+
+        Args:
+            after: (value, obj_id) keyset position to resume from
+                   (exclusive). None starts from the beginning.
+            limit: Maximum number of ids, None for no limit.
+        """
+        start = 0 if after is None else bisect.bisect_right(
+            self._entries, tuple(after))
+        stop = len(self._entries) if limit is None else start + limit
+        return [obj_id for _, obj_id in self._entries[start:stop]]
+
+    def last(self):
+        """Highest indexed value, or None if the index is empty."""
+        return self._entries[-1][0] if self._entries else None
+
+    def _span(self, low=None, high=None):
+        """Positions of the entries with low <= value <= high."""
+        start = 0 if low is None else bisect.bisect_left(
+            self._entries, low, key=_value_of)
+        stop = len(self._entries) if high is None else bisect.bisect_right(
+            self._entries, high, key=_value_of)
+        return start, max(start, stop)
+
+    def count_between(self, low=None, high=None):
+        """Number of objects with low <= value <= high (None: unbounded)."""
+        start, stop = self._span(low, high)
+        return stop - start
+
+    def between(self, low=None, high=None):
+        """Ids of the objects with low <= value <= high, in value order."""
+        start, stop = self._span(low, high)
+        return [obj_id for _, obj_id in self._entries[start:stop]]
+
+
+class ChangeLog:
+    """
+    Numbered log of the objects whose attributes changed, for readers
+    keeping a copy of them (e.g. the place coordinate cache): they catch
+    up from the last number they saw. Only the last `size` changes are
+    kept.
+
+    The partition removes an object before every re-index, so remove()
+    logs nothing: the repository reports deletions with deleted().
+    """
+
+    unique = False
+
+    def __init__(self, *attr_names, size=10000):
+        self.attr_names = attr_names
+        self.seq = 0                       # number of the latest change
+        self._changes = deque(maxlen=size)  # (seq, obj_id)
+        self._keys = {}                    # obj_id -> values last logged
+
+    @property
+    def name(self):
+        return f"changes({','.join(self.attr_names)})"
+
+    @property
+    def attributes(self):
+        """Attributes the index depends on."""
+        return self.attr_names
+
+    def key_of(self, obj):
+        """Return the tracked values of obj."""
+        return tuple(getattr(obj, attr_name, None)
+                     for attr_name in self.attr_names)
+
+    def check(self, obj):
+        """Any change may be logged."""
+
+    def _log(self, obj_id):
+        self.seq += 1
+        self._changes.append((self.seq, obj_id))
+
+    def insert(self, obj):
+        """Log obj if it is new or its tracked values changed."""
+        key = self.key_of(obj)
+        if self._keys.get(obj.id) != key:
+            self._keys[obj.id] = key
+            self._log(obj.id)
+
+    def remove(self, obj_id):
+        """Followed by insert() on a re-index: see deleted()."""
+
+    def deleted(self, obj_id):
+        """Log the deletion of obj_id."""
+        if self._keys.pop(obj_id, None) is not None:
+            self._log(obj_id)
+
+    def since(self, seq):
+        """
+        Ids changed after change number seq, or None if the log no
+        longer goes back that far.
+        """
+        if self._changes and self._changes[0][0] > seq + 1:
+            return None
+        ids = {}
+        for change, obj_id in reversed(self._changes):
+            if change <= seq:
+                break
+            ids[obj_id] = None
+        return list(ids)
+
+
+class InvertedIndex:
+    """
+    Inverted index on a collection attribute.
+
+    Each object appears in the posting list of every item of its
+    collection, keyed by the items' `item_key` attribute (e.g. the
+    places of each amenity id). Posting lists are dicts, so testing
+    whether an object is in one is O(1) when intersecting them.
+    """
+
+    unique = False
+
+    def __init__(self, attr_name, item_key="id"):
+        self.attr_name = attr_name
+        self.item_key = item_key
+        self._postings = {}  # item key -> {obj_id: None}
+        self._keys = {}      # obj_id -> frozenset of item keys
+
+    @property
+    def name(self):
+        return self.attr_name
+
+    @property
+    def attributes(self):
+        """Attributes the index depends on."""
+        return (self.attr_name,)
+
+    def key_of(self, obj):
+        """Return the keys of the items in obj's collection."""
+        items = getattr(obj, self.attr_name, None) or ()
+        return frozenset(getattr(item, self.item_key) for item in items)
+
+    def check(self, obj):
+        """Several objects may share an item."""
+
+    def insert(self, obj):
+        """Add obj to the posting list of each of its items."""
+        key = self.key_of(obj)
+        for value in key:
+            self._postings.setdefault(value, {})[obj.id] = None
+        self._keys[obj.id] = key
+
+    def remove(self, obj_id):
+        """Drop obj_id from all the posting lists it is in."""
+        for value in self._keys.pop(obj_id, ()):
+            posting = self._postings.get(value)
+            if posting is not None:
+                posting.pop(obj_id, None)
+                if not posting:
+                    del self._postings[value]
+
+    def postings(self, value):
+        """Posting list (dict keyed by obj_id) of an item key."""
+        return self._postings.get(value, {})
+
+    def lookup(self, value):
+        """Return the ids of the objects whose collection holds value."""
+        try:
+            return list(self.postings(value))
+        except TypeError:
+            return []
+
+
+class GridIndex:
+    """
+    Spatial grid index on a (latitude, longitude) pair of attributes.
+
+    The globe is cut into square cells of `cell_deg` degrees; each cell
+    holds the ids of the objects located in it. A bounding-box query
+    only visits the cells overlapping the box, and the caller refines
+    the candidates with the exact coordinates.
+    """
+
+    unique = False
+
+    def __init__(self, lat_attr="latitude", lon_attr="longitude",
+                 cell_deg=0.5):
+        self.lat_attr = lat_attr
+        self.lon_attr = lon_attr
+        self.cell_deg = cell_deg
+        self._cells = {}   # (row, col) -> {obj_id: None}
+        self._keys = {}    # obj_id -> (row, col)
+
+    @property
+    def name(self):
+        return f"grid:{self.lat_attr},{self.lon_attr}"
+
+    @property
+    def attributes(self):
+        """Attributes the index depends on."""
+        return (self.lat_attr, self.lon_attr)
+
+    def _row(self, latitude):
+        return math.floor(latitude / self.cell_deg)
+
+    def _col(self, longitude):
+        return math.floor(longitude / self.cell_deg)
+
+    def key_of(self, obj):
+        """Return the cell of obj, None if it has no coordinates."""
+        latitude = getattr(obj, self.lat_attr, None)
+        longitude = getattr(obj, self.lon_attr, None)
+        if latitude is None or longitude is None:
+            return None
+        return self._row(latitude), self._col(longitude)
+
+    def check(self, obj):
+        """Several objects may share a cell."""
+
+    def insert(self, obj):
+        """Index obj in the cell of its current coordinates."""
+        key = self.key_of(obj)
+        if key is None:
+            return
+        self._cells.setdefault(key, {})[obj.id] = None
+        self._keys[obj.id] = key
+
+    def remove(self, obj_id):
+        """Drop whatever entry obj_id currently has in the index."""
+        if obj_id not in self._keys:
+            return
+        key = self._keys.pop(obj_id)
+        cell = self._cells.get(key)
+        if cell is not None:
+            cell.pop(obj_id, None)
+            if not cell:
+                del self._cells[key]
+
+    def _col_ranges(self, min_lon, max_lon):
+        """Column ranges of a longitude span (two if it crosses 180°)."""
+        if min_lon <= max_lon:
+            return [(self._col(min_lon), self._col(max_lon))]
+        return [(self._col(min_lon), self._col(180.0)),
+                (self._col(-180.0), self._col(max_lon))]
+
+    def candidates(self, min_lat, max_lat, min_lon, max_lon):
+        """
+        Return the ids of the objects in cells overlapping the box.
+
+        min_lon > max_lon describes a box crossing the antimeridian.
+        Results are a superset of the box content: cells on the border
+        also hold objects just outside of it.
+        """
+        rows = (self._row(min_lat), self._row(max_lat))
+        col_ranges = self._col_ranges(min_lon, max_lon)
+        wanted = (rows[1] - rows[0] + 1) * sum(
+            last - first + 1 for first, last in col_ranges)
+
+        if wanted > len(self._cells):
+            # Large box: cheaper to filter the occupied cells
+            keys = [key for key in self._cells
+                    if rows[0] <= key[0] <= rows[1]
+                    and any(first <= key[1] <= last
+                            for first, last in col_ranges)]
+        else:
+            keys = [(row, col)
+                    for row in range(rows[0], rows[1] + 1)
+                    for first, last in col_ranges
+                    for col in range(first, last + 1)]
+
+        ids = []
+        for key in keys:
+            ids.extend(self._cells.get(key, ()))
+        return ids
@@ -0,0 +1,278 @@
+"""
+Offline bulk loader for seed and staging data.
+
+Streams CSV or NDJSON files straight into the schema, without building
+ORM objects: rows are read lazily, converted to the column types and
+inserted in chunks with one executemany per chunk. During a load:
+
+- foreign keys are checked once, at commit (PRAGMA defer_foreign_keys),
+  so files can be loaded in any order and rows may reference each
+  other;
+- secondary (non-unique) indexes are dropped and rebuilt at the end,
+  one sorted build instead of a B-tree update per row;
+- plain-text passwords are bcrypt-hashed a chunk at a time through
+  the `hash_passwords` callable (e.g. PasswordHasher.hash_many, which
+  spreads them over a process pool).
+
+Everything runs on the caller's connection and transaction: nothing is
+committed here.
+"""
+import csv
+import itertools
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+# Supported seed file extensions
+FORMATS = (".csv", ".ndjson", ".jsonl")
+
+# Columns holding passwords, hashed on load unless already bcrypt hashes
+PASSWORD_COLUMNS = {"users": "password"}
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+_TRUE = {"1", "true", "t", "yes", "y"}
+# Start of an INSERT statement, after blank and "--" comment lines
+_INSERT = re.compile(r"^((?:\s*--[^\n]*\n)*\s*)INSERT\s+INTO\b",
+                     re.IGNORECASE)
+
+
+def read_rows(path):
+    """
+    Yield the rows of a CSV (header line) or NDJSON file as dicts.
+
+    Raises:
+        ValueError: unknown extension or invalid JSON line.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(
+            f"{path}: unsupported format (expected {', '.join(FORMATS)})")
+    with open(path, newline="", encoding="utf-8") as source:
+        if extension == ".csv":
+            yield from csv.DictReader(source)
+            return
+        for number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON ({e.msg})")
+
+
+def sql_statements(path):
+    """Yield the statements of an SQL script, one at a time."""
+    statement = ""
+    with open(path, encoding="utf-8") as source:
+        for line in source:
+            statement += line
+            if sqlite3.complete_statement(statement):
+                yield statement.strip()
+                statement = ""
+    if statement.strip():
+        yield statement.strip()
+
+
+def _converter(column):
+    """Function turning a (non-empty) file value into the column type."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if python_type is bool:
+        return lambda value: (value if isinstance(value, bool)
+                              else str(value).strip().lower() in _TRUE)
+    if python_type is datetime:
+        return datetime.fromisoformat
+    if python_type in (int, float, str):
+        return python_type
+    return None
+
+
+def _default(column):
+    """Zero-argument function giving the column's Python-side default."""
+    default = column.default
+    if default is None:
+        return None
+    if default.is_callable:
+        return lambda: default.arg(None)
+    if default.is_scalar:
+        return lambda: default.arg
+    return None
+
+
+class BulkLoader:
+    """Chunked executemany loader for the tables of a MetaData."""
+
+    def __init__(self, connection, metadata, chunk_size=10000,
+                 hash_passwords=None, on_conflict="abort"):
+        """
+        Args:
+            connection: SQLAlchemy Connection (its transaction is used).
+            metadata: MetaData describing the tables.
+            chunk_size: Rows per executemany.
+            hash_passwords: Function hashing a list of plain-text
+                            passwords, None to store them as given.
+            on_conflict: "abort" or "ignore" (skip rows whose primary
+                         key or unique value is already taken).
+        """
+        if on_conflict not in ("abort", "ignore"):
+            raise ValueError("on_conflict must be 'abort' or 'ignore'")
+        self.connection = connection
+        self.metadata = metadata
+        self.chunk_size = chunk_size
+        self.hash_passwords = hash_passwords
+        self.on_conflict = on_conflict
+
+    def table_for(self, path):
+        """Table named like the file (users.csv -> users)."""
+        name = os.path.splitext(os.path.basename(path))[0]
+        table = self.metadata.tables.get(name)
+        if table is None:
+            raise ValueError(
+                f"{path}: no table named '{name}' "
+                f"(expected one of {', '.join(sorted(self.metadata.tables))})")
+        return table
+
+    def ordered(self, paths):
+        """Sort files parents first (users before places...)."""
+        order = {table.name: position for position, table
+                 in enumerate(self.metadata.sorted_tables)}
+        return sorted(paths, key=lambda path: order[self.table_for(path).name])
+
+    @contextmanager
+    def deferred_checks(self, tables):
+        """
+        Defer foreign key checks to commit and drop the non-unique
+        indexes of `tables` until the block exits.
+        """
+        if self.connection.dialect.name == "sqlite":
+            if not self.connection.connection.dbapi_connection.in_transaction:
+                # pysqlite only opens a transaction before DML: open it
+                # now, or the pragma and the index DDL would autocommit
+                self.connection.exec_driver_sql("BEGIN")
+            self.connection.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+        indexes = [index for table in tables for index in table.indexes
+                   if not index.unique]
+        # IF [NOT] EXISTS rather than checkfirst: SQLite reflection does
+        # not see expression indexes (ix_places_rating)
+        for index in indexes:
+            self.connection.execute(DropIndex(index, if_exists=True))
+        yield
+        for index in indexes:
+            self.connection.execute(CreateIndex(index, if_not_exists=True))
+
+    def _insert(self, table, keys):
+        """INSERT of the `keys` columns, compiled once for the whole load."""
+        statement = insert(table)
+        if self.on_conflict == "ignore":
+            statement = statement.prefix_with("OR IGNORE", dialect="sqlite")
+        return statement.compile(dialect=self.connection.dialect,
+                                 column_keys=keys)
+
+    def _plan(self, table, first):
+        """
+        Columns loaded (the file's, plus those with a Python-side
+        default) and a function building their typed values from a row.
+
+        Returns:
+            (columns, build): build(row, number) -> list of values
+        """
+        unknown = set(first) - {column.name for column in table.columns}
+        if unknown:
+            raise ValueError(f"Unknown {table.name} columns: "
+                             f"{', '.join(sorted(unknown))}")
+        columns = [column for column in table.columns
+                   if column.name in first or column.default is not None]
+        fields = [(column.name if column.name in first else None,
+                   _converter(column), _default(column))
+                  for column in columns]
+
+        def build(row, number):
+            values = []
+            for name, convert, default in fields:
+                value = row.get(name) if name is not None else None
+                if value is None or value == "":
+                    value = default() if default else None
+                elif convert is not None:
+                    try:
+                        value = convert(value)
+                    except (TypeError, ValueError) as e:
+                        raise ValueError(
+                            f"{table.name} row {number}, {name}: {e}")
+                values.append(value)
+            return values
+
+        return columns, build
+
+    def _hash_passwords(self, chunk, position):
+        """Hash the plain-text passwords at `position` in the chunk rows."""
+        plain = [values for values in chunk if values[position]
+                 and not values[position].startswith(BCRYPT_PREFIXES)]
+        if not plain:
+            return
+        hashed = self.hash_passwords([values[position] for values in plain])
+        for values, value in zip(plain, hashed):
+            values[position] = value
+
+    def load_rows(self, table, rows):
+        """Insert rows (iterable of dicts) into table, returns the count."""
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        columns, build = self._plan(table, first)
+        keys = [column.name for column in columns]
+        compiled = self._insert(table, keys)
+        dialect = self.connection.dialect
+        # The driver gets the rows directly: apply the types' bind
+        # processors (e.g. datetime -> SQLite string) ourselves
+        processors = [(position, processor)
+                      for position, processor in enumerate(
+                          column.type.dialect_impl(dialect)
+                          .bind_processor(dialect) for column in columns)
+                      if processor is not None]
+        password = None
+        if self.hash_passwords is not None \
+                and PASSWORD_COLUMNS.get(table.name) in keys:
+            password = keys.index(PASSWORD_COLUMNS[table.name])
+        if compiled.positional:
+            order = [keys.index(name) for name in compiled.positiontup]
+        numbered = enumerate(itertools.chain([first], rows), 1)
+        count = 0
+        while True:
+            chunk = [build(row, number) for number, row
+                     in itertools.islice(numbered, self.chunk_size)]
+            if not chunk:
+                return count
+            if password is not None:
+                self._hash_passwords(chunk, password)
+            for position, process in processors:
+                for values in chunk:
+                    values[position] = process(values[position])
+            if compiled.positional:
+                params = [tuple(values[i] for i in order) for values in chunk]
+            else:
+                params = [dict(zip(keys, values)) for values in chunk]
+            self.connection.exec_driver_sql(str(compiled), params)
+            count += len(chunk)
+
+    def load_file(self, path):
+        """Load a CSV / NDJSON file into its table, returns the count."""
+        return self.load_rows(self.table_for(path), read_rows(path))
+
+    def load_sql(self, path):
+        """Run the statements of an SQL script, returns their count."""
+        count = 0
+        for statement in sql_statements(path):
+            if self.on_conflict == "ignore":
+                statement = _INSERT.sub(r"\1INSERT OR IGNORE INTO", statement)
+            self.connection.exec_driver_sql(statement)
+            count += 1
+        return count
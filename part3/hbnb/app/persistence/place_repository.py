@@ -0,0 +1,297 @@
+"""
+Place repositories: the generic repositories plus geographic search
+and price / amenity filtering.
+"""
+from sqlalchemy import func, or_, select, tuple_, update
+
+from hbnb.app.geo import in_bbox
+from hbnb.app.persistence.indexes import (
+    ChangeLog, GridIndex, InvertedIndex, SortedIndex)
+from hbnb.app.persistence.repository import (
+    InMemoryRepository, SQLAlchemyRepository)
+
+
+def _in_price_range(place, min_price, max_price):
+    return ((min_price is None or place.price >= min_price)
+            and (max_price is None or place.price <= max_price))
+
+
+def _check_sort(sort):
+    if sort not in (None, 'rating'):
+        raise ValueError("sort must be: rating")
+
+
+def _keyset_of(place, sort=None):
+    """
+    Keyset position of a place: (created_at, id), or with sort='rating'
+    (-average, -review_count, created_at, id) (see Place.rating_order).
+    """
+    if sort == 'rating':
+        return (*place.rating_order, place.id)
+    return (place.created_at, place.id)
+
+
+class RatingIndex(SortedIndex):
+    """Sorted index on Place.rating_order, i.e. in sort=rating order."""
+
+    def __init__(self):
+        super().__init__('rating_order')
+
+    @property
+    def attributes(self):
+        """Attributes the index depends on."""
+        return ('review_count', 'rating_sum', 'created_at')
+
+    def after(self, after=None, limit=None):
+        """Ids in sort=rating order after a _keyset_of(place, 'rating')."""
+        if after is not None:
+            after = (tuple(after[:-1]), after[-1])
+        return super().after(after, limit)
+
+
+class InMemoryPlaceRepository(InMemoryRepository):
+    """
+    In-memory place repository with a spatial grid index, a sorted
+    price index and amenity -> places posting lists
+    """
+
+    def __init__(self, model=None, indexes=()):
+        super().__init__(model, indexes)
+        self._grid = self._partition.add_index(
+            GridIndex('latitude', 'longitude'))
+        self._price = self._partition.add_index(SortedIndex('price'))
+        self._amenities = self._partition.add_index(
+            InvertedIndex('amenities'))
+        self._rating = self._partition.add_index(RatingIndex())
+        self._coordinate_changes = self._partition.add_index(
+            ChangeLog('latitude', 'longitude'))
+
+    def delete(self, obj_id):
+        """Delete a place and log it in the coordinate changes"""
+        super().delete(obj_id)
+        self._coordinate_changes.deleted(obj_id)
+
+    def reindex(self, place_id):
+        """Refresh the index entries of a place mutated in place
+        (e.g. its amenities), outside of update()"""
+        place = self.get(place_id)
+        if place:
+            self._index(place)
+
+    def find_in_bbox(self, min_lat, max_lat, min_lon, max_lon):
+        """
+        Get the places inside a lat/lon box.
+
+        Only the grid cells overlapping the box are visited; their
+        places are then checked against the exact box.
+        min_lon > max_lon describes a box crossing the antimeridian.
+        """
+        places = (self._storage[obj_id] for obj_id in
+                  self._grid.candidates(min_lat, max_lat, min_lon, max_lon))
+        return [place for place in places
+                if in_bbox(place.latitude, place.longitude,
+                           min_lat, max_lat, min_lon, max_lon)]
+
+    def get_coordinates_version(self):
+        """Number of the latest coordinate change (see ChangeLog)"""
+        return self._coordinate_changes.seq
+
+    def find_coordinate_changes(self, since):
+        """
+        (id, latitude, longitude) of the places added, moved or deleted
+        (latitude and longitude None) after change number `since`, or
+        None if the log no longer goes back that far.
+        """
+        ids = self._coordinate_changes.since(since or 0)
+        if ids is None:
+            return None
+        changes = []
+        for place_id in ids:
+            place = self._storage.get(place_id)
+            changes.append((place_id, place.latitude, place.longitude)
+                           if place is not None else (place_id, None, None))
+        return changes
+
+    def find_filtered(self, min_price=None, max_price=None, amenity_ids=(),
+                      limit=None, after=None, eager=(), sort=None):
+        """
+        Get the places within a price range that have all the amenities,
+        in (created_at, id) order, or best rated first with sort='rating'.
+
+        The amenity posting lists are intersected smallest first; the
+        price range is answered from the sorted price index when it is
+        more selective than the smallest posting list. Without filters,
+        the rating index is walked from the keyset position.
+
+        Args:
+            limit, after: Optional keyset page (see Repository.get_page),
+                          `after` being a _keyset_of(place, sort).
+            eager: Eager-load spec (see Repository).
+            sort: None or 'rating'.
+        """
+        _check_sort(sort)
+        if (sort == 'rating' and not amenity_ids
+                and min_price is None and max_price is None):
+            return [self._storage[place_id]
+                    for place_id in self._rating.after(after, limit)]
+
+        postings = sorted((self._amenities.postings(amenity_id)
+                           for amenity_id in set(amenity_ids)), key=len)
+        by_price = min_price is not None or max_price is not None
+        in_range = (self._price.count_between(min_price, max_price)
+                    if by_price else None)
+
+        if postings and (in_range is None or len(postings[0]) <= in_range):
+            ids = postings[0]
+            others = postings[1:]
+            check_price = by_price
+        elif by_price:
+            ids = self._price.between(min_price, max_price)
+            others = postings
+            check_price = False
+        else:
+            ids = self._storage
+            others = ()
+            check_price = False
+
+        places = []
+        for place_id in ids:
+            if not all(place_id in posting for posting in others):
+                continue
+            place = self._storage[place_id]
+            if check_price and not _in_price_range(place, min_price, max_price):
+                continue
+            places.append(place)
+
+        places.sort(key=lambda place: _keyset_of(place, sort))
+        if after is not None:
+            after = tuple(after)
+            places = [place for place in places
+                      if _keyset_of(place, sort) > after]
+        return places if limit is None else places[:limit]
+
+
+class SQLAlchemyPlaceRepository(SQLAlchemyRepository):
+    """SQLAlchemy place repository with indexed range search"""
+
+    def find_in_bbox(self, min_lat, max_lat, min_lon, max_lon):
+        """
+        Get the places inside a lat/lon box.
+
+        Range predicates on latitude/longitude are answered from the
+        (latitude, longitude) index. min_lon > max_lon describes a box
+        crossing the antimeridian.
+        """
+        model = self.model
+        if min_lon <= max_lon:
+            lon_filter = model.longitude.between(min_lon, max_lon)
+        else:
+            lon_filter = or_(model.longitude >= min_lon,
+                             model.longitude <= max_lon)
+        return model.query.filter(
+            model.latitude.between(min_lat, max_lat), lon_filter).all()
+
+    def get_coordinates_version(self):
+        """
+        Number of the latest change logged in place_changes (by the
+        triggers of the places table, whoever wrote): the end of the
+        primary key, not a scan.
+        """
+        from hbnb.app import db
+        from hbnb.app.models import PlaceChange
+        return db.session.scalar(select(func.max(PlaceChange.seq)))
+
+    def find_coordinate_changes(self, since):
+        """
+        (id, latitude, longitude) of the places added, moved or deleted
+        (latitude and longitude None) after change number `since`, or
+        None if the log was pruned past it.
+        """
+        from hbnb.app import db
+        from hbnb.app.models import PlaceChange
+        since = since or 0
+        oldest = db.session.scalar(select(func.min(PlaceChange.seq)))
+        if oldest is not None and oldest > since + 1:
+            return None
+        changed = (select(PlaceChange.place_id)
+                   .where(PlaceChange.seq > since).distinct().subquery())
+        model = self.model
+        rows = db.session.execute(
+            select(changed.c.place_id, model.latitude, model.longitude)
+            .outerjoin(model, model.id == changed.c.place_id))
+        return [tuple(row) for row in rows]
+
+    def reindex(self, place_id):
+        """The database maintains its indexes itself"""
+
+    def rebuild_rating_aggregates(self):
+        """
+        Recompute the rating aggregates of every place from its reviews,
+        in one UPDATE with correlated subqueries (e.g. after the columns
+        were added to an existing database). Not committed.
+        """
+        from hbnb.app import db
+        from hbnb.app.models import Review
+
+        model = self.model
+
+        def per_place(column, *criteria):
+            return (select(column)
+                    .where(Review.place_id == model.id, *criteria)
+                    .scalar_subquery())
+
+        values = {
+            'review_count': per_place(func.count(Review.id)),
+            'rating_sum': per_place(func.coalesce(func.sum(Review.rating), 0)),
+        }
+        for rating in model.RATINGS:
+            values[f'rating_{rating}'] = per_place(
+                func.count(Review.id), Review.rating == rating)
+        db.session.execute(update(model).values(values))
+
+    def find_filtered(self, min_price=None, max_price=None, amenity_ids=(),
+                      limit=None, after=None, eager=(), sort=None):
+        """
+        Get the places within a price range that have all the amenities,
+        in (created_at, id) order, or best rated first with sort='rating'.
+
+        Compiles to a single query: price range on ix_places_price, then
+        a JOIN on place_amenity grouped by place, keeping the places
+        that matched every requested amenity (HAVING COUNT = n). The
+        rating order is Place.RATING_ORDER, read from ix_places_rating.
+
+        Args:
+            limit, after: Optional keyset page (see Repository.get_page),
+                          `after` being a _keyset_of(place, sort).
+            eager: Eager-load spec (see Repository).
+            sort: None or 'rating'.
+        """
+        from hbnb.app.models import place_amenity
+
+        _check_sort(sort)
+        model = self.model
+        order = (model.created_at, model.id)
+        if sort == 'rating':
+            order = (*model.RATING_ORDER, *order)
+        query = model.query.options(*self._eager_options(eager))
+        if min_price is not None:
+            query = query.filter(model.price >= min_price)
+        if max_price is not None:
+            query = query.filter(model.price <= max_price)
+        amenity_ids = set(amenity_ids)
+        if amenity_ids:
+            query = (query
+                     .join(place_amenity, place_amenity.c.place_id == model.id)
+                     .filter(place_amenity.c.amenity_id.in_(amenity_ids))
+                     .group_by(model.id)
+                     .having(func.count(place_amenity.c.amenity_id)
+                             == len(amenity_ids)))
+        if after is not None:
+            # The bound on the first key alone lets SQLite seek in the
+            # index; the row value then skips the rest of the position
+            query = query.filter(order[0] >= after[0],
+                                 tuple_(*order) > tuple(after))
+        query = query.order_by(*order)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
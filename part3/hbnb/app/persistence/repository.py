@@ -4,22 +4,69 @@ Supports both in-memory and SQLAlchemy-based persistence.
 """
 from abc import ABC, abstractmethod
 
-# Global storage for InMemoryRepository (persists across instances)
+from sqlalchemy import func, insert, inspect, select, tuple_, update
+from sqlalchemy.orm import joinedload, selectinload
+
+from hbnb.app.persistence.indexes import SortedIndex
+
+# Global storage for InMemoryRepository (persists across instances).
+# One partition per model class: {model: _Partition}
 _GLOBAL_STORAGE = {}
 
+
+class _Partition:
+    """Objects of one model plus the secondary indexes declared on them."""
+
+    def __init__(self):
+        self.objects = {}   # obj_id -> obj
+        self.indexes = {}   # index name -> index
+
+    def add_index(self, index):
+        """Register an index (once per name) and fill it with existing objects."""
+        if index.name in self.indexes:
+            return self.indexes[index.name]
+        for obj in self.objects.values():
+            index.check(obj)
+            index.insert(obj)
+        self.indexes[index.name] = index
+        return index
+
+
+def _get_partition(model):
+    """Return the storage partition of a model, creating it on first use."""
+    return _GLOBAL_STORAGE.setdefault(model, _Partition())
+
+
 class Repository(ABC):
-    """Abstract base repository interface"""
+    """
+    Abstract base repository interface
+    
+    Read methods taking `eager` accept an eager-load spec: names of the
+    model's relationships the caller is about to traverse. The database
+    backend loads them with the objects (selectinload for collections,
+    joinedload for many-to-one) instead of one lazy query per object.
+    """
     
     @abstractmethod
     def add(self, obj):
         pass
     
     @abstractmethod
-    def get(self, obj_id):
+    def add_many(self, objs):
+        """Add several objects at once"""
         pass
     
     @abstractmethod
-    def get_all(self):
+    def get(self, obj_id, eager=()):
+        pass
+    
+    @abstractmethod
+    def get_all(self, eager=()):
+        pass
+    
+    @abstractmethod
+    def get_many(self, obj_ids, eager=()):
+        """Get the objects with the given ids, in that order (missing skipped)"""
         pass
     
     @abstractmethod
@@ -30,55 +77,233 @@ class Repository(ABC):
     def delete(self, obj_id):
         pass
     
+    @abstractmethod
+    def delete_many(self, obj_ids):
+        """Delete the objects with the given ids (missing ones skipped)"""
+        pass
+    
+    @abstractmethod
+    def increment(self, obj_id, deltas):
+        """
+        Add deltas ({attr_name: amount}) to numeric attributes of an
+        object, atomically.
+        """
+        pass
+    
     @abstractmethod
     def get_by_attribute(self, attr_name, attr_value):
         pass
+    
+    @abstractmethod
+    def find_by(self, **criteria):
+        """Get every object whose attributes equal all the criteria"""
+        pass
+    
+    @abstractmethod
+    def get_page(self, limit, after=None, eager=()):
+        """
+        Get up to `limit` objects in (created_at, id) order, starting
+        strictly after the `after` (created_at, id) keyset position.
+        """
+        pass
+    
+    @abstractmethod
+    def iter_all(self, batch_size=1000):
+        """
+        Iterate over every object in (created_at, id) order, holding at
+        most about `batch_size` of them in memory at a time.
+        """
+        pass
+    
+    @abstractmethod
+    def get_version(self, obj_id):
+        """updated_at of an object (None if missing), without loading it"""
+        pass
+    
+    @abstractmethod
+    def get_collection_version(self):
+        """(count, latest updated_at) of all objects, without loading them"""
+        pass
 
 
 class InMemoryRepository(Repository):
     """In-memory repository implementation with global storage"""
     
-    def __init__(self):
-        """Initialize with global storage"""
+    def __init__(self, model=None, indexes=()):
+        """
+        Initialize repository on the global partition of a model.
+        
+        Args:
+            model: Model class stored by this repository. Repositories
+                   sharing the same model share the same partition.
+            indexes: Secondary indexes (see persistence.indexes) to
+                     maintain on the partition. An index already
+                     declared under the same name is reused.
+        """
         # Use global storage instead of instance storage
         # This ensures data persists across different repository instances
-        pass
+        self.model = model
+        self._partition = _get_partition(model)
+        self._storage = self._partition.objects
+        # Keyset order used by get_page()
+        self._partition.add_index(SortedIndex('created_at'))
+        # Latest change, for get_collection_version()
+        self._partition.add_index(SortedIndex('updated_at'))
+        for index in indexes:
+            self._partition.add_index(index)
+    
+    def _index(self, obj):
+        """(Re)index obj in every secondary index of the partition"""
+        indexes = self._partition.indexes.values()
+        for index in indexes:
+            index.check(obj)
+        for index in indexes:
+            index.remove(obj.id)
+            index.insert(obj)
+    
+    def _unindex(self, obj_id):
+        """Drop obj_id from every secondary index of the partition"""
+        for index in self._partition.indexes.values():
+            index.remove(obj_id)
     
     def add(self, obj):
-        """Add object to global storage"""
-        _GLOBAL_STORAGE[obj.id] = obj
+        """Add object to its model partition"""
+        self._index(obj)
+        self._storage[obj.id] = obj
+    
+    def add_many(self, objs):
+        """Add objects to the model partition"""
+        for obj in objs:
+            self.add(obj)
     
-    def get(self, obj_id):
-        """Get object by ID from global storage"""
-        return _GLOBAL_STORAGE.get(obj_id)
+    def get(self, obj_id, eager=()):
+        """Get object by ID from the model partition"""
+        return self._storage.get(obj_id)
     
-    def get_all(self):
-        """Get all objects from global storage"""
-        return list(_GLOBAL_STORAGE.values())
+    def get_all(self, eager=()):
+        """Get all objects of the model partition"""
+        return list(self._storage.values())
+    
+    def get_many(self, obj_ids, eager=()):
+        """Get the objects with the given ids, in that order"""
+        storage = self._storage
+        return [storage[obj_id] for obj_id in obj_ids if obj_id in storage]
     
     def update(self, obj_id, data):
-        """Update object in global storage"""
+        """Update object in the model partition"""
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            # Everything update() may change, to undo a rejected update
+            attr_names = {attr_name
+                          for index in self._partition.indexes.values()
+                          for attr_name in index.attributes}
+            attr_names.update(attr_name for attr_name in data
+                              if hasattr(obj, attr_name))
+            attr_names.add('updated_at')
+            previous = {attr_name: getattr(obj, attr_name, None)
+                        for attr_name in attr_names}
+            try:
+                obj.update(data)
+                self._index(obj)
+            except ValueError:
+                # Keep the object and its index entries as they were
+                for attr_name, value in previous.items():
+                    setattr(obj, attr_name, value)
+                raise
             return obj
         return None
     
     def delete(self, obj_id):
-        """Delete object from global storage"""
-        if obj_id in _GLOBAL_STORAGE:
-            del _GLOBAL_STORAGE[obj_id]
+        """Delete object from the model partition"""
+        if self._storage.pop(obj_id, None) is not None:
+            self._unindex(obj_id)
+    
+    def delete_many(self, obj_ids):
+        """Delete objects from the model partition"""
+        for obj_id in obj_ids:
+            self.delete(obj_id)
+    
+    def increment(self, obj_id, deltas):
+        """Add deltas to numeric attributes of an object"""
+        obj = self.get(obj_id)
+        if obj is None:
+            return
+        for attr_name, amount in deltas.items():
+            setattr(obj, attr_name, (getattr(obj, attr_name) or 0) + amount)
+        # Like the UPDATE of the database backend (onupdate)
+        obj.save()
+        self._index(obj)
     
     def get_by_attribute(self, attr_name, attr_value):
-        """Get object by attribute from global storage"""
-        for obj in _GLOBAL_STORAGE.values():
+        """Get object by attribute from the model partition"""
+        index = self._partition.indexes.get(attr_name)
+        if index is not None:
+            for obj_id in index.lookup(attr_value):
+                return self._storage[obj_id]
+            return None
+        for obj in self._storage.values():
             if getattr(obj, attr_name, None) == attr_value:
                 return obj
         return None
+    
+    def find_by(self, **criteria):
+        """
+        Get all objects matching every criterion (attribute == value).
+        
+        Candidates come from the smallest posting list among the indexed
+        criteria; only the remaining criteria are checked per object. The
+        whole partition is scanned only if no criterion is indexed.
+        """
+        candidates = None
+        for attr_name, value in criteria.items():
+            index = self._partition.indexes.get(attr_name)
+            if index is None:
+                continue
+            ids = index.lookup(value)
+            if candidates is None or len(ids) < len(candidates):
+                candidates = ids
+        if candidates is None:
+            objects = self._storage.values()
+        else:
+            objects = [self._storage[obj_id] for obj_id in candidates]
+        return [obj for obj in objects
+                if all(getattr(obj, attr_name, None) == value
+                       for attr_name, value in criteria.items())]
+    
+    def get_page(self, limit, after=None, eager=()):
+        """Get a page of objects by walking the created_at sorted index"""
+        index = self._partition.indexes['created_at']
+        return [self._storage[obj_id] for obj_id in index.after(after, limit)]
+    
+    def iter_all(self, batch_size=1000):
+        """Iterate page by page, so objects added meanwhile are not missed"""
+        after = None
+        while True:
+            page = self.get_page(batch_size, after)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = (page[-1].created_at, page[-1].id)
+    
+    def get_version(self, obj_id):
+        """updated_at of an object (None if missing)"""
+        obj = self._storage.get(obj_id)
+        return obj.updated_at if obj is not None else None
+    
+    def get_collection_version(self):
+        """(count, latest updated_at), the latter from the sorted index"""
+        return (len(self._storage),
+                self._partition.indexes['updated_at'].last())
 
 
 class SQLAlchemyRepository(Repository):
-    """SQLAlchemy-based repository implementation"""
+    """
+    SQLAlchemy-based repository implementation
+    
+    Writes are only flushed: they are sent within the current database
+    transaction, which the caller commits once per unit of work (see
+    persistence.unit_of_work).
+    """
     
     def __init__(self, model):
         """
@@ -89,22 +314,70 @@ class SQLAlchemyRepository(Repository):
         """
         self.model = model
     
+    def _eager_options(self, eager):
+        """Loader options of an eager-load spec (relationship names)"""
+        options = []
+        for name in eager:
+            relationship = getattr(self.model, name)
+            if relationship.property.uselist:
+                # One extra SELECT ... WHERE fk IN (...) per collection
+                options.append(selectinload(relationship))
+            else:
+                # Many-to-one: LEFT OUTER JOIN in the same query
+                options.append(joinedload(relationship))
+        return options
+    
     def add(self, obj):
         """Add an object to the database"""
         # Import db locally to avoid circular import
         from hbnb.app import db
         db.session.add(obj)
-        db.session.commit()
+        db.session.flush()
+    
+    def add_many(self, objs):
+        """
+        Insert objects with a bulk (executemany / multi-row VALUES)
+        INSERT instead of one unit-of-work flush per object.
+        
+        The objects are not attached to the session: every column
+        value, defaults included, must already be set on them.
+        """
+        # Import db locally to avoid circular import
+        from hbnb.app import db
+        objs = list(objs)
+        if not objs:
+            return
+        # Core insert on the table: no ORM bulk bookkeeping per row.
+        # The objects are new, so every value set on them is in their
+        # instance dict; reading it skips the attribute instrumentation.
+        columns = [(attr.key, attr.columns[0].key)
+                   for attr in inspect(self.model).column_attrs]
+        db.session.execute(
+            insert(self.model.__table__),
+            [{column: values.get(key) for key, column in columns}
+             for values in map(vars, objs)])
     
-    def get(self, obj_id):
+    def get(self, obj_id, eager=()):
         """Get an object by ID"""
         # Import db locally to avoid circular import
         from hbnb.app import db
-        return db.session.get(self.model, obj_id)
+        return db.session.get(self.model, obj_id,
+                              options=self._eager_options(eager))
     
-    def get_all(self):
+    def get_all(self, eager=()):
         """Get all objects"""
-        return self.model.query.all()
+        return self.model.query.options(*self._eager_options(eager)).all()
+    
+    def get_many(self, obj_ids, eager=(), chunk_size=500):
+        """Get the objects with the given ids, in that order"""
+        obj_ids = list(obj_ids)
+        query = self.model.query.options(*self._eager_options(eager))
+        found = {}
+        for start in range(0, len(obj_ids), chunk_size):
+            chunk = obj_ids[start:start + chunk_size]
+            for obj in query.filter(self.model.id.in_(chunk)):
+                found[obj.id] = obj
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
     
     def update(self, obj_id, data):
         """Update an object with new data"""
@@ -112,9 +385,9 @@ class SQLAlchemyRepository(Repository):
         from hbnb.app import db
         obj = self.get(obj_id)
         if obj:
-            for key, value in data.items():
-                setattr(obj, key, value)
-            db.session.commit()
+            # Go through the model so its validations apply
+            obj.update(data)
+            db.session.flush()
             return obj
         return None
     
@@ -125,8 +398,78 @@ class SQLAlchemyRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            db.session.flush()
+    
+    def delete_many(self, obj_ids):
+        """Delete objects with a single flush (batched DELETE statements)"""
+        # Import db locally to avoid circular import
+        from hbnb.app import db
+        for obj in self.get_many(obj_ids):
+            db.session.delete(obj)
+        db.session.flush()
+    
+    def increment(self, obj_id, deltas):
+        """
+        Add deltas with a single UPDATE ... SET col = col + amount, so
+        concurrent increments never overwrite each other
+        """
+        # Import db locally to avoid circular import
+        from hbnb.app import db
+        model = self.model
+        db.session.execute(
+            update(model).where(model.id == obj_id).values(
+                {getattr(model, attr_name): getattr(model, attr_name) + amount
+                 for attr_name, amount in deltas.items()}),
+            execution_options={'synchronize_session': False})
+        obj = db.session.identity_map.get(
+            db.session.identity_key(model, obj_id))
+        if obj is not None:
+            # Reload the new values on next access
+            db.session.expire(obj, list(deltas))
     
     def get_by_attribute(self, attr_name, attr_value):
         """Get an object by a specific attribute"""
         return self.model.query.filter_by(**{attr_name: attr_value}).first()
+    
+    def find_by(self, **criteria):
+        """Get all objects matching every criterion (WHERE ... AND ...)"""
+        return self.model.query.filter_by(**criteria).all()
+    
+    def get_page(self, limit, after=None, eager=()):
+        """
+        Get a page of objects with a keyset (seek) query.
+        
+        Uses a row-value comparison on (created_at, id) so the database
+        seeks in the composite index instead of skipping OFFSET rows.
+        """
+        query = (self.model.query.options(*self._eager_options(eager))
+                 .order_by(self.model.created_at, self.model.id))
+        if after is not None:
+            query = query.filter(
+                tuple_(self.model.created_at, self.model.id) > tuple(after))
+        return query.limit(limit).all()
+    
+    def iter_all(self, batch_size=1000):
+        """
+        Stream the table with a server-side cursor (yield_per): rows are
+        fetched and turned into objects `batch_size` at a time.
+        """
+        from hbnb.app import db
+        stmt = (select(self.model)
+                .order_by(self.model.created_at, self.model.id)
+                .execution_options(yield_per=batch_size))
+        yield from db.session.scalars(stmt)
+    
+    def get_version(self, obj_id):
+        """updated_at of an object (None if missing): one column by key"""
+        from hbnb.app import db
+        return db.session.scalar(
+            select(self.model.updated_at).where(self.model.id == obj_id))
+    
+    def get_collection_version(self):
+        """(count, latest updated_at), answered from the indexes"""
+        from hbnb.app import db
+        count, latest = db.session.execute(
+            select(func.count(), func.max(self.model.updated_at))
+            .select_from(self.model)).one()
+        return count, latest
@@ -0,0 +1,186 @@
+"""
+Read/write routing between the primary database and a read replica.
+
+When the app has a replica bind (SQLALCHEMY_BINDS[REPLICA_BIND], e.g.
+DATABASE_REPLICA_URL), the queries of the facade's read methods (the
+get_* family, marked with @reads) go to the replica; everything else
+uses the primary: writes and flushes, reads inside a unit of work or a
+write operation (@writes), and lazy loads made later by the handlers.
+
+Read-your-writes: once a session (a request) has written, its reads
+stay on the primary. The caller who wrote also keeps reading from the
+primary for REPLICA_STICKY_SECONDS, in the following requests, so a
+lagging replica never hides their own changes; the window should be
+longer than the replication lag. It is per process: several workers
+need sticky load balancing, or a window short enough to tolerate.
+
+Objects loaded from the replica share the session's identity map with
+the writes: a write operation expires them first, so that it checks and
+changes the primary's state (e.g. whether an amenity is already linked
+to a place), never a lagging copy.
+
+Other callers may read data older than the primary by the replication
+lag, and the response cache can keep such a read until its TTL; the
+process-wide caches without a TTL (user_cache.py) skip such reads.
+"""
+import threading
+import time
+import weakref
+from functools import wraps
+
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+from hbnb.app.persistence.unit_of_work import in_transaction
+
+# Keys kept on session.info (per request / thread)
+_READ_KEY = "routing_reads"         # depth of @reads calls
+_WRITE_KEY = "routing_writes"       # depth of @writes calls
+_WROTE_KEY = "routing_wrote"        # the session wrote: primary only
+_STICKY_KEY = "routing_sticky"      # the caller wrote recently
+_LOADED_KEY = "routing_loaded"      # objects loaded from the replica
+
+
+class RoutingSession(Session):
+    """Session sending the queries of @reads calls to the replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            replica = self.replica()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind,
+                                **kwargs)
+
+    def replica(self):
+        """The replica engine if a query made now would use it, else None."""
+        if (self.info.get(_READ_KEY) and not self.info.get(_WRITE_KEY)
+                and not self._flushing and not in_transaction(self)):
+            return replica_router.replica_for(self)
+        return None
+
+    def expire_replica_loads(self):
+        """Expire the objects loaded from the replica: their next access
+        reloads them (from the primary during a write)."""
+        loaded = self.info.pop(_LOADED_KEY, None)
+        for instance in loaded or ():
+            if instance in self:
+                self.expire(instance)
+
+
+@event.listens_for(RoutingSession, "loaded_as_persistent")
+def _track_replica_load(session, instance):
+    if session.replica() is not None:
+        session.info.setdefault(_LOADED_KEY, weakref.WeakSet()).add(instance)
+
+
+def _caller_id():
+    """User id of the request's token, None if anonymous."""
+    if not has_request_context():
+        return None
+    identity = g.get('identity')
+    if identity is not None:
+        return identity.user_id
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+class ReplicaRouter:
+    """Replica engine lookup and the read-your-writes windows."""
+
+    def __init__(self, bind_key="replica", sticky_seconds=5):
+        self._lock = threading.Lock()
+        self._recent_writers = {}           # user id -> window end
+        self.configure(bind_key, sticky_seconds)
+
+    def configure(self, bind_key="replica", sticky_seconds=5):
+        """Change the settings; the windows are dropped."""
+        with self._lock:
+            self.bind_key = bind_key
+            self.sticky_seconds = sticky_seconds
+            self._recent_writers.clear()
+
+    def init_app(self, app):
+        """Read the REPLICA_BIND / REPLICA_STICKY_SECONDS settings."""
+        self.configure(app.config.get("REPLICA_BIND", "replica"),
+                       app.config.get("REPLICA_STICKY_SECONDS", 5))
+
+    def replica_for(self, session):
+        """The replica engine for a session's read, or None (primary)."""
+        replica = session._db.engines.get(self.bind_key)
+        if replica is None or session.info.get(_WROTE_KEY):
+            return None
+        sticky = session.info.get(_STICKY_KEY)
+        if sticky is None:
+            # Reading the caller's token may query the blocklist: on the
+            # primary, while the answer is not known
+            session.info[_STICKY_KEY] = True
+            sticky = session.info[_STICKY_KEY] = self._wrote_recently()
+        return None if sticky else replica
+
+    def _wrote_recently(self):
+        with self._lock:
+            if not self._recent_writers:
+                return False
+        user_id = _caller_id()
+        with self._lock:
+            return self._recent_writers.get(user_id, 0) > time.monotonic()
+
+    def wrote(self, session):
+        """A write succeeded: stick the session and its caller to the primary."""
+        session.info[_WROTE_KEY] = True
+        user_id = _caller_id()
+        if user_id is None or not self.sticky_seconds:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {
+                    key: end for key, end in self._recent_writers.items()
+                    if end > now}
+            self._recent_writers[user_id] = now + self.sticky_seconds
+
+
+replica_router = ReplicaRouter()
+
+
+def _count(session, key, step):
+    session.info[key] = session.info.get(key, 0) + step
+
+
+def reads(method):
+    """Decorator: the queries of method may be served by the replica."""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        from hbnb.app import db
+        session = db.session()
+        _count(session, _READ_KEY, 1)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _count(session, _READ_KEY, -1)
+    return wrapper
+
+
+def writes(method):
+    """Decorator: method writes; its reads and the caller's next ones
+    use the primary, and the objects read from the replica are expired."""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        from hbnb.app import db
+        session = db.session()
+        if not session.info.get(_WRITE_KEY):
+            session.expire_replica_loads()
+        _count(session, _WRITE_KEY, 1)
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            _count(session, _WRITE_KEY, -1)
+        replica_router.wrote(session)
+        return result
+    return wrapper
@@ -0,0 +1,57 @@
+"""
+Per-connection SQLite settings.
+
+SQLite keeps most settings (PRAGMAs) per connection, so they are set on
+every new connection of the app's engine, from the SQLITE_PRAGMAS
+setting. The production profile (see config.py) is tuned for threaded
+workers sharing one database file:
+
+- journal_mode=WAL: readers no longer block the writer, nor the writer
+  the readers (the mode is stored in the file, set once);
+- synchronous=NORMAL: in WAL mode, fsync at checkpoints only; a power
+  loss may drop the last commits but never corrupts the database;
+- busy_timeout: wait for the write lock instead of failing at once
+  with "database is locked";
+- cache_size, mmap_size, temp_store: more pages cached per connection,
+  reads through the OS page cache, temporary tables in memory.
+
+A read replica (see persistence/routing.py) gets the same settings plus
+query_only; a SQLite file refreshed with copy_database() can stand in
+for a real replica.
+"""
+import sqlite3
+
+from sqlalchemy import event
+
+
+def apply_pragmas(engine, pragmas):
+    """
+    Run PRAGMA name = value for each item on every new connection
+    (of a SQLite engine, sync or the sync_engine of an async one).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = dict(pragmas)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def copy_database(engine, path):
+    """
+    Copy the database of a SQLite engine into the file at path, with
+    the online backup API: consistent, and safe while both are in use.
+    """
+    source = engine.raw_connection()
+    try:
+        target = sqlite3.connect(path)
+        try:
+            source.driver_connection.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
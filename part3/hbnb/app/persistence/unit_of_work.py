@@ -0,0 +1,99 @@
+"""
+Unit of work for the SQLAlchemy backend.
+
+Repository writes only flush: their statements run inside the current
+database transaction, but nothing is committed. `transaction()` marks
+the boundaries of a unit of work: a multi-step operation (deleting a
+place and its reviews, creating a review and updating its place...)
+commits once when the outermost block exits, or is rolled back as a
+whole if an exception escapes it. Nested blocks simply join the
+enclosing unit, so helpers can open one without knowing their caller.
+
+Side effects that must only happen once the data is committed (cache
+invalidations...) are registered with `after_commit()`; `savepoint()`
+lets one step of a unit fail alone (see persistence.write_queue).
+`async_transaction()` is the same unit of work on an AsyncSession (see
+app/aio).
+"""
+from contextlib import asynccontextmanager, contextmanager
+
+# Nesting depth, kept on the session so it is per request/thread
+_DEPTH_KEY = "unit_of_work_depth"
+# (callback, args) to run after the outermost commit
+_CALLBACKS_KEY = "unit_of_work_after_commit"
+
+
+@contextmanager
+def transaction(session):
+    """Run the block as (part of) a unit of work on session."""
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+    except BaseException:
+        if depth == 0:
+            session.rollback()
+            session.info.pop(_CALLBACKS_KEY, None)
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+    if depth == 0:
+        for callback, args in session.info.pop(_CALLBACKS_KEY, []):
+            callback(*args)
+
+
+@asynccontextmanager
+async def async_transaction(session):
+    """transaction() for an AsyncSession: commit and rollback are awaited."""
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            await session.commit()
+    except BaseException:
+        if depth == 0:
+            await session.rollback()
+            session.info.pop(_CALLBACKS_KEY, None)
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+    if depth == 0:
+        for callback, args in session.info.pop(_CALLBACKS_KEY, []):
+            callback(*args)
+
+
+def in_transaction(session):
+    """True inside a transaction() block."""
+    return session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def after_commit(session, callback, *args):
+    """
+    Call callback(*args) once the current unit of work is committed
+    (right away outside one); dropped if it is rolled back.
+    """
+    if in_transaction(session):
+        session.info.setdefault(_CALLBACKS_KEY, []).append((callback, args))
+    else:
+        callback(*args)
+
+
+@contextmanager
+def savepoint(session):
+    """
+    Run the block in a SAVEPOINT of the current unit of work: if it
+    raises, only its own changes and after_commit callbacks are undone.
+    """
+    callbacks = session.info.setdefault(_CALLBACKS_KEY, [])
+    mark = len(callbacks)
+    nested = session.begin_nested()
+    try:
+        yield session
+    except BaseException:
+        nested.rollback()
+        del callbacks[mark:]
+        raise
+    nested.commit()
@@ -0,0 +1,214 @@
+"""
+Single writer thread for SQLite, with group commit.
+
+SQLite lets one connection write at a time. When every request thread
+commits its own writes, concurrent POST/PUT requests pile up on the
+database lock: each one sleeps and retries (busy_timeout), then pays
+for its own commit. With WRITE_QUEUE on, the facade's write operations
+are handed to one writer thread instead:
+
+- the writer takes the queued operations in batches (up to
+  WRITE_QUEUE_BATCH of them, waiting at most WRITE_QUEUE_DELAY_MS for
+  more) and runs a batch as one unit of work; on SQLite it starts with
+  BEGIN IMMEDIATE, so the lock is taken once per batch;
+- each operation runs in its own SAVEPOINT: one that raises is rolled
+  back alone, and its caller gets the exception;
+- the batch is committed once, its after_commit callbacks (cache
+  invalidations) run, then every caller gets its result.
+
+Callers block on a Future, so the facade API is unchanged; returned
+model objects are merged into the caller's session, expired as after
+any commit. The writer is per process: with several worker processes,
+the database lock still serializes their batches.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+
+from sqlalchemy import inspect, text
+
+from hbnb.app.persistence.unit_of_work import (
+    in_transaction, savepoint, transaction)
+
+_STOP = object()
+
+
+def _adopt(session, result):
+    """Merge the model objects of a result into the caller's session."""
+    if isinstance(result, (list, tuple)):
+        return type(result)(_adopt(session, item) for item in result)
+    state = inspect(result, raiseerr=False)
+    if getattr(state, "key", None) is not None:
+        return session.merge(result, load=False)
+    return result
+
+
+class WriteQueue:
+    """Runs write operations on one thread, committed in groups."""
+
+    def __init__(self, max_batch=64, max_delay=0.002, max_pending=1024):
+        """
+        Args:
+            max_batch: Operations committed together at most.
+            max_delay: Seconds a batch waits for more operations.
+            max_pending: Queued operations before submit() blocks.
+        """
+        self._thread = None
+        self._pending = None
+        self._stats_lock = threading.Lock()
+        self.configure(max_batch, max_delay, max_pending)
+
+    def configure(self, max_batch=64, max_delay=0.002, max_pending=1024):
+        """Change the batching settings; counters are reset."""
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0, max_delay)
+        self.max_pending = max_pending
+        with self._stats_lock:
+            self.batches = 0
+            self.operations = 0
+            self.failures = 0
+            self.largest_batch = 0
+
+    def init_app(self, app):
+        """
+        Read the WRITE_QUEUE* settings of a Flask app and start its
+        writer if WRITE_QUEUE is set (any previous writer is stopped).
+        """
+        self.shutdown()
+        self.configure(app.config.get("WRITE_QUEUE_BATCH", 64),
+                       app.config.get("WRITE_QUEUE_DELAY_MS", 2) / 1000,
+                       app.config.get("WRITE_QUEUE_SIZE", 1024))
+        if app.config.get("WRITE_QUEUE"):
+            self.start(app)
+
+    @property
+    def running(self):
+        """True while a writer thread is started."""
+        return self._thread is not None
+
+    def start(self, app):
+        """Start the writer thread of app."""
+        self._pending = queue.Queue(self.max_pending)
+        self._thread = threading.Thread(
+            target=self._run, args=(app, self._pending),
+            name="hbnb-writer", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """Run the operations already queued, then stop the writer."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._pending.put(_STOP)
+            thread.join()
+
+    def submit(self, function, *args, **kwargs):
+        """Queue function(*args, **kwargs); returns a Future of its result."""
+        future = Future()
+        self._pending.put((future, function, args, kwargs))
+        return future
+
+    def routed(self, method):
+        """
+        Decorator: run method on the writer thread while it is started.
+        Calls made by the writer itself, or inside an open unit of work
+        (which must commit as a whole), run in place.
+        """
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not self._should_queue():
+                return method(*args, **kwargs)
+            from hbnb.app import db
+            # End the caller's read transaction: its pooled connection
+            # must not be held while waiting for the writer
+            db.session.commit()
+            result = self.submit(method, *args, **kwargs).result()
+            return _adopt(db.session, result)
+        return wrapper
+
+    def _should_queue(self):
+        thread = self._thread
+        if thread is None or threading.current_thread() is thread:
+            return False
+        from hbnb.app import db
+        return not in_transaction(db.session)
+
+    def stats(self):
+        """Batch counters and current queue length."""
+        with self._stats_lock:
+            return {"batches": self.batches, "operations": self.operations,
+                    "failures": self.failures,
+                    "largest_batch": self.largest_batch,
+                    "pending": self._pending.qsize() if self._pending else 0}
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self, app, pending):
+        while True:
+            batch = self._next_batch(pending)
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                self._commit_batch(app, batch)
+            if stop:
+                return
+
+    def _next_batch(self, pending):
+        """Wait for one operation, then gather more for up to max_delay."""
+        batch = [pending.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch and batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(pending.get(timeout=timeout))
+                else:
+                    batch.append(pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit_batch(self, app, batch):
+        """Run a batch as one unit of work, then resolve its futures."""
+        from hbnb.app import db
+        done, failures = [], 0
+        with app.app_context():
+            session = db.session()
+            try:
+                with transaction(session):
+                    if session.get_bind().dialect.name == "sqlite":
+                        # pysqlite would only BEGIN at the first write,
+                        # after the SAVEPOINTs: take the lock up front
+                        session.execute(text("BEGIN IMMEDIATE"))
+                    for future, function, args, kwargs in batch:
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        try:
+                            with savepoint(session):
+                                result = function(*args, **kwargs)
+                            done.append((future, result))
+                        except Exception as error:
+                            failures += 1
+                            future.set_exception(error)
+            except Exception as error:
+                # The batch could not be committed: nothing of it is stored
+                done = []
+                for future, *_ in batch:
+                    if not future.done():
+                        failures += 1
+                        future.set_exception(error)
+        # The session is closed: results are detached, safe to hand over
+        for future, result in done:
+            future.set_result(result)
+        with self._stats_lock:
+            self.batches += 1
+            self.operations += len(batch)
+            self.failures += failures
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+
+write_queue = WriteQueue()
@@ -0,0 +1,144 @@
+"""
+Read-through cache of serialized public GET responses.
+
+GET /places/<id>, its amenities and reviews, /amenities/ and
+/users/<id> are read far more often than the data behind them changes.
+Their JSON bodies are kept in an LRU with a TTL, each entry tagged with
+the entities it was built from (e.g. ("place", id), ("amenity", id)).
+
+Invalidation is by version: every tag has the number of the last write
+that touched it (HBnBFacade calls invalidate() after each create,
+update and delete), and an entry is only served if none of its tags
+was written since the entry was built. A write racing with the read
+that builds an entry therefore cannot leave a stale entry behind.
+The versions are swept once there are more of them than entries: the
+stale and expired entries are dropped, and the versions forgotten,
+bodies built before the sweep being refused by put().
+
+Like the other in-process caches, it only sees writes made through this
+process's facade: RESPONSE_CACHE_SIZE = 0 turns it off for deployments
+with several writer processes.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Bounded LRU of key -> serialized body, with TTL and tag versions."""
+
+    def __init__(self, max_entries=4096, ttl=300):
+        """
+        Args:
+            max_entries: Entries kept, least recently used evicted first
+                         (0 disables the cache).
+            ttl: Seconds an entry stays valid.
+        """
+        self._entries = OrderedDict()  # key -> (body, tags, built, expires)
+        self._versions = {}  # tag -> number of the last write touching it
+        self._clock = 0
+        self._floor = 0      # bodies built before it are refused (sweep)
+        self._lock = threading.Lock()
+        self.configure(max_entries, ttl)
+
+    def configure(self, max_entries=4096, ttl=300):
+        """Change the settings; entries and counters are reset."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self._entries.clear()
+            self._versions.clear()
+            self._floor = self._clock
+            self.hits = self.misses = 0
+            self.evictions = self.expirations = self.invalidations = 0
+
+    def init_app(self, app):
+        """Read the RESPONSE_CACHE_* settings of a Flask app."""
+        self.configure(app.config.get("RESPONSE_CACHE_SIZE", 4096),
+                       app.config.get("RESPONSE_CACHE_TTL", 300))
+
+    def generation(self):
+        """Write number to pass to put() for a body built from now on."""
+        with self._lock:
+            return self._clock
+
+    def _stale(self, tags, built):
+        return any(self._versions.get(tag, 0) > built for tag in tags)
+
+    def get(self, key):
+        """The cached body, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                body, tags, built, expires = entry
+                if expires <= time.monotonic():
+                    del self._entries[key]
+                    self.expirations += 1
+                elif self._stale(tags, built):
+                    del self._entries[key]
+                    self.invalidations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+            self.misses += 1
+            return None
+
+    def put(self, key, body, tags, built):
+        """
+        Store a body built from the tagged entities, unless one of them
+        was written after generation `built`.
+        """
+        if not self.max_entries:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if built < self._floor or self._stale(tags, built):
+                return
+            self._entries[key] = (body, tags, built,
+                                  time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        """Record a write to the entities named by tags."""
+        with self._lock:
+            self._clock += 1
+            for tag in tags:
+                self._versions[tag] = self._clock
+            if len(self._versions) > self.max_entries:
+                self._sweep()
+
+    def _sweep(self):
+        """
+        Drop the expired and stale entries, then forget the versions:
+        none of the remaining entries is older than them, and bodies
+        built before now are refused. Amortized over the max_entries
+        writes it takes to fill the versions again.
+        """
+        now = time.monotonic()
+        for key, (_, tags, built, expires) in list(self._entries.items()):
+            if expires <= now:
+                del self._entries[key]
+                self.expirations += 1
+            elif self._stale(tags, built):
+                del self._entries[key]
+                self.invalidations += 1
+        self._versions.clear()
+        self._floor = self._clock
+
+    def stats(self):
+        """Counters, hit rate and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "evictions": self.evictions,
+                    "expirations": self.expirations,
+                    "invalidations": self.invalidations,
+                    "size": len(self._entries)}
+
+
+response_cache = ResponseCache()
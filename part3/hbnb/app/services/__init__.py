@@ -3,9 +3,10 @@ Services package initializer.
 Provides a singleton facade instance.
 """
 
+from hbnb.app.metrics import FACADE_CALLS, metrics
 from hbnb.app.services.facade import HBnBFacade
 
-# Singleton instance
-facade = HBnBFacade()
+# Singleton instance, its calls timed on GET /metrics
+facade = metrics.instrument(HBnBFacade(), FACADE_CALLS)
 
 __all__ = ["facade", "HBnBFacade"]
\ No newline at end of file
@@ -3,8 +3,20 @@ Facade layer connecting API and business logic.
 Supports both in-memory and database persistence.
 """
 import os
+from contextlib import contextmanager
+from hbnb.app.credential_cache import credential_cache
+from hbnb.app.geo import MAX_RADIUS_KM, bounding_box, haversine_km
+from hbnb.app.metrics import REPOSITORY_CALLS, metrics
 from hbnb.app.models import User, Place, Review, Amenity
 from hbnb.app.persistence import get_repository
+from hbnb.app.persistence.coordinate_cache import PlaceCoordinateCache
+from hbnb.app.persistence.indexes import HashIndex
+from hbnb.app.persistence.routing import reads, writes
+from hbnb.app.persistence.unit_of_work import (
+    after_commit, in_transaction, savepoint, transaction)
+from hbnb.app.persistence.write_queue import write_queue
+from hbnb.app.response_cache import response_cache
+from hbnb.app.user_cache import user_cache
 from sqlalchemy.exc import IntegrityError
  
 # Determine which repository to use based on environment
@@ -12,73 +24,273 @@ USE_DATABASE = os.getenv('USE_DATABASE', 'false').lower() == 'true'
  
 if USE_DATABASE:
     from hbnb.app.persistence.repository import SQLAlchemyRepository as RepositoryClass
+    from hbnb.app.persistence.place_repository import SQLAlchemyPlaceRepository as PlaceRepositoryClass
     print("Using SQLAlchemy Repository")
 else:
     from hbnb.app.persistence.repository import InMemoryRepository as RepositoryClass
+    from hbnb.app.persistence.place_repository import InMemoryPlaceRepository as PlaceRepositoryClass
     print("Using InMemory Repository")
  
  
+def _read(method):
+    """Read operation: may use the read replica (persistence/routing.py)"""
+    return reads(method) if USE_DATABASE else method
+ 
+ 
+def _write(method):
+    """
+    Write operation: on the primary, through the writer thread when
+    WRITE_QUEUE is on (persistence/write_queue.py)
+    """
+    return writes(write_queue.routed(method)) if USE_DATABASE else method
+ 
+ 
+def _reads_replica():
+    """True if the current read is served by the read replica"""
+    if USE_DATABASE:
+        from hbnb.app import db
+        return db.session().replica() is not None
+    return False
+ 
+
+def _after_commit(callback, *args):
+    """Call callback(*args) once the current unit of work is committed"""
+    if USE_DATABASE:
+        from hbnb.app import db
+        after_commit(db.session, callback, *args)
+    else:
+        callback(*args)
+ 
+ 
 class HBnBFacade:
     def __init__(self):
         """Initialize repositories based on configuration"""
+        self.user_repo = self._make_repository(
+            User, HashIndex('email', unique=True))
+        self.place_repo = self._make_repository(
+            Place, repository_class=PlaceRepositoryClass)
+        self.review_repo = self._make_repository(
+            Review, HashIndex('place_id'), HashIndex('user_id'))
+        self.amenity_repo = self._make_repository(
+            Amenity, HashIndex('name', unique=True))
+        self.place_coordinates = PlaceCoordinateCache()
+ 
+    @staticmethod
+    def _make_repository(model, *indexes, repository_class=None):
+        """
+        Build the repository of a model.
+ 
+        Secondary indexes only apply to the in-memory backend: the
+        database maintains its own (see the models' column options).
+        The facade's calls to it are timed on GET /metrics.
+        """
+        repository_class = repository_class or RepositoryClass
         if USE_DATABASE:
-            self.user_repo = RepositoryClass(User)
-            self.place_repo = RepositoryClass(Place)
-            self.review_repo = RepositoryClass(Review)
-            self.amenity_repo = RepositoryClass(Amenity)
+            repository = repository_class(model)
         else:
-            self.user_repo = RepositoryClass()
-            self.place_repo = RepositoryClass()
-            self.review_repo = RepositoryClass()
-            self.amenity_repo = RepositoryClass()
+            repository = repository_class(model, indexes=indexes)
+        return metrics.instrument(repository, REPOSITORY_CALLS,
+                                  model=model.__name__.lower())
  
     # =========================
     # UTILS
     # =========================
  
     def save(self):
-        """Sauvegarder les changements en base"""
+        """Sauvegarder les changements en base (hors unit of work)"""
         if USE_DATABASE:
             from hbnb.app import db
-            db.session.commit()
+            if not in_transaction(db.session):
+                db.session.commit()
+ 
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: repository writes made inside the block are
+        committed once, when the outermost block exits, or all rolled
+        back if it raises (see persistence.unit_of_work). The in-memory
+        backend applies changes immediately and has nothing to commit.
+        """
+        if not USE_DATABASE:
+            yield
+            return
+        from hbnb.app import db
+        with transaction(db.session):
+            yield
+ 
+    @staticmethod
+    def _validate_bulk(items, build):
+        """
+        Build the objects of a bulk request one by one; an invalid item
+        is reported and skipped without aborting the others.
+ 
+        Args:
+            items: list of dicts (the request payload).
+            build: callable(item) -> model object, raising ValueError.
+ 
+        Returns:
+            (created, errors): [(index, obj)], [(index, message)]
+        """
+        created, errors = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append((index, "Item must be an object"))
+                continue
+            try:
+                created.append((index, build(item)))
+            except ValueError as e:
+                errors.append((index, str(e)))
+        return created, errors
+ 
+    @contextmanager
+    def _savepoint(self):
+        """
+        savepoint() of the SQL backend; the in-memory one checks its
+        constraints before writing, there is nothing to undo.
+        """
+        if not USE_DATABASE:
+            yield
+            return
+        from hbnb.app import db
+        with savepoint(db.session):
+            yield
+ 
+    def _insert_bulk(self, created, errors, insert, recheck):
+        """
+        Insert the objects of a bulk request (see _validate_bulk) in one
+        transaction.
+ 
+        Their duplicate checks read the data before the transaction: if
+        a concurrent write makes the insert break a constraint, the
+        items are checked again, the ones that now conflict are reported
+        with the other errors and the rest is inserted.
+ 
+        Args:
+            insert: callable(objs) making the repository writes.
+            recheck: callable(created) -> {index: message} of the items
+                     that conflict with the current data.
+ 
+        Returns:
+            (created, errors) as inserted
+        """
+        with self.transaction():
+            while True:
+                try:
+                    with self._savepoint():
+                        insert([obj for _, obj in created])
+                    return created, errors
+                except IntegrityError:
+                    conflicts = recheck(created)
+                    if not conflicts:
+                        raise ValueError(
+                            "Conflict with a concurrent change, retry")
+                    created = [(index, obj) for index, obj in created
+                               if index not in conflicts]
+                    errors = sorted(errors + list(conflicts.items()))
+ 
+    @_read
+    def get_version(self, kind, obj_id=None):
+        """
+        Last change of an object (its updated_at, None if missing) or,
+        without obj_id, of a whole collection ((count, latest
+        updated_at)), read without loading the rows.
+ 
+        Args:
+            kind: 'user', 'place', 'review' or 'amenity'.
+        """
+        repo = getattr(self, f'{kind}_repo')
+        if obj_id is None:
+            return repo.get_collection_version()
+        return repo.get_version(obj_id)
  
     # =========================
     # USER
     # =========================
  
+    @_write
     def create_user(self, user_data):
         """Create a new user with validation"""
         existing_user = self.get_user_by_email(user_data["email"])
         if existing_user:
             raise ValueError("Email already exists")
         user = User(**user_data)
-        self.user_repo.add(user)
+        with self.transaction():
+            self.user_repo.add(user)
         return user
  
+    @_read
     def get_user(self, user_id):
         """Get user by ID"""
         return self.user_repo.get(user_id)
  
+    @_read
+    def get_user_record(self, user_id):
+        """
+        Get the serialized user (to_dict()), through the user cache.
+        A record read on the replica is not cached: it may lag, and the
+        cache has no TTL.
+        """
+        record = user_cache.get(user_id)
+        if record is None:
+            user = self.user_repo.get(user_id)
+            if not user:
+                return None
+            record = user.to_dict()
+            if not _reads_replica():
+                user_cache.put(user_id, record)
+        return record
+ 
     def get_user_by_email(self, email):
-        """Get user by email address"""
+        """
+        Get user by email address. Always read on the primary: logins
+        must see new accounts and password changes at once.
+        """
         return self.user_repo.get_by_attribute("email", email)
  
+    @_read
     def get_all_users(self):
         """Get all users"""
         return self.user_repo.get_all()
  
+    @_read
+    def get_users_page(self, limit, after=None):
+        """Get a keyset page of users (see Repository.get_page)"""
+        return self.user_repo.get_page(limit, after)
+ 
+    @_write
     def update_user(self, user_id, update_data):
         """Update user with new data"""
-        user = self.user_repo.get(user_id)
+        with self.transaction():
+            user = self.user_repo.update(user_id, update_data)
         if not user:
             raise ValueError("User not found")
-        user.update(update_data)
+        if 'password' in update_data:
+            _after_commit(credential_cache.invalidate, user_id)
+        _after_commit(user_cache.put, user_id, user.to_dict())
+        _after_commit(response_cache.invalidate, ('user', user_id))
         return user
  
+    @_write
+    def replace_password_hash(self, user_id, old_hash, new_hash):
+        """
+        Store a rehash of the same password (cost migration), unless
+        the password changed since old_hash was read.
+ 
+        Returns:
+            True if the new hash was stored.
+        """
+        with self.transaction():
+            user = self.user_repo.get(user_id)
+            if not user or user.password != old_hash:
+                return False
+            self.user_repo.update(user_id, {'password': new_hash})
+        return True
+ 
     # =========================
     # AMENITY
     # =========================
  
+    @_write
     def create_amenity(self, amenity_data):
         """Create a new amenity"""
         existing = self.amenity_repo.get_by_attribute('name', amenity_data.get('name'))
@@ -87,22 +299,58 @@ class HBnBFacade:
  
         amenity = Amenity(**amenity_data)
         try:
-            self.amenity_repo.add(amenity)
+            with self.transaction():
+                self.amenity_repo.add(amenity)
         except IntegrityError:
-            if USE_DATABASE:
-                from hbnb.app import db
-                db.session.rollback()
             raise ValueError(f"Amenity '{amenity_data['name']}' already exists")
+        _after_commit(response_cache.invalidate, ('amenities',))
         return amenity
  
+    @_write
+    def create_amenities(self, items):
+        """
+        Create many amenities in one transaction (see _validate_bulk).
+ 
+        Returns:
+            (created, errors): [(index, amenity)], [(index, message)]
+        """
+        taken = {amenity.name for amenity in self.amenity_repo.get_all()}
+ 
+        def build(item):
+            amenity = Amenity(name=item.get('name'))
+            if amenity.name in taken:
+                raise ValueError(f"Amenity '{amenity.name}' already exists")
+            taken.add(amenity.name)
+            return amenity
+ 
+        def recheck(created):
+            return {index: f"Amenity '{amenity.name}' already exists"
+                    for index, amenity in created
+                    if self.amenity_repo.get_by_attribute(
+                        'name', amenity.name)}
+ 
+        created, errors = self._validate_bulk(items, build)
+        created, errors = self._insert_bulk(
+            created, errors, self.amenity_repo.add_many, recheck)
+        _after_commit(response_cache.invalidate, ('amenities',))
+        return created, errors
+ 
+    @_read
     def get_amenity(self, amenity_id):
         """Get amenity by ID"""
         return self.amenity_repo.get(amenity_id)
  
+    @_read
     def get_all_amenities(self):
         """Get all amenities"""
         return self.amenity_repo.get_all()
  
+    @_read
+    def get_amenities_page(self, limit, after=None):
+        """Get a keyset page of amenities (see Repository.get_page)"""
+        return self.amenity_repo.get_page(limit, after)
+ 
+    @_write
     def update_amenity(self, amenity_id, update_data):
         """Update amenity with new data"""
         amenity = self.amenity_repo.get(amenity_id)
@@ -116,14 +364,15 @@ class HBnBFacade:
                 raise ValueError(f"Amenity '{new_name}' already exists")
  
         try:
-            amenity.update(update_data)
+            with self.transaction():
+                self.amenity_repo.update(amenity_id, update_data)
         except IntegrityError:
-            if USE_DATABASE:
-                from hbnb.app import db
-                db.session.rollback()
             raise ValueError(f"Amenity '{new_name}' already exists")
+        _after_commit(response_cache.invalidate,
+                      ('amenities',), ('amenity', amenity_id))
         return amenity
  
+    @_write
     def add_amenity_to_place(self, place_id, amenity_id):
         """Add amenity to a place"""
         place = self.place_repo.get(place_id)
@@ -136,14 +385,15 @@ class HBnBFacade:
         if amenity in place.amenities:
             raise ValueError("Amenity already linked to this place")
  
-        place.amenities.append(amenity)
- 
-        if USE_DATABASE:
-            from hbnb.app import db
-            db.session.commit()
+        with self.transaction():
+            place.amenities.append(amenity)
+        self.place_repo.reindex(place_id)
+        _after_commit(response_cache.invalidate,
+                      ('place_amenities', place_id))
  
         return place
  
+    @_write
     def remove_amenity_from_place(self, place_id, amenity_id):
         """Remove amenity from a place"""
         place = self.place_repo.get(place_id)
@@ -156,11 +406,11 @@ class HBnBFacade:
         if amenity not in place.amenities:
             raise ValueError("Amenity not linked to this place")
  
-        place.amenities.remove(amenity)
- 
-        if USE_DATABASE:
-            from hbnb.app import db
-            db.session.commit()
+        with self.transaction():
+            place.amenities.remove(amenity)
+        self.place_repo.reindex(place_id)
+        _after_commit(response_cache.invalidate,
+                      ('place_amenities', place_id))
  
         return place
  
@@ -168,47 +418,246 @@ class HBnBFacade:
     # PLACE
     # =========================
  
+    @_write
     def create_place(self, place_data):
         """Create a new place"""
         owner = self.user_repo.get(place_data["owner_id"])
         if not owner:
             raise ValueError("Owner not found")
         place = Place(**place_data)
-        self.place_repo.add(place)
+        # Link the relationship too, so it is usable in memory as well
+        place.owner = owner
+        with self.transaction():
+            self.place_repo.add(place)
+        _after_commit(self._sync_place_coordinates, place)
         return place
  
-    def get_place(self, place_id):
-        """Get place by ID"""
-        return self.place_repo.get(place_id)
+    @_write
+    def create_places(self, items, owner_id):
+        """
+        Create many places of one owner in one transaction: validated by
+        the Place constructor, inserted with a single bulk INSERT.
  
-    def get_all_places(self):
-        """Get all places"""
-        return self.place_repo.get_all()
+        Returns:
+            (created, errors): [(index, place)], [(index, message)]
+        """
+        owner = self.user_repo.get(owner_id)
+        if not owner:
+            raise ValueError("Owner not found")
  
+        def build(item):
+            place = Place(owner_id=owner_id, **{
+                field: item.get(field) for field in
+                ('title', 'description', 'price', 'latitude', 'longitude')})
+            if not USE_DATABASE:
+                # Bulk inserts bypass the session: only link in memory
+                place.owner = owner
+            return place
+ 
+        created, errors = self._validate_bulk(items, build)
+        with self.transaction():
+            self.place_repo.add_many(place for _, place in created)
+        for _, place in created:
+            _after_commit(self._sync_place_coordinates, place)
+        return created, errors
+ 
+    @_read
+    def get_place(self, place_id, expand=()):
+        """Get place by ID, with the `expand` relationships loaded"""
+        return self.place_repo.get(place_id, eager=expand)
+ 
+    @_read
+    def get_all_places(self, expand=()):
+        """Get all places, with the `expand` relationships loaded"""
+        return self.place_repo.get_all(eager=expand)
+ 
+    @_read
+    def get_places_page(self, limit, after=None, expand=()):
+        """Get a keyset page of places (see Repository.get_page)"""
+        return self.place_repo.get_page(limit, after, eager=expand)
+ 
+    def _resolve_amenity_ids(self, amenities):
+        """Map amenity ids or names (case-insensitive) to amenity ids"""
+        by_name = None
+        amenity_ids = []
+        for token in amenities:
+            amenity = self.amenity_repo.get(token)
+            if amenity is None:
+                if by_name is None:
+                    by_name = {a.name.lower(): a
+                               for a in self.amenity_repo.get_all()}
+                amenity = by_name.get(token.lower())
+            if amenity is None:
+                raise ValueError(f"Amenity not found: {token}")
+            amenity_ids.append(amenity.id)
+        return amenity_ids
+ 
+    def filter_places(self, min_price=None, max_price=None, amenities=(),
+                      limit=None, after=None, expand=(), sort=None):
+        """
+        Get the places priced within [min_price, max_price] that have
+        all the given amenities (ids or names), in (created_at, id) order.
+ 
+        Args:
+            limit, after: Optional keyset page (see Repository.get_page).
+            expand: Relationships to load with the places.
+            sort: 'rating' for the best rated first: highest average,
+                  then most reviews, places without reviews last. Read
+                  in that order from the materialized aggregates' index;
+                  the keyset is then (-average, -review_count,
+                  created_at, id).
+        """
+        for value in (min_price, max_price):
+            if value is not None and value < 0:
+                raise ValueError("Price must be a positive number")
+        if (min_price is not None and max_price is not None
+                and min_price > max_price):
+            raise ValueError("min_price must not exceed max_price")
+        amenity_ids = self._resolve_amenity_ids(amenities)
+        return self.place_repo.find_filtered(
+            min_price, max_price, amenity_ids, limit, after, eager=expand,
+            sort=sort)
+ 
+    def iter_all_places(self, batch_size=1000):
+        """Iterate over all places without loading them all at once"""
+        return self.place_repo.iter_all(batch_size)
+ 
+    @_write
     def update_place(self, place_id, update_data):
         """Update place with new data"""
-        place = self.place_repo.get(place_id)
+        with self.transaction():
+            place = self.place_repo.update(place_id, update_data)
         if not place:
             raise ValueError("Place not found")
-        place.update(update_data)
+        _after_commit(self._sync_place_coordinates, place)
+        _after_commit(response_cache.invalidate, ('place', place_id))
         return place
  
+    def _sync_place_coordinates(self, place):
+        """Mirror a place's coordinates in the coordinate cache"""
+        self.place_coordinates.upsert(
+            place.id, place.latitude, place.longitude)
+ 
+    def _get_place_coordinates(self):
+        """
+        The coordinate cache brought up to date with the repository, or
+        None when it is turned off (PLACE_COORDINATE_CACHE).
+ 
+        The repository numbers the coordinate changes of the places,
+        whichever process made them (see models/place_change.py). The
+        latest number is one primary-key lookup; when it differs from
+        the one the cache was synced at, only the places changed since
+        are read again. The cache is reloaded if the log was pruned
+        past that number.
+        """
+        cache = self.place_coordinates
+        if not cache.enabled:
+            return None
+        version = self.place_repo.get_coordinates_version()
+        if cache.loaded and cache.version == version:
+            return cache
+        if cache.loaded:
+            changes = self.place_repo.find_coordinate_changes(cache.version)
+            if changes is not None:
+                cache.refresh(changes, version)
+                return cache
+        cache.load(((place.id, place.latitude, place.longitude)
+                    for place in self.place_repo.iter_all()), version)
+        return cache
+ 
+    def _rank_places_near(self, latitude, longitude, radius_km, limit):
+        """
+        Without the coordinate cache: the places of the circle's
+        bounding box (of the whole map without a radius), ranked by
+        haversine distance.
+        """
+        if radius_km is None:
+            candidates = self.place_repo.get_all()
+        else:
+            candidates = self.place_repo.find_in_bbox(
+                *bounding_box(latitude, longitude, radius_km))
+        results = []
+        for place in candidates:
+            distance = haversine_km(latitude, longitude,
+                                    place.latitude, place.longitude)
+            if radius_km is None or distance <= radius_km:
+                results.append((place, distance))
+        results.sort(key=lambda item: item[1])
+        return results if limit is None else results[:limit]
+ 
+    def search_places_in_bbox(self, min_lat, max_lat, min_lon, max_lon):
+        """
+        Get the places inside a lat/lon box.
+        min_lon > max_lon selects a box crossing the antimeridian.
+        """
+        for value in (min_lat, max_lat):
+            if not -90 <= value <= 90:
+                raise ValueError("Latitude must be between -90 and 90")
+        for value in (min_lon, max_lon):
+            if not -180 <= value <= 180:
+                raise ValueError("Longitude must be between -180 and 180")
+        if min_lat > max_lat:
+            raise ValueError("min_lat must not exceed max_lat")
+        return self.place_repo.find_in_bbox(min_lat, max_lat, min_lon, max_lon)
+ 
+    def search_places_near(self, latitude, longitude, radius_km=None,
+                           limit=None):
+        """
+        Get the places around a point, nearest first.
+ 
+        Distances are computed in one vectorized pass over the
+        coordinate cache; only the matching places are then loaded.
+        With the cache turned off, the places of the bounding box are
+        ranked one by one.
+ 
+        Args:
+            radius_km: Keep places within this distance.
+            limit: Keep only the `limit` nearest places.
+            At least one of the two is required.
+ 
+        Returns:
+            list of (place, distance_km) tuples
+        """
+        if not -90 <= latitude <= 90:
+            raise ValueError("Latitude must be between -90 and 90")
+        if not -180 <= longitude <= 180:
+            raise ValueError("Longitude must be between -180 and 180")
+        if radius_km is None and limit is None:
+            raise ValueError("radius_km or limit is required")
+        if radius_km is not None and not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValueError(
+                f"radius_km must be between 0 and {MAX_RADIUS_KM:.0f}")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer")
+ 
+        cache = self._get_place_coordinates()
+        if cache is None:
+            return self._rank_places_near(latitude, longitude,
+                                          radius_km, limit)
+        ranked = cache.nearest(latitude, longitude, radius_km, limit)
+        distances = dict(ranked)
+        places = self.place_repo.get_many(place_id for place_id, _ in ranked)
+        return [(place, distances[place.id]) for place in places]
+ 
+    @_write
     def delete_place(self, place_id):
-        """Delete a place by ID"""
+        """Delete a place and its reviews, in a single commit"""
         place = self.place_repo.get(place_id)
         if not place:
             raise ValueError("Place not found")
  
-        if hasattr(place, 'reviews') and place.reviews:
-            for review in place.reviews[:]:
-                self.review_repo.delete(review.id)
- 
-        self.place_repo.delete(place_id)
+        with self.transaction():
+            reviews = self.review_repo.find_by(place_id=place_id)
+            self.review_repo.delete_many(review.id for review in reviews)
+            self.place_repo.delete(place_id)
+        _after_commit(self.place_coordinates.remove, place_id)
+        _after_commit(response_cache.invalidate, ('place', place_id))
  
     # =========================
     # REVIEW
     # =========================
  
+    @_write
     def create_review(self, review_data):
         """Validate place and user existence before creating review"""
         user = self.user_repo.get(review_data["user_id"])
@@ -220,68 +669,170 @@ class HBnBFacade:
             raise ValueError("User not found")
  
         review = Review(**review_data)
-        self.review_repo.add(review)
- 
-        if hasattr(place, 'add_review'):
-            place.add_review(review)
- 
-        if USE_DATABASE:
-            from hbnb.app import db
-            db.session.commit()
+        with self.transaction():
+            self.place_repo.increment(
+                place.id, Place.rating_deltas(added=[review.rating]))
+            # Link the relationships too, so they are usable in memory as well
+            review.place = place
+            review.user = user
+            self.review_repo.add(review)
+        self._invalidate_place_reviews(place.id)
  
         return review
  
+    @_write
+    def create_reviews(self, items, user_id):
+        """
+        Create many reviews by one user in one transaction, with the
+        same rules as a single review (not on one's own place, one
+        review per place). Place rating aggregates get one increment
+        per place.
+ 
+        Returns:
+            (created, errors): [(index, review)], [(index, message)]
+        """
+        user = self.user_repo.get(user_id)
+        if not user:
+            raise ValueError("User not found")
+        places = {place.id: place for place in self.place_repo.get_many(
+            {item.get('place_id') for item in items
+             if isinstance(item, dict)})}
+        reviewed = {review.place_id
+                    for review in self.review_repo.find_by(user_id=user_id)}
+ 
+        def build(item):
+            place = places.get(item.get('place_id'))
+            if not place:
+                raise ValueError("Place not found")
+            if place.owner_id == user_id:
+                raise ValueError("You cannot review your own place")
+            if place.id in reviewed:
+                raise ValueError("You have already reviewed this place")
+            review = Review(text=item.get('text'), rating=item.get('rating'),
+                            user_id=user_id, place_id=place.id)
+            reviewed.add(place.id)
+            return review
+ 
+        def insert(reviews):
+            ratings = {}
+            for review in reviews:
+                ratings.setdefault(review.place_id, []).append(review.rating)
+            for place_id, added in ratings.items():
+                self.place_repo.increment(
+                    place_id, Place.rating_deltas(added=added))
+            self.review_repo.add_many(reviews)
+ 
+        def recheck(created):
+            existing = {place.id for place in self.place_repo.get_many(
+                {review.place_id for _, review in created})}
+            reviewed = {review.place_id for review
+                        in self.review_repo.find_by(user_id=user_id)}
+            conflicts = {}
+            for index, review in created:
+                if review.place_id not in existing:
+                    conflicts[index] = "Place not found"
+                elif review.place_id in reviewed:
+                    conflicts[index] = "You have already reviewed this place"
+            return conflicts
+ 
+        created, errors = self._validate_bulk(items, build)
+        created, errors = self._insert_bulk(created, errors, insert, recheck)
+        self._invalidate_place_reviews(
+            *{review.place_id for _, review in created})
+        if not USE_DATABASE:
+            # Bulk inserts bypass the session: only link in memory
+            for _, review in created:
+                review.place = places[review.place_id]
+                review.user = user
+        return created, errors
+ 
+    @_read
     def get_review(self, review_id):
         """Get review by ID"""
         return self.review_repo.get(review_id)
  
-    def get_all_reviews(self):
-        """Get all reviews"""
-        return self.review_repo.get_all()
+    @_read
+    def get_all_reviews(self, expand=()):
+        """Get all reviews, with the `expand` relationships loaded"""
+        return self.review_repo.get_all(eager=expand)
+ 
+    @_read
+    def get_reviews_page(self, limit, after=None, expand=()):
+        """Get a keyset page of reviews (see Repository.get_page)"""
+        return self.review_repo.get_page(limit, after, eager=expand)
+ 
+    def iter_all_reviews(self, batch_size=1000):
+        """Iterate over all reviews without loading them all at once"""
+        return self.review_repo.iter_all(batch_size)
  
+    @_read
     def get_reviews_by_place(self, place_id):
         """Get all reviews for a specific place"""
-        all_reviews = self.review_repo.get_all()
-        return [review for review in all_reviews
-                if isinstance(review, Review) and hasattr(review, 'place_id') and review.place_id == place_id]
+        return self.review_repo.find_by(place_id=place_id)
  
+    @_read
     def get_reviews_by_user(self, user_id):
         """Get all reviews by a specific user"""
-        all_reviews = self.review_repo.get_all()
-        return [review for review in all_reviews
-                if isinstance(review, Review) and hasattr(review, 'user_id') and review.user_id == user_id]
+        return self.review_repo.find_by(user_id=user_id)
  
+    @staticmethod
+    def _invalidate_place_reviews(*place_ids):
+        """Reviews changed: their places' lists and rating aggregates"""
+        _after_commit(response_cache.invalidate,
+                      *(tag for place_id in place_ids
+                        for tag in (('place', place_id),
+                                    ('place_reviews', place_id))))
+ 
+    @_write
     def update_review(self, review_id, update_data):
-        """Update review with new data"""
+        """Update review with new data (and its place's rating aggregates)"""
         review = self.review_repo.get(review_id)
         if not review:
             raise ValueError("Review not found")
-        review.update(update_data)
+ 
+        deltas = {}
+        new_rating = update_data.get('rating', review.rating)
+        if new_rating != review.rating and new_rating in Place.RATINGS:
+            deltas = Place.rating_deltas(added=[new_rating],
+                                         removed=[review.rating])
+        place_id = review.place_id
+        try:
+            with self.transaction():
+                if deltas:
+                    self.place_repo.increment(place_id, deltas)
+                review = self.review_repo.update(review_id, update_data)
+        except ValueError:
+            if deltas and not USE_DATABASE:
+                # Nothing to roll back in memory: undo by hand
+                self.place_repo.increment(
+                    place_id,
+                    {attr_name: -amount for attr_name, amount in deltas.items()})
+            raise
+        self._invalidate_place_reviews(place_id)
         return review
  
+    @_write
     def delete_review(self, review_id):
         """Delete a review"""
         review = self.review_repo.get(review_id)
         if not review:
             raise ValueError("Review not found")
  
-        if hasattr(review, 'place_id'):
+        place_id = review.place_id
+        with self.transaction():
+            self.place_repo.increment(
+                place_id, Place.rating_deltas(removed=[review.rating]))
+ 
             place = self.place_repo.get(review.place_id)
-            if place and hasattr(place, 'reviews') and review in place.reviews:
+            if place and review in place.reviews:
                 place.reviews.remove(review)
-                if USE_DATABASE:
-                    from hbnb.app import db
-                    db.session.commit()
  
-        if hasattr(review, 'user_id'):
             user = self.user_repo.get(review.user_id)
-            if user and hasattr(user, 'reviews') and user.reviews and review in user.reviews:
+            if user and review in user.reviews:
                 user.reviews.remove(review)
-                if USE_DATABASE:
-                    from hbnb.app import db
-                    db.session.commit()
  
-        self.review_repo.delete(review_id)
+            self.review_repo.delete(review_id)
+        self._invalidate_place_reviews(place_id)
  
  
 # Singleton
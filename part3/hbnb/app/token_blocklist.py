@@ -0,0 +1,178 @@
+"""
+Revoked JWTs (logout).
+
+Every authenticated request asks whether its token was revoked, so the
+check must cost next to nothing. Two stores are available
+(JWT_BLOCKLIST_STORE):
+
+- "memory": a set of revoked token ids (jti) in this process, with the
+  same ids grouped in buckets by expiration time. A revoked token only
+  has to be remembered until it expires anyway (an expired token is
+  refused before the blocklist is asked): whole buckets are dropped
+  once past, so memory stays bounded by the tokens revoked within one
+  token lifetime.
+- "database": the revoked_tokens table, shared by all the workers of a
+  deployment; expired rows are deleted on each revocation.
+
+An access token names the refresh token it was issued with (claims
+refresh_jti / refresh_exp, see token_pair() and access_token_for()):
+a logout with either token revokes the refresh token, and an access
+token is refused once its refresh token is revoked. Otherwise a client
+logging out with its access token would keep a refresh token good for
+a month.
+"""
+import heapq
+import threading
+import time
+
+from flask_jwt_extended import (
+    create_access_token, create_refresh_token, decode_token)
+from sqlalchemy import delete, select
+
+from hbnb.app import db
+from hbnb.app.models import RevokedToken
+from hbnb.app.persistence.unit_of_work import transaction
+
+
+class MemoryBlocklist:
+    """Revoked jtis in a set, pruned by expiration bucket."""
+
+    def __init__(self, bucket_seconds=60):
+        self.bucket_seconds = bucket_seconds
+        self._jtis = set()
+        self._buckets = {}  # bucket number -> jtis expiring in it
+        self._order = []    # heap of bucket numbers
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti):
+        if time.time() >= self._next_prune:
+            self.prune()
+        return jti in self._jtis
+
+    def __len__(self):
+        return len(self._jtis)
+
+    def any_revoked(self, jtis):
+        """True if one of jtis is revoked."""
+        return any(jti in self for jti in jtis)
+
+    def revoke(self, jti, expires):
+        """Remember jti until `expires` (epoch seconds)."""
+        bucket = int(expires // self.bucket_seconds)
+        with self._lock:
+            if bucket not in self._buckets:
+                self._buckets[bucket] = set()
+                heapq.heappush(self._order, bucket)
+            self._buckets[bucket].add(jti)
+            self._jtis.add(jti)
+
+    def prune(self, now=None):
+        """Forget the buckets whose tokens have all expired."""
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_seconds)
+        with self._lock:
+            while self._order and self._order[0] < current:
+                self._jtis.difference_update(
+                    self._buckets.pop(heapq.heappop(self._order)))
+            self._next_prune = (current + 1) * self.bucket_seconds
+
+
+class DatabaseBlocklist:
+    """Revoked jtis in the revoked_tokens table."""
+
+    def __contains__(self, jti):
+        return db.session.get(RevokedToken, jti) is not None
+
+    def __len__(self):
+        return db.session.query(RevokedToken).count()
+
+    def any_revoked(self, jtis):
+        """True if one of jtis is revoked: one query by primary key."""
+        return db.session.scalar(
+            select(RevokedToken.jti)
+            .where(RevokedToken.jti.in_(jtis)).limit(1)) is not None
+
+    def revoke(self, jti, expires):
+        """Remember jti until `expires` (epoch seconds)."""
+        with transaction(db.session):
+            db.session.merge(RevokedToken(jti=jti, expires=int(expires)))
+            self.prune()
+
+    def prune(self, now=None):
+        """Delete the rows of expired tokens."""
+        now = time.time() if now is None else now
+        with transaction(db.session):
+            db.session.execute(
+                delete(RevokedToken).where(RevokedToken.expires < now))
+
+
+REFRESH_JTI = "refresh_jti"
+REFRESH_EXP = "refresh_exp"
+
+
+def access_token_for(refresh_payload, additional_claims=None):
+    """
+    A new access token of the user of a decoded refresh token, naming
+    that refresh token (call in an app context).
+    """
+    claims = dict(additional_claims or {})
+    claims[REFRESH_JTI] = refresh_payload["jti"]
+    claims[REFRESH_EXP] = refresh_payload["exp"]
+    return create_access_token(identity=refresh_payload["sub"],
+                               additional_claims=claims)
+
+
+def token_pair(identity, additional_claims=None):
+    """(access token, refresh token) of a login (call in an app context)."""
+    refresh_token = create_refresh_token(identity=identity)
+    return (access_token_for(decode_token(refresh_token), additional_claims),
+            refresh_token)
+
+
+def revoked_by(jwt_payload):
+    """
+    (jti, expires) pairs revoked by a logout with a decoded token: the
+    token, and the refresh token an access token names.
+    """
+    revoked = [(jwt_payload["jti"], jwt_payload["exp"])]
+    if jwt_payload.get(REFRESH_JTI) is not None:
+        revoked.append((jwt_payload[REFRESH_JTI], jwt_payload[REFRESH_EXP]))
+    return revoked
+
+
+def checked_jtis(jwt_payload):
+    """jtis any of which, revoked, refuses a decoded token."""
+    refresh_jti = jwt_payload.get(REFRESH_JTI)
+    if refresh_jti is None:
+        return (jwt_payload["jti"],)
+    return (jwt_payload["jti"], refresh_jti)
+
+
+class TokenBlocklist:
+    """The configured store, behind the JWT manager's blocklist check."""
+
+    STORES = {"memory": MemoryBlocklist, "database": DatabaseBlocklist}
+
+    def __init__(self):
+        self.store = MemoryBlocklist()
+
+    def init_app(self, app):
+        """Read JWT_BLOCKLIST_STORE ("memory" or "database")."""
+        name = app.config.get("JWT_BLOCKLIST_STORE", "memory")
+        if name not in self.STORES:
+            raise ValueError(
+                f"JWT_BLOCKLIST_STORE must be one of {', '.join(self.STORES)}")
+        self.store = self.STORES[name]()
+
+    def revoke(self, jwt_payload):
+        """Revoke a decoded token and its refresh token until they expire."""
+        for jti, expires in revoked_by(jwt_payload):
+            self.store.revoke(jti, expires)
+
+    def is_revoked(self, jwt_payload):
+        """True if the decoded token, or its refresh token, was revoked."""
+        return self.store.any_revoked(checked_jtis(jwt_payload))
+
+
+token_blocklist = TokenBlocklist()
@@ -0,0 +1,76 @@
+"""
+Process-wide cache of recently read user records.
+
+Token refreshes (POST /auth/refresh) read the same few user rows over
+and over, by id. The cache keeps their serialized form (to_dict(),
+never the password) in a small LRU, so a repeated read skips the
+repository. It is write-through: HBnBFacade.update_user stores the new
+record as soon as the change is committed.
+
+It only sees writes made through this process's facade; USER_CACHE_SIZE
+= 0 turns it off for deployments with several writer processes. Records
+read on a lagging read replica are not stored.
+"""
+import threading
+from collections import OrderedDict
+
+
+class UserRecordCache:
+    """Bounded LRU of user id -> user.to_dict()."""
+
+    def __init__(self, max_entries=1024):
+        """
+        Args:
+            max_entries: Records kept, least recently used evicted first
+                         (0 disables the cache).
+        """
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.configure(max_entries)
+
+    def configure(self, max_entries=1024):
+        """Change the size; existing records are dropped."""
+        with self._lock:
+            self.max_entries = max_entries
+            self._records.clear()
+
+    def init_app(self, app):
+        """Read the USER_CACHE_SIZE setting of a Flask app."""
+        self.configure(app.config.get("USER_CACHE_SIZE", 1024))
+
+    def get(self, user_id):
+        """A copy of the cached record, or None."""
+        with self._lock:
+            record = self._records.get(user_id)
+            if record is None:
+                self.misses += 1
+                return None
+            self._records.move_to_end(user_id)
+            self.hits += 1
+            return dict(record)
+
+    def put(self, user_id, record):
+        """Store (or replace) a user's record."""
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._records[user_id] = dict(record)
+            self._records.move_to_end(user_id)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Forget a user's record."""
+        with self._lock:
+            self._records.pop(user_id, None)
+
+    def stats(self):
+        """Hit / miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._records)}
+
+
+user_cache = UserRecordCache()
@@ -1,9 +1,8 @@
-from flask_bcrypt import Bcrypt
+from hbnb.app.hashing import password_hasher
 
-bcrypt = Bcrypt()
 
 def hash_password(password):
-    return bcrypt.generate_password_hash(password).decode('utf-8')
+    return password_hasher.hash(password)
 
 def check_password(hashed_password, password):
-    return bcrypt.check_password_hash(hashed_password, password)
+    return password_hasher.verify(hashed_password, password)
@@ -0,0 +1,14 @@
+"""
+ASGI entry point (async handlers, see hbnb/app/aio).
+
+Usage (from part3/):
+    uvicorn hbnb.asgi:app
+"""
+import os
+
+# The async facade runs on the SQL backend
+os.environ.setdefault('USE_DATABASE', 'true')
+
+from hbnb.app.aio import create_asgi_app  # noqa: E402
+
+app = create_asgi_app('development')
@@ -0,0 +1,208 @@
+"""
+Benchmark - concurrent connections, WSGI (threads) vs ASGI (event loop)
+
+Serves the same production-profile database (SQLite, response cache
+off, so every request reaches the facade) in turn with the WSGI app
+(werkzeug's threaded server, one thread per connection, as `flask run`)
+and the ASGI app (uvicorn, one event loop). A minimal asyncio client
+keeps CONNECTIONS keep-alive connections busy for SECONDS per workload
+(a full client library would cost more CPU per request than the
+servers measured):
+
+- read:   GET /api/v1/places/<id> (public, random place)
+- update: PUT /api/v1/places/<id> (authenticated write)
+
+and reports requests/s, latency percentiles and errors. The client
+shares the machine with the server: compare the two modes with each
+other, not with other hosts.
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_asgi [SECONDS] [CONNECTIONS ...]
+"""
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+os.environ["USE_DATABASE"] = "true"
+
+from hbnb.app import create_app  # noqa: E402  (reads USE_DATABASE)
+from hbnb.app.services import facade  # noqa: E402
+from hbnb.config import ProductionConfig, config  # noqa: E402
+
+PLACES = 2000
+HOST, PORT = "127.0.0.1", 8765
+ADMIN = {"email": "admin@hbnb.io", "password": "admin1234"}
+
+
+def register_config(path):
+    """Production profile on the benchmark database, caches off"""
+    config["bench-asgi"] = type("BenchConfig", (ProductionConfig,), dict(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}", PASSWORD_WORK_FACTOR=4,
+        RESPONSE_CACHE_SIZE=0, USER_CACHE_SIZE=0))
+    return "bench-asgi"
+
+
+def setup(path):
+    """Database with PLACES places of the admin; returns their ids"""
+    app = create_app(register_config(path))
+    with app.app_context():
+        admin = facade.get_user_by_email(ADMIN["email"])
+        created, _ = facade.create_places([
+            {"title": f"Place {i}", "description": "benchmark", "price": 50,
+             "latitude": 0, "longitude": 0} for i in range(PLACES)], admin.id)
+    return [place.id for _, place in created]
+
+
+def serve(mode, path):
+    """Server process: run the app of `mode` until killed"""
+    name = register_config(path)
+    if mode == "asgi":
+        import uvicorn
+        from hbnb.app.aio import create_asgi_app
+        uvicorn.run(create_asgi_app(name), host=HOST, port=PORT,
+                    log_level="warning")
+    else:
+        from werkzeug.serving import run_simple
+        run_simple(HOST, PORT, create_app(name), threaded=True)
+
+
+def start_server(mode, path):
+    """Start `serve` in a subprocess and wait until it answers"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "hbnb.benchmarks.bench_asgi", "--serve",
+         mode, path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://{HOST}:{PORT}/", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def login():
+    """Access token of the admin"""
+    request = urllib.request.Request(
+        f"http://{HOST}:{PORT}/api/v1/auth/login",
+        data=json.dumps(ADMIN).encode(),
+        headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["access_token"]
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 client connection (Content-Length bodies)"""
+
+    def __init__(self):
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None, headers=None):
+        """Send a request, read the whole response; returns its status"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                HOST, PORT)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {HOST}",
+                f"Content-Length: {len(body)}"]
+        if payload is not None:
+            head.append("Content-Type: application/json")
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        lines = (await self.reader.readuntil(b"\r\n\r\n")).decode(
+            "latin-1").split("\r\n")
+        fields = {name.strip().lower(): value.strip() for name, _, value in
+                  (line.partition(":") for line in lines[1:] if line)}
+        await self.reader.readexactly(int(fields.get("content-length", 0)))
+        if fields.get("connection", "").lower() == "close":
+            self.close()
+        return int(lines[0].split()[1])
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def load(connections, seconds, request):
+    """Keep `connections` connections busy; returns (latencies, errors)"""
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        connection = Connection()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                ok = await request(connection) < 400
+            except (OSError, asyncio.IncompleteReadError):
+                connection.close()
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(1)
+        connection.close()
+
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    return latencies, errors
+
+
+def report(mode, workload, connections, seconds, latencies, errors):
+    latencies.sort()
+    if latencies:
+        p50 = f"{latencies[len(latencies) // 2] * 1000:.1f}"
+        p99 = f"{latencies[int(len(latencies) * 0.99)] * 1000:.1f}"
+    else:
+        p50 = p99 = "-"
+    print(f"{mode:<6}{workload:<8}{connections:>6}"
+          f"{len(latencies) / seconds:>10.0f}{p50:>9}{p99:>9}"
+          f"{len(errors):>8}")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    levels = [int(arg) for arg in sys.argv[2:]] or [8, 64, 256]
+    path = os.path.join(tempfile.mkdtemp(prefix="hbnb-bench-"), "bench.db")
+    place_ids = setup(path)
+
+    async def read(connection):
+        return await connection.request(
+            "GET", f"/api/v1/places/{random.choice(place_ids)}")
+
+    print(f"{PLACES} places, {seconds:.0f} s per run, {os.cpu_count()} CPU")
+    print(f"{'mode':<6}{'load':<8}{'conns':>6}{'req/s':>10}{'p50 ms':>9}"
+          f"{'p99 ms':>9}{'errors':>8}")
+    for mode in ("wsgi", "asgi"):
+        process = start_server(mode, path)
+        try:
+            auth = {"Authorization": f"Bearer {login()}"}
+
+            async def update(connection):
+                return await connection.request(
+                    "PUT", f"/api/v1/places/{random.choice(place_ids)}",
+                    {"price": random.randint(10, 500)}, auth)
+
+            for workload, request in (("read", read), ("update", update)):
+                for connections in levels:
+                    latencies, errors = asyncio.run(
+                        load(connections, seconds, request))
+                    report(mode, workload, connections, seconds,
+                           latencies, errors)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        serve(sys.argv[2], sys.argv[3])
+    else:
+        main()
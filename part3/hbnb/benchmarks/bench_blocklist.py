@@ -0,0 +1,73 @@
+"""
+Benchmark - token blocklist lookups
+
+Times the check made on every authenticated request,
+TokenBlocklist.is_revoked(), against N revoked tokens: a revoked token
+(hit) and a valid one (miss), with the in-process store and with the
+database store (SQLite file). The tokens are access tokens, which name
+their refresh token: both jtis are checked.
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_blocklist [N_REVOKED]
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+import uuid
+
+_DB_DIR = tempfile.mkdtemp(prefix="hbnb-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+
+from hbnb.app import create_app, db  # noqa: E402
+from hbnb.app.models import RevokedToken  # noqa: E402
+from hbnb.app.token_blocklist import (  # noqa: E402
+    DatabaseBlocklist, MemoryBlocklist, TokenBlocklist)
+
+
+def per_call(func, number):
+    """Best of 5 runs, in microseconds per call."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    expires = time.time() + 3600
+    jtis = [str(uuid.uuid4()) for _ in range(count)]
+
+    def access_token(jti):
+        return {"jti": jti, "exp": expires,
+                "refresh_jti": str(uuid.uuid4()), "refresh_exp": expires}
+
+    hit = access_token(jtis[count // 2])
+    miss = access_token(str(uuid.uuid4()))
+
+    blocklist = TokenBlocklist()
+    blocklist.store = MemoryBlocklist()
+    for jti in jtis:
+        blocklist.store.revoke(jti, expires)
+    rows = [("memory", per_call(lambda: blocklist.is_revoked(hit), 1_000_000),
+             per_call(lambda: blocklist.is_revoked(miss), 1_000_000))]
+
+    app = create_app("production")
+    with app.app_context():
+        db.session.execute(db.insert(RevokedToken), [
+            {"jti": jti, "expires": int(expires)} for jti in jtis])
+        db.session.commit()
+        blocklist.store = DatabaseBlocklist()
+
+        def lookup(payload):
+            blocklist.is_revoked(payload)
+            db.session.expunge_all()  # no identity-map shortcut
+
+        rows.append(("database", per_call(lambda: lookup(hit), 2_000),
+                     per_call(lambda: lookup(miss), 2_000)))
+
+    print(f"{'store':<10}{'revoked':>10}{'hit us':>10}{'miss us':>10}")
+    for name, hit_us, miss_us in rows:
+        print(f"{name:<10}{count:>10,}{hit_us:>10.3f}{miss_us:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
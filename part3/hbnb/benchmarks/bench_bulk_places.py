@@ -0,0 +1,67 @@
+"""
+Benchmark - bulk place creation on SQLite
+
+Creates listings through POST /api/v1/places/ one request at a time,
+then through POST /api/v1/places/bulk in batches, against a fresh
+SQLite database, and reports listings per second for both.
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_bulk_places [N_PLACES] [BATCH_SIZE]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="hbnb-bench-")
+os.environ["USE_DATABASE"] = "true"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+
+from hbnb.app import create_app  # noqa: E402  (reads USE_DATABASE)
+
+SINGLE_COUNT = 1000
+
+
+def make_items(count, seed=42):
+    rng = random.Random(seed)
+    return [{"title": f"Listing {i}", "description": "benchmark",
+             "price": round(rng.uniform(20, 500), 2),
+             "latitude": rng.uniform(-90, 90),
+             "longitude": rng.uniform(-180, 180)}
+            for i in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    client = create_app("production").test_client()
+    login = client.post("/api/v1/auth/login", json={
+        "email": "admin@hbnb.io", "password": "admin1234"})
+    auth = {"Authorization": f"Bearer {login.json['access_token']}"}
+
+    items = make_items(SINGLE_COUNT, seed=1)
+    start = time.perf_counter()
+    for item in items:
+        assert client.post("/api/v1/places/", json=item,
+                           headers=auth).status_code == 201
+    single = SINGLE_COUNT / (time.perf_counter() - start)
+
+    items = make_items(count)
+    start = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        resp = client.post("/api/v1/places/bulk",
+                           json=items[offset:offset + batch_size],
+                           headers=auth)
+        assert resp.status_code == 201, resp.json
+    bulk = count / (time.perf_counter() - start)
+
+    print(f"{'endpoint':<28}{'listings':>10}{'listings/s':>14}")
+    print(f"{'POST /places/':<28}{SINGLE_COUNT:>10,}{single:>14,.0f}")
+    print(f"{f'POST /places/bulk x{batch_size}':<28}{count:>10,}"
+          f"{bulk:>14,.0f}")
+    print(f"speedup: {bulk / single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
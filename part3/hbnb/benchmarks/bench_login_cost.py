@@ -0,0 +1,89 @@
+"""
+Benchmark - login latency per bcrypt cost
+
+For each cost, creates a user hashed at that cost and times
+POST /api/v1/auth/login with the credential cache off, so that every
+login pays a bcrypt check. Then times the first logins after the
+target cost changes: the old hash is migrated in the background and
+must not show up in the login latency.
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_login_cost [LOGINS] [COST ...]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="hbnb-bench-")
+os.environ["USE_DATABASE"] = "true"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+
+from hbnb.app import create_app  # noqa: E402  (reads USE_DATABASE)
+from hbnb.app.credential_cache import credential_cache  # noqa: E402
+from hbnb.app.hashing import hash_rounds, password_hasher  # noqa: E402
+from hbnb.app.services import facade  # noqa: E402
+
+PASSWORD = "bench-password"
+
+
+def percentiles(samples):
+    """(p50, p99) in milliseconds."""
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+def time_logins(client, email, count):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        resp = client.post("/api/v1/auth/login", json={
+            "email": email, "password": PASSWORD})
+        samples.append(time.perf_counter() - start)
+        assert resp.status_code == 200, resp.json
+    return samples
+
+
+def make_user(app, cost):
+    password_hasher.work_factor = cost
+    email = f"cost{cost}-{time.monotonic_ns()}@bench.io"
+    with app.app_context():
+        user = facade.create_user({
+            "first_name": "Bench", "last_name": "User", "email": email,
+            "password": password_hasher.hash(PASSWORD)})
+        return user.id, email
+
+
+def stored_rounds(app, user_id):
+    with app.app_context():
+        return hash_rounds(facade.get_user(user_id).password)
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    costs = [int(cost) for cost in sys.argv[2:]] or [10, 11, 12]
+    app = create_app("production")
+    client = app.test_client()
+    credential_cache.configure(ttl=0)
+
+    print(f"{'cost':<22}{'logins':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for cost in costs:
+        _, email = make_user(app, cost)
+        p50, p99 = percentiles(time_logins(client, email, logins))
+        print(f"{cost:<22}{logins:>8}{p50:>10.1f}{p99:>10.1f}")
+
+    # Migration: hashes made at the first cost, target is now the last
+    old, new = costs[0], costs[-1]
+    users = [make_user(app, old) for _ in range(logins)]
+    password_hasher.work_factor = new
+    samples = [time_logins(client, email, 1)[0] for _, email in users]
+    password_hasher.shutdown()
+    migrated = sum(stored_rounds(app, user_id) == new for user_id, _ in users)
+    p50, p99 = percentiles(samples)
+    print(f"{f'{old} -> {new} (first)':<22}{logins:>8}{p50:>10.1f}{p99:>10.1f}")
+    print(f"{migrated}/{logins} hashes migrated to cost {new}")
+
+
+if __name__ == "__main__":
+    main()
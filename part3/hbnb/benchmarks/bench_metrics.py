@@ -0,0 +1,117 @@
+"""
+Benchmark - cost of recording the metrics (app/metrics.py)
+
+Times what GET /metrics adds to a request:
+- the request timer (WSGI middleware) and hook (count + histogram by
+  route), run on a real, matched request context
+- the wrapper of one timed facade / repository call, over a no-op
+- the number of timed calls made by typical requests (counted from the
+  recorded series)
+
+and reports the recording cost per request: hooks + calls x wrapper.
+An end-to-end comparison through the test client, recording on and
+off, is printed as a cross-check: its difference is within the noise
+of a request that costs several hundred microseconds.
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_metrics [REQUESTS]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+_DB_DIR = tempfile.mkdtemp(prefix="hbnb-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+
+from hbnb.app import create_app  # noqa: E402
+from hbnb.app.metrics import (  # noqa: E402
+    FACADE_CALLS, REPOSITORY_CALLS, metrics)
+
+ADMIN = {"email": "admin@hbnb.io", "password": "admin1234"}
+
+
+def per_call(func, number):
+    """Best of 5 runs, in microseconds per call."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def timed_calls(client, method, url, **kwargs):
+    """Facade + repository calls timed while serving one request."""
+    def observations():
+        return sum(sum(counts[:-1]) for key, counts
+                   in metrics.snapshot().items()
+                   if key[0] in (FACADE_CALLS, REPOSITORY_CALLS))
+
+    before = observations()
+    getattr(client, method)(url, **kwargs)
+    return observations() - before
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    app = create_app("production")
+    client = app.test_client()
+    token = client.post("/api/v1/auth/login", json=ADMIN).json[
+        "access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    place_id = client.post("/api/v1/places/", headers=auth, json={
+        "title": "Bench", "description": "metrics", "price": 50,
+        "latitude": 0, "longitude": 0}).json["id"]
+    url = f"/api/v1/places/{place_id}"
+
+    # Request timer (WSGI middleware) and hook, on a matched request
+    def noop_app(environ, start_response):
+        return None
+    timer = metrics.timer(noop_app)
+    record_request, = [hook for hook in app.after_request_funcs[None]
+                       if hook.__name__ == "record_request"]
+    response = app.response_class("{}", 200)
+    with app.test_request_context(url) as context:
+        environ = context.request.environ
+
+        def hooks():
+            timer(environ, None)
+            record_request(response)
+        hooks_us = per_call(hooks, 200_000) - per_call(
+            lambda: noop_app(environ, None), 200_000)
+
+    # One timed call, over a call of the bare function
+    def noop():
+        return None
+    wrapped = metrics.timed(noop, FACADE_CALLS, method="noop")
+    wrapper_us = per_call(wrapped, 1_000_000) - per_call(noop, 1_000_000)
+
+    print(f"request hooks        {hooks_us:8.3f} us")
+    print(f"timed call wrapper   {wrapper_us:8.3f} us")
+    print()
+    print(f"{'request':<28}{'timed calls':>12}{'recording us':>14}")
+    for name, method, kwargs in (
+            ("GET /places/<id>", "get", {}),
+            ("GET /places/<id> (If-None-Match)", "get",
+             {"headers": {"If-None-Match": client.get(url).headers["ETag"]}}),
+            ("PUT /places/<id>", "put",
+             {"headers": auth, "json": {"price": 60}})):
+        calls = timed_calls(client, method, url, **kwargs)
+        print(f"{name:<28}{calls:>12}{hooks_us + calls * wrapper_us:>14.3f}")
+
+    # End to end: recording on and off for every other request (so
+    # that drift affects both alike), median durations
+    durations = {True: [], False: []}
+    for index in range(2 * requests):
+        enabled = metrics.enabled = bool(index % 2)
+        started = time.perf_counter_ns()
+        client.get(url)
+        durations[enabled].append(time.perf_counter_ns() - started)
+    metrics.enabled = True
+    with_metrics, without = (statistics.median(durations[enabled]) / 1000
+                             for enabled in (True, False))
+    print()
+    print(f"GET /places/<id> end to end (median): {with_metrics:.1f} us "
+          f"with metrics, {without:.1f} us with recording off")
+
+
+if __name__ == "__main__":
+    main()
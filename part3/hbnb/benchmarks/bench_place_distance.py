@@ -0,0 +1,174 @@
+"""
+Benchmark - distance ranking of places around a point
+
+Compares the per-object loop (haversine_km on every Place-like object,
+then sort) with the vectorized PlaceCoordinateCache, for a radius
+filter and for a top-k ranking over the whole catalogue.
+
+Then times the whole facade search (facade.search_places_near) on a
+SQLite database of the same places: the staleness check of the cache
+(compared with the count + max(updated_at) it replaced), the ranking
+and the loading of the places found; a search after a place was moved
+by another connection (the changed places are read again); and a
+search on a cold cache (full load).
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_place_distance [N_PLACES] [REPEAT]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+_DB_DIR = tempfile.mkdtemp(prefix="hbnb-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+os.environ["USE_DATABASE"] = "true"
+
+from sqlalchemy import func, insert, select, update  # noqa: E402
+
+from hbnb.app import create_app, db  # noqa: E402
+from hbnb.app.geo import haversine_km  # noqa: E402
+from hbnb.app.models import Place, User  # noqa: E402
+from hbnb.app.persistence.coordinate_cache import (  # noqa: E402
+    PlaceCoordinateCache)
+from hbnb.app.services import facade  # noqa: E402
+
+CENTER = (48.8566, 2.3522)
+RADIUS_KM = 500
+TOP_K = 50
+
+
+def make_places(count, seed=42):
+    rng = random.Random(seed)
+    return [SimpleNamespace(id=str(i),
+                            latitude=rng.uniform(-90, 90),
+                            longitude=rng.uniform(-180, 180))
+            for i in range(count)]
+
+
+def loop_radius(places, lat, lon, radius_km):
+    results = []
+    for place in places:
+        distance = haversine_km(lat, lon, place.latitude, place.longitude)
+        if distance <= radius_km:
+            results.append((place.id, distance))
+    results.sort(key=lambda item: item[1])
+    return results
+
+
+def loop_top_k(places, lat, lon, k):
+    ranked = sorted(
+        ((place.id, haversine_km(lat, lon, place.latitude, place.longitude))
+         for place in places), key=lambda item: item[1])
+    return ranked[:k]
+
+
+def best_of(repeat, func, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def fill_database(places, chunk=50_000):
+    """Insert the places (and their owner) in the benchmark database."""
+    now = datetime.utcnow()
+    owner = str(uuid.uuid4())
+    db.session.execute(insert(User), [{
+        "id": owner, "first_name": "Bench", "last_name": "Owner",
+        "email": "owner@bench.io", "password": "x", "is_admin": False,
+        "created_at": now, "updated_at": now}])
+    for start in range(0, len(places), chunk):
+        db.session.execute(insert(Place), [{
+            "id": str(uuid.uuid4()), "title": "Bench", "price": 10,
+            "latitude": p.latitude, "longitude": p.longitude,
+            "owner_id": owner, "created_at": now, "updated_at": now}
+            for p in places[start:start + chunk]])
+    db.session.commit()
+
+
+def facade_search(places, repeat):
+    """Time facade.search_places_near and its staleness check."""
+    app = create_app("production")
+    with app.app_context():
+        start = time.perf_counter()
+        fill_database(places)
+        print(f"\nSQLite database filled in "
+              f"{time.perf_counter() - start:.1f}s")
+
+        def previous_check():
+            return db.session.execute(
+                select(func.count(), func.max(Place.updated_at))).one()
+
+        def move_elsewhere():
+            # Another process's write: behind the facade's back
+            with db.engine.begin() as connection:
+                connection.execute(
+                    update(Place).where(Place.id == place_id)
+                    .values(latitude=random.uniform(-90, 90)))
+
+        place_id = db.session.scalar(select(Place.id).limit(1))
+        cold, _ = best_of(1, facade.search_places_near, *CENTER, RADIUS_KM)
+        print(f"{'facade search':<28}{'best':>10}")
+        for label, func_, args in (
+                ("staleness check", facade.place_repo.get_coordinates_version,
+                 ()),
+                ("count + max(updated_at)", previous_check, ()),
+                (f"radius {RADIUS_KM} km", facade.search_places_near,
+                 (*CENTER, RADIUS_KM)),
+                (f"top {TOP_K}", facade.search_places_near,
+                 (*CENTER, None, TOP_K))):
+            elapsed, _ = best_of(repeat, func_, *args)
+            print(f"{label:<28}{elapsed * 1000:>8.2f}ms")
+
+        after_write = float("inf")
+        for _ in range(repeat):
+            move_elsewhere()
+            elapsed, _ = best_of(1, facade.search_places_near, *CENTER, None,
+                                 TOP_K)
+            after_write = min(after_write, elapsed)
+        print(f"{'top ' + str(TOP_K) + ' after a write':<28}"
+              f"{after_write * 1000:>8.2f}ms")
+        print(f"{'radius, cold cache (load)':<28}{cold * 1000:>8.2f}ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    places = make_places(count)
+
+    start = time.perf_counter()
+    cache = PlaceCoordinateCache()
+    cache.load((p.id, p.latitude, p.longitude) for p in places)
+    print(f"{count:,} places, cache built in "
+          f"{time.perf_counter() - start:.2f}s")
+
+    cases = [
+        (f"radius {RADIUS_KM} km",
+         (loop_radius, places, *CENTER, RADIUS_KM),
+         (cache.nearest, *CENTER, RADIUS_KM)),
+        (f"top {TOP_K}",
+         (loop_top_k, places, *CENTER, TOP_K),
+         (cache.nearest, *CENTER, None, TOP_K)),
+    ]
+    print(f"{'query':<16}{'loop':>12}{'numpy':>12}{'speedup':>10}"
+          f"{'places/s (numpy)':>20}")
+    for label, loop_case, cache_case in cases:
+        loop_time, expected = best_of(repeat, *loop_case)
+        cache_time, got = best_of(repeat, *cache_case)
+        assert [p for p, _ in got] == [p for p, _ in expected], label
+        print(f"{label:<16}{loop_time * 1000:>10.1f}ms"
+              f"{cache_time * 1000:>10.1f}ms{loop_time / cache_time:>9.1f}x"
+              f"{count / cache_time:>20,.0f}")
+
+    facade_search(places, repeat)
+
+
+if __name__ == "__main__":
+    main()
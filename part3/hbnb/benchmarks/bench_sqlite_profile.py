@@ -0,0 +1,101 @@
+"""
+Benchmark - mixed read/write throughput per SQLite profile
+
+Runs WORKERS processes (like the workers of a WSGI server) against one
+fresh SQLite file for a fixed time, each doing GET /api/v1/places/<id>
+and, one request in WRITE_EVERY, a PUT on a place. Compares the plain
+settings (foreign keys only, default pool) with the production profile
+(WAL, synchronous=NORMAL, busy_timeout, mmap, cache, sized pool). The
+response cache is off so that every read reaches the database.
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_sqlite_profile [WORKERS] [SECONDS] [WRITE_EVERY]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ["USE_DATABASE"] = "true"
+
+from hbnb.app import create_app  # noqa: E402  (reads USE_DATABASE)
+from hbnb.config import ProductionConfig, config  # noqa: E402
+
+PLACES = 200
+PROFILES = {
+    "plain": {"SQLITE_PRAGMAS": {"foreign_keys": "ON"},
+              "SQLALCHEMY_ENGINE_OPTIONS": {}},
+    "production": {},
+}
+
+
+def make_app(label, path):
+    """App of a production config variant on the database file `path`."""
+    name = f"bench-{label}"
+    config[name] = type(name, (ProductionConfig,), dict(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
+        RESPONSE_CACHE_SIZE=0, **PROFILES[label]))
+    return create_app(name)
+
+
+def setup(label):
+    """Fresh database with PLACES places; returns (path, ids, auth header)."""
+    path = os.path.join(tempfile.mkdtemp(prefix="hbnb-bench-"), "bench.db")
+    client = make_app(label, path).test_client()
+    login = client.post("/api/v1/auth/login", json={
+        "email": "admin@hbnb.io", "password": "admin1234"})
+    auth = {"Authorization": f"Bearer {login.json['access_token']}"}
+    place_ids = [client.post("/api/v1/places/", json={
+        "title": f"Place {i}", "description": "benchmark", "price": 50,
+        "latitude": 0, "longitude": 0}, headers=auth).json["id"]
+        for i in range(PLACES)]
+    return path, place_ids, auth
+
+
+def worker(label, path, place_ids, auth, start, seconds, write_every, seed):
+    """One process: mixed requests until start + seconds."""
+    client = make_app(label, path).test_client()
+    rng = random.Random(seed)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    while time.time() < start:
+        time.sleep(0.01)
+    n = 0
+    while time.time() < start + seconds:
+        n += 1
+        place_id = rng.choice(place_ids)
+        if n % write_every == 0:
+            resp = client.put(f"/api/v1/places/{place_id}",
+                              json={"price": rng.randint(1, 500)}, headers=auth)
+            kind = "writes"
+        else:
+            resp = client.get(f"/api/v1/places/{place_id}")
+            kind = "reads"
+        counts[kind if resp.status_code == 200 else "errors"] += 1
+    return counts
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    write_every = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    context = multiprocessing.get_context("spawn")
+    print(f"{workers} workers, {seconds:.0f} s, 1 write every {write_every}")
+    print(f"{'profile':<12}{'reads/s':>10}{'writes/s':>10}{'errors':>8}")
+    for label in PROFILES:
+        path, place_ids, auth = setup(label)
+        # Leave the workers time to start their app
+        start = time.time() + 3 + 2 * workers
+        with context.Pool(workers) as pool:
+            results = pool.starmap(worker, [
+                (label, path, place_ids, auth, start, seconds, write_every,
+                 seed) for seed in range(workers)])
+        total = {key: sum(counts[key] for counts in results)
+                 for key in results[0]}
+        print(f"{label:<12}{total['reads'] / seconds:>10.0f}"
+              f"{total['writes'] / seconds:>10.0f}{total['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
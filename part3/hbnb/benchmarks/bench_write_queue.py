@@ -0,0 +1,108 @@
+"""
+Benchmark - concurrent review creation, with and without the writer queue
+
+THREADS threads (like the threads of a WSGI worker) create reviews
+through the facade for SECONDS, on the production SQLite profile:
+first with each thread committing its own writes, then with
+WRITE_QUEUE on (one writer thread, group commits). Reports reviews/s,
+latency percentiles, errors and, for the queue, the mean batch size.
+
+Usage (from part3/):
+    python -m hbnb.benchmarks.bench_write_queue [THREADS] [SECONDS]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ["USE_DATABASE"] = "true"
+
+from hbnb.app import create_app  # noqa: E402  (reads USE_DATABASE)
+from hbnb.app.persistence.write_queue import write_queue  # noqa: E402
+from hbnb.app.services import facade  # noqa: E402
+from hbnb.config import ProductionConfig, config  # noqa: E402
+
+PLACES = 500
+
+
+def make_app(label, write_queue_on):
+    """Production app on a fresh database file."""
+    path = os.path.join(tempfile.mkdtemp(prefix="hbnb-bench-"), "bench.db")
+    name = f"bench-{label}"
+    config[name] = type(name, (ProductionConfig,), dict(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
+        PASSWORD_WORK_FACTOR=4, WRITE_QUEUE=write_queue_on))
+    return create_app(name)
+
+
+def setup(app, threads):
+    """One owner with PLACES places, one reviewer per thread."""
+    with app.app_context():
+        owner = facade.create_user({
+            "first_name": "Owner", "last_name": "Bench",
+            "email": "owner@bench.io", "password": "x"})
+        created, _ = facade.create_places([
+            {"title": f"Place {i}", "description": "benchmark", "price": 50,
+             "latitude": 0, "longitude": 0} for i in range(PLACES)], owner.id)
+        place_ids = [place.id for _, place in created]
+        user_ids = [facade.create_user({
+            "first_name": "Reviewer", "last_name": str(i),
+            "email": f"reviewer{i}@bench.io", "password": "x"}).id
+            for i in range(threads)]
+    return place_ids, user_ids
+
+
+def reviewer(app, user_id, place_ids, deadline, latencies, errors):
+    """Review places one after the other until the deadline."""
+    with app.app_context():
+        for place_id in place_ids:
+            if time.perf_counter() >= deadline:
+                return
+            started = time.perf_counter()
+            try:
+                facade.create_review({"text": "Benchmark review", "rating": 4,
+                                      "user_id": user_id,
+                                      "place_id": place_id})
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors.append(1)
+
+
+def run(label, threads, seconds):
+    app = make_app(label, label == "queue")
+    place_ids, user_ids = setup(app, threads)
+    stats_before = write_queue.stats()
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    workers = [threading.Thread(target=reviewer, args=(
+        app, user_id, place_ids, deadline, latencies, errors))
+        for user_id in user_ids]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    stats = write_queue.stats()
+    write_queue.shutdown()
+    latencies.sort()
+    batches = stats["batches"] - stats_before["batches"]
+    operations = stats["operations"] - stats_before["operations"]
+    mean_batch = f"{operations / batches:.1f}" if batches else "-"
+    print(f"{label:<8}{len(latencies) / seconds:>10.0f}"
+          f"{latencies[len(latencies) // 2] * 1000:>9.1f}"
+          f"{latencies[int(len(latencies) * 0.99)] * 1000:>9.1f}"
+          f"{len(errors):>8}{mean_batch:>8}")
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print(f"{threads} threads, {seconds:.0f} s")
+    print(f"{'mode':<8}{'writes/s':>10}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>8}{'batch':>8}")
+    for label in ("direct", "queue"):
+        run(label, threads, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Configuration settings for the HBnB application."""
 import os
+import tempfile
 from datetime import timedelta
 
 
@@ -7,9 +8,52 @@ class Config:
     """Base configuration class."""
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=30)
+    # Short-lived access tokens, renewed with a refresh token (POST
+    # /api/v1/auth/refresh); POST /api/v1/auth/logout revokes a token
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Revoked tokens: "memory" (one process) or "database" (shared by
+    # several workers), see app/token_blocklist.py
+    JWT_BLOCKLIST_STORE = os.getenv('JWT_BLOCKLIST_STORE', 'memory')
+    # Password hashing pool (see app/hashing.py). PASSWORD_WORK_FACTOR is
+    # the bcrypt cost of new hashes, or a callable returning it.
+    PASSWORD_WORK_FACTOR = int(os.getenv('PASSWORD_WORK_FACTOR', 12))
+    PASSWORD_HASH_WORKERS = None        # one process per CPU
+    PASSWORD_HASH_QUEUE_SIZE = 32       # waiting calls before 503
+    PASSWORD_HASH_RETRY_AFTER = 1       # seconds
+    # Recently verified logins skip bcrypt (see app/credential_cache.py)
+    CREDENTIAL_CACHE_TTL = 60           # seconds, 0 disables it
+    CREDENTIAL_CACHE_SIZE = 10000       # entries
+    # Recently read user records (see app/user_cache.py)
+    USER_CACHE_SIZE = 1024              # entries, 0 disables it
+    # Public GET responses (see app/response_cache.py)
+    RESPONSE_CACHE_SIZE = 4096          # entries, 0 disables it
+    RESPONSE_CACHE_TTL = 300            # seconds
+    # Place coordinates in NumPy arrays for the near= search (see
+    # app/persistence/coordinate_cache.py); off: bounding box + haversine
+    # on the repository
+    PLACE_COORDINATE_CACHE = os.getenv(
+        'PLACE_COORDINATE_CACHE', 'true').lower() == 'true'
+    # Facade writes on one thread, committed in groups (see
+    # app/persistence/write_queue.py); SQL backend only
+    WRITE_QUEUE = os.getenv('WRITE_QUEUE', 'false').lower() == 'true'
+    WRITE_QUEUE_BATCH = 64              # operations per commit at most
+    WRITE_QUEUE_DELAY_MS = 2            # wait for more operations
+    WRITE_QUEUE_SIZE = 1024             # queued operations before blocking
     DEBUG = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # PRAGMAs set on every SQLite connection (see app/persistence/sqlite.py)
+    SQLITE_PRAGMAS = {'foreign_keys': 'ON'}
+    # Request and facade / repository timings on GET /metrics (see
+    # app/metrics.py); meant to be scraped from the internal network
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    # Read replica of the facade's get_* methods, if set (see
+    # app/persistence/routing.py); a SQLite file copy of the primary
+    # will do (`flask hbnb sync-replica`)
+    REPLICA_BIND = 'replica'
+    REPLICA_STICKY_SECONDS = 5          # primary reads after a write
+    SQLALCHEMY_BINDS = ({REPLICA_BIND: os.getenv('DATABASE_REPLICA_URL')}
+                        if os.getenv('DATABASE_REPLICA_URL') else {})
 
 
 class DevelopmentConfig(Config):
@@ -21,13 +65,36 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
+    PASSWORD_WORK_FACTOR = 4            # bcrypt minimum: fast tests
+    # A scratch file rather than instance/development.db, so test runs
+    # leave the development database alone (not in memory: the async
+    # engine opens the same file)
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'TEST_DATABASE_URL',
+        'sqlite:///' + os.path.join(tempfile.gettempdir(), 'hbnb-testing.db'))
 
 
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    # Many concurrent readers, one writer at a time (see
+    # app/persistence/sqlite.py)
+    SQLITE_PRAGMAS = {
+        'busy_timeout': 5000,           # ms waiting for the write lock
+        'foreign_keys': 'ON',
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,           # KiB (64 MiB) per connection
+        'mmap_size': 268435456,         # bytes (256 MiB)
+        'temp_store': 'MEMORY',
+    }
+    # One connection per worker thread, none opened beyond that
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 8)),
+        'max_overflow': 0,
+        'pool_timeout': 30,
+    }
 
 
 config = {
@@ -15,6 +15,13 @@ CREATE TABLE IF NOT EXISTS places (
     latitude    FLOAT,
     longitude   FLOAT,
     owner_id    CHAR(36) NOT NULL,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum   INTEGER NOT NULL DEFAULT 0,
+    rating_1     INTEGER NOT NULL DEFAULT 0,
+    rating_2     INTEGER NOT NULL DEFAULT 0,
+    rating_3     INTEGER NOT NULL DEFAULT 0,
+    rating_4     INTEGER NOT NULL DEFAULT 0,
+    rating_5     INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (owner_id) REFERENCES User(id)
 );
 
@@ -41,3 +48,37 @@ CREATE TABLE place_amenity (
     FOREIGN KEY (place_id)   REFERENCES places(id)   ON DELETE CASCADE,
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
+
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id ON reviews (place_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_user_id  ON reviews (user_id);
+CREATE INDEX IF NOT EXISTS ix_places_price ON places (price);
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity (amenity_id, place_id);
+-- sort=rating (Place.RATING_ORDER, then created_at, id)
+CREATE INDEX IF NOT EXISTS ix_places_rating ON places (
+    -coalesce(CAST(rating_sum AS FLOAT) / (nullif(review_count, 0) + 0.0), 0),
+    -review_count, created_at, id);
+
+-- Places added, moved or deleted, for the coordinate caches of the
+-- workers (see app/models/place_change.py)
+CREATE TABLE IF NOT EXISTS place_changes (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    place_id VARCHAR(36) NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS tr_places_log_insert
+AFTER INSERT ON places BEGIN
+    INSERT INTO place_changes (place_id) VALUES (NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS tr_places_log_move
+AFTER UPDATE OF latitude, longitude ON places
+WHEN NEW.latitude IS NOT OLD.latitude
+    OR NEW.longitude IS NOT OLD.longitude BEGIN
+    INSERT INTO place_changes (place_id) VALUES (NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS tr_places_log_delete
+AFTER DELETE ON places BEGIN
+    INSERT INTO place_changes (place_id) VALUES (OLD.id);
+END;
+CREATE TRIGGER IF NOT EXISTS tr_place_changes_prune
+AFTER INSERT ON place_changes BEGIN
+    DELETE FROM place_changes WHERE seq <= NEW.seq - 10000;
+END;
@@ -0,0 +1,229 @@
+"""
+Tests - ASGI serving mode (async facade and handlers)
+Covers:
+- Async facade: rating aggregates kept with reviews, a failed update
+  rolled back, a place deleted with its reviews, caches invalidated
+  after the commit
+- Async handlers answer like the sync ones (status codes, bodies,
+  validation and JWT errors, ETag / 304)
+- Tokens issued by either mode are accepted by the other; a logout
+  revokes the token and its refresh token for both
+- Bulk, search and query-string requests are served by the Flask app
+"""
+import asyncio
+import unittest
+import uuid
+from starlette.testclient import TestClient
+from hbnb.app import create_app
+from hbnb.app.aio import create_asgi_app
+from hbnb.app.aio.database import async_db
+from hbnb.app.aio.facade import AsyncHBnBFacade
+from hbnb.app.response_cache import response_cache
+from hbnb.app.services.facade import USE_DATABASE
+
+ADMIN = {"email": "admin@hbnb.io", "password": "admin1234"}
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+def run(coroutine):
+    """Run a coroutine on a new loop, leaving no connection behind"""
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await async_db.session.remove()
+            await async_db.dispose()
+    return asyncio.run(main())
+
+
+class TestAsyncFacade(unittest.TestCase):
+    """Runs on the async engine directly, whatever the backend."""
+
+    def setUp(self):
+        self.app = create_app()
+        async_db.init_app(self.app)
+        self.facade = AsyncHBnBFacade()
+        self.owner_id, self.reviewer_id, self.place_id = run(self.populate())
+
+    def tearDown(self):
+        run(self.facade.delete_place(self.place_id))
+
+    async def populate(self):
+        users = [await self.facade.create_user({
+            "first_name": "Async", "last_name": "User",
+            "email": f"{unique('async')}@test.com", "password": "x"})
+            for _ in range(2)]
+        place = await self.facade.create_place({
+            "title": "Async place", "description": "test", "price": 80,
+            "latitude": 10, "longitude": 20, "owner_id": users[0].id})
+        return users[0].id, users[1].id, place.id
+
+    def test_review_updates_place_aggregates(self):
+        """Create, failed update, delete: aggregates follow each commit."""
+        async def scenario():
+            review = await self.facade.create_review({
+                "text": "Great", "rating": 4, "user_id": self.reviewer_id,
+                "place_id": self.place_id})
+            place = await self.facade.get_place(self.place_id)
+            created = (place.review_count, place.rating_4)
+            await async_db.session.remove()
+            with self.assertRaises(ValueError):
+                await self.facade.update_review(review.id, {"rating": 9})
+            await async_db.session.remove()
+            place = await self.facade.get_place(self.place_id)
+            after_failure = (place.review_count, place.rating_4)
+            await self.facade.delete_review(review.id)
+            await async_db.session.remove()
+            place = await self.facade.get_place(self.place_id)
+            return created, after_failure, (place.review_count,
+                                            place.rating_4)
+
+        self.assertEqual(run(scenario()), ((1, 1), (1, 1), (0, 0)))
+
+    def test_delete_place_with_reviews(self):
+        """The place's reviews go with it, in the same commit."""
+        async def scenario():
+            review = await self.facade.create_review({
+                "text": "Fine", "rating": 3, "user_id": self.reviewer_id,
+                "place_id": self.place_id})
+            await async_db.session.remove()
+            await self.facade.delete_place(self.place_id)
+            return (await self.facade.get_place(self.place_id),
+                    await self.facade.get_review(review.id))
+
+        self.assertEqual(run(scenario()), (None, None))
+        place = run(self.facade.create_place({
+            "title": "Async place", "description": "test", "price": 80,
+            "latitude": 10, "longitude": 20, "owner_id": self.owner_id}))
+        self.place_id = place.id
+
+    def test_cache_invalidated_after_commit(self):
+        """A cached place response is dropped by an async update."""
+        key = f"/api/v1/places/{self.place_id}?"
+        response_cache.put(key, "{}", [("place", self.place_id)],
+                           response_cache.generation())
+        run(self.facade.update_place(self.place_id, {"price": 90}))
+        self.assertIsNone(response_cache.get(key))
+
+
+@unittest.skipUnless(USE_DATABASE, "the ASGI app runs on the SQL backend")
+class TestAsgiApi(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(create_asgi_app())
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+        self.flask_client = self.client.app.state.flask_app.test_client()
+        resp = self.client.post("/api/v1/auth/login", json=ADMIN)
+        self.auth = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    def new_place(self):
+        resp = self.client.post("/api/v1/places/", json={
+            "title": unique("Async "), "description": "test", "price": 100,
+            "latitude": 5, "longitude": 5}, headers=self.auth)
+        self.assertEqual(resp.status_code, 201, resp.text)
+        self.addCleanup(self.client.delete,
+                        f"/api/v1/places/{resp.json()['id']}",
+                        headers=self.auth)
+        return resp.json()
+
+    def test_place_lifecycle(self):
+        """Create, read (cached, ETag / 304), update, delete."""
+        place = self.new_place()
+        url = f"/api/v1/places/{place['id']}"
+        self.assertEqual(place["price"], 100.0)
+        resp = self.client.get(url)
+        self.assertEqual(resp.json(), self.flask_client.get(url).json)
+        etag = resp.headers["ETag"]
+        self.assertEqual(self.flask_client.get(url).headers["ETag"], etag)
+        self.assertEqual(self.client.get(
+            url, headers={"If-None-Match": etag}).status_code, 304)
+
+        resp = self.client.put(url, json={"price": 120}, headers=self.auth)
+        self.assertEqual(resp.json()["price"], 120.0)
+        self.assertEqual(self.client.get(url).json()["price"], 120.0)
+        self.assertEqual(self.client.get(
+            url, headers={"If-None-Match": etag}).status_code, 200)
+
+        self.assertEqual(self.client.delete(url, headers=self.auth).json(),
+                         {"message": "Place deleted successfully"})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_amenity_links_and_reviews(self):
+        """Link rules and review rules of the sync handlers."""
+        place = self.new_place()
+        url = f"/api/v1/places/{place['id']}"
+        amenity = self.client.get("/api/v1/amenities/").json()[0]
+        link = f"{url}/amenities/{amenity['id']}"
+        self.assertEqual(self.client.post(link, headers=self.auth).status_code,
+                         200)
+        self.assertEqual(self.client.post(link, headers=self.auth).json(),
+                         {"error": "Amenity already linked to this place"})
+        self.assertEqual(self.client.get(f"{url}/amenities").json(), [amenity])
+        self.assertEqual(
+            self.client.delete(link, headers=self.auth).status_code, 200)
+
+        review = {"text": "Mine", "rating": 5, "user_id": "ignored",
+                  "place_id": place["id"]}
+        resp = self.client.post("/api/v1/reviews/", json=review,
+                                headers=self.auth)
+        self.assertEqual((resp.status_code, resp.json()),
+                         (400, {"error": "You cannot review your own place"}))
+        self.assertEqual(self.client.get(f"{url}/reviews").json(), [])
+
+    def test_errors_match_the_sync_api(self):
+        """Validation and JWT errors: same status and body in both modes."""
+        requests = [
+            ("post", "/api/v1/amenities/", {"json": {"name": 1},
+                                            "headers": self.auth}),
+            ("post", "/api/v1/amenities/", {"json": {}, "headers": self.auth}),
+            ("post", "/api/v1/amenities/", {"json": {"name": "x"}}),
+            ("post", "/api/v1/amenities/", {
+                "json": {"name": "x"},
+                "headers": {"Authorization": "Bearer not-a-token"}}),
+            ("put", "/api/v1/places/missing", {"json": {"price": 1},
+                                               "headers": self.auth}),
+            ("post", "/api/v1/auth/login", {"json": {
+                "email": "admin@hbnb.io", "password": "wrong"}}),
+            ("get", "/api/v1/reviews/missing", {}),
+        ]
+        for method, url, kwargs in requests:
+            resp = getattr(self.client, method)(url, **kwargs)
+            expected = getattr(self.flask_client, method)(url, **kwargs)
+            self.assertEqual((resp.status_code, resp.json()),
+                             (expected.status_code, expected.json),
+                             f"{method} {url}")
+
+    def test_tokens_work_in_both_modes(self):
+        """Either mode's token passes the other; logout revokes the pair."""
+        resp = self.flask_client.post("/api/v1/auth/login", json=ADMIN)
+        flask_auth = {"Authorization": f"Bearer {resp.json['access_token']}"}
+        refresh = {"Authorization": f"Bearer {resp.json['refresh_token']}"}
+        for auth in (self.auth, flask_auth):
+            self.assertEqual(self.client.get("/api/v1/auth/protected",
+                                             headers=auth).status_code, 200)
+            self.assertEqual(self.flask_client.get(
+                "/api/v1/auth/protected", headers=auth).status_code, 200)
+        self.client.post("/api/v1/auth/logout", headers=flask_auth)
+        for client in (self.client, self.flask_client):
+            resp = client.get("/api/v1/auth/protected", headers=flask_auth)
+            self.assertEqual(resp.status_code, 401)
+            resp = client.post("/api/v1/auth/refresh", headers=refresh)
+            self.assertEqual(resp.status_code, 401)
+
+    def test_flask_fallback(self):
+        """Query strings, search and the docs are served by Flask."""
+        place = self.new_place()
+        resp = self.client.get("/api/v1/places/?limit=1")
+        self.assertEqual(list(resp.json()), ["items", "next_cursor"])
+        resp = self.client.get(
+            "/api/v1/places/search?lat=5&lon=5&radius_km=1")
+        self.assertIn(place["id"], [found["id"] for found in resp.json()])
+        self.assertEqual(self.client.get("/api/v1/docs").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
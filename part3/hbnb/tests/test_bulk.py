@@ -0,0 +1,200 @@
+"""
+Tests - Bulk create endpoints
+Covers:
+- All items valid → 201 with the created ids, fetchable afterwards
+- Mixed valid / invalid items → 207, errors reported by index
+- Duplicate amenity names within one batch
+- Bulk reviews follow the single-review rules and update the
+  place rating aggregates
+- Bulk places are found by radius search
+- Non-array / empty body → 400, non-admin amenities → 403
+- Rows written concurrently (after the duplicate checks read the data)
+  are reported by index, not a 500
+"""
+import unittest
+import uuid
+from unittest import mock
+from hbnb.app import create_app
+from hbnb.app.services import facade
+from hbnb.app.services.facade import USE_DATABASE
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class BulkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.admin_auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+    def create_user(self):
+        email = f"{unique('bulk_')}@example.com"
+        self.client.post("/api/v1/users/", json={
+            "first_name": "Bulk", "last_name": "User",
+            "email": email, "password": "pass123"
+        }, headers=self.admin_auth)
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": email, "password": "pass123"
+        })
+        return {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+    def place_item(self, **overrides):
+        item = {"title": unique("Bulk "), "description": "test", "price": 80,
+                "latitude": 12.0, "longitude": 34.0}
+        item.update(overrides)
+        return item
+
+
+class TestBulkCreate(BulkTestCase):
+
+    def test_places_all_valid(self):
+        """Every place is created and can be fetched by id."""
+        resp = self.client.post("/api/v1/places/bulk", json=[
+            self.place_item(), self.place_item()], headers=self.admin_auth)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([c["index"] for c in resp.json["created"]], [0, 1])
+        self.assertEqual(resp.json["errors"], [])
+        for created in resp.json["created"]:
+            place = self.client.get(f"/api/v1/places/{created['id']}")
+            self.assertEqual(place.status_code, 200)
+            self.assertEqual(place.json["review_count"], 0)
+
+    def test_places_partial(self):
+        """Invalid items are reported by index, the others are created."""
+        resp = self.client.post("/api/v1/places/bulk", json=[
+            self.place_item(), self.place_item(price=-1),
+            "not an object", self.place_item(latitude=95)
+        ], headers=self.admin_auth)
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([c["index"] for c in resp.json["created"]], [0])
+        self.assertEqual([e["index"] for e in resp.json["errors"]], [1, 2, 3])
+
+    def test_places_found_by_search(self):
+        """Bulk-created places are in the coordinate cache."""
+        resp = self.client.post("/api/v1/places/bulk", json=[
+            self.place_item(latitude=-54.8, longitude=-68.3)
+        ], headers=self.admin_auth)
+        place_id = resp.json["created"][0]["id"]
+        found = self.client.get(
+            "/api/v1/places/search?lat=-54.8&lon=-68.3&radius_km=1")
+        self.assertIn(place_id, [p["id"] for p in found.json])
+
+    def test_amenities_duplicates(self):
+        """A name repeated in the batch or already taken is rejected."""
+        name = unique("Sauna ")
+        resp = self.client.post("/api/v1/amenities/bulk", json=[
+            {"name": name}, {"name": name}, {"name": ""}
+        ], headers=self.admin_auth)
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([c["index"] for c in resp.json["created"]], [0])
+        again = self.client.post("/api/v1/amenities/bulk", json=[
+            {"name": name}], headers=self.admin_auth)
+        self.assertEqual(again.status_code, 400)
+        self.assertEqual(again.json["created"], [])
+
+    def test_amenities_admin_only(self):
+        """Non-admin users cannot bulk create amenities."""
+        resp = self.client.post("/api/v1/amenities/bulk", json=[
+            {"name": unique("Pool ")}], headers=self.create_user())
+        self.assertEqual(resp.status_code, 403)
+
+    def test_reviews_rules_and_aggregates(self):
+        """Own place, unknown place and duplicates fail; ratings add up."""
+        places = self.client.post("/api/v1/places/bulk", json=[
+            self.place_item(), self.place_item()], headers=self.admin_auth)
+        first, second = [c["id"] for c in places.json["created"]]
+        reviewer = self.create_user()
+        resp = self.client.post("/api/v1/reviews/bulk", json=[
+            {"text": "Great", "rating": 5, "place_id": first},
+            {"text": "Again", "rating": 1, "place_id": first},
+            {"text": "Fine", "rating": 3, "place_id": second},
+            {"text": "Lost", "rating": 4, "place_id": "missing"},
+            {"text": "Bad", "rating": 9, "place_id": second},
+        ], headers=reviewer)
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([c["index"] for c in resp.json["created"]], [0, 2])
+        self.assertEqual([e["index"] for e in resp.json["errors"]], [1, 3, 4])
+
+        place = self.client.get(f"/api/v1/places/{first}").json
+        self.assertEqual(place["review_count"], 1)
+        self.assertEqual(place["rating_histogram"]["5"], 1)
+        reviews = self.client.get(f"/api/v1/places/{second}/reviews").json
+        self.assertEqual([r["rating"] for r in reviews], [3])
+
+        own = self.client.post("/api/v1/reviews/bulk", json=[
+            {"text": "Mine", "rating": 5, "place_id": first}
+        ], headers=self.admin_auth)
+        self.assertEqual(own.status_code, 400)
+
+    def test_invalid_body(self):
+        """The body must be a non-empty JSON array."""
+        for body in ({"title": "x"}, [], None):
+            resp = self.client.post("/api/v1/places/bulk", json=body,
+                                    headers=self.admin_auth)
+            self.assertEqual(resp.status_code, 400, body)
+
+
+@unittest.skipUnless(USE_DATABASE, "constraints are enforced by the database")
+class TestBulkConcurrentWrites(BulkTestCase):
+    """The duplicate checks read data that is stale by the insert."""
+
+    def stale_first_read(self, repo, method):
+        """Make the first call of repo.method see no rows."""
+        original = getattr(repo, method)
+        calls = []
+
+        def read(*args, **kwargs):
+            calls.append(1)
+            return [] if len(calls) == 1 else original(*args, **kwargs)
+        patcher = mock.patch.object(repo, method, read)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_amenity_created_meanwhile(self):
+        """The taken name is reported by index, the rest created."""
+        taken = unique("Spa ")
+        self.client.post("/api/v1/amenities/", json={"name": taken},
+                         headers=self.admin_auth)
+        self.stale_first_read(facade.amenity_repo, "get_all")
+        resp = self.client.post("/api/v1/amenities/bulk", json=[
+            {"name": unique("Gym ")}, {"name": taken}, {"name": ""}
+        ], headers=self.admin_auth)
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([c["index"] for c in resp.json["created"]], [0])
+        self.assertEqual(resp.json["errors"][0],
+                         {"index": 1, "error": f"Amenity '{taken}' already exists"})
+        self.assertEqual([e["index"] for e in resp.json["errors"]], [1, 2])
+
+    def test_review_created_meanwhile(self):
+        """Already reviewed places are reported, aggregates stay exact."""
+        places = self.client.post("/api/v1/places/bulk", json=[
+            self.place_item(), self.place_item()], headers=self.admin_auth)
+        first, second = [c["id"] for c in places.json["created"]]
+        reviewer = self.create_user()
+        self.client.post("/api/v1/reviews/", json={
+            "text": "Before", "rating": 2, "place_id": first,
+            "user_id": "placeholder"}, headers=reviewer)
+        self.stale_first_read(facade.review_repo, "find_by")
+        resp = self.client.post("/api/v1/reviews/bulk", json=[
+            {"text": "Again", "rating": 5, "place_id": first},
+            {"text": "Fine", "rating": 4, "place_id": second},
+        ], headers=reviewer)
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([c["index"] for c in resp.json["created"]], [1])
+        self.assertEqual(resp.json["errors"], [
+            {"index": 0, "error": "You have already reviewed this place"}])
+        place = self.client.get(f"/api/v1/places/{first}").json
+        self.assertEqual((place["review_count"], place["average_rating"]),
+                         (1, 2.0))
+        self.assertEqual(
+            self.client.get(f"/api/v1/places/{second}").json["review_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
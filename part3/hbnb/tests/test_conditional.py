@@ -0,0 +1,108 @@
+"""
+Tests - ETag / Last-Modified and conditional GET
+Covers:
+- Item and collection responses carry ETag and Last-Modified
+- If-None-Match with the current ETag gets an empty 304; any write to
+  the item (or a review changing its rating aggregates) changes it
+- Collection ETags change on create; If-Modified-Since
+- ?expand= responses carry no validators; missing items still 404
+"""
+import time
+import unittest
+import uuid
+from hbnb.app import create_app
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.admin = self.login("admin@hbnb.io", "admin1234")
+        email = f"{unique('etag_')}@example.com"
+        resp = self.client.post("/api/v1/users/", json={
+            "first_name": "Etag", "last_name": "Owner", "email": email,
+            "password": "pass1234"}, headers=self.admin)
+        self.owner = self.login(email, "pass1234")
+        resp = self.client.post("/api/v1/places/", json={
+            "title": "Validated", "description": "Test", "price": 80,
+            "latitude": 1, "longitude": 2}, headers=self.owner)
+        self.place_url = f"/api/v1/places/{resp.json['id']}"
+        self.place_id = resp.json["id"]
+
+    def login(self, email, password):
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": email, "password": password})
+        return {"Authorization": f"Bearer {resp.json['access_token']}"}
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, headers={"If-None-Match": etag})
+
+    def test_item_not_modified(self):
+        """An unchanged place answers 304 with no body."""
+        resp = self.client.get(self.place_url)
+        etag = resp.headers["ETag"]
+        self.assertIn("Last-Modified", resp.headers)
+        resp = self.revalidate(self.place_url, etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.data, b"")
+        self.assertEqual(resp.headers["ETag"], etag)
+
+    def test_item_write_changes_etag(self):
+        """Updates and new reviews make the old ETag fail."""
+        etag = self.client.get(self.place_url).headers["ETag"]
+        self.client.put(self.place_url, json={"title": "Changed"},
+                        headers=self.owner)
+        resp = self.revalidate(self.place_url, etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json["title"], "Changed")
+
+        etag = resp.headers["ETag"]
+        guest_id = self.client.get("/api/v1/users/").json[0]["id"]
+        self.client.post("/api/v1/reviews/", json={
+            "text": "Nice", "rating": 4, "user_id": guest_id,
+            "place_id": self.place_id}, headers=self.admin)
+        resp = self.revalidate(self.place_url, etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json["review_count"], 1)
+
+    def test_collection(self):
+        """A collection's ETag changes when an item is added."""
+        for url in ("/api/v1/amenities/", "/api/v1/users/",
+                    "/api/v1/reviews/", "/api/v1/places/?limit=5"):
+            etag = self.client.get(url).headers["ETag"]
+            self.assertEqual(self.revalidate(url, etag).status_code, 304, url)
+        etag = self.client.get("/api/v1/amenities/").headers["ETag"]
+        self.client.post("/api/v1/amenities/", json={"name": unique("Bar ")},
+                         headers=self.admin)
+        self.assertEqual(
+            self.revalidate("/api/v1/amenities/", etag).status_code, 200)
+
+    def test_if_modified_since(self):
+        """Last-Modified can be sent back in If-Modified-Since."""
+        last_modified = self.client.get(self.place_url).headers["Last-Modified"]
+        resp = self.client.get(self.place_url,
+                               headers={"If-Modified-Since": last_modified})
+        self.assertEqual(resp.status_code, 304)
+        time.sleep(1)
+        self.client.put(self.place_url, json={"price": 90}, headers=self.owner)
+        resp = self.client.get(self.place_url,
+                               headers={"If-Modified-Since": last_modified})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_no_validators(self):
+        """Expanded representations and 404s carry no ETag."""
+        resp = self.client.get(f"{self.place_url}?expand=owner")
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("ETag", resp.headers)
+        resp = self.client.get("/api/v1/places/missing")
+        self.assertEqual(resp.status_code, 404)
+        self.assertNotIn("ETag", resp.headers)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,110 @@
+"""
+Tests - Verified-credential cache
+Covers:
+- A verified password is a hit for the same user and hash version only
+- Wrong passwords, expired entries and a changed hash are misses
+- LRU bound and invalidation
+- Repeated logins hit the cache; an admin password change invalidates
+  it (old password refused, new one accepted)
+- Stats endpoint is admin only
+"""
+import time
+import unittest
+import uuid
+from hbnb.app import create_app
+from hbnb.app.credential_cache import CredentialCache, credential_cache
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestCredentialCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = CredentialCache(ttl=60, max_entries=2)
+        self.cache.remember("u1", "$2b$hash1", "secret")
+
+    def test_hit_and_misses(self):
+        """Only the same user, hash version and password hit."""
+        self.assertTrue(self.cache.check("u1", "$2b$hash1", "secret"))
+        self.assertFalse(self.cache.check("u1", "$2b$hash1", "wrong"))
+        self.assertFalse(self.cache.check("u2", "$2b$hash1", "secret"))
+        self.assertFalse(self.cache.check("u1", "$2b$hash2", "secret"))
+        self.assertEqual(self.cache.stats(),
+                         {"hits": 1, "misses": 3, "size": 0})
+
+    def test_expiry(self):
+        """Entries stop matching after the TTL."""
+        cache = CredentialCache(ttl=0.01)
+        cache.remember("u1", "h", "secret")
+        time.sleep(0.02)
+        self.assertFalse(cache.check("u1", "h", "secret"))
+
+    def test_lru_bound_and_invalidate(self):
+        """The least recently used entry goes first; invalidate drops one."""
+        self.cache.remember("u2", "h", "a")
+        self.cache.check("u1", "$2b$hash1", "secret")
+        self.cache.remember("u3", "h", "b")
+        self.assertFalse(self.cache.check("u2", "h", "a"))
+        self.cache.invalidate("u1")
+        self.assertFalse(self.cache.check("u1", "$2b$hash1", "secret"))
+        self.assertTrue(self.cache.check("u3", "h", "b"))
+
+    def test_disabled(self):
+        """ttl=0 never caches."""
+        cache = CredentialCache(ttl=0)
+        cache.remember("u1", "h", "secret")
+        self.assertFalse(cache.check("u1", "h", "secret"))
+
+
+class TestLoginCache(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.admin_auth = self.login("admin@hbnb.io", "admin1234")[1]
+        self.email = f"{unique('cache_')}@example.com"
+        resp = self.client.post("/api/v1/users/", json={
+            "first_name": "Cache", "last_name": "User",
+            "email": self.email, "password": "first-pass"
+        }, headers=self.admin_auth)
+        self.user_id = resp.json["id"]
+
+    def login(self, email, password):
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": email, "password": password})
+        token = (resp.json or {}).get("access_token", "")
+        return resp.status_code, {"Authorization": f"Bearer {token}"}
+
+    def test_repeated_login_hits(self):
+        """The second correct login is served from the cache."""
+        self.login(self.email, "first-pass")
+        hits = credential_cache.stats()["hits"]
+        self.assertEqual(self.login(self.email, "first-pass")[0], 200)
+        self.assertEqual(credential_cache.stats()["hits"], hits + 1)
+        self.assertEqual(self.login(self.email, "wrong")[0], 401)
+
+    def test_password_change_invalidates(self):
+        """After an admin sets a new password, the old one is refused."""
+        self.assertEqual(self.login(self.email, "first-pass")[0], 200)
+        resp = self.client.put(f"/api/v1/users/{self.user_id}", json={
+            "password": "second-pass"}, headers=self.admin_auth)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.login(self.email, "first-pass")[0], 401)
+        self.assertEqual(self.login(self.email, "second-pass")[0], 200)
+
+    def test_stats_admin_only(self):
+        """Counters are visible to admins only."""
+        resp = self.client.get("/api/v1/auth/credential-cache",
+                               headers=self.admin_auth)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(set(resp.json), {"hits", "misses", "size"})
+        user_auth = self.login(self.email, "first-pass")[1]
+        resp = self.client.get("/api/v1/auth/credential-cache",
+                               headers=user_auth)
+        self.assertEqual(resp.status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,162 @@
+"""
+Tests - ?expand= on place and review endpoints
+Covers:
+- expand=owner,amenities,reviews embeds the related objects
+- Without expand the payload is unchanged
+- Unknown relation → 400
+- The eager-load spec keeps the query count bounded (SQL backend),
+  whatever the number of places
+"""
+import unittest
+import uuid
+from sqlalchemy import event
+from hbnb.app import create_app, db
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.models.place import Place
+from hbnb.app.models.review import Review
+from hbnb.app.models.user import User
+from hbnb.app.persistence.place_repository import SQLAlchemyPlaceRepository
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestExpandEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+        email = f"{unique('expand_')}@example.com"
+        self.client.post("/api/v1/users/", json={
+            "first_name": "Expand", "last_name": "User",
+            "email": email, "password": "pass123"
+        }, headers=self.auth)
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": email, "password": "pass123"
+        })
+        reviewer = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+        place = self.client.post("/api/v1/places/", json={
+            "title": unique("Expanded "), "description": "test", "price": 90,
+            "latitude": 30.0, "longitude": 30.0
+        }, headers=self.auth)
+        self.place_id = place.json["id"]
+        amenity = self.client.post("/api/v1/amenities/", json={
+            "name": unique("Hammock ")
+        }, headers=self.auth)
+        self.amenity_id = amenity.json["id"]
+        self.client.post(
+            f"/api/v1/places/{self.place_id}/amenities/{self.amenity_id}",
+            headers=self.auth)
+        review = self.client.post("/api/v1/reviews/", json={
+            "text": "Expanded stay", "rating": 4,
+            "user_id": "placeholder", "place_id": self.place_id
+        }, headers=reviewer)
+        self.review_id = review.json["id"]
+
+    def test_expand_place(self):
+        """owner, amenities and reviews are embedded."""
+        resp = self.client.get(f"/api/v1/places/{self.place_id}"
+                               "?expand=owner,amenities,reviews")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json["owner"]["email"], "admin@hbnb.io")
+        self.assertNotIn("password", resp.json["owner"])
+        self.assertEqual([a["id"] for a in resp.json["amenities"]],
+                         [self.amenity_id])
+        self.assertEqual([r["id"] for r in resp.json["reviews"]],
+                         [self.review_id])
+
+    def test_expand_list(self):
+        """The list (plain and paginated) embeds the relations too."""
+        resp = self.client.get("/api/v1/places/?expand=owner")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(all("owner" in place for place in resp.json))
+        resp = self.client.get("/api/v1/places/?expand=amenities&limit=2")
+        self.assertTrue(all("amenities" in place
+                            for place in resp.json["items"]))
+        resp = self.client.get("/api/v1/reviews/?expand=user,place")
+        mine = [r for r in resp.json if r["id"] == self.review_id][0]
+        self.assertEqual(mine["place"]["id"], self.place_id)
+        self.assertEqual(mine["user"]["id"], mine["user_id"])
+
+    def test_no_expand(self):
+        """Without expand no relation is embedded."""
+        resp = self.client.get(f"/api/v1/places/{self.place_id}")
+        for key in ("owner", "amenities", "reviews"):
+            self.assertNotIn(key, resp.json)
+
+    def test_unknown_relation(self):
+        """expand=password → 400."""
+        for url in ("/api/v1/places/?expand=password",
+                    f"/api/v1/places/{self.place_id}?expand=owner,nope",
+                    "/api/v1/reviews/?expand=owner"):
+            self.assertEqual(self.client.get(url).status_code, 400, url)
+
+
+class TestEagerLoadQueryCount(unittest.TestCase):
+    """Runs on the SQL repository directly; nothing is committed."""
+
+    PLACES = 8
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repo = SQLAlchemyPlaceRepository(Place)
+        owner = User(first_name="Eager", last_name="Owner",
+                     email=f"{unique('eager_')}@example.com", password="x")
+        guest = User(first_name="Eager", last_name="Guest",
+                     email=f"{unique('eager_')}@example.com", password="x")
+        amenity = Amenity(name=unique("Eager "))
+        db.session.add_all([owner, guest, amenity])
+        self.place_ids = []
+        for _ in range(self.PLACES):
+            place = Place(title=unique("Eager "), description=None,
+                          price=10, latitude=1.0, longitude=1.0,
+                          owner_id=owner.id)
+            place.amenities.append(amenity)
+            db.session.add(place)
+            db.session.add(Review(text="ok", rating=3, user_id=guest.id,
+                                  place_id=place.id))
+            self.place_ids.append(place.id)
+        db.session.flush()
+        self.statements = []
+        event.listen(db.engine, "before_cursor_execute", self.count)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self.count)
+        db.session.rollback()
+        self.ctx.pop()
+
+    def count(self, *args):
+        self.statements.append(args[2])
+
+    def serialize(self, eager):
+        db.session.expire_all()
+        self.statements.clear()
+        places = self.repo.get_many(self.place_ids, eager=eager)
+        payload = [place.to_dict(include_owner=True, include_reviews=True,
+                                 include_amenities=True) for place in places]
+        self.assertEqual(len(payload), self.PLACES)
+        self.assertTrue(all(p["owner"] and p["reviews"] and p["amenities"]
+                            for p in payload))
+        return len(self.statements)
+
+    def test_bounded_query_count(self):
+        """Eager spec: 3 queries (places+owner, amenities, reviews)."""
+        self.assertLessEqual(
+            self.serialize(("owner", "amenities", "reviews")), 3)
+
+    def test_lazy_loading_grows_with_places(self):
+        """Without the spec every place triggers its own queries."""
+        self.assertGreater(self.serialize(()), 2 * self.PLACES)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
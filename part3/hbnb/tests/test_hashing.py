@@ -0,0 +1,101 @@
+"""
+Tests - Password hashing pool
+Covers:
+- Hash / verify round trip on the process pool
+- The work-factor policy sets the cost of new hashes (fixed, callable,
+  calibrated); the testing config uses the minimum cost
+- A saturated pool raises HasherBusy; the API answers 503 + Retry-After
+- Empty passwords are rejected
+"""
+import unittest
+import uuid
+from hbnb.app import create_app
+from hbnb.app.hashing import (
+    HasherBusy, PasswordHasher, calibrated_work_factor, password_hasher)
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def setUp(self):
+        self.hasher = PasswordHasher(workers=1, queue_size=0, retry_after=3,
+                                     work_factor=5)
+        self.addCleanup(self.hasher.shutdown)
+
+    def test_round_trip(self):
+        """A hash verifies its password only, with the policy's cost."""
+        hashed = self.hasher.hash("s3cret")
+        self.assertTrue(hashed.startswith("$2b$05$"))
+        self.assertTrue(self.hasher.verify(hashed, "s3cret"))
+        self.assertFalse(self.hasher.verify(hashed, "wrong"))
+
+    def test_callable_work_factor(self):
+        """A callable policy is asked for the cost of each new hash."""
+        self.hasher.work_factor = lambda: 6
+        self.assertTrue(self.hasher.hash("s3cret").startswith("$2b$06$"))
+
+    def test_calibrated_work_factor(self):
+        """Calibration stays within bounds and is measured once."""
+        policy = calibrated_work_factor(target_seconds=0, minimum=4,
+                                        maximum=8)
+        self.assertEqual(policy(), 4)
+        self.assertEqual(policy(), 4)
+
+    def test_saturated(self):
+        """Past workers + queue_size pending calls: HasherBusy."""
+        pending = self.hasher.hash_async("first")
+        with self.assertRaises(HasherBusy) as busy:
+            self.hasher.hash("second")
+        self.assertEqual(busy.exception.retry_after, 3)
+        self.assertTrue(pending.result().startswith("$2b$"))
+
+    def test_hash_many(self):
+        """Batch hashing keeps the order of the passwords."""
+        hashed = self.hasher.hash_many(["a", "b"])
+        self.assertTrue(self.hasher.verify(hashed[0], "a"))
+        self.assertTrue(self.hasher.verify(hashed[1], "b"))
+
+    def test_empty_password(self):
+        """Empty or non-string passwords are not hashed."""
+        for password in ("", None, 123):
+            with self.assertRaises(ValueError):
+                self.hasher.hash(password)
+
+
+class TestHashingEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+
+    def test_testing_config_cost(self):
+        """New users get the testing work factor."""
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        auth = {"Authorization": f"Bearer {login.json['access_token']}"}
+        email = f"{unique('cost_')}@example.com"
+        self.client.post("/api/v1/users/", json={
+            "first_name": "Cost", "last_name": "User",
+            "email": email, "password": "pass123"}, headers=auth)
+        from hbnb.app.services import facade
+        with self.app.app_context():
+            user = facade.get_user_by_email(email)
+            self.assertTrue(user.password.startswith("$2b$04$"))
+
+    def test_busy_returns_503(self):
+        """A saturated pool turns logins away with Retry-After."""
+        max_pending = password_hasher.max_pending
+        password_hasher.max_pending = 0
+        self.addCleanup(setattr, password_hasher, "max_pending", max_pending)
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.headers["Retry-After"], "1")
+        self.assertIn("error", resp.json)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
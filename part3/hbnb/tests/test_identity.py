@@ -0,0 +1,133 @@
+"""
+Tests - Request identity and user record cache
+Covers:
+- current_identity() is built once per request and fetches the caller's
+  record at most once, through the user cache
+- may_modify: owner or admin
+- UserRecordCache: copies, LRU bound, size 0 disables it
+- facade.get_user_record reads through the cache and sees updates at once
+"""
+import unittest
+import uuid
+from unittest import mock
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+from hbnb.app import create_app
+from hbnb.app.api.v1.identity import current_identity
+from hbnb.app.services import facade
+from hbnb.app.user_cache import UserRecordCache, user_cache
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestIdentity(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        with self.app.app_context():
+            self.admin = facade.get_user_by_email("admin@hbnb.io")
+            self.token = create_access_token(
+                identity=self.admin.id, additional_claims={"is_admin": True})
+
+    def test_one_identity_per_request(self):
+        """The token is read once and the record fetched once."""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        with self.app.test_request_context(headers=headers):
+            verify_jwt_in_request()
+            with mock.patch.object(facade, "get_user_record",
+                                   wraps=facade.get_user_record) as get_record:
+                identity = current_identity()
+                self.assertIs(current_identity(), identity)
+                self.assertEqual(identity.record["id"], self.admin.id)
+                self.assertIs(current_identity().record, identity.record)
+                self.assertEqual(get_record.call_count, 1)
+            self.assertTrue(identity.is_admin)
+            self.assertTrue(identity.may_modify("someone-else"))
+
+    def test_record_from_user_cache(self):
+        """A later request finds the caller's record in the cache."""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        with self.app.test_request_context(headers=headers):
+            verify_jwt_in_request()
+            current_identity().record
+        with self.app.test_request_context(headers=headers):
+            verify_jwt_in_request()
+            with mock.patch.object(facade.user_repo, "get") as get:
+                self.assertEqual(current_identity().record["id"],
+                                 self.admin.id)
+                get.assert_not_called()
+
+    def test_may_modify_owner_only(self):
+        """Without the admin claim, only the owner may modify."""
+        with self.app.app_context():
+            token = create_access_token(identity="user-1")
+        headers = {"Authorization": f"Bearer {token}"}
+        with self.app.test_request_context(headers=headers):
+            verify_jwt_in_request()
+            identity = current_identity()
+            self.assertFalse(identity.is_admin)
+            self.assertTrue(identity.may_modify("user-1"))
+            self.assertFalse(identity.may_modify("user-2"))
+
+
+class TestUserRecordCache(unittest.TestCase):
+
+    def test_lru(self):
+        """Records are copied, the least recently used goes first."""
+        cache = UserRecordCache(max_entries=2)
+        cache.put("a", {"id": "a"})
+        cache.put("b", {"id": "b"})
+        cache.get("a")["id"] = "changed"
+        cache.put("c", {"id": "c"})
+        self.assertEqual(cache.get("a"), {"id": "a"})
+        self.assertIsNone(cache.get("b"))
+        cache.invalidate("a")
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "size": 1})
+
+    def test_disabled(self):
+        """Size 0 stores nothing."""
+        cache = UserRecordCache(max_entries=0)
+        cache.put("a", {"id": "a"})
+        self.assertIsNone(cache.get("a"))
+
+
+class TestUserCacheApi(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        self.auth = {"Authorization": f"Bearer {resp.json['access_token']}"}
+        resp = self.client.post("/api/v1/users/", json={
+            "first_name": "Cached", "last_name": "User",
+            "email": f"{unique('record_')}@example.com",
+            "password": "pass1234"}, headers=self.auth)
+        self.user_id = resp.json["id"]
+
+    def test_read_through_write_through(self):
+        """A second read is a hit; an update is visible immediately."""
+        with self.app.app_context():
+            self.assertEqual(
+                facade.get_user_record(self.user_id)["first_name"], "Cached")
+            hits = user_cache.stats()["hits"]
+            record = facade.get_user_record(self.user_id)
+            self.assertNotIn("password", record)
+            self.assertEqual(user_cache.stats()["hits"], hits + 1)
+
+        self.client.put(f"/api/v1/users/{self.user_id}",
+                        json={"first_name": "Renamed"}, headers=self.auth)
+        with self.app.app_context():
+            self.assertEqual(
+                facade.get_user_record(self.user_id)["first_name"], "Renamed")
+
+    def test_unknown_user(self):
+        """Missing users are not cached."""
+        with self.app.app_context():
+            self.assertIsNone(facade.get_user_record("nope"))
+            self.assertIsNone(user_cache.get("nope"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,133 @@
+"""
+Tests - Offline bulk loader (`flask hbnb load`)
+Covers:
+- CSV and NDJSON files load into the tables they are named after,
+  parents first whatever the command-line order
+- Typed values, column defaults, rating aggregates rebuilt
+- Plain-text passwords are hashed, bcrypt hashes kept as given
+- A foreign key violation rolls the whole load back, indexes included
+- --on-conflict ignore skips rows already present (initial_data.sql)
+"""
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+from hbnb.app import create_app, db
+from hbnb.app.models import Place, Review, User
+from hbnb.app.utils import check_password
+
+HASHED = "$2b$12$bnkulHyYHLXJA2DJZ9Z/hOorKdLWSPOuYjN4MOwzglA8xuQR3XA1a"
+INITIAL_DATA = os.path.join(os.path.dirname(__file__), "..", "initial_data.sql")
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestBulkLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.runner = self.app.test_cli_runner()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def write_csv(self, name, rows):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def write_ndjson(self, name, rows):
+        path = os.path.join(self.dir, name)
+        with open(path, "w") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        return path
+
+    def load(self, *args):
+        return self.runner.invoke(args=["hbnb", "load", *args])
+
+    def test_load_files(self):
+        """Users, places and reviews load with types and aggregates."""
+        owner, guest = str(uuid.uuid4()), str(uuid.uuid4())
+        place_id = str(uuid.uuid4())
+        users = self.write_csv("users.csv", [
+            {"id": owner, "first_name": "Own", "last_name": "Er",
+             "email": f"{unique('own')}@load.io", "password": "plain-pass",
+             "is_admin": "false"},
+            {"id": guest, "first_name": "Gu", "last_name": "Est",
+             "email": f"{unique('guest')}@load.io", "password": HASHED,
+             "is_admin": "1"},
+        ])
+        places = self.write_ndjson("places.ndjson", [
+            {"id": place_id, "title": "Loaded", "price": "120.5",
+             "latitude": 10, "longitude": 20, "owner_id": owner}])
+        reviews = self.write_ndjson("reviews.ndjson", [
+            {"text": "Nice", "rating": 4, "user_id": guest,
+             "place_id": place_id}])
+
+        result = self.load(reviews, places, users)
+        self.assertEqual(result.exit_code, 0, result.output)
+        with self.app.app_context():
+            place = db.session.get(Place, place_id)
+            self.assertEqual(place.price, 120.5)
+            self.assertIsNotNone(place.created_at)
+            self.assertEqual((place.review_count, place.rating_4), (1, 1))
+            self.assertEqual(
+                Review.query.filter_by(place_id=place_id).count(), 1)
+            plain, hashed = db.session.get(User, owner), db.session.get(User, guest)
+            self.assertTrue(check_password(plain.password, "plain-pass"))
+            self.assertEqual(hashed.password, HASHED)
+            self.assertEqual((plain.is_admin, hashed.is_admin), (False, True))
+
+    def test_foreign_key_violation_rolls_back(self):
+        """A dangling owner_id aborts the load; nothing is kept."""
+        user_id = str(uuid.uuid4())
+        users = self.write_csv("users.csv", [
+            {"id": user_id, "first_name": "A", "last_name": "B",
+             "email": f"{unique('fk')}@load.io", "password": HASHED}])
+        places = self.write_ndjson("places.ndjson", [
+            {"title": "Orphan", "price": 1, "latitude": 0, "longitude": 0,
+             "owner_id": "missing-owner"}])
+
+        result = self.load(users, places)
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("FOREIGN KEY", result.output)
+        with self.app.app_context():
+            self.assertIsNone(db.session.get(User, user_id))
+            indexes = {index["name"] for index
+                       in db.inspect(db.engine).get_indexes("places")}
+            self.assertIn("ix_places_price", indexes)
+
+    def test_invalid_value(self):
+        """A value of the wrong type names the row and column."""
+        places = self.write_csv("places.csv", [
+            {"title": "Bad", "price": "cheap", "latitude": 0,
+             "longitude": 0, "owner_id": "x"}])
+        result = self.load(places)
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("places row 1, price", result.output)
+
+    def test_initial_data_ignore_conflicts(self):
+        """initial_data.sql loads twice with --on-conflict ignore."""
+        for _ in range(2):
+            result = self.load("--sql", INITIAL_DATA, "--on-conflict", "ignore")
+            self.assertEqual(result.exit_code, 0, result.output)
+        self.assertNotEqual(self.load("--sql", INITIAL_DATA).exit_code, 0)
+
+    def test_unknown_table(self):
+        """Files must be named after a table."""
+        path = self.write_csv("guests.csv", [{"name": "x"}])
+        result = self.load(path)
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("no table named 'guests'", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
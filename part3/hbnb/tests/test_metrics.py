@@ -0,0 +1,257 @@
+"""
+Tests - Request / facade / repository metrics on GET /metrics
+Covers:
+- Histogram buckets: every duration lands under the right bound, a
+  duration equal to a bound under that bound (Prometheus "le")
+- Requests counted per namespace, route, method and status, with a
+  latency histogram per route (cumulative buckets, +Inf = count)
+- Facade and repository calls timed; calls an object makes on itself
+  are not counted twice; generators are passed through untimed
+- Series of finished threads are kept
+- Component counters (caches, hasher, blocklist, writer queue)
+- METRICS_ENABLED = False: nothing recorded, no /metrics
+- The async handlers record the same series as the Flask ones
+"""
+import asyncio
+import re
+import threading
+import unittest
+from hbnb.app import create_app
+from hbnb.app.metrics import (
+    FACADE_CALLS, REPOSITORY_CALLS, Metrics, _BOUNDS, _INDEX, _INDEXED,
+    bucket, metrics, route_labels)
+from hbnb.app.services.facade import USE_DATABASE
+from hbnb.config import TestingConfig, config
+
+ADMIN = {"email": "admin@hbnb.io", "password": "admin1234"}
+SAMPLE = re.compile(r'^(\w+)(?:\{(.*)\})? (\S+)$')
+
+
+def samples(text):
+    """{(name, labels): value} of a Prometheus text exposition"""
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, labels, value = SAMPLE.match(line).groups()
+            values[(name, labels or "")] = float(value)
+    return values
+
+
+class TestBuckets(unittest.TestCase):
+
+    def test_bounds(self):
+        """A duration is above the previous bound and at most its own."""
+        for us in list(range(5000)) + [2 ** k + d for k in range(12, 27)
+                                       for d in (-1, 0, 1)]:
+            for ns in (us * 1000, us * 1000 + 1):
+                index = bucket(ns)
+                if index == len(_BOUNDS):  # +Inf only
+                    self.assertGreater(ns, _BOUNDS[-1] * 1000)
+                    continue
+                self.assertLessEqual(ns, _BOUNDS[index] * 1000)
+                if index:
+                    self.assertGreater(ns, _BOUNDS[index - 1] * 1000)
+        self.assertEqual(bucket(4000), _BOUNDS.index(4))
+        self.assertEqual(bucket(4001), _BOUNDS.index(6))
+        self.assertEqual(bucket(0), 0)
+        self.assertEqual(bucket(10 ** 12), len(_BOUNDS))
+        self.assertEqual(_BOUNDS[:8], [1, 2, 3, 4, 6, 8, 12, 16])
+
+    def test_lookup_table(self):
+        """The table used while recording agrees with bucket()."""
+        for ns in range(0, _INDEXED * 1000, 6997):
+            self.assertEqual(_INDEX[(ns + 999) // 1000], bucket(ns))
+
+    def test_route_labels(self):
+        """Flask and Starlette rules give the same labels."""
+        expected = ("users", "/api/v1/users/<user_id>")
+        self.assertEqual(route_labels("/api/v1/users/<string:user_id>"),
+                         expected)
+        self.assertEqual(route_labels("/api/v1/users/{user_id}"), expected)
+        self.assertEqual(route_labels("/"), ("", "/"))
+        self.assertEqual(route_labels(None), ("", ""))
+
+
+class TestRecording(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_instrumented_calls(self):
+        """Outer calls are timed, self-calls and generators are not."""
+        class Repository:
+            def get(self, key):
+                return key
+
+            def update(self, key):
+                return self.get(key)
+
+            def iterate(self):
+                yield 1
+
+        repo = self.metrics.instrument(Repository(), REPOSITORY_CALLS,
+                                       model="thing")
+        self.assertEqual(repo.update(3), 3)
+        self.assertEqual(list(repo.iterate()), [1])
+        counts = {key: sum(values[:-1])
+                  for key, values in self.metrics.snapshot().items()}
+        self.assertEqual(counts, {
+            (REPOSITORY_CALLS, 'model="thing",method="update"'): 1})
+
+    def test_async_calls(self):
+        class Facade:
+            async def get_thing(self):
+                await asyncio.sleep(0)
+                return "thing"
+
+        facade = self.metrics.instrument(Facade(), FACADE_CALLS)
+        self.assertEqual(asyncio.run(facade.get_thing()), "thing")
+        self.assertIn((FACADE_CALLS, 'method="get_thing"'),
+                      self.metrics.snapshot())
+
+    def test_finished_threads_are_kept(self):
+        """Series of exited threads are folded, not lost."""
+        key = (FACADE_CALLS, 'method="x"')
+
+        def record():
+            for _ in range(10):
+                self.metrics.observe(key, 1500)
+
+        for _ in range(3):
+            threads = [threading.Thread(target=record) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        counts = self.metrics.snapshot()[key]
+        self.assertEqual(counts[bucket(1500)], 120)
+        self.assertEqual(counts[-1], 120 * 1500)
+        self.assertLessEqual(len(self.metrics._shards), 5)
+
+    def test_disabled(self):
+        """Timed calls still work, nothing is recorded."""
+        self.metrics.configure(enabled=False)
+        wrapped = self.metrics.timed(lambda: 4, FACADE_CALLS, method="x")
+        self.assertEqual(wrapped(), 4)
+        self.assertEqual(self.metrics.snapshot(), {})
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        resp = self.client.post("/api/v1/auth/login", json=ADMIN)
+        self.auth = {"Authorization": f"Bearer {resp.json['access_token']}"}
+
+    def scrape(self):
+        resp = self.client.get("/metrics")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.content_type.startswith("text/plain"))
+        return resp.get_data(as_text=True)
+
+    def test_requests_counted_by_route(self):
+        """Count per status, one latency histogram per route."""
+        user_id = self.client.get("/api/v1/users/", headers=self.auth).json[
+            0]["id"]
+        for _ in range(2):
+            self.client.get(f"/api/v1/users/{user_id}")
+        self.client.get("/api/v1/users/missing")
+        self.client.get("/api/v1/nowhere")
+        values = samples(self.scrape())
+
+        route = 'namespace="users",route="/api/v1/users/<user_id>"'
+        self.assertEqual(values[("hbnb_http_requests_total",
+                                 f'{route},method="GET",status="200"')], 2)
+        self.assertEqual(values[("hbnb_http_requests_total",
+                                 f'{route},method="GET",status="404"')], 1)
+        self.assertEqual(values[(
+            "hbnb_http_requests_total",
+            'namespace="",route="",method="GET",status="404"')], 1)
+        self.assertEqual(values[(
+            "hbnb_http_requests_total",
+            'namespace="auth",route="/api/v1/auth/login",method="POST",'
+            'status="200"')], 1)
+
+        labels = f'{route},method="GET"'
+        name = "hbnb_http_request_duration_seconds"
+        self.assertEqual(values[(f"{name}_count", labels)], 3)
+        self.assertGreater(values[(f"{name}_sum", labels)], 0)
+        buckets = [value for (sample, sample_labels), value in values.items()
+                   if sample == f"{name}_bucket"
+                   and sample_labels.startswith(labels + ",le=")]
+        self.assertEqual(len(buckets), len(_BOUNDS) + 1)
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertEqual(buckets[-1], 3)
+
+    def test_facade_and_repository_calls(self):
+        """The facade's calls and its repository calls are timed."""
+        self.client.get("/api/v1/amenities/")
+        values = samples(self.scrape())
+        self.assertGreaterEqual(values[(
+            "hbnb_facade_call_duration_seconds_count",
+            'method="get_all_amenities"')], 1)
+        self.assertGreaterEqual(values[(
+            "hbnb_repository_call_duration_seconds_count",
+            'model="amenity",method="get_all"')], 1)
+
+    def test_component_counters(self):
+        """Cache, hasher, blocklist and writer queue counters."""
+        self.client.post("/api/v1/auth/logout", headers=self.auth)
+        values = samples(self.scrape())
+        for cache in ("credential", "user", "response"):
+            self.assertIn(("hbnb_cache_hits_total", f'cache="{cache}"'),
+                          values)
+            self.assertIn(("hbnb_cache_entries", f'cache="{cache}"'), values)
+        self.assertGreaterEqual(values[("hbnb_cache_misses_total",
+                                        'cache="credential"')], 1)
+        self.assertGreaterEqual(values[("hbnb_revoked_tokens", "")], 1)
+        self.assertGreaterEqual(
+            values[("hbnb_password_hasher_capacity", "")],
+            values[("hbnb_password_hasher_workers", "")])
+        self.assertEqual(values[("hbnb_write_queue_pending", "")], 0)
+
+
+class TestMetricsDisabled(unittest.TestCase):
+
+    def setUp(self):
+        config["test-no-metrics"] = type("NoMetricsConfig", (TestingConfig,),
+                                         {"METRICS_ENABLED": False})
+        self.addCleanup(config.pop, "test-no-metrics")
+        self.addCleanup(metrics.configure)
+        self.app = create_app("test-no-metrics")
+
+    def test_nothing_recorded(self):
+        client = self.app.test_client()
+        client.get("/api/v1/amenities/")
+        self.assertEqual(client.get("/metrics").status_code, 404)
+        self.assertEqual(metrics.snapshot(), {})
+
+
+@unittest.skipUnless(USE_DATABASE, "the ASGI app runs on the SQL backend")
+class TestAsgiMetrics(unittest.TestCase):
+
+    def test_async_handlers_share_the_series(self):
+        """An async GET adds to the series of the Flask route."""
+        from starlette.testclient import TestClient
+        from hbnb.app.aio import create_asgi_app
+
+        with TestClient(create_asgi_app()) as client:
+            flask_client = client.app.state.flask_app.test_client()
+            amenity = client.get("/api/v1/amenities/").json()[0]
+            url = f"/api/v1/amenities/{amenity['id']}"
+            client.get(url)
+            flask_client.get(url)
+            values = samples(client.get("/metrics").text)
+
+        self.assertEqual(values[(
+            "hbnb_http_requests_total",
+            'namespace="amenities",route="/api/v1/amenities/<amenity_id>",'
+            'method="GET",status="200"')], 2)
+        self.assertGreaterEqual(values[(
+            "hbnb_facade_call_duration_seconds_count",
+            'method="get_amenity"')], 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,118 @@
+"""
+Tests - Keyset pagination on list endpoints
+Covers:
+- Without limit/cursor the list endpoints still return a plain list
+- Walking pages with next_cursor returns every item once, in order
+- Invalid limit or cursor → 400
+- A cursor whose datetime has a UTC offset resumes at the same place
+"""
+import base64
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+from hbnb.app import create_app
+from hbnb.app.api.v1.pagination import decode_cursor
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+    def walk(self, url, limit):
+        """Follow next_cursor until the last page; return all items."""
+        items, cursor = [], None
+        while True:
+            query = f"?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+            resp = self.client.get(url + query)
+            self.assertEqual(resp.status_code, 200)
+            self.assertLessEqual(len(resp.json["items"]), limit)
+            items.extend(resp.json["items"])
+            cursor = resp.json["next_cursor"]
+            if cursor is None:
+                return items
+
+    def test_unpaginated_list_unchanged(self):
+        """GET without limit/cursor returns a JSON list."""
+        resp = self.client.get("/api/v1/amenities/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsInstance(resp.json, list)
+
+    def test_walk_all_pages(self):
+        """Every amenity shows up exactly once, in (created_at, id) order."""
+        created = []
+        for _ in range(5):
+            resp = self.client.post("/api/v1/amenities/", json={
+                "name": unique("Paged ")
+            }, headers=self.auth)
+            self.assertEqual(resp.status_code, 201)
+            created.append(resp.json["id"])
+
+        items = self.walk("/api/v1/amenities/", limit=2)
+        ids = [item["id"] for item in items]
+        self.assertEqual(len(ids), len(set(ids)))
+        for amenity_id in created:
+            self.assertIn(amenity_id, ids)
+        keys = [(item["created_at"], item["id"]) for item in items]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(items),
+                         len(self.client.get("/api/v1/amenities/").json))
+
+    def test_places_page_shape(self):
+        """A page of places has items and next_cursor."""
+        self.client.post("/api/v1/places/", json={
+            "title": unique("Paged place "), "description": "test",
+            "price": 10, "latitude": 1.0, "longitude": 2.0
+        }, headers=self.auth)
+        resp = self.client.get("/api/v1/places/?limit=1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.json["items"]), 1)
+        self.assertIn("next_cursor", resp.json)
+
+    def test_invalid_limit(self):
+        """limit outside 1..MAX_LIMIT or not an int → 400."""
+        for limit in ("0", "-3", "abc", "100000"):
+            resp = self.client.get(f"/api/v1/users/?limit={limit}")
+            self.assertEqual(resp.status_code, 400, limit)
+
+    def test_invalid_cursor(self):
+        """Garbage cursor → 400."""
+        resp = self.client.get("/api/v1/reviews/?cursor=not-a-cursor")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_cursor_with_utc_offset(self):
+        """The same instant written with an offset gives the same page."""
+        for _ in range(3):
+            self.client.post("/api/v1/amenities/", json={
+                "name": unique("Offset ")}, headers=self.auth)
+        cursor = self.client.get("/api/v1/amenities/?limit=2").json[
+            "next_cursor"]
+        created_at, obj_id = decode_cursor(cursor)
+        shifted = created_at.replace(tzinfo=timezone.utc).astimezone(
+            timezone(timedelta(hours=2)))
+        self.assertEqual(decode_cursor(self.encode(shifted, obj_id)),
+                         (created_at, obj_id))
+
+        expected = self.client.get(f"/api/v1/amenities/?limit=2&cursor={cursor}")
+        resp = self.client.get("/api/v1/amenities/?limit=2&cursor="
+                               + self.encode(shifted, obj_id))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json["items"], expected.json["items"])
+
+    @staticmethod
+    def encode(created_at, obj_id):
+        raw = f"{created_at.isoformat()}|{obj_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,144 @@
+"""
+Tests - Filtered place listing
+Covers:
+- min_price / max_price bounds are inclusive
+- amenities=a,b keeps places having all of them (names or ids,
+  case-insensitive names)
+- Linking / unlinking an amenity updates the results
+- Filters combine with keyset pagination
+- Sorted price index range queries and amenity posting lists
+- Invalid filters → 400
+"""
+import unittest
+import uuid
+from types import SimpleNamespace
+from hbnb.app import create_app
+from hbnb.app.persistence.indexes import InvertedIndex, SortedIndex
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestFilterIndexes(unittest.TestCase):
+
+    def test_sorted_index_between(self):
+        """between() is inclusive and open-ended on None bounds."""
+        index = SortedIndex("price")
+        for obj_id, price in (("a", 10), ("b", 20), ("c", 20), ("d", 30)):
+            index.insert(SimpleNamespace(id=obj_id, price=price))
+        self.assertEqual(index.between(20, 30), ["b", "c", "d"])
+        self.assertEqual(index.between(None, 20), ["a", "b", "c"])
+        self.assertEqual(index.between(21, 29), [])
+        self.assertEqual(index.count_between(15), 3)
+
+    def test_inverted_index(self):
+        """Objects are listed under every item, and re-indexed on change."""
+        index = InvertedIndex("amenities")
+        wifi, pool = SimpleNamespace(id="wifi"), SimpleNamespace(id="pool")
+        place = SimpleNamespace(id="p1", amenities=[wifi, pool])
+        index.insert(place)
+        self.assertEqual(index.lookup("pool"), ["p1"])
+        place.amenities = [wifi]
+        index.remove("p1")
+        index.insert(place)
+        self.assertEqual(index.lookup("pool"), [])
+        self.assertIn("p1", index.postings("wifi"))
+
+
+class TestPlaceFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+        # Amenity names unique to this test, so results are predictable
+        self.sauna = self.create_amenity(unique("Sauna "))
+        self.jacuzzi = self.create_amenity(unique("Jacuzzi "))
+
+    def create_amenity(self, name):
+        resp = self.client.post("/api/v1/amenities/", json={"name": name},
+                                headers=self.auth)
+        self.assertEqual(resp.status_code, 201)
+        return resp.json
+
+    def create_place(self, price, *amenities):
+        resp = self.client.post("/api/v1/places/", json={
+            "title": unique("Filtered "), "description": "test",
+            "price": price, "latitude": 10.0, "longitude": 10.0
+        }, headers=self.auth)
+        self.assertEqual(resp.status_code, 201)
+        for amenity in amenities:
+            link = self.client.post(
+                f"/api/v1/places/{resp.json['id']}/amenities/{amenity['id']}",
+                headers=self.auth)
+            self.assertEqual(link.status_code, 200)
+        return resp.json["id"]
+
+    def ids(self, query):
+        resp = self.client.get(f"/api/v1/places/?{query}")
+        self.assertEqual(resp.status_code, 200, resp.json)
+        return [place["id"] for place in resp.json]
+
+    def test_price_range(self):
+        """Bounds are inclusive."""
+        cheap = self.create_place(40)
+        mid = self.create_place(75)
+        pricey = self.create_place(120)
+        ids = self.ids("min_price=40&max_price=75")
+        self.assertIn(cheap, ids)
+        self.assertIn(mid, ids)
+        self.assertNotIn(pricey, ids)
+
+    def test_amenities_all_required(self):
+        """Only places with every requested amenity are returned."""
+        both = self.create_place(50, self.sauna, self.jacuzzi)
+        sauna_only = self.create_place(50, self.sauna)
+        self.create_place(50)
+        names = f"{self.sauna['name'].upper()},{self.jacuzzi['name']}"
+        self.assertEqual(self.ids(f"amenities={names}"), [both])
+        self.assertEqual(sorted(self.ids(f"amenities={self.sauna['id']}")),
+                         sorted([both, sauna_only]))
+
+    def test_combined_filters(self):
+        """Price and amenity filters apply together."""
+        cheap = self.create_place(30, self.sauna)
+        self.create_place(300, self.sauna)
+        self.assertEqual(
+            self.ids(f"max_price=100&amenities={self.sauna['id']}"), [cheap])
+
+    def test_unlink_updates_results(self):
+        """A removed amenity no longer matches."""
+        place_id = self.create_place(50, self.jacuzzi)
+        self.client.delete(
+            f"/api/v1/places/{place_id}/amenities/{self.jacuzzi['id']}",
+            headers=self.auth)
+        self.assertEqual(self.ids(f"amenities={self.jacuzzi['id']}"), [])
+
+    def test_filtered_pages(self):
+        """limit/cursor walk the filtered places only, in order."""
+        created = [self.create_place(50, self.sauna) for _ in range(3)]
+        resp = self.client.get(
+            f"/api/v1/places/?amenities={self.sauna['id']}&limit=2")
+        self.assertEqual(resp.status_code, 200)
+        first = [place["id"] for place in resp.json["items"]]
+        cursor = resp.json["next_cursor"]
+        resp = self.client.get(f"/api/v1/places/?amenities={self.sauna['id']}"
+                               f"&limit=2&cursor={cursor}")
+        rest = [place["id"] for place in resp.json["items"]]
+        self.assertEqual(first + rest, created)
+        self.assertIsNone(resp.json["next_cursor"])
+
+    def test_invalid_filters(self):
+        """Bad numbers, inverted range or unknown amenity → 400."""
+        for query in ("min_price=abc", "min_price=10&max_price=5",
+                      "max_price=-1", "amenities=no-such-amenity"):
+            resp = self.client.get(f"/api/v1/places/?{query}")
+            self.assertEqual(resp.status_code, 400, query)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,177 @@
+"""
+Tests - Materialized place rating aggregates
+Covers:
+- Place.rating_deltas merges added / removed ratings
+- Creating, updating and deleting reviews keep review_count,
+  average_rating and rating_histogram in sync
+- A rejected review update leaves the aggregates untouched
+- sort=rating lists the best rated places first, unrated last, with
+  keyset pages (alone or with filters)
+- Invalid sort, or sort with stream → 400
+"""
+import random
+import unittest
+import uuid
+from hbnb.app import create_app
+from hbnb.app.models.place import Place
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestRatingDeltas(unittest.TestCase):
+
+    def test_add_and_remove(self):
+        """Changing a 2 into a 5 moves one histogram unit and adds 3."""
+        self.assertEqual(Place.rating_deltas(added=[5], removed=[2]),
+                         {"rating_sum": 3, "rating_5": 1, "rating_2": -1})
+        self.assertEqual(Place.rating_deltas(added=[4]),
+                         {"review_count": 1, "rating_sum": 4, "rating_4": 1})
+
+
+class TestPlaceRatings(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.admin_auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+        self.reviewers = [self.create_reviewer() for _ in range(2)]
+
+    def create_reviewer(self):
+        email = f"{unique('rater_')}@example.com"
+        self.client.post("/api/v1/users/", json={
+            "first_name": "Rater", "last_name": "User",
+            "email": email, "password": "pass123"
+        }, headers=self.admin_auth)
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": email, "password": "pass123"
+        })
+        return {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+    def create_place(self, price=70):
+        resp = self.client.post("/api/v1/places/", json={
+            "title": unique("Rated "), "description": "test", "price": price,
+            "latitude": 20.0, "longitude": 20.0
+        }, headers=self.admin_auth)
+        self.assertEqual(resp.status_code, 201)
+        return resp.json["id"]
+
+    def review(self, place_id, auth, rating):
+        resp = self.client.post("/api/v1/reviews/", json={
+            "text": "Rated stay", "rating": rating,
+            "user_id": "placeholder", "place_id": place_id
+        }, headers=auth)
+        self.assertEqual(resp.status_code, 201)
+        return resp.json["id"]
+
+    def place(self, place_id):
+        return self.client.get(f"/api/v1/places/{place_id}").json
+
+    def test_new_place_has_empty_aggregates(self):
+        """No reviews: count 0, no average, empty histogram."""
+        place = self.place(self.create_place())
+        self.assertEqual(place["review_count"], 0)
+        self.assertIsNone(place["average_rating"])
+        self.assertEqual(place["rating_histogram"],
+                         {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0})
+
+    def test_create_update_delete(self):
+        """Aggregates follow every review change."""
+        place_id = self.create_place()
+        first = self.review(place_id, self.reviewers[0], 5)
+        self.review(place_id, self.reviewers[1], 2)
+        place = self.place(place_id)
+        self.assertEqual(place["review_count"], 2)
+        self.assertEqual(place["average_rating"], 3.5)
+        self.assertEqual(place["rating_histogram"]["5"], 1)
+        self.assertEqual(place["rating_histogram"]["2"], 1)
+
+        resp = self.client.put(f"/api/v1/reviews/{first}", json={
+            "text": "Changed my mind", "rating": 3
+        }, headers=self.reviewers[0])
+        self.assertEqual(resp.status_code, 200)
+        place = self.place(place_id)
+        self.assertEqual(place["average_rating"], 2.5)
+        self.assertEqual(place["rating_histogram"]["5"], 0)
+        self.assertEqual(place["rating_histogram"]["3"], 1)
+
+        resp = self.client.delete(f"/api/v1/reviews/{first}",
+                                  headers=self.reviewers[0])
+        self.assertEqual(resp.status_code, 200)
+        place = self.place(place_id)
+        self.assertEqual(place["review_count"], 1)
+        self.assertEqual(place["average_rating"], 2.0)
+        self.assertEqual(place["rating_histogram"]["3"], 0)
+
+    def test_rejected_update_keeps_aggregates(self):
+        """A valid rating with invalid text changes nothing."""
+        place_id = self.create_place()
+        review_id = self.review(place_id, self.reviewers[0], 4)
+        resp = self.client.put(f"/api/v1/reviews/{review_id}", json={
+            "text": "   ", "rating": 1
+        }, headers=self.reviewers[0])
+        self.assertEqual(resp.status_code, 400)
+        place = self.place(place_id)
+        self.assertEqual(place["average_rating"], 4.0)
+        self.assertEqual(place["rating_histogram"]["1"], 0)
+
+    def test_sort_by_rating(self):
+        """Best average first; unrated places after rated ones."""
+        good, bad, unrated = (self.create_place() for _ in range(3))
+        self.review(good, self.reviewers[0], 5)
+        self.review(bad, self.reviewers[0], 1)
+        resp = self.client.get("/api/v1/places/?sort=rating")
+        self.assertEqual(resp.status_code, 200)
+        ids = [place["id"] for place in resp.json]
+        self.assertLess(ids.index(good), ids.index(bad))
+        self.assertLess(ids.index(bad), ids.index(unrated))
+
+    def pages(self, query, limit):
+        """Every item of a paginated listing, following next_cursor."""
+        items, cursor = [], None
+        while True:
+            url = f"/api/v1/places/?{query}&limit={limit}"
+            resp = self.client.get(url + (f"&cursor={cursor}" if cursor else ""))
+            self.assertEqual(resp.status_code, 200)
+            items.extend(place["id"] for place in resp.json["items"])
+            cursor = resp.json["next_cursor"]
+            if cursor is None:
+                return items
+
+    def test_sort_by_rating_pages(self):
+        """Pages of sort=rating follow the unpaginated order."""
+        price = 1000 + random.random()
+        places = [self.create_place(price) for _ in range(5)]
+        for place_id, ratings in zip(places, ([4], [4, 5], [5], [4])):
+            for auth, rating in zip(self.reviewers, ratings):
+                self.review(place_id, auth, rating)
+
+        query = f"sort=rating&min_price={price}&max_price={price}"
+        ordered = [place["id"] for place in
+                   self.client.get(f"/api/v1/places/?{query}").json]
+        self.assertEqual(ordered, [places[2], places[1], places[0],
+                                   places[3], places[4]])
+        for limit in (1, 2, 3):
+            self.assertEqual(self.pages(query, limit), ordered)
+
+        everything = [place["id"] for place in
+                      self.client.get("/api/v1/places/?sort=rating").json]
+        self.assertEqual(self.pages("sort=rating", 500), everything)
+        first = self.client.get("/api/v1/places/?sort=rating&limit=3").json
+        self.assertEqual([place["id"] for place in first["items"]],
+                         everything[:3])
+
+    def test_invalid_sort(self):
+        """Unknown sort key, sort with stream, bad cursor → 400."""
+        for query in ("sort=price", "sort=rating&stream=ndjson",
+                      "sort=rating&limit=5&cursor=bm9wZQ"):
+            resp = self.client.get(f"/api/v1/places/?{query}")
+            self.assertEqual(resp.status_code, 400, query)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
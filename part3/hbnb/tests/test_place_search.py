@@ -0,0 +1,287 @@
+"""
+Tests - Geographic place search
+Covers:
+- Haversine distance and bounding boxes (including the antimeridian)
+- Radius search returns places within range, nearest first
+- Bounding-box search, including a box crossing 180°
+- The spatial index follows place updates
+- Coordinate cache: vectorized ranking, top-k, swap delete, changes
+  made during a load kept
+- Places written behind the coordinate cache's back (other processes)
+  are found, by reading the logged changes only; a pruned change log
+  reloads the cache; PLACE_COORDINATE_CACHE = False searches the
+  repository
+- Invalid parameters → 400
+"""
+import random
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+from hbnb.app import create_app
+from hbnb.app.geo import bounding_box, haversine_km, in_bbox
+from hbnb.app.persistence.coordinate_cache import PlaceCoordinateCache
+from hbnb.app.persistence.indexes import ChangeLog
+from hbnb.app.services import facade
+from hbnb.config import TestingConfig, config
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestGeoHelpers(unittest.TestCase):
+
+    def test_haversine_paris_london(self):
+        """Paris → London is about 344 km."""
+        self.assertAlmostEqual(haversine_km(48.8566, 2.3522, 51.5074, -0.1278),
+                               343.5, delta=1.0)
+
+    def test_bounding_box_contains_circle(self):
+        """Points at radius distance north/east fall inside the box."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(45.0, 5.0, 100)
+        self.assertTrue(in_bbox(45.89, 5.0, min_lat, max_lat, min_lon, max_lon))
+        self.assertTrue(in_bbox(45.0, 6.26, min_lat, max_lat, min_lon, max_lon))
+        self.assertFalse(in_bbox(47.0, 5.0, min_lat, max_lat, min_lon, max_lon))
+
+    def test_bounding_box_antimeridian(self):
+        """A circle around 179.9° wraps to negative longitudes."""
+        _, _, min_lon, max_lon = bounding_box(-17.7, 179.9, 50)
+        self.assertGreater(min_lon, max_lon)
+        self.assertTrue(in_bbox(-17.7, -179.9, -18, -17, min_lon, max_lon))
+
+    def test_bounding_box_pole(self):
+        """A circle reaching a pole spans every longitude."""
+        self.assertEqual(bounding_box(89.5, 0.0, 200)[2:], (-180.0, 180.0))
+
+
+class TestPlaceCoordinateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PlaceCoordinateCache(capacity=2)
+        self.points = {"paris": (48.8566, 2.3522), "lyon": (45.764, 4.8357),
+                       "nice": (43.7102, 7.262), "lille": (50.6292, 3.0573)}
+        for place_id, (lat, lon) in self.points.items():
+            self.cache.upsert(place_id, lat, lon)
+
+    def test_matches_scalar_haversine(self):
+        """Vectorized distances equal haversine_km, nearest first."""
+        ranked = self.cache.nearest(48.0, 2.0)
+        expected = sorted(
+            ((place_id, haversine_km(48.0, 2.0, lat, lon))
+             for place_id, (lat, lon) in self.points.items()),
+            key=lambda item: item[1])
+        self.assertEqual([p for p, _ in ranked], [p for p, _ in expected])
+        for (_, got), (_, want) in zip(ranked, expected):
+            self.assertAlmostEqual(got, want, places=6)
+
+    def test_radius_and_limit(self):
+        """radius_km filters, limit keeps the k nearest."""
+        within = [p for p, _ in self.cache.nearest(48.8566, 2.3522, 250)]
+        self.assertEqual(within, ["paris", "lille"])
+        top = [p for p, _ in self.cache.nearest(44.0, 6.0, limit=2)]
+        self.assertEqual(top, ["nice", "lyon"])
+
+    def test_update_and_swap_delete(self):
+        """Moves and deletes keep the arrays consistent."""
+        self.cache.remove("paris")
+        self.cache.upsert("lille", 43.7, 7.26)
+        self.assertEqual(len(self.cache), 3)
+        self.assertNotIn("paris", self.cache)
+        near_nice = [p for p, d in self.cache.nearest(43.7102, 7.262, 5)]
+        self.assertEqual(sorted(near_nice), ["lille", "nice"])
+
+    def test_changes_during_load_are_kept(self):
+        """Upserts and removes made while rows are read are replayed."""
+        def rows():
+            yield "paris", 48.8566, 2.3522
+            self.cache.upsert("nice", 43.7102, 7.262)
+            self.cache.remove("lille")
+            yield "lille", 50.6292, 3.0573
+
+        self.cache.load(rows(), version=(2, None))
+        self.assertEqual(sorted(self.cache._slots), ["nice", "paris"])
+        self.assertEqual(self.cache.version, (2, None))
+
+
+class TestPlaceSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+    def create_place(self, latitude, longitude):
+        resp = self.client.post("/api/v1/places/", json={
+            "title": unique("Geo "), "description": "test", "price": 60,
+            "latitude": latitude, "longitude": longitude
+        }, headers=self.auth)
+        self.assertEqual(resp.status_code, 201)
+        return resp.json["id"]
+
+    def test_radius_search(self):
+        """Places within the radius come back nearest first."""
+        sydney = self.create_place(-33.8688, 151.2093)
+        bondi = self.create_place(-33.8915, 151.2767)
+        melbourne = self.create_place(-37.8136, 144.9631)
+
+        resp = self.client.get(
+            "/api/v1/places/search?lat=-33.87&lon=151.21&radius_km=20")
+        self.assertEqual(resp.status_code, 200)
+        ids = [p["id"] for p in resp.json]
+        self.assertIn(sydney, ids)
+        self.assertIn(bondi, ids)
+        self.assertNotIn(melbourne, ids)
+        self.assertLess(ids.index(sydney), ids.index(bondi))
+        distances = [p["distance_km"] for p in resp.json]
+        self.assertEqual(distances, sorted(distances))
+        self.assertTrue(all(d <= 20 for d in distances))
+
+    def test_nearest_limit(self):
+        """lat/lon with limit returns the N nearest places."""
+        lat, lon = -60 + random.random() * 10, -70 + random.random() * 10
+        near = self.create_place(lat + 0.002, lon)
+        nearer = self.create_place(lat, lon + 0.0001)
+        resp = self.client.get(
+            f"/api/v1/places/search?lat={lat}&lon={lon}&limit=2")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([p["id"] for p in resp.json], [nearer, near])
+
+    def test_deleted_place_not_found(self):
+        """A deleted place disappears from radius search."""
+        place_id = self.create_place(-77.85, 166.67)
+        self.client.delete(f"/api/v1/places/{place_id}", headers=self.auth)
+        resp = self.client.get(
+            "/api/v1/places/search?lat=-77.85&lon=166.67&radius_km=1")
+        self.assertNotIn(place_id, [p["id"] for p in resp.json])
+
+    def test_bbox_search_across_antimeridian(self):
+        """A box from 179° to -179° finds places on both sides."""
+        east = self.create_place(-17.7, 179.5)
+        west = self.create_place(-17.7, -179.5)
+        far = self.create_place(-17.7, 170.0)
+
+        resp = self.client.get("/api/v1/places/search?min_lat=-18&max_lat=-17"
+                               "&min_lon=179&max_lon=-179")
+        self.assertEqual(resp.status_code, 200)
+        ids = [p["id"] for p in resp.json]
+        self.assertIn(east, ids)
+        self.assertIn(west, ids)
+        self.assertNotIn(far, ids)
+
+    def test_search_follows_updates(self):
+        """A moved place is found at its new location only."""
+        place_id = self.create_place(64.1466, -21.9426)
+        self.client.put(f"/api/v1/places/{place_id}", json={
+            "latitude": 65.6885, "longitude": -18.1262
+        }, headers=self.auth)
+
+        old = self.client.get(
+            "/api/v1/places/search?lat=64.1466&lon=-21.9426&radius_km=10")
+        new = self.client.get(
+            "/api/v1/places/search?lat=65.6885&lon=-18.1262&radius_km=10")
+        self.assertNotIn(place_id, [p["id"] for p in old.json])
+        self.assertIn(place_id, [p["id"] for p in new.json])
+
+    def test_invalid_parameters(self):
+        """Missing, non-numeric or out-of-range parameters → 400."""
+        for query in ("", "lat=10&radius_km=5", "lat=a&lon=1&radius_km=5",
+                      "lat=95&lon=1&radius_km=5", "lat=1&lon=1&radius_km=0",
+                      "min_lat=5&max_lat=1&min_lon=0&max_lon=1",
+                      "lat=1&lon=1", "lat=1&lon=1&limit=0",
+                      "lat=1&lon=1&limit=x"):
+            resp = self.client.get(f"/api/v1/places/search?{query}")
+            self.assertEqual(resp.status_code, 400, query)
+
+
+class TestCoordinateCacheSync(unittest.TestCase):
+    """Writes that skip this facade, as another process's would."""
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.auth = {"Authorization": f"Bearer {login.json['access_token']}"}
+
+    def search(self, lat, lon, radius_km=5):
+        resp = self.client.get(f"/api/v1/places/search?lat={lat}&lon={lon}"
+                               f"&radius_km={radius_km}")
+        self.assertEqual(resp.status_code, 200)
+        return [p["id"] for p in resp.json]
+
+    def create_place(self, latitude, longitude):
+        return self.client.post("/api/v1/places/", json={
+            "title": unique("Sync "), "description": "test", "price": 60,
+            "latitude": latitude, "longitude": longitude
+        }, headers=self.auth).json["id"]
+
+    def test_write_behind_the_cache(self):
+        """A place moved or deleted in the repository is seen."""
+        moved = self.create_place(-54.8, -68.3)
+        deleted = self.create_place(-54.8, -68.31)
+        self.assertIn(moved, self.search(-54.8, -68.3))
+        with mock.patch.object(facade.place_coordinates, "load") as load:
+            with self.app.app_context(), facade.transaction():
+                facade.place_repo.update(moved, {"latitude": -51.7,
+                                                 "longitude": -57.85})
+            self.assertNotIn(moved, self.search(-54.8, -68.3))
+            self.assertIn(moved, self.search(-51.7, -57.85))
+            with self.app.app_context(), facade.transaction():
+                facade.place_repo.delete(deleted)
+            self.assertNotIn(deleted, self.search(-54.8, -68.31))
+        # Only the changed places were read again
+        load.assert_not_called()
+
+    def test_pruned_change_log(self):
+        """Changes the log no longer holds: the cache is reloaded."""
+        self.search(0, 0)
+        moved = self.create_place(-54.8, -68.3)
+        with self.app.app_context(), facade.transaction():
+            facade.place_repo.update(moved, {"latitude": -51.7,
+                                             "longitude": -57.85})
+        with mock.patch.object(facade.place_repo, "find_coordinate_changes",
+                               return_value=None):
+            self.assertIn(moved, self.search(-51.7, -57.85))
+
+    def test_change_log(self):
+        """New and moved objects and deletions, the last `size` only."""
+        log = ChangeLog('latitude', 'longitude', size=3)
+        place = SimpleNamespace(id="a", latitude=1.0, longitude=2.0)
+        log.insert(place)
+        log.remove("a")
+        log.insert(place)        # re-indexed, not moved: not logged
+        self.assertEqual((log.seq, log.since(0)), (1, ["a"]))
+        place.latitude = 3.0
+        log.insert(SimpleNamespace(id="b", latitude=0.0, longitude=0.0))
+        log.insert(place)
+        log.deleted("b")
+        self.assertEqual(log.since(1), ["b", "a"])
+        self.assertEqual(log.since(4), [])
+        self.assertIsNone(log.since(0))
+
+    def test_cache_turned_off(self):
+        """Radius and nearest-N searches work without the cache."""
+        config["test-no-coordinates"] = type(
+            "NoCoordinateCacheConfig", (TestingConfig,),
+            {"PLACE_COORDINATE_CACHE": False})
+        self.addCleanup(config.pop, "test-no-coordinates")
+        self.addCleanup(facade.place_coordinates.configure)
+        self.app = create_app("test-no-coordinates")
+        self.client = self.app.test_client()
+        lat, lon = -50 + random.random() * 10, 160 + random.random() * 10
+        near = self.create_place(lat + 0.002, lon)
+        nearer = self.create_place(lat, lon + 0.0001)
+        self.assertEqual(self.search(lat, lon, 1), [nearer, near])
+        resp = self.client.get(
+            f"/api/v1/places/search?lat={lat}&lon={lon}&limit=2")
+        self.assertEqual([p["id"] for p in resp.json], [nearer, near])
+        self.assertFalse(facade.place_coordinates.loaded)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
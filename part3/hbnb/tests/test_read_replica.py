@@ -0,0 +1,191 @@
+"""
+Tests - Read replica routing
+Covers:
+- A new replica file starts as a copy of the primary, read-only
+- @reads queries go to the replica, everything else to the primary
+- Reads inside a write, or after one in the same session, use the primary
+- The caller who wrote reads the primary for REPLICA_STICKY_SECONDS
+- A write sees the primary's state of the objects read on the replica
+- `flask hbnb sync-replica` refreshes the replica
+- API: a new amenity is visible to its creator at once, to others
+  after the sync; a user read on the replica is not kept in user_cache
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import uuid
+from flask import g
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from hbnb.app import create_app, db
+from hbnb.app.api.v1.identity import Identity
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.persistence.repository import SQLAlchemyRepository
+from hbnb.app.persistence.routing import reads, replica_router, writes
+from hbnb.app.persistence.unit_of_work import transaction
+from hbnb.app.services.facade import USE_DATABASE, facade
+from hbnb.app.user_cache import user_cache
+from hbnb.config import TestingConfig, config
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+def make_replica_app(test):
+    """Testing app with a fresh replica file; cleaned up after test."""
+    directory = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, directory)
+    config["test-replica"] = type("ReplicaConfig", (TestingConfig,), {
+        "SQLALCHEMY_BINDS": {
+            "replica": f"sqlite:///{os.path.join(directory, 'replica.db')}"}})
+    test.addCleanup(config.pop, "test-replica")
+    return create_app("test-replica")
+
+
+@reads
+def read_amenity(amenity_id):
+    return db.session.get(Amenity, amenity_id)
+
+
+@writes
+def write_nothing():
+    """Stands for a facade write operation."""
+
+
+@writes
+def amenity_name(amenity_id):
+    """The name a write operation sees."""
+    return db.session.get(Amenity, amenity_id).name
+
+
+class TestReplicaRouting(unittest.TestCase):
+    """Runs on the SQL session directly, whatever the backend."""
+
+    def setUp(self):
+        self.app = make_replica_app(self)
+        self.repo = SQLAlchemyRepository(Amenity)
+        # Created on the primary only, after the replica copy
+        amenity = Amenity(name=unique("Replica "))
+        self.amenity_id = amenity.id
+        with self.app.app_context():
+            with transaction(db.session):
+                self.repo.add(amenity)
+
+    def tearDown(self):
+        with self.app.app_context():
+            with transaction(db.session):
+                self.repo.delete(self.amenity_id)
+
+    def test_replica_is_a_read_only_copy(self):
+        """Seeded from the primary; writes through it are refused."""
+        with self.app.app_context():
+            replica = db.engines["replica"]
+            with replica.connect() as connection:
+                self.assertEqual(connection.execute(text(
+                    "SELECT count(*) FROM users WHERE email = "
+                    "'admin@hbnb.io'")).scalar(), 1)
+                with self.assertRaises(OperationalError):
+                    connection.execute(text("DELETE FROM amenities"))
+
+    def test_reads_use_the_replica(self):
+        """Only @reads calls miss the row the replica lacks."""
+        with self.app.app_context():
+            self.assertIsNone(read_amenity(self.amenity_id))
+            self.assertIsNotNone(db.session.get(Amenity, self.amenity_id))
+
+    def test_session_sticks_after_write(self):
+        """After a write, the session's reads go to the primary."""
+        with self.app.app_context():
+            write_nothing()
+            self.assertIsNotNone(read_amenity(self.amenity_id))
+        with self.app.app_context():
+            self.assertIsNone(read_amenity(self.amenity_id))
+
+    def test_caller_window(self):
+        """The writer's next requests read the primary, others don't."""
+        def request_as(user_id):
+            context = self.app.test_request_context()
+            context.push()
+            g.identity = Identity(user_id, {})
+            return context
+
+        context = request_as("writer")
+        write_nothing()
+        context.pop()
+        for user_id, visible in (("writer", True), ("other", False)):
+            context = request_as(user_id)
+            self.assertEqual(read_amenity(self.amenity_id) is not None,
+                             visible, user_id)
+            context.pop()
+
+        replica_router.sticky_seconds = 0.01
+        context = request_as("writer")
+        write_nothing()
+        context.pop()
+        time.sleep(0.02)
+        context = request_as("writer")
+        self.assertIsNone(read_amenity(self.amenity_id))
+        context.pop()
+
+    def test_write_after_replica_read(self):
+        """A write reloads what the same session read on the replica."""
+        self.app.test_cli_runner().invoke(args=["hbnb", "sync-replica"])
+        with self.app.app_context():
+            with transaction(db.session):
+                self.repo.update(self.amenity_id, {"name": "Renamed"})
+        with self.app.app_context():
+            amenity = read_amenity(self.amenity_id)
+            self.assertNotEqual(amenity.name, "Renamed")
+            self.assertEqual(amenity_name(self.amenity_id), "Renamed")
+            self.assertEqual(amenity.name, "Renamed")
+
+    def test_sync_command(self):
+        """sync-replica copies the new row."""
+        result = self.app.test_cli_runner().invoke(
+            args=["hbnb", "sync-replica"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        with self.app.app_context():
+            self.assertIsNotNone(read_amenity(self.amenity_id))
+
+
+@unittest.skipUnless(USE_DATABASE, "the facade routes reads on the SQL backend")
+class TestReplicaApi(unittest.TestCase):
+
+    def setUp(self):
+        self.app = make_replica_app(self)
+        self.client = self.app.test_client()
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        self.auth = {"Authorization": f"Bearer {resp.json['access_token']}"}
+
+    def test_read_your_writes(self):
+        """The creator sees the amenity at once, anonymous after sync."""
+        resp = self.client.post("/api/v1/amenities/", json={
+            "name": unique("Replica api ")}, headers=self.auth)
+        self.assertEqual(resp.status_code, 201)
+        url = f"/api/v1/amenities/{resp.json['id']}"
+        self.assertEqual(self.client.get(url, headers=self.auth).status_code,
+                         200)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.app.test_cli_runner().invoke(args=["hbnb", "sync-replica"])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_user_cache_skips_replica(self):
+        """Only a user read on the primary enters the user cache."""
+        with self.app.app_context():
+            user_id = facade.get_user_by_email("admin@hbnb.io").id
+        user_cache.configure()
+        self.assertEqual(
+            self.client.get(f"/api/v1/users/{user_id}").status_code, 200)
+        self.assertIsNone(user_cache.get(user_id))
+        with self.app.app_context():
+            write_nothing()
+            facade.get_user_record(user_id)
+        self.assertIsNotNone(user_cache.get(user_id))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
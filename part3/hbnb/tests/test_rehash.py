@@ -0,0 +1,86 @@
+"""
+Tests - bcrypt cost migration on login
+Covers:
+- hash_rounds / needs_rehash read the cost stored in a hash
+- A successful login with a hash at another cost rehashes it in the
+  background and stores it; the password still works afterwards
+- A hash at the target cost is left alone; a failed login never rehashes
+- replace_password_hash does not overwrite a password changed meanwhile
+"""
+import unittest
+import uuid
+from hbnb.app import create_app
+from hbnb.app.hashing import hash_rounds, password_hasher
+from hbnb.app.services import facade
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestRehashOnLogin(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.email = f"{unique('rehash_')}@example.com"
+        resp = self.client.post("/api/v1/users/", json={
+            "first_name": "Re", "last_name": "Hash",
+            "email": self.email, "password": "pass1234"
+        }, headers=self.admin_headers())
+        self.user_id = resp.json["id"]
+        self.addCleanup(setattr, password_hasher, "work_factor",
+                        password_hasher.work_factor)
+
+    def admin_headers(self):
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        return {"Authorization": f"Bearer {resp.json['access_token']}"}
+
+    def login(self, password="pass1234"):
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": self.email, "password": password})
+        # Wait for background rehashes to be stored
+        password_hasher.shutdown()
+        return resp.status_code
+
+    def stored_hash(self):
+        with self.app.app_context():
+            return facade.get_user(self.user_id).password
+
+    def test_hash_rounds(self):
+        """The cost is read from the hash; other strings give None."""
+        self.assertEqual(hash_rounds("$2b$12$" + "a" * 53), 12)
+        self.assertIsNone(hash_rounds("plain-text"))
+        self.assertIsNone(hash_rounds(None))
+        self.assertFalse(password_hasher.needs_rehash("plain-text"))
+
+    def test_rehash_to_new_cost(self):
+        """Raising the target cost migrates the hash at the next login."""
+        self.assertEqual(hash_rounds(self.stored_hash()), 4)
+        password_hasher.work_factor = 5
+        self.assertEqual(self.login(), 200)
+        self.assertEqual(hash_rounds(self.stored_hash()), 5)
+        self.assertEqual(self.login(), 200)
+        self.assertEqual(self.login("wrong"), 401)
+
+    def test_same_cost_untouched(self):
+        """No rehash at the target cost, nor after a failed login."""
+        before = self.stored_hash()
+        self.assertEqual(self.login(), 200)
+        self.assertEqual(self.stored_hash(), before)
+        password_hasher.work_factor = 5
+        self.assertEqual(self.login("wrong"), 401)
+        self.assertEqual(self.stored_hash(), before)
+
+    def test_password_changed_meanwhile(self):
+        """A rehash of an outdated hash is dropped."""
+        with self.app.app_context():
+            stored = facade.replace_password_hash(
+                self.user_id, "$2b$04$outdated", "$2b$05$new")
+        self.assertFalse(stored)
+        self.assertNotEqual(self.stored_hash(), "$2b$05$new")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,193 @@
+"""
+Tests - InMemoryRepository
+Covers:
+- One storage partition per model class
+- Repositories on the same model share their partition
+- get_all / get_by_attribute never return objects of another model
+- Secondary hash indexes stay consistent through add / update / delete;
+  an update rejected by a unique index changes nothing
+- find_by filters on several criteria, with or without an index
+"""
+import unittest
+import uuid
+from datetime import datetime
+from hbnb.app import create_app
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.models.review import Review
+from hbnb.app.models.user import User
+from hbnb.app.persistence.indexes import HashIndex
+from hbnb.app.persistence.repository import InMemoryRepository
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class Listing:
+    """A model of these tests only: its partition starts empty."""
+
+    def __init__(self, code, title):
+        self.id = str(uuid.uuid4())
+        self.code = code
+        self.title = title
+        self.created_at = self.updated_at = datetime.utcnow()
+
+    def update(self, data):
+        for key, value in data.items():
+            setattr(self, key, value)
+        self.updated_at = datetime.utcnow()
+
+
+class TestInMemoryRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.user_repo = InMemoryRepository(User)
+        self.amenity_repo = InMemoryRepository(Amenity)
+
+    def make_user(self):
+        return User(first_name="Repo", last_name="Test",
+                    email=f"{unique('repo_')}@example.com", password="hashed")
+
+    def test_partitions_are_per_model(self):
+        """Objects only show up in the partition of their own model."""
+        user = self.make_user()
+        amenity = Amenity(name=unique("Sauna "))
+        self.user_repo.add(user)
+        self.amenity_repo.add(amenity)
+
+        self.assertIn(user, self.user_repo.get_all())
+        self.assertNotIn(amenity, self.user_repo.get_all())
+        self.assertIn(amenity, self.amenity_repo.get_all())
+        self.assertNotIn(user, self.amenity_repo.get_all())
+        self.assertIsNone(self.amenity_repo.get(user.id))
+
+    def test_partition_shared_between_instances(self):
+        """A second repository on the same model sees the same objects."""
+        user = self.make_user()
+        self.user_repo.add(user)
+        self.assertIs(InMemoryRepository(User).get(user.id), user)
+
+    def test_get_by_attribute_scoped_to_model(self):
+        """get_by_attribute does not match objects of other models."""
+        amenity = Amenity(name=unique("Jacuzzi "))
+        self.amenity_repo.add(amenity)
+        self.assertIsNone(self.user_repo.get_by_attribute("name", amenity.name))
+        self.assertIs(self.amenity_repo.get_by_attribute("name", amenity.name),
+                      amenity)
+
+    def test_delete(self):
+        """Deleted objects disappear from their partition."""
+        user = self.make_user()
+        self.user_repo.add(user)
+        self.user_repo.delete(user.id)
+        self.assertIsNone(self.user_repo.get(user.id))
+        self.assertNotIn(user, self.user_repo.get_all())
+
+
+class TestSecondaryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.repo = InMemoryRepository(Amenity,
+                                       indexes=[HashIndex("name", unique=True)])
+
+    def test_lookup_uses_index(self):
+        """get_by_attribute answers from the index."""
+        amenity = Amenity(name=unique("Sauna "))
+        self.repo.add(amenity)
+        index = self.repo._partition.indexes["name"]
+        self.assertEqual(index.lookup(amenity.name), [amenity.id])
+        self.assertIs(self.repo.get_by_attribute("name", amenity.name), amenity)
+
+    def test_unique_index_rejects_duplicates(self):
+        """Adding a second object with the same unique value fails."""
+        name = unique("Hammam ")
+        self.repo.add(Amenity(name=name))
+        with self.assertRaises(ValueError):
+            self.repo.add(Amenity(name=name))
+
+    def test_update_reindexes(self):
+        """After update the object is found under its new value only."""
+        amenity = Amenity(name=unique("Old "))
+        old_name = amenity.name
+        self.repo.add(amenity)
+        new_name = unique("New ")
+        self.repo.update(amenity.id, {"name": new_name})
+        self.assertIsNone(self.repo.get_by_attribute("name", old_name))
+        self.assertIs(self.repo.get_by_attribute("name", new_name), amenity)
+
+    def test_update_to_taken_value_is_rolled_back(self):
+        """A unique violation on update leaves the object unchanged."""
+        taken = Amenity(name=unique("Taken "))
+        amenity = Amenity(name=unique("Mine "))
+        self.repo.add(taken)
+        self.repo.add(amenity)
+        original = amenity.name
+        with self.assertRaises(ValueError):
+            self.repo.update(amenity.id, {"name": taken.name})
+        self.assertEqual(amenity.name, original)
+        self.assertIs(self.repo.get_by_attribute("name", original), amenity)
+        self.assertIs(self.repo.get_by_attribute("name", taken.name), taken)
+
+    def test_rejected_update_changes_nothing(self):
+        """The other fields of a rejected update are rolled back too."""
+        repo = InMemoryRepository(Listing,
+                                  indexes=[HashIndex("code", unique=True)])
+        taken = Listing(unique("code-"), "Taken")
+        listing = Listing(unique("code-"), "Old title")
+        repo.add(taken)
+        repo.add(listing)
+        before = vars(listing).copy()
+        with self.assertRaises(ValueError):
+            repo.update(listing.id, {"title": "New title",
+                                     "code": taken.code})
+        self.assertEqual(vars(listing), before)
+        self.assertIs(repo.get_by_attribute("code", listing.code), listing)
+
+    def test_delete_unindexes(self):
+        """Deleted objects are no longer reachable through the index."""
+        amenity = Amenity(name=unique("Gone "))
+        self.repo.add(amenity)
+        self.repo.delete(amenity.id)
+        self.assertIsNone(self.repo.get_by_attribute("name", amenity.name))
+
+    def test_non_unique_index(self):
+        """A non-unique index keeps every object sharing a value."""
+        if "last_name" not in InMemoryRepository(User)._partition.indexes:
+            # Not left on the shared User partition for later tests
+            self.addCleanup(InMemoryRepository(User)._partition.indexes.pop,
+                            "last_name")
+        repo = InMemoryRepository(User, indexes=[HashIndex("last_name")])
+        last_name = unique("Fam")
+        users = [User(first_name="A", last_name=last_name,
+                      email=f"{unique('idx_')}@example.com", password="x")
+                 for _ in range(3)]
+        for user in users:
+            repo.add(user)
+        index = repo._partition.indexes["last_name"]
+        self.assertEqual(index.lookup(last_name), [u.id for u in users])
+    def test_find_by(self):
+        """find_by combines indexed and non-indexed criteria."""
+        repo = InMemoryRepository(Review, indexes=[HashIndex("place_id"),
+                                                   HashIndex("user_id")])
+        place_id, other_place = unique("place-"), unique("place-")
+        first = Review(text="ok", rating=4, user_id=unique("u-"),
+                       place_id=place_id)
+        second = Review(text="meh", rating=2, user_id=unique("u-"),
+                        place_id=place_id)
+        elsewhere = Review(text="ok", rating=4, user_id=first.user_id,
+                           place_id=other_place)
+        for review in (first, second, elsewhere):
+            repo.add(review)
+
+        self.assertEqual(repo.find_by(place_id=place_id), [first, second])
+        self.assertEqual(repo.find_by(user_id=first.user_id),
+                         [first, elsewhere])
+        self.assertEqual(repo.find_by(place_id=place_id, rating=2), [second])
+        self.assertEqual(repo.find_by(place_id=unique("none-")), [])
+        self.assertIn(second, repo.find_by(text="meh"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
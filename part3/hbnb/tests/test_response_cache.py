@@ -0,0 +1,186 @@
+"""
+Tests - Response cache of public GET endpoints
+Covers:
+- ResponseCache: LRU eviction, TTL, tag invalidation, no stale entry
+  from a read racing with a write (also across a sweep of the tag
+  versions, which stay bounded), metrics
+- GET /places/<id> (with ?expand=), /places/<id>/amenities,
+  /places/<id>/reviews, /amenities/ and /users/<id> are served from
+  the cache and reflect every write made through the API at once
+"""
+import time
+import unittest
+import uuid
+from hbnb.app import create_app
+from hbnb.app.response_cache import ResponseCache, response_cache
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_lru_and_metrics(self):
+        """Least recently used entries are evicted and counted."""
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.put(key, key, [(key,)], cache.generation())
+        cache.get("a")
+        cache.put("c", "c", [], cache.generation())
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "a")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"],
+                          stats["size"]), (2, 1, 1, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+    def test_ttl(self):
+        """Entries expire."""
+        cache = ResponseCache(ttl=0.01)
+        cache.put("a", "a", [], cache.generation())
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_invalidation(self):
+        """A write drops exactly the entries tagged with it."""
+        cache = ResponseCache()
+        cache.put("p1", "p1", [("place", "1")], cache.generation())
+        cache.put("p2", "p2", [("place", "2")], cache.generation())
+        cache.invalidate(("place", "1"))
+        self.assertIsNone(cache.get("p1"))
+        self.assertEqual(cache.get("p2"), "p2")
+        self.assertEqual(cache.stats()["invalidations"], 1)
+
+    def test_racing_write(self):
+        """A body built before a write to its entities is not stored."""
+        cache = ResponseCache()
+        built = cache.generation()
+        cache.invalidate(("place", "1"))
+        cache.put("p1", "old", [("place", "1")], built)
+        self.assertIsNone(cache.get("p1"))
+
+    def test_versions_bounded(self):
+        """Many distinct writes: the versions are swept, nothing stale."""
+        cache = ResponseCache(max_entries=4)
+        cache.put("p1", "p1", [("place", "1")], cache.generation())
+        cache.put("p2", "p2", [("place", "2")], cache.generation())
+        built = cache.generation()
+        cache.invalidate(("place", "1"))
+        for n in range(1000):
+            cache.invalidate(("review", n))
+            self.assertLessEqual(len(cache._versions), 4)
+        # Swept: the stale entry, the body built before the write
+        self.assertIsNone(cache.get("p1"))
+        cache.put("p1", "old", [("place", "1")], built)
+        self.assertIsNone(cache.get("p1"))
+        self.assertEqual(cache.get("p2"), "p2")
+        cache.invalidate(("place", "2"))
+        self.assertIsNone(cache.get("p2"))
+
+    def test_disabled(self):
+        """Size 0 stores nothing."""
+        cache = ResponseCache(max_entries=0)
+        cache.put("a", "a", [], cache.generation())
+        self.assertIsNone(cache.get("a"))
+
+
+class TestCachedEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.admin = self.login("admin@hbnb.io", "admin1234")
+        self.owner_id, self.owner = self.make_user("owner")
+        self.guest_id, self.guest = self.make_user("guest")
+        resp = self.client.post("/api/v1/places/", json={
+            "title": "Cached place", "description": "Test", "price": 100,
+            "latitude": 10, "longitude": 20}, headers=self.owner)
+        self.place_id = resp.json["id"]
+        resp = self.client.post("/api/v1/amenities/", json={
+            "name": unique("Sauna ")}, headers=self.admin)
+        self.amenity_id = resp.json["id"]
+
+    def login(self, email, password):
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": email, "password": password})
+        return {"Authorization": f"Bearer {resp.json['access_token']}"}
+
+    def make_user(self, name):
+        email = f"{unique(name)}@example.com"
+        resp = self.client.post("/api/v1/users/", json={
+            "first_name": name, "last_name": "Test", "email": email,
+            "password": "pass1234"}, headers=self.admin)
+        return resp.json["id"], self.login(email, "pass1234")
+
+    def get_twice(self, url):
+        """GET url twice; the second answer must come from the cache."""
+        first = self.client.get(url)
+        hits = response_cache.stats()["hits"]
+        second = self.client.get(url)
+        self.assertEqual(response_cache.stats()["hits"], hits + 1)
+        self.assertEqual(first.json, second.json)
+        return second
+
+    def test_place_and_reviews(self):
+        """A review refreshes the place's aggregates and review list."""
+        place_url = f"/api/v1/places/{self.place_id}"
+        self.assertEqual(self.get_twice(place_url).json["review_count"], 0)
+        self.assertEqual(self.get_twice(f"{place_url}/reviews").json, [])
+        resp = self.client.post("/api/v1/reviews/", json={
+            "text": "Great", "rating": 5, "user_id": self.guest_id,
+            "place_id": self.place_id},
+            headers=self.guest)
+        self.assertEqual(resp.status_code, 201, resp.json)
+        self.assertEqual(self.client.get(place_url).json["review_count"], 1)
+        self.assertEqual(len(self.client.get(f"{place_url}/reviews").json), 1)
+
+        self.client.put(place_url, json={"title": "Renamed"},
+                        headers=self.owner)
+        self.assertEqual(self.client.get(place_url).json["title"], "Renamed")
+        self.client.delete(place_url, headers=self.owner)
+        self.assertEqual(self.client.get(place_url).status_code, 404)
+        self.assertEqual(self.client.get(f"{place_url}/reviews").status_code, 404)
+
+    def test_place_amenities(self):
+        """Linking and renaming an amenity refresh the cached lists."""
+        url = f"/api/v1/places/{self.place_id}/amenities"
+        expanded = f"/api/v1/places/{self.place_id}?expand=amenities,owner"
+        self.assertEqual(self.get_twice(url).json, [])
+        self.get_twice(expanded)
+        self.client.post(f"{url}/{self.amenity_id}", headers=self.owner)
+        self.assertEqual(len(self.client.get(url).json), 1)
+        self.assertEqual(len(self.get_twice(expanded).json["amenities"]), 1)
+
+        self.client.put(f"/api/v1/amenities/{self.amenity_id}",
+                        json={"name": unique("Spa ")}, headers=self.admin)
+        name = self.client.get(f"/api/v1/amenities/{self.amenity_id}").json["name"]
+        self.assertEqual(self.client.get(url).json[0]["name"], name)
+        self.assertEqual(
+            self.client.get(expanded).json["amenities"][0]["name"], name)
+
+        self.client.put(f"/api/v1/users/{self.owner_id}",
+                        json={"first_name": "Newname"}, headers=self.owner)
+        self.assertEqual(
+            self.client.get(expanded).json["owner"]["first_name"], "Newname")
+
+    def test_amenities_and_users(self):
+        """Amenity and user writes refresh their cached responses."""
+        names = {a["name"] for a in self.get_twice("/api/v1/amenities/").json}
+        new_name = unique("Gym ")
+        self.assertNotIn(new_name, names)
+        self.client.post("/api/v1/amenities/", json={"name": new_name},
+                         headers=self.admin)
+        self.assertIn(new_name, {a["name"] for a
+                                 in self.client.get("/api/v1/amenities/").json})
+
+        url = f"/api/v1/users/{self.guest_id}"
+        self.assertEqual(self.get_twice(url).json["first_name"], "guest")
+        self.client.put(url, json={"first_name": "Visitor"}, headers=self.guest)
+        self.assertEqual(self.client.get(url).json["first_name"], "Visitor")
+        self.assertEqual(self.client.get("/api/v1/users/nope").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -46,6 +46,14 @@ class TestSQLSchema(unittest.TestCase):
             self.assertIn(t.lower(), tables,
                           f"Table '{t}' missing. Found: {tables}")
  
+    def test_review_foreign_keys_indexed(self):
+        """reviews.place_id and reviews.user_id have their own index."""
+        inspector = db.inspect(db.engine)
+        indexed = {tuple(ix["column_names"])
+                   for ix in inspector.get_indexes("reviews")}
+        self.assertIn(("place_id",), indexed)
+        self.assertIn(("user_id",), indexed)
+ 
     # ------------------------------------------------------------------
     # Initial data
     # ------------------------------------------------------------------
@@ -0,0 +1,52 @@
+"""
+Tests - SQLite connection settings
+Covers:
+- Every connection gets the SQLITE_PRAGMAS of its app
+- The production profile (WAL, busy timeout, ...) and pool size
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import text
+from hbnb.app import create_app, db
+from hbnb.config import ProductionConfig, config
+
+
+def pragma(name):
+    with db.engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSqliteProfile(unittest.TestCase):
+
+    def test_testing_profile(self):
+        """Foreign keys are enforced; the journal is left as is."""
+        app = create_app()
+        with app.app_context():
+            self.assertEqual(pragma("foreign_keys"), 1)
+            self.assertEqual(pragma("journal_mode"), "delete")
+
+    def test_production_profile(self):
+        """WAL and the other production pragmas on a fresh file."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        config["test-production"] = type("TestProduction", (ProductionConfig,), {
+            "SQLALCHEMY_DATABASE_URI":
+                f"sqlite:///{os.path.join(directory, 'prod.db')}"})
+        self.addCleanup(config.pop, "test-production")
+
+        app = create_app("test-production")
+        with app.app_context():
+            self.assertEqual(pragma("journal_mode"), "wal")
+            self.assertEqual(pragma("synchronous"), 1)  # NORMAL
+            self.assertEqual(pragma("busy_timeout"), 5000)
+            self.assertEqual(pragma("foreign_keys"), 1)
+            self.assertEqual(pragma("temp_store"), 2)   # MEMORY
+            self.assertEqual(pragma("cache_size"), -65536)
+            self.assertEqual(db.engine.pool.size(),
+                             ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS["pool_size"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
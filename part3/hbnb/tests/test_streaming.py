@@ -0,0 +1,65 @@
+"""
+Tests - Streaming exports
+Covers:
+- ?stream=ndjson returns one JSON object per line
+- ?stream=json returns a valid JSON array
+- Streamed exports contain the same items as the plain list
+- Unknown stream format → 400
+"""
+import json
+import unittest
+import uuid
+from hbnb.app import create_app
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+        resp = self.client.post("/api/v1/places/", json={
+            "title": unique("Streamed "), "description": "test",
+            "price": 80, "latitude": 43.3, "longitude": 5.4
+        }, headers=auth)
+        self.place_id = resp.json.get("id")
+
+    def test_ndjson(self):
+        """Each line is one place; the new place is among them."""
+        resp = self.client.get("/api/v1/places/?stream=ndjson")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, "application/x-ndjson")
+        lines = resp.get_data(as_text=True).splitlines()
+        places = [json.loads(line) for line in lines]
+        self.assertIn(self.place_id, [p["id"] for p in places])
+
+    def test_json_array_matches_plain_list(self):
+        """The streamed array holds the same places as the plain list."""
+        resp = self.client.get("/api/v1/places/?stream=json")
+        self.assertEqual(resp.status_code, 200)
+        streamed = json.loads(resp.get_data(as_text=True))
+        plain = self.client.get("/api/v1/places/").json
+        self.assertEqual(sorted(p["id"] for p in streamed),
+                         sorted(p["id"] for p in plain))
+
+    def test_reviews_stream(self):
+        """Reviews can be streamed too (possibly empty)."""
+        resp = self.client.get("/api/v1/reviews/?stream=json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsInstance(json.loads(resp.get_data(as_text=True)), list)
+
+    def test_unknown_format(self):
+        """stream=xml → 400."""
+        resp = self.client.get("/api/v1/places/?stream=xml")
+        self.assertEqual(resp.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
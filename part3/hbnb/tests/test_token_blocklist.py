@@ -0,0 +1,131 @@
+"""
+Tests - Refresh tokens, logout and the token blocklist
+Covers:
+- Login returns an access and a refresh token; /auth/refresh only
+  accepts the refresh token and issues a working access token
+- /auth/logout revokes the token sent and the refresh token of the
+  pair: after logging out with the access token, /auth/refresh is
+  refused; after logging out with the refresh token, so are the access
+  tokens it issued (both blocklist stores)
+- Memory store: expired buckets are dropped
+- Database store: expired rows are deleted on revocation
+"""
+import time
+import unittest
+import uuid
+from hbnb.app import create_app, db
+from hbnb.app.models import RevokedToken
+from hbnb.app.token_blocklist import (DatabaseBlocklist, MemoryBlocklist,
+                                      token_blocklist)
+
+
+class TestMemoryBlocklist(unittest.TestCase):
+
+    def test_revoke_and_prune(self):
+        """Tokens are revoked until their bucket is past."""
+        blocklist = MemoryBlocklist(bucket_seconds=60)
+        now = time.time()
+        blocklist.revoke("soon", now + 10)
+        blocklist.revoke("later", now + 3600)
+        self.assertIn("soon", blocklist)
+        self.assertNotIn("other", blocklist)
+        blocklist.prune(now + 130)
+        self.assertNotIn("soon", blocklist)
+        self.assertIn("later", blocklist)
+        self.assertEqual(len(blocklist), 1)
+
+    def test_expired_on_lookup(self):
+        """Lookups prune by themselves once past the next bucket."""
+        blocklist = MemoryBlocklist(bucket_seconds=0.01)
+        blocklist.revoke("gone", time.time())
+        time.sleep(0.03)
+        self.assertNotIn("gone", blocklist)
+        self.assertEqual(len(blocklist), 0)
+
+
+class TestDatabaseBlocklist(unittest.TestCase):
+
+    def test_revoke_and_prune(self):
+        """Revoking deletes the rows of expired tokens."""
+        app = create_app()
+        blocklist = DatabaseBlocklist()
+        expired, live = str(uuid.uuid4()), str(uuid.uuid4())
+        with app.app_context():
+            db.session.add(RevokedToken(jti=expired, expires=0))
+            db.session.commit()
+            self.assertIn(expired, blocklist)
+            blocklist.revoke(live, time.time() + 60)
+            blocklist.revoke(live, time.time() + 60)
+            self.assertIn(live, blocklist)
+            self.assertNotIn(expired, blocklist)
+
+
+class TestLogoutRefresh(unittest.TestCase):
+
+    store = "memory"
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config["JWT_BLOCKLIST_STORE"] = self.store
+        token_blocklist.init_app(self.app)
+        self.addCleanup(token_blocklist.init_app, create_app())
+        self.client = self.app.test_client()
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        self.access = resp.json["access_token"]
+        self.refresh = resp.json["refresh_token"]
+
+    def post(self, path, token):
+        return self.client.post(f"/api/v1/auth/{path}",
+                                headers={"Authorization": f"Bearer {token}"})
+
+    def protected(self, token):
+        return self.client.get("/api/v1/auth/protected",
+                               headers={"Authorization": f"Bearer {token}"})
+
+    def test_refresh(self):
+        """The refresh token, and only it, yields a new access token."""
+        self.assertEqual(self.post("refresh", self.access).status_code, 422)
+        resp = self.post("refresh", self.refresh)
+        self.assertEqual(resp.status_code, 200)
+        access = resp.json["access_token"]
+        resp = self.protected(access)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json["is_admin"])
+        # A refresh token is not an access token
+        self.assertEqual(self.protected(self.refresh).status_code, 422)
+
+    def login(self):
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        return resp.json["access_token"], resp.json["refresh_token"]
+
+    def test_logout(self):
+        """The access token and its refresh token are both revoked."""
+        access, refresh = self.login()
+        self.assertEqual(self.post("logout", self.access).status_code, 200)
+        resp = self.protected(self.access)
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.json["msg"], "Token has been revoked")
+        self.assertEqual(self.post("refresh", self.refresh).status_code, 401)
+        # Another login's tokens keep working
+        self.assertEqual(self.protected(access).status_code, 200)
+        self.assertEqual(self.post("refresh", refresh).status_code, 200)
+
+    def test_logout_with_refresh_token(self):
+        """The access tokens of a revoked refresh token are refused."""
+        access = self.post("refresh", self.refresh).json["access_token"]
+        self.assertEqual(self.protected(access).status_code, 200)
+        self.assertEqual(self.post("logout", self.refresh).status_code, 200)
+        self.assertEqual(self.post("refresh", self.refresh).status_code, 401)
+        for token in (access, self.access):
+            self.assertEqual(self.protected(token).status_code, 401)
+
+
+class TestLogoutRefreshDatabase(TestLogoutRefresh):
+
+    store = "database"
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,145 @@
+"""
+Tests - Unit of work
+Covers:
+- Repository writes inside transaction() commit once, at the end
+- Nested blocks join the outer unit
+- An exception rolls the whole unit back
+- delete_many removes N rows with one commit and batched DELETEs
+- Deleting a place removes its reviews (single facade transaction)
+"""
+import unittest
+import uuid
+from sqlalchemy import event
+from hbnb.app import create_app, db
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.persistence.repository import SQLAlchemyRepository
+from hbnb.app.persistence.unit_of_work import in_transaction, transaction
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Runs on the SQL repository directly, whatever the backend."""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repo = SQLAlchemyRepository(Amenity)
+        self.session = db.session()
+        self.commits = 0
+        self.statements = []
+        event.listen(self.session, "after_commit", self.count_commit)
+        event.listen(db.engine, "before_cursor_execute", self.count_statement)
+        self.created = []
+
+    def tearDown(self):
+        event.remove(self.session, "after_commit", self.count_commit)
+        event.remove(db.engine, "before_cursor_execute", self.count_statement)
+        with transaction(db.session):
+            self.repo.delete_many(self.created)
+        self.ctx.pop()
+
+    def count_commit(self, session):
+        self.commits += 1
+
+    def count_statement(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def new_amenity(self):
+        amenity = Amenity(name=unique("Unit "))
+        self.created.append(amenity.id)
+        return amenity
+
+    def test_single_commit(self):
+        """Two adds and an update → one commit."""
+        first, second = self.new_amenity(), self.new_amenity()
+        with transaction(db.session):
+            self.repo.add(first)
+            self.repo.add(second)
+            self.repo.update(first.id, {"name": unique("Renamed ")})
+            self.assertTrue(in_transaction(db.session))
+        self.assertEqual(self.commits, 1)
+        self.assertFalse(in_transaction(db.session))
+        db.session.expire_all()
+        self.assertIsNotNone(self.repo.get(second.id))
+
+    def test_nested_blocks_join(self):
+        """Only the outermost block commits."""
+        with transaction(db.session):
+            self.repo.add(self.new_amenity())
+            with transaction(db.session):
+                self.repo.add(self.new_amenity())
+            self.assertEqual(self.commits, 0)
+        self.assertEqual(self.commits, 1)
+
+    def test_exception_rolls_back(self):
+        """Nothing of a failed unit is kept."""
+        amenity = self.new_amenity()
+        with self.assertRaises(RuntimeError):
+            with transaction(db.session):
+                self.repo.add(amenity)
+                raise RuntimeError("boom")
+        self.assertEqual(self.commits, 0)
+        self.assertIsNone(self.repo.get(amenity.id))
+
+    def test_delete_many_batches(self):
+        """Deleting 20 rows: one commit, DELETEs sent as one batch."""
+        amenities = [self.new_amenity() for _ in range(20)]
+        with transaction(db.session):
+            for amenity in amenities:
+                self.repo.add(amenity)
+        self.commits = 0
+        self.statements.clear()
+        with transaction(db.session):
+            self.repo.delete_many(a.id for a in amenities)
+        self.assertEqual(self.commits, 1)
+        deletes = [s for s in self.statements if s.startswith("DELETE")]
+        self.assertLessEqual(len(deletes), 2)
+        self.assertEqual(self.repo.get_many(a.id for a in amenities), [])
+
+
+class TestDeletePlaceWithReviews(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        login = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"
+        })
+        self.auth = {"Authorization": f"Bearer {login.json.get('access_token', '')}"}
+
+    def test_reviews_deleted_with_place(self):
+        """The place's reviews are gone after deleting it."""
+        place = self.client.post("/api/v1/places/", json={
+            "title": unique("Doomed "), "description": "test", "price": 10,
+            "latitude": 0.0, "longitude": 0.0
+        }, headers=self.auth).json
+        review_ids = []
+        for _ in range(3):
+            email = f"{unique('uow_')}@example.com"
+            self.client.post("/api/v1/users/", json={
+                "first_name": "Unit", "last_name": "Work",
+                "email": email, "password": "pass123"
+            }, headers=self.auth)
+            token = self.client.post("/api/v1/auth/login", json={
+                "email": email, "password": "pass123"
+            }).json["access_token"]
+            review = self.client.post("/api/v1/reviews/", json={
+                "text": "Soon gone", "rating": 3,
+                "user_id": "placeholder", "place_id": place["id"]
+            }, headers={"Authorization": f"Bearer {token}"})
+            review_ids.append(review.json["id"])
+
+        resp = self.client.delete(f"/api/v1/places/{place['id']}",
+                                  headers=self.auth)
+        self.assertEqual(resp.status_code, 200)
+        for review_id in review_ids:
+            resp = self.client.get(f"/api/v1/reviews/{review_id}")
+            self.assertEqual(resp.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,96 @@
+"""
+Tests - Schema upgrade of an existing database (`flask hbnb upgrade-schema`)
+Covers:
+- create_app leaves existing tables as they are (no ALTER TABLE)
+- The command adds the missing columns and indexes, and fills the
+  rating aggregates of the places when their columns were added
+- Running it again changes nothing
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+from datetime import datetime
+from sqlalchemy import inspect, text
+from hbnb.app import create_app, db
+from hbnb.app.models import Place
+from hbnb.config import TestingConfig, config
+
+
+class TestUpgradeSchema(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        config["test-upgrade"] = type("UpgradeConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI":
+                f"sqlite:///{os.path.join(directory, 'old.db')}"})
+        self.addCleanup(config.pop, "test-upgrade")
+
+        # A database from before the rating aggregates: one rated place
+        app = create_app("test-upgrade")
+        self.place_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        with app.app_context(), db.engine.begin() as connection:
+            users = [str(uuid.uuid4()) for _ in range(2)]
+            for user_id in users:
+                connection.execute(text(
+                    "INSERT INTO users (id, first_name, last_name, email,"
+                    " password, created_at, updated_at) VALUES"
+                    " (:id, 'Old', 'User', :email, 'x', :now, :now)"),
+                    {"id": user_id, "email": f"{user_id}@old.io", "now": now})
+            connection.execute(text(
+                "INSERT INTO places (id, title, price, latitude, longitude,"
+                " owner_id, created_at, updated_at) VALUES"
+                " (:id, 'Old', 10, 0, 0, :owner, :now, :now)"),
+                {"id": self.place_id, "owner": users[0], "now": now})
+            for user_id, rating in zip(users, (3, 4)):
+                connection.execute(text(
+                    "INSERT INTO reviews (id, text, rating, user_id, place_id,"
+                    " created_at, updated_at) VALUES"
+                    " (:id, 'Old review', :rating, :user, :place, :now, :now)"),
+                    {"id": str(uuid.uuid4()), "rating": rating,
+                     "user": user_id, "place": self.place_id, "now": now})
+            connection.execute(text("DROP INDEX ix_places_rating"))
+            for column in Place.RATING_AGGREGATES:
+                connection.execute(text(
+                    f"ALTER TABLE places DROP COLUMN {column}"))
+
+    def place_columns(self):
+        return {column["name"]
+                for column in inspect(db.engine).get_columns("places")}
+
+    def index_names(self):
+        with db.engine.connect() as connection:
+            return set(connection.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )).scalars())
+
+    def test_upgrade(self):
+        app = create_app("test-upgrade")
+        with app.app_context():
+            self.assertNotIn("review_count", self.place_columns())
+
+        runner = app.test_cli_runner()
+        result = runner.invoke(args=["hbnb", "upgrade-schema"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("places.review_count: added", result.output)
+        self.assertIn("rating aggregates rebuilt", result.output)
+        with app.app_context():
+            self.assertLessEqual(set(Place.RATING_AGGREGATES),
+                                 self.place_columns())
+            self.assertIn("ix_places_rating", self.index_names())
+            place = db.session.get(Place, self.place_id)
+            self.assertEqual(place.review_count, 2)
+            self.assertEqual(place.average_rating, 3.5)
+            self.assertEqual(place.rating_4, 1)
+
+        result = runner.invoke(args=["hbnb", "upgrade-schema"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertNotIn("added", result.output)
+        self.assertNotIn("rebuilt", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,212 @@
+"""
+Tests - Single writer queue with group commit
+Covers:
+- after_commit callbacks run after the outermost commit, never on rollback
+- A failing savepoint undoes only its own changes and callbacks
+- Queued operations are committed in one batch (one COMMIT)
+- A failing operation gets its exception, the rest of its batch is kept
+- Routed calls return objects usable in the caller's session; inside
+  an open unit of work they run in place
+- With WRITE_QUEUE on, concurrent API writes go through the writer
+"""
+import threading
+import unittest
+import uuid
+from sqlalchemy import event
+from hbnb.app import create_app, db
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.persistence.repository import SQLAlchemyRepository
+from hbnb.app.persistence.unit_of_work import (
+    after_commit, in_transaction, savepoint, transaction)
+from hbnb.app.persistence.write_queue import WriteQueue, write_queue
+from hbnb.app.services.facade import USE_DATABASE
+from hbnb.config import TestingConfig, config
+
+
+def unique(prefix=""):
+    return f"{prefix}{str(uuid.uuid4())[:8]}"
+
+
+class SqlTestCase(unittest.TestCase):
+    """Runs on the SQL repository directly, whatever the backend."""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repo = SQLAlchemyRepository(Amenity)
+        self.created = []
+
+    def tearDown(self):
+        db.session.rollback()
+        with transaction(db.session):
+            self.repo.delete_many(self.created)
+        self.ctx.pop()
+
+    def new_amenity(self):
+        amenity = Amenity(name=unique("Writer "))
+        self.created.append(amenity.id)
+        return amenity
+
+    def stored(self, amenity_id):
+        db.session.expire_all()
+        return self.repo.get(amenity_id) is not None
+
+
+class TestAfterCommit(SqlTestCase):
+
+    def test_after_outermost_commit(self):
+        """Deferred inside a unit of work, immediate outside."""
+        calls = []
+        with transaction(db.session):
+            with transaction(db.session):
+                after_commit(db.session, calls.append, "inner")
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ["inner"])
+        after_commit(db.session, calls.append, "now")
+        self.assertEqual(calls, ["inner", "now"])
+
+    def test_dropped_on_rollback(self):
+        """A rolled back unit runs none of its callbacks."""
+        calls = []
+        with self.assertRaises(ValueError):
+            with transaction(db.session):
+                after_commit(db.session, calls.append, "lost")
+                raise ValueError("boom")
+        with transaction(db.session):
+            pass
+        self.assertEqual(calls, [])
+
+    def test_savepoint_failure_is_local(self):
+        """Only the failed step's row and callback are dropped."""
+        calls = []
+        kept, lost = self.new_amenity(), self.new_amenity()
+        with transaction(db.session):
+            with savepoint(db.session):
+                self.repo.add(kept)
+                after_commit(db.session, calls.append, "kept")
+            with self.assertRaises(ValueError):
+                with savepoint(db.session):
+                    self.repo.add(lost)
+                    after_commit(db.session, calls.append, "lost")
+                    raise ValueError("boom")
+        self.assertEqual(calls, ["kept"])
+        self.assertTrue(self.stored(kept.id))
+        self.assertFalse(self.stored(lost.id))
+
+
+class TestWriteQueue(SqlTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Long delay: everything submitted at once lands in one batch
+        self.queue = WriteQueue(max_batch=5, max_delay=0.5)
+        self.queue.start(self.app)
+        self.commits = 0
+        event.listen(db.engine, "commit", self.count_commit)
+
+    def tearDown(self):
+        self.queue.shutdown()
+        event.remove(db.engine, "commit", self.count_commit)
+        super().tearDown()
+
+    def count_commit(self, connection):
+        self.commits += 1
+
+    def add(self, amenity, fail=False):
+        self.repo.add(amenity)
+        if fail:
+            raise ValueError("rejected")
+        return amenity.id
+
+    def test_group_commit(self):
+        """Five operations, one batch, one COMMIT."""
+        amenities = [self.new_amenity() for _ in range(5)]
+        ids = [amenity.id for amenity in amenities]
+        futures = [self.queue.submit(self.add, amenity)
+                   for amenity in amenities]
+        self.assertEqual([future.result(timeout=10) for future in futures],
+                         ids)
+        self.assertEqual(self.commits, 1)
+        stats = self.queue.stats()
+        self.assertEqual((stats["batches"], stats["largest_batch"]), (1, 5))
+        self.assertTrue(all(self.stored(amenity_id) for amenity_id in ids))
+
+    def test_failure_is_isolated(self):
+        """The failing operation raises; its neighbours are committed."""
+        first, bad, last = (self.new_amenity() for _ in range(3))
+        ids = [first.id, bad.id, last.id]
+        futures = [self.queue.submit(self.add, first),
+                   self.queue.submit(self.add, bad, fail=True),
+                   self.queue.submit(self.add, last)]
+        with self.assertRaises(ValueError):
+            futures[1].result(timeout=10)
+        futures[2].result(timeout=10)
+        self.assertEqual(self.queue.stats()["failures"], 1)
+        self.assertEqual([self.stored(amenity_id) for amenity_id in ids],
+                         [True, False, True])
+
+    def test_routed_result_is_adopted(self):
+        """The returned object belongs to the caller's session."""
+        threads = []
+
+        @self.queue.routed
+        def create(name):
+            threads.append(threading.current_thread())
+            amenity = Amenity(name=name)
+            self.created.append(amenity.id)
+            self.repo.add(amenity)
+            return amenity
+
+        name = unique("Routed ")
+        amenity = create(name)
+        self.assertIs(threads[0], self.queue._thread)
+        self.assertIn(amenity, db.session)
+        self.assertEqual(amenity.name, name)
+
+        with transaction(db.session):
+            create(unique("In place "))
+            self.assertTrue(in_transaction(db.session))
+        self.assertIs(threads[1], threading.current_thread())
+
+
+@unittest.skipUnless(USE_DATABASE, "the writer only serves the SQL backend")
+class TestWriteQueueApi(unittest.TestCase):
+
+    def setUp(self):
+        config["test-write-queue"] = type("WriteQueueConfig", (TestingConfig,),
+                                          {"WRITE_QUEUE": True})
+        self.addCleanup(config.pop, "test-write-queue")
+        self.app = create_app("test-write-queue")
+        self.addCleanup(write_queue.shutdown)
+        self.client = self.app.test_client()
+        resp = self.client.post("/api/v1/auth/login", json={
+            "email": "admin@hbnb.io", "password": "admin1234"})
+        self.auth = {"Authorization": f"Bearer {resp.json['access_token']}"}
+
+    def test_concurrent_writes(self):
+        """Parallel creations all succeed; a duplicate is refused."""
+        names = [unique("Queued ") for _ in range(8)]
+        statuses = []
+
+        def create(name):
+            with self.app.test_client() as client:
+                resp = client.post("/api/v1/amenities/", json={"name": name},
+                                   headers=self.auth)
+                statuses.append(resp.status_code)
+
+        threads = [threading.Thread(target=create, args=(name,))
+                   for name in names + names[:1]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(statuses), [201] * 8 + [400])
+        self.assertGreaterEqual(write_queue.stats()["operations"], 9)
+        listed = {amenity["name"] for amenity in
+                  self.client.get("/api/v1/amenities/").json}
+        self.assertTrue(set(names) <= listed)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)